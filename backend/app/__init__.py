@@ -1,34 +1,66 @@
 import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity # Import JWTManager and decorators/functions
 from flask import jsonify # Import jsonify for error responses
 
 from .config import config_by_name # Use relative import now that config is in the app package
+from .replica import RoutingSession, init_replica
 
 # Moved User import into user_lookup_callback to avoid circular import
 
 # Initialize extensions without app context
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession}) # Reads may go to a replica (see replica.py)
 bcrypt = Bcrypt()
 cors = CORS()
 jwt = JWTManager() # Initialize JWTManager
 
-def create_app(config_name=None):
-    """Application Factory Function"""
+APP_MODES = ('web', 'cli')
+
+
+def create_app(config_name=None, mode='web'):
+    """Application Factory Function
+
+    ``mode='cli'`` builds a slim app for scripts: config, database, models and
+    signal receivers only - no blueprints, CORS, JWT or read-replica routing.
+    """
     if config_name is None:
         config_name = os.getenv('FLASK_CONFIG', 'default')
+    if mode not in APP_MODES:
+        raise ValueError(f"mode must be one of {', '.join(APP_MODES)}")
 
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
 
+    if mode == 'cli':
+        db.init_app(app)
+        bcrypt.init_app(app)
+        _init_data_layer(app)
+        return app
+
+    # Serialize responses with orjson when available (see json_provider.py)
+    from .json_provider import make_json_provider
+    app.json = make_json_provider(app)
+
+    # Compress /api responses per Accept-Encoding (registered first so it runs last)
+    from .compression import init_compression
+    init_compression(app)
+
+    # Shed or queue requests per route class before they reach the database
+    from .admission import init_admission
+    init_admission(app)
+
+    # Route GET reads to the read replica when DATABASE_REPLICA_URL is set (adds the bind)
+    init_replica(app)
+
     # Initialize extensions with app context
     db.init_app(app)
-    migrate.init_app(app, db)
+    _init_migrate(app)
+    # `flask worker` runs the background jobs requests enqueue (see jobs.py)
+    from .jobs import init_jobs
+    init_jobs(app)
     bcrypt.init_app(app)
     # Allow requests from the frontend origin (adjust in production)
     # Explicitly allow the Vite dev server origin with necessary headers
@@ -45,12 +77,20 @@ def create_app(config_name=None):
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 900  # 15 minutes
     app.config['JWT_REFRESH_TOKEN_EXPIRES'] = 2592000  # 30 days
     jwt.init_app(app) # Initialize JWT with app context
+    # Reject revoked tokens from an in-memory list synced from token_revocations
+    from .revocation import init_revocation
+    init_revocation(app)
+    # Player rankings served from memory, patched as results are approved
+    from .leaderboards import init_leaderboards
+    init_leaderboards(app)
 
     # Ensure JWT_SECRET_KEY is set (should come from config.py)
     if not app.config.get('JWT_SECRET_KEY'):
         app.logger.warning("JWT_SECRET_KEY is not set! Authentication will not work securely.")
         # You might want to raise an error here in production
         # raise ValueError("JWT_SECRET_KEY must be set in configuration")
+    if not os.environ.get('SECRET_KEY') and not (app.debug or app.testing):
+        app.logger.warning("SECRET_KEY is not set in the environment! Using the development default.")
 
     # Ensure upload directory exists
     try:
@@ -65,9 +105,12 @@ def create_app(config_name=None):
         app.logger.error(f"Failed to create upload directory: {e}")
 
 
+    _init_data_layer(app)
+
     # Register Blueprints
     # Register Blueprints (before registering error handlers that might use the blueprint)
-    from .api import bp as api_bp
+    from .api import bp as api_bp, load_routes
+    load_routes()
     app.register_blueprint(api_bp, url_prefix='/api')
 
     # Add a simple route for testing
@@ -75,11 +118,6 @@ def create_app(config_name=None):
     def ping():
         return 'Pong!'
 
-    # Shell context for flask cli
-    @app.shell_context_processor
-    def ctx():
-        return {"app": app, "db": db}
-
     # Register JWT Error Handlers for Debugging
     @jwt.invalid_token_loader
     def invalid_token_callback(error_string):
@@ -128,3 +166,30 @@ def create_app(config_name=None):
     # JWT Error Handlers already registered above
 
     return app
+
+
+def _init_data_layer(app):
+    """Pieces every app needs, web or CLI: the soft-delete filter and signal receivers."""
+    # Exclude soft-deleted games from all ORM queries (admin views opt out)
+    from . import soft_delete  # noqa: F401 - registers the session event
+    # Keep the derived tables (summaries, head-to-head, stats) in step with writes
+    from .api.services import connect_receivers
+    connect_receivers()
+
+    # Shell context for flask cli
+    @app.shell_context_processor
+    def ctx():
+        return {"app": app, "db": db}
+
+
+def _init_migrate(app):
+    """Register the ``flask db`` commands when the app is loaded by the Flask CLI.
+
+    Flask-Migrate imports Alembic, the single largest import of the app, which
+    web workers and scripts never use.
+    """
+    import click
+    if click.get_current_context(silent=True) is None:
+        return
+    from flask_migrate import Migrate
+    Migrate(app, db)
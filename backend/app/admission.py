@@ -0,0 +1,201 @@
+"""
+Admission control and load shedding for ``/api`` requests.
+
+Each request is put in one of four classes, each with its own concurrency
+limit, bounded wait queue and maximum queue wait (``ADMISSION_LIMITS``):
+
+* ``auth``      - login, logout, refresh, password changes, auth checks
+* ``write``     - every other mutating request (submit/approve match,
+                  registrations, ...)
+* ``read``      - cheap GETs
+* ``analytics`` - expensive reads: stats, head-to-head, pod suggestions,
+                  batched page data
+
+A request that finds its class at the limit waits in that class's queue
+until a slot frees up or its wait deadline passes; if the queue is already
+full it is rejected at once. Rejections are ``503`` with ``Retry-After``.
+Reads and analytics are low priority: while any ``auth`` or ``write``
+request is waiting for a slot, they are shed immediately, so saturation
+never makes match submissions and approvals wait behind list pages.
+
+Limits are per process: a Gunicorn worker's threads share them, so workers
+must be threaded (``gthread``) with more threads than any class's limit -
+gunicorn.conf.py sets that up and refuses to start otherwise.
+
+Counters per class (admitted, shed, timed out, queue wait) are served by
+``GET /api/admin/admission``, which itself bypasses admission.
+"""
+import threading
+import time
+
+from flask import current_app, jsonify, request
+
+READ_CLASSES = ('read', 'analytics')
+PRIORITY_CLASSES = ('auth', 'write')
+
+AUTH_ENDPOINTS = frozenset({'api.login', 'api.logout', 'api.refresh', 'api.change_password', 'api.check_auth'})
+ANALYTICS_ENDPOINTS = frozenset({
+    'api.get_duration_stats', 'api.get_card_leaderboard', 'api.get_user_head_to_head',
+    'api.get_head_to_head_matrix', 'api.get_deck_game_history', 'api.suggest_pods',
+    'api.get_deck_leaderboard', 'api.get_player_leaderboard', 'api.get_commander_matchups',
+    'api.batch',  # Several reads in one request
+})
+# Never queued or shed, so overload stays observable
+EXEMPT_ENDPOINTS = frozenset({'api.get_admission_stats'})
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+ADMISSION_CLASS = 'magmon.admission_class'
+# Set in the environ of requests run inside an already admitted one (batch sub-requests)
+ADMISSION_EXEMPT = 'magmon.admission_exempt'
+
+
+def classify(endpoint, method):
+    """Route class of a request, or None for requests that bypass admission."""
+    if endpoint is None or not endpoint.startswith('api.') or endpoint in EXEMPT_ENDPOINTS:
+        return None
+    if method == 'OPTIONS':
+        return None
+    if endpoint in AUTH_ENDPOINTS:
+        return 'auth'
+    if endpoint in ANALYTICS_ENDPOINTS:
+        return 'analytics'
+    return 'read' if method in SAFE_METHODS else 'write'
+
+
+class Gate:
+    """Concurrency limit with a bounded FIFO-ish wait queue and counters."""
+
+    def __init__(self, name, concurrency, queue, max_wait):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._cond = threading.Condition()
+
+    def enter(self):
+        """Take a slot, waiting up to ``max_wait``.
+
+        Returns:
+            bool: True when admitted; the caller must then call ``leave``
+        """
+        with self._cond:
+            if self.active < self.concurrency and self.waiting == 0:
+                self.active += 1
+                self.admitted += 1
+                return True
+            if self.waiting >= self.queue:
+                self.shed += 1
+                return False
+
+            self.waiting += 1
+            self.queued += 1
+            started = time.monotonic()
+            deadline = started + self.max_wait
+            try:
+                while self.active >= self.concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        return False
+                    self._cond.wait(remaining)
+                self.active += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.waiting -= 1
+                waited = time.monotonic() - started
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def reject(self):
+        """Count a request shed without trying for a slot."""
+        with self._cond:
+            self.shed += 1
+
+    def leave(self):
+        """Release a slot taken by ``enter``."""
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "concurrency": self.concurrency,
+                "queue": self.queue,
+                "max_wait_seconds": self.max_wait,
+                "active": self.active,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "shed": self.shed,
+                "timed_out": self.timed_out,
+                "queued": self.queued,
+                "avg_queue_wait_ms": round(self.wait_total / self.queued * 1000, 2) if self.queued else 0.0,
+                "max_queue_wait_ms": round(self.wait_max * 1000, 2)
+            }
+
+
+class AdmissionController:
+    """The gates of one app, plus the shedding policy between them."""
+
+    def __init__(self, limits, retry_after=1):
+        self.gates = {name: Gate(name, **options) for name, options in limits.items()}
+        self.retry_after = retry_after
+
+    def admit(self, route_class):
+        """Admit a request of ``route_class``; False means it should get a 503."""
+        gate = self.gates.get(route_class)
+        if gate is None:
+            return True
+        if route_class in READ_CLASSES and any(
+            self.gates[name].waiting for name in PRIORITY_CLASSES if name in self.gates
+        ):
+            gate.reject()
+            return False
+        return gate.enter()
+
+    def release(self, route_class):
+        self.gates[route_class].leave()
+
+    def snapshot(self):
+        return {name: gate.snapshot() for name, gate in self.gates.items()}
+
+
+def init_admission(app):
+    """Install admission control when ``ADMISSION_CONTROL`` is on."""
+    if not app.config.get('ADMISSION_CONTROL'):
+        return
+    controller = app.extensions['admission'] = AdmissionController(
+        app.config['ADMISSION_LIMITS'], app.config.get('ADMISSION_RETRY_AFTER', 1)
+    )
+
+    @app.before_request
+    def _admit():
+        if request.environ.get(ADMISSION_EXEMPT):
+            return None
+        route_class = classify(request.endpoint, request.method)
+        if route_class is None or route_class not in controller.gates:
+            return None
+        if not controller.admit(route_class):
+            current_app.logger.warning(f"Shed {route_class} request {request.method} {request.path}")
+            response = jsonify({"error": "Server is busy, please retry shortly"})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(controller.retry_after)
+            return response
+        # Kept on the request, not ``g``: batch sub-requests (routes/batch.py)
+        # share the app context and must not release the batch's slot
+        request.environ[ADMISSION_CLASS] = route_class
+        return None
+
+    @app.teardown_request
+    def _release(exc):
+        route_class = request.environ.pop(ADMISSION_CLASS, None)
+        if route_class is not None:
+            controller.release(route_class)
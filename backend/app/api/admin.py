@@ -1,10 +1,16 @@
 from datetime import datetime, timedelta
-from flask import jsonify, request
+from flask import jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm.exc import StaleDataError
 # Removed functools, secrets, string imports as they are now in utils.auth
 from .. import db
-from ..models import User, Game, AdminAuditLog, AdminActionType
+from ..models import User, Game, Match, AdminAuditLog, AdminActionType
+from ..signals import game_deleted, game_restored, match_unapproved
+from ..soft_delete import including_deleted
+from ..revocation import revoke_user_tokens
+from ..jobs import enqueue, job_metrics
 from . import bp
+from .routes.games import CONCURRENT_UPDATE_ERROR
 from .utils.auth import admin_required, generate_temp_password # Import from utils
 
 # Removed original definitions of admin_required and generate_temp_password
@@ -21,7 +27,11 @@ def check_admin():
 @admin_required
 def list_users():
     """List all users with their status"""
-    users = User.query.all()
+    # Projection only: the full row would also load the password hashes
+    users = db.session.query(
+        User.id, User.username, User.email, User.avatar_url, User.must_change_password,
+        User.last_login, User.is_admin
+    ).all()
     return jsonify([{
         'id': user.id,
         'username': user.username,
@@ -46,6 +56,7 @@ def reset_user_password(user_id):
     # Generate and set temporary password
     temp_password = generate_temp_password()
     user.set_temp_password(temp_password)
+    revoke_user_tokens(user.id)
     
     try:
         db.session.commit()
@@ -69,6 +80,9 @@ def toggle_admin(user_id):
 
     user = User.query.get_or_404(user_id)
     user.is_admin = not user.is_admin
+    if not user.is_admin:
+        # Tokens carry the is_admin claim; make the user log in again without it
+        revoke_user_tokens(user.id)
 
     try:
         db.session.commit()
@@ -81,6 +95,7 @@ def toggle_admin(user_id):
 @bp.route('/admin/games/deleted', methods=['GET'])
 @jwt_required()
 @admin_required
+@including_deleted()
 def list_deleted_games():
     """Get a list of all soft-deleted games"""
     deleted_games = Game.query.filter(Game.deleted_at.isnot(None)).all()
@@ -100,13 +115,14 @@ def list_deleted_games():
 @bp.route('/admin/games/<int:game_id>/audit-log', methods=['GET'])
 @jwt_required()
 @admin_required
+@including_deleted()
 def get_game_audit_log(game_id):
     """Get the audit log history for a specific game"""
     # Verify game exists
     game = Game.query.get_or_404(game_id)
     
     # Get all audit log entries for this game
-    audit_logs = AdminAuditLog.query.filter_by(
+    audit_logs = AdminAuditLog.query.options(db.undefer_group('audit_state')).filter_by(
         target_type='game',
         target_id=game_id
     ).order_by(AdminAuditLog.created_at.desc()).all()
@@ -126,6 +142,7 @@ def get_game_audit_log(game_id):
 @bp.route('/admin/games/<int:game_id>', methods=['DELETE'])
 @jwt_required()
 @admin_required
+@including_deleted()
 def delete_game(game_id):
     """Soft delete a game"""
     admin_id = get_jwt_identity()
@@ -173,6 +190,7 @@ def delete_game(game_id):
     try:
         db.session.add(game)
         db.session.add(audit_log)
+        game_deleted.send(current_app._get_current_object(), game=game)
         db.session.commit()
         return jsonify({
             'message': 'Game deleted successfully',
@@ -180,6 +198,9 @@ def delete_game(game_id):
             'deleted_at': game.deleted_at.isoformat(),
             'deleted_by': game.deleted_by_id
         })
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify(CONCURRENT_UPDATE_ERROR), 409
     except Exception as e:
         db.session.rollback()
         print(f"Error deleting game: {str(e)}")  # Debug log
@@ -190,6 +211,7 @@ def delete_game(game_id):
 @bp.route('/admin/games/<int:game_id>/restore', methods=['POST'])
 @jwt_required()
 @admin_required
+@including_deleted()
 def restore_game(game_id):
     """Restore a soft-deleted game"""
     admin_id = get_jwt_identity()
@@ -237,6 +259,7 @@ def restore_game(game_id):
     try:
         db.session.add(game)
         db.session.add(audit_log)
+        game_restored.send(current_app._get_current_object(), game=game)
         db.session.commit()
         return jsonify({
             'message': 'Game restored successfully',
@@ -244,6 +267,100 @@ def restore_game(game_id):
             'restored_at': game.last_admin_action_at.isoformat(),
             'restored_by': admin_id
         })
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify(CONCURRENT_UPDATE_ERROR), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to restore game: {str(e)}'}), 500
+
+@bp.route('/admin/matches/<int:match_id>/unapprove', methods=['POST'])
+@jwt_required()
+@admin_required
+def unapprove_match(match_id):
+    """Revert approved game results back to pending"""
+    admin_id = get_jwt_identity()
+    match = Match.query.get_or_404(match_id)
+    reason = request.json.get('reason')
+
+    if not reason:
+        return jsonify({'error': 'Reason is required for unapproval'}), 400
+
+    if match.status != 'approved':
+        return jsonify({'error': 'Match is not approved'}), 400
+
+    # Store previous state for audit log
+    previous_state = {
+        'status': match.status,
+        'approved_by_id': match.approved_by_id,
+        'approved_at': match.approved_at.isoformat() if match.approved_at else None
+    }
+
+    # Update match state
+    match.status = 'pending'
+    match.approved_by_id = None
+    match.approved_at = None
+
+    # Create audit log entry
+    new_state = {
+        'status': match.status,
+        'approved_by_id': None,
+        'approved_at': None
+    }
+
+    audit_log = AdminAuditLog(
+        admin_id=admin_id,
+        action_type=AdminActionType.MATCH_UNAPPROVE,
+        target_type='match',
+        target_id=match_id,
+        previous_state=previous_state,
+        new_state=new_state,
+        reason=reason
+    )
+
+    try:
+        db.session.add(match)
+        db.session.add(audit_log)
+        match_unapproved.send(current_app._get_current_object(), match=match)
+        db.session.commit()
+        return jsonify({
+            'message': 'Match unapproved successfully',
+            'match_id': match_id,
+            'status': match.status
+        })
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify(CONCURRENT_UPDATE_ERROR), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to unapprove match: {str(e)}'}), 500
+
+@bp.route('/admin/admission', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_admission_stats():
+    """Get admission-control counters per route class for this worker process."""
+    controller = current_app.extensions.get('admission')
+    if controller is None:
+        return jsonify({'enabled': False, 'classes': {}})
+    return jsonify({'enabled': True, 'retry_after': controller.retry_after, 'classes': controller.snapshot()})
+
+@bp.route('/admin/jobs', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_job_stats():
+    """Get background job counts and durations per job name (finished counts cover the last day)."""
+    return jsonify({'jobs': job_metrics()})
+
+@bp.route('/admin/stats/recompute', methods=['POST'])
+@jwt_required()
+@admin_required
+def recompute_stats():
+    """Queue a full rebuild of the card statistics."""
+    try:
+        queued = enqueue('recompute_card_stats')
+        db.session.commit()
+        return jsonify({'message': 'Recompute queued', 'job_id': queued.id}), 202
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': f'Failed to restore game: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'Failed to queue recompute: {str(e)}'}), 500
@@ -5,10 +5,12 @@ from flask_jwt_extended import (
     create_refresh_token,
     jwt_required,
     get_jwt_identity,
-    get_jwt
+    get_jwt,
+    decode_token
 )
 from .. import db
 from ..models import User
+from ..revocation import revoke_token, revoke_user_tokens
 from . import bp
 
 @bp.route('/login', methods=['POST'])
@@ -23,7 +25,7 @@ def login():
     if not username or not password:
         return jsonify({"error": "Missing username or password"}), 400
 
-    user = User.query.filter_by(username=username).first()
+    user = User.query.options(db.undefer_group('credentials')).filter_by(username=username).first()
     if not user or not user.check_password(password):
         return jsonify({"error": "Invalid username or password"}), 401
 
@@ -72,7 +74,7 @@ def change_password():
         return jsonify({"error": "Missing current or new password"}), 400
 
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = User.query.options(db.undefer_group('credentials')).get(current_user_id)
 
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -83,6 +85,8 @@ def change_password():
 
     # Set new password (this also clears temporary password fields)
     user.set_password(new_password)
+    # Sessions holding the old password's tokens end; the tokens issued below stay valid
+    revoke_user_tokens(user.id)
 
     try:
         db.session.commit()
@@ -106,6 +110,30 @@ def change_password():
         db.session.rollback()
         return jsonify({'error': f'Failed to change password: {str(e)}'}), 500
 
+@bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """Revoke the token used for this request, and the refresh token if one is sent"""
+    claims = get_jwt()
+    revoke_token(claims)
+
+    refresh_token = request.json.get('refresh_token') if request.is_json else None
+    if refresh_token:
+        try:
+            refresh_claims = decode_token(refresh_token, allow_expired=True)
+        except Exception:
+            return jsonify({"error": "Invalid refresh token"}), 400
+        if refresh_claims.get('sub') != claims.get('sub'):
+            return jsonify({"error": "Refresh token belongs to another user"}), 403
+        revoke_token(refresh_claims)
+
+    try:
+        db.session.commit()
+        return jsonify({'message': 'Logged out'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Logout failed: {str(e)}'}), 500
+
 @bp.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
@@ -0,0 +1,118 @@
+"""
+Composite page-data endpoint: several GET sub-requests in one round trip.
+
+``POST /api/batch`` takes ``{"requests": [{"id": "deck", "path": "/api/decks/3"}, ...]}``
+and answers ``{"responses": {"deck": {"status": 200, "body": {...}}, ...}}``.
+Sub-requests run in order inside this request's app context, so they share
+its database session - an object one sub-request loaded (the caller's User
+row, a deck) is served from the identity map to the next - and they carry
+the caller's Authorization header, so each view applies its own auth rules
+to the same identity. Identical paths are executed once.
+
+A path may refer to a field of an earlier response, e.g.
+``/api/users/{deck.user_id}`` after a sub-request with id ``deck``; a
+sub-request whose reference cannot be resolved fails with status 424.
+
+Only GET ``/api/...`` views are allowed. Each sub-request runs the app's
+``before_request`` functions and URL value preprocessors before its view and
+the ``teardown_request`` functions after it, as a real request would, so
+per-request setup and cleanup (replica.py's read routing) stay paired.
+``after_request`` functions don't run: the sub-response is not sent, and the
+batch response gets compression and the replica headers once. Sub-requests
+are also exempt from admission control (``ADMISSION_EXEMPT``); the batch
+request itself is admitted as an analytics read, see admission.py.
+"""
+import re
+
+from flask import current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from ...admission import ADMISSION_EXEMPT
+from .. import bp
+
+PLACEHOLDER = re.compile(r'\{([A-Za-z0-9_\-]+)\.([A-Za-z0-9_]+)\}')
+
+
+def _resolve(path, responses):
+    """Substitute ``{id.field}`` references; returns None when one can't be resolved."""
+    missing = []
+
+    def substitute(match):
+        earlier = responses.get(match.group(1))
+        body = earlier["body"] if earlier and earlier["status"] < 400 else None
+        if not isinstance(body, dict) or body.get(match.group(2)) is None:
+            missing.append(match.group(0))
+            return ''
+        return str(body[match.group(2)])
+
+    resolved = PLACEHOLDER.sub(substitute, path)
+    return None if missing else resolved
+
+
+def _dispatch(app, path, headers):
+    """Run one GET request (hooks and view) in a nested request context; returns (status, body)."""
+    builder = EnvironBuilder(path=path, method='GET', headers=headers, base_url=request.host_url)
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+    environ[ADMISSION_EXEMPT] = True  # The batch holds the slot
+    with app.request_context(environ):
+        try:
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = app.dispatch_request()
+        except HTTPException as e:
+            rv = app.handle_user_exception(e)
+        except Exception as e:
+            try:
+                rv = app.handle_user_exception(e)
+            except Exception:
+                current_app.logger.error(f"Batch sub-request {path} failed: {e}")
+                return 500, {"error": "Sub-request failed"}
+        response = app.make_response(rv)
+        return response.status_code, response.get_json(silent=True)
+
+
+@bp.route('/batch', methods=['POST'])
+def batch():
+    """Run several GET sub-requests and return their responses keyed by id."""
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    limit = current_app.config.get('BATCH_MAX_REQUESTS', 20)
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "'requests' must be a non-empty list"}), 400
+    if len(items) > limit:
+        return jsonify({"error": f"At most {limit} sub-requests per batch"}), 400
+
+    requests = []
+    for n, item in enumerate(items):
+        if isinstance(item, str):
+            item = {"path": item}
+        path = item.get('path') if isinstance(item, dict) else None
+        if not isinstance(path, str) or not path.startswith('/api/') or path.split('?')[0].rstrip('/') == '/api/batch':
+            return jsonify({"error": f"Sub-request {n}: 'path' must be an /api/ path other than /api/batch"}), 400
+        if item.get('method', 'GET').upper() != 'GET':
+            return jsonify({"error": f"Sub-request {n}: only GET is supported"}), 400
+        request_id = str(item.get('id', path))
+        earlier = next((existing for existing in requests if existing[0] == request_id), None)
+        if earlier is not None and earlier[1] != path:
+            return jsonify({"error": f"Duplicate sub-request id: {request_id}"}), 400
+        if earlier is None:
+            requests.append((request_id, path))
+
+    app = current_app._get_current_object()
+    headers = {name: value for name, value in request.headers.items()
+               if name.lower() in ('authorization', 'cookie', 'accept-language')}
+    responses, by_path = {}, {}
+    for request_id, path in requests:
+        resolved = _resolve(path, responses)
+        if resolved is None:
+            responses[request_id] = {"status": 424, "body": {"error": "Depends on a failed or missing sub-request"}}
+            continue
+        if resolved not in by_path:
+            status, body = _dispatch(app, resolved, headers)
+            by_path[resolved] = {"status": status, "body": body}
+        responses[request_id] = by_path[resolved]
+    return jsonify({"responses": responses}), 200
@@ -1,12 +1,12 @@
 """
 Routes for deck management, including CRUD operations, versioning, and history.
 """
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from dataclasses import asdict
 
 from .. import bp
 from ..services.deck_service import DeckService
+from ..utils.dataloader import parse_ids
 from ..schemas.deck_schemas import (
     DeckCreate, DeckVersionCreate, DeckResponse,
     DeckListResponse, DeckVersionResponse, DeckHistoryEntry
@@ -27,7 +27,7 @@ def create_deck():
 
         deck_data = DeckCreate(**data)
         response, status_code = DeckService.create_deck(current_user_id, deck_data)
-        return jsonify({"message": "Deck created successfully", "deck": asdict(response)}), status_code
+        return jsonify({"message": "Deck created successfully", "deck": response}), status_code
     except (ValueError, TypeError, KeyError) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -36,12 +36,25 @@ def create_deck():
 @bp.route('/decks', methods=['GET'])
 @jwt_required()
 def get_user_decks():
-    """Get all decks belonging to the logged-in user."""
+    """Get all decks belonging to the logged-in user.
+
+    ``?ids=1,2,3`` instead returns those decks' details (the shape of
+    ``/decks/<id>``) in the order asked, skipping unknown ids.
+    """
     current_user_id = get_jwt_identity()
-    
+    if 'ids' in request.args:
+        try:
+            ids = parse_ids(request.args['ids'], current_app.config['BATCH_MAX_IDS'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        try:
+            return jsonify(DeckService.get_decks_by_ids(ids)), 200
+        except Exception as e:
+            return jsonify({"error": "Failed to fetch deck details"}), 500
+
     try:
         decks = DeckService.get_user_decks(current_user_id)
-        return jsonify([asdict(deck) for deck in decks]), 200
+        return jsonify(decks), 200
     except Exception as e:
         return jsonify({"error": "Failed to fetch decks"}), 500
 
@@ -51,7 +64,7 @@ def get_deck_details(deck_id):
     """Get full details for a specific deck, including decklist."""
     try:
         response, status_code = DeckService.get_deck_details(deck_id)
-        return jsonify(asdict(response)), status_code
+        return jsonify(response), status_code
     except Exception as e:
         return jsonify({"error": "Failed to fetch deck details"}), 500
 
@@ -61,7 +74,20 @@ def get_deck_versions(deck_id):
     """Get all versions of a specific deck."""
     try:
         versions = DeckService.get_deck_versions(deck_id)
-        return jsonify([asdict(version) for version in versions]), 200
+        return jsonify(versions), 200
+    except Exception as e:
+        return jsonify({"error": "Failed to fetch deck versions"}), 500
+
+@bp.route('/decks/versions', methods=['GET'])
+@jwt_required()
+def get_deck_versions_by_ids():
+    """Get several deck versions by id: ``?ids=1,2,3``, in the order asked."""
+    try:
+        ids = parse_ids(request.args.get('ids'), current_app.config['BATCH_MAX_IDS'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        return jsonify(DeckService.get_deck_versions_by_ids(ids)), 200
     except Exception as e:
         return jsonify({"error": "Failed to fetch deck versions"}), 500
 
@@ -71,7 +97,7 @@ def get_deck_version(deck_id, version_id):
     """Get a specific version of a deck."""
     try:
         response, status_code = DeckService.get_deck_version(deck_id, version_id)
-        return jsonify(asdict(response)), status_code
+        return jsonify(response), status_code
     except Exception as e:
         return jsonify({"error": "Failed to fetch deck version"}), 500
 
@@ -88,7 +114,7 @@ def create_deck_version(deck_id):
         
         version_data = DeckVersionCreate(**data)
         response, status_code = DeckService.create_deck_version(deck_id, current_user_id, version_data)
-        return jsonify({"message": "New version created successfully", "version": asdict(response)}), status_code
+        return jsonify({"message": "New version created successfully", "version": response}), status_code
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except (ValueError, TypeError, KeyError) as e:
@@ -102,6 +128,6 @@ def get_deck_game_history(deck_id):
     """Get the game history for a specific deck, including placement."""
     try:
         history = DeckService.get_deck_history(deck_id)
-        return jsonify([asdict(entry) for entry in history]), 200
+        return jsonify(history), 200
     except Exception as e:
         return jsonify({"error": "Failed to fetch deck history"}), 500
\ No newline at end of file
@@ -4,12 +4,16 @@
 from flask import request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy.orm import aliased, joinedload
-from sqlalchemy import func, select
+from sqlalchemy.orm.exc import StaleDataError
 from datetime import date, datetime # Added datetime
 
 from backend.app import db
 from backend.app.models import User, Deck, Match, MatchPlayer, Game, GameStatus, GameRegistration, DeckVersion
 from backend.app.api import bp
+from backend.app import signals
+from ..services.game_summary_service import GameSummaryService, SUMMARY_FIELDS, SUMMARY_INCLUDES
+from ..utils.dataloader import loader, parse_ids
+from ..utils.fieldsets import Field, isoformat, parse_fieldset, select_fields, serialize
 
 # Import validation helpers from utils
 from ..utils.game_validation import (
@@ -19,6 +23,50 @@ from ..utils.game_validation import (
     validate_match_status
 )
 
+# Game and Match carry optimistic lock versions (version_id_col): when two
+# lifecycle transitions race on the same row, the loser's UPDATE matches no
+# row, raises StaleDataError and is answered with this 409.
+CONCURRENT_UPDATE_ERROR = {"error": "The game was changed by another request. Reload and try again."}
+
+# ?fields= specs of the list routes (see utils/fieldsets.py): each field names
+# the joins it needs, so narrow requests skip the joins they don't use
+_submitter, _approver = aliased(User, name='submitter'), aliased(User, name='approver')
+
+MATCH_FIELDS = {
+    "match_id": Field(Match.id),
+    "game_id": Field(Match.game_id),
+    "game_date": Field(Game.game_date, ('game',), isoformat),
+    "status": Field(Match.status),
+    "player_count": Field(Match.player_count),
+    "submitted_by": Field(_submitter.username, ('submitter',)),
+    "created_at": Field(Match.created_at, format=isoformat),
+    "approved_by": Field(_approver.username, ('approver',)),
+    "approved_at": Field(Match.approved_at, format=isoformat),
+}
+MATCH_JOINS = {
+    'game': lambda query: query.outerjoin(Game, Game.id == Match.game_id),
+    'submitter': lambda query: query.join(_submitter, _submitter.id == Match.submitted_by_id),
+    'approver': lambda query: query.outerjoin(_approver, _approver.id == Match.approved_by_id),
+}
+
+REGISTRATION_FIELDS = {
+    "registration_id": Field(GameRegistration.id),
+    "user_id": Field(GameRegistration.user_id),
+    "username": Field(User.username, ('player',)),
+    "deck_id": Field(GameRegistration.deck_id),
+    "deck_name": Field(Deck.name, ('deck',)),
+    "commander": Field(Deck.commander, ('deck',)),
+    "colors": Field(Deck.colors, ('deck',)),
+    "deck_version_id": Field(GameRegistration.deck_version_id),
+    "version_number": Field(DeckVersion.version_number, ('version',)),
+    "version_notes": Field(DeckVersion.notes, ('version',)),
+}
+REGISTRATION_JOINS = {
+    'player': lambda query: query.join(User, User.id == GameRegistration.user_id),
+    'deck': lambda query: query.join(Deck, Deck.id == GameRegistration.deck_id),
+    'version': lambda query: query.outerjoin(DeckVersion, DeckVersion.id == GameRegistration.deck_version_id),
+}
+
 # ================== Game Routes ==================
 
 @bp.route('/games', methods=['POST'])
@@ -46,6 +94,8 @@ def create_game():
     new_game = Game(game_date=game_date, status=GameStatus.UPCOMING, is_pauper=is_pauper, details=details)
     try:
         db.session.add(new_game)
+        db.session.flush()
+        signals.game_created.send(current_app._get_current_object(), game=new_game)
         db.session.commit()
         return jsonify({"message": "Game created successfully", "game": {"id": new_game.id, "game_date": new_game.game_date.isoformat(), "status": new_game.status.value, "is_pauper": new_game.is_pauper, "details": new_game.details}}), 201
     except Exception as e:
@@ -53,75 +103,27 @@ def create_game():
 
 @bp.route('/games', methods=['GET'])
 def get_games():
-    """ Get a list of games, optionally filtered by status. """
-    status_filter = request.args.get('status')
-
-    # Subquery for registration count
-    reg_count_sq = select(
-        GameRegistration.game_id,
-        func.count(GameRegistration.id).label('registration_count')
-    ).group_by(GameRegistration.game_id).subquery()
-
-    # Alias for joining the subquery
-    reg_count_alias = aliased(reg_count_sq)
-
-    # Base query
-    query = db.session.query(
-        Game,
-        reg_count_alias.c.registration_count
-    ).outerjoin(
-        reg_count_alias, Game.id == reg_count_alias.c.game_id
-    )
-    # Removed .options(subqueryload(Game.matches)) due to lazy='dynamic' incompatibility
+    """ Get a list of games, optionally filtered by status.
 
+    Served from the game_summaries read model: one row per game that already
+    carries the registration count, current match and winner. ``?fields=``
+    narrows the item fields (``id`` is always returned); ``?include=`` adds
+    players, player_count, submitted_by_username or approved_by.
+    """
+    status_filter = request.args.get('status')
+    status_enum = None
     if status_filter:
         try:
             status_enum = GameStatus(status_filter)
-            query = query.filter(Game.status == status_enum)
         except ValueError:
             return jsonify({"error": f"Invalid status filter: {status_filter}. Valid: {[s.value for s in GameStatus]}"}), 400
+    try:
+        fields, include = parse_fieldset(request.args, SUMMARY_FIELDS, 'id', SUMMARY_INCLUDES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     try:
-        # Execute the optimized query
-        results = query.order_by(Game.game_date.desc()).all()
-        game_list = []
-
-        for g, reg_count in results: # Unpack game and count
-            # Access the first match from the pre-loaded collection
-            # Note: g.matches is still a query object due to lazy='dynamic',
-            # but the data is loaded, so .first() is efficient here.
-            match = g.matches.first()
-
-            game_data = {
-                "id": g.id,
-                "game_date": g.game_date.isoformat(),
-                "status": g.status.value,
-                "is_pauper": g.is_pauper,
-                "details": g.details,
-                "match_id": match.id if match else None,
-                "match_status": match.status if match else None,
-                "submitted_by_id": match.submitted_by_id if match else None,
-                "registration_count": reg_count if reg_count is not None else 0, # Use the count from the query
-                "winner_id": None, # Placeholder
-                "winner_username": None # Placeholder
-            }
-            # If game is completed and match approved, find the winner
-            if g.status == GameStatus.COMPLETED and match and match.status == 'approved':
-                current_app.logger.info(f"Looking for winner for game {g.id} with match {match.id}")
-                winner_player = MatchPlayer.query.filter_by(match_id=match.id, placement=1).first()
-                if winner_player:
-                    current_app.logger.info(f"Found winner player: {winner_player.user_id}")
-                    if winner_player.user:
-                        current_app.logger.info(f"Found winner user: {winner_player.user.username}")
-                        game_data["winner_id"] = winner_player.user_id
-                        game_data["winner_username"] = winner_player.user.username
-                else:
-                    current_app.logger.info(f"No winner player found for match {match.id}")
-
-            game_list.append(game_data)
-
-        # Ensure proper JSON formatting with commas between fields
-        return jsonify(game_list), 200
+        return jsonify(GameSummaryService.list_games(status_enum, fields, include)), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching games: {e}")
         return jsonify({"error": "Failed to fetch games"}), 500
@@ -139,7 +141,9 @@ def update_game_status(game_id):
     if game.status == GameStatus.CANCELLED and new_status != GameStatus.CANCELLED: return jsonify({"error": "Cannot change status of cancelled game."}), 400
     game.status = new_status
     try:
-        db.session.add(game); db.session.commit()
+        db.session.add(game)
+        signals.game_updated.send(current_app._get_current_object(), game=game)
+        db.session.commit()
         return jsonify({"message": "Game status updated", "game": {"id": game.id, "game_date": game.game_date.isoformat(), "status": game.status.value, "is_pauper": game.is_pauper, "details": game.details}}), 200
     except Exception as e:
         db.session.rollback(); current_app.logger.error(f"Error updating game status: {e}"); return jsonify({"error": "Status update failed"}), 500
@@ -178,6 +182,7 @@ def register_for_game(game_id):
     
     try:
         db.session.add(new_registration)
+        signals.registration_changed.send(current_app._get_current_object(), game=game)
         db.session.commit()
         return jsonify({"message": "Successfully registered for game"}), 201
     except Exception as e:
@@ -187,32 +192,29 @@ def register_for_game(game_id):
 
 @bp.route('/games/<int:game_id>/registrations', methods=['GET'])
 def get_game_registrations(game_id):
-    """ Gets the list of players and decks registered for a specific game. """
-    game = Game.query.get_or_404(game_id)
-    registrations = GameRegistration.query.filter_by(game_id=game_id).all()
-    
+    """ Gets the list of players and decks registered for a specific game.
+
+    ``?fields=`` narrows the item fields (``registration_id`` is always
+    returned); the user, deck and version joins are made only for fields
+    that need them. Version fields are omitted when there is no version.
+    """
+    Game.query.get_or_404(game_id)
+    try:
+        fields, _ = parse_fieldset(request.args, REGISTRATION_FIELDS, 'registration_id')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    rows = select_fields(db.session, REGISTRATION_FIELDS, fields, GameRegistration, REGISTRATION_JOINS).filter(
+        GameRegistration.game_id == game_id
+    ).order_by(GameRegistration.id).all()
     reg_list = []
-    for reg in registrations:
-        reg_data = {
-            "registration_id": reg.id,
-            "user_id": reg.user_id,
-            "username": reg.player.username,
-            "deck_id": reg.deck_id,
-            "deck_name": reg.deck.name,
-            "commander": reg.deck.commander,
-            "colors": reg.deck.colors,
-            "deck_version_id": reg.deck_version_id
-        }
-        
-        # Add version information if available
-        if reg.deck_version_id:
-            version = DeckVersion.query.get(reg.deck_version_id)
-            if version:
-                reg_data["version_number"] = version.version_number
-                reg_data["version_notes"] = version.notes
-        
+    for row in rows:
+        reg_data = serialize(row, REGISTRATION_FIELDS, fields)
+        if reg_data.get("version_number", 0) is None:
+            reg_data.pop("version_number")
+            reg_data.pop("version_notes", None)
         reg_list.append(reg_data)
-    
+
     return jsonify(reg_list), 200
 
 @bp.route('/games/<int:game_id>/registrations', methods=['DELETE'])
@@ -233,6 +235,7 @@ def unregister_from_game(game_id):
 
     try:
         db.session.delete(registration)
+        signals.registration_changed.send(current_app._get_current_object(), game=game)
         db.session.commit()
         return jsonify({"message": "Successfully unregistered from game"}), 200
     except Exception as e:
@@ -240,6 +243,41 @@ def unregister_from_game(game_id):
         current_app.logger.error(f"Error unregistering user {user_id} from game {game_id}: {e}")
         return jsonify({"error": "Unregistration failed"}), 500
 
+@bp.route('/games/<int:game_id>/pods/suggest', methods=['POST'])
+@jwt_required()
+def suggest_pods(game_id):
+    """ Proposes a split of the game's registered players into balanced pods.
+
+    Optional JSON body: min_size, max_size, recent_matches, skill_weight,
+    repeat_weight, time_budget_ms (capped at 90) and seed. Nothing is saved.
+    """
+    game = Game.query.get_or_404(game_id)
+    data = request.get_json(silent=True) or {}
+    try:
+        options = {
+            "min_size": int(data.get('min_size', 3)),
+            "max_size": int(data.get('max_size', 5)),
+            "recent_matches": int(data.get('recent_matches', 10)),
+            "skill_weight": float(data.get('skill_weight', 1.0)),
+            "repeat_weight": float(data.get('repeat_weight', 1.0)),
+            "time_budget_ms": min(float(data.get('time_budget_ms', 50)), 90),
+            "seed": data.get('seed')
+        }
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid pod suggestion options"}), 400
+    if options["min_size"] < 2 or options["max_size"] < options["min_size"]:
+        return jsonify({"error": "Pod sizes must satisfy 2 <= min_size <= max_size"}), 400
+
+    # Imported here: the optimizer pulls in NumPy, which the other game routes don't need
+    from ..services.pod_matchmaking_service import PodMatchmakingService
+    try:
+        return jsonify(PodMatchmakingService.suggest(game, **options)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error suggesting pods for game {game_id}: {e}")
+        return jsonify({"error": "Pod suggestion failed"}), 500
+
 # ================== Game Results Routes ==================
 
 @bp.route('/matches', methods=['POST'])
@@ -255,6 +293,9 @@ def submit_match():
     
     The match will be in 'pending' status until approved by another user,
     at which point the game's COMPLETED status becomes final.
+
+    Concurrent submissions for one game race on the game's version: the
+    first to commit wins and the others get 409, so no duplicate Match rows.
     """
     data = request.get_json()
     if not data: return jsonify({"error": "No input data provided"}), 400
@@ -329,10 +370,13 @@ def submit_match():
 
         game.status = GameStatus.COMPLETED
         db.session.add(game)
+        signals.match_submitted.send(current_app._get_current_object(), match=new_match)
 
         db.session.commit()
         # Use consistent terminology in response message
         return jsonify({"message": "Game results submitted successfully", "match_id": new_match.id}), 201
+    except StaleDataError:
+        db.session.rollback(); return jsonify(CONCURRENT_UPDATE_ERROR), 409
     except Exception as e:
         # Use consistent terminology in error message and log
         db.session.rollback(); current_app.logger.error(f"Error submitting game results: {e}"); return jsonify({"error": "Game result submission failed"}), 500
@@ -353,25 +397,38 @@ def get_matches():
     - Player count
     - Submission details (who, when)
     - Approval details (who, when) if approved
+
+    ``?fields=`` narrows the item fields (``match_id`` is always returned)
+    and joins only the game, submitter and approver tables those fields
+    need; ``?include=players`` adds each match's placements.
+
+    ``?ids=1,2,3`` instead returns those matches' details (the shape of
+    ``/matches/<id>``) in the order asked, skipping unknown ids.
     """
+    if 'ids' in request.args:
+        try:
+            ids = parse_ids(request.args['ids'], current_app.config['BATCH_MAX_IDS'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        matches = {m.id: m for m in _match_detail_query().filter(Match.id.in_(ids)).all()}
+        return jsonify(_match_details([matches[i] for i in ids if i in matches])), 200
     status_filter = request.args.get('status')
-    query = Match.query
+    try:
+        fields, include = parse_fieldset(request.args, MATCH_FIELDS, 'match_id', ('players',))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Projection only: one query instead of loading full Match rows (and their
+    # deferred notes) plus a lazy load per game, submitter and approver
+    query = select_fields(db.session, MATCH_FIELDS, fields, Match, MATCH_JOINS)
     if status_filter:
-        query = query.filter_by(status=status_filter)
+        query = query.filter(Match.status == status_filter)
 
     try:
-        matches = query.order_by(Match.created_at.desc()).all()
-        match_list = [{
-            "match_id": m.id,
-            "game_id": m.game_id,
-            "game_date": m.game.game_date.isoformat() if m.game else None,
-            "status": m.status,
-            "player_count": m.player_count,
-            "submitted_by": m.submitter.username,
-            "created_at": m.created_at.isoformat(),
-            "approved_by": m.approver.username if m.approved_by_id else None, # Include approver username
-            "approved_at": m.approved_at.isoformat() if m.approved_at else None
-        } for m in matches]
+        match_list = [serialize(m, MATCH_FIELDS, fields) for m in query.order_by(Match.created_at.desc()).all()]
+        if 'players' in include:
+            players = _match_players([m["match_id"] for m in match_list])
+            for m in match_list:
+                m["players"] = players.get(m["match_id"], [])
         return jsonify(match_list), 200
     except Exception as e:
         # Use consistent terminology in error message and log
@@ -379,6 +436,25 @@ def get_matches():
         return jsonify({"error": "Failed to fetch game results"}), 500
 
 
+def _match_players(match_ids):
+    """match id -> its players ordered by placement, in one query."""
+    players = {}
+    if not match_ids:
+        return players
+    rows = db.session.query(
+        MatchPlayer.match_id, MatchPlayer.user_id, User.username, MatchPlayer.deck_id, Deck.commander,
+        MatchPlayer.placement
+    ).join(User, User.id == MatchPlayer.user_id).join(Deck, Deck.id == MatchPlayer.deck_id).filter(
+        MatchPlayer.match_id.in_(match_ids)
+    ).order_by(MatchPlayer.match_id, MatchPlayer.placement).all()
+    for row in rows:
+        players.setdefault(row.match_id, []).append({
+            "user_id": row.user_id, "username": row.username, "deck_id": row.deck_id,
+            "commander": row.commander, "placement": row.placement
+        })
+    return players
+
+
 @bp.route('/matches/<int:match_id>/approve', methods=['PATCH'])
 @jwt_required()
 def approve_match(match_id):
@@ -395,6 +471,9 @@ def approve_match(match_id):
     match = Match.query.get_or_404(match_id)
     if error := validate_match_status(match, 'pending'):
         return jsonify(error[0]), error[1]
+    # A rejection sends the game back to UPCOMING for resubmission; the rejected results can't be approved
+    if match.game and (error := validate_game_status(match.game, GameStatus.COMPLETED)):
+        return jsonify(error[0]), error[1]
 
     approver_id = get_jwt_identity() # Approver is the logged-in user
     data = request.get_json() # Still need data for notes
@@ -417,9 +496,13 @@ def approve_match(match_id):
 
     try:
         db.session.add(match)
+        signals.match_approved.send(current_app._get_current_object(), match=match)
         db.session.commit()
         # Use consistent terminology in response message
         return jsonify({"message": "Game results approved successfully", "match_id": match.id, "status": match.status}), 200
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify(CONCURRENT_UPDATE_ERROR), 409
     except Exception as e:
         db.session.rollback()
         # Use consistent terminology in error message and log
@@ -461,21 +544,27 @@ def reject_match(match_id):
     # Let's go with Option 1 for simplicity now: Delete the match and its players.
     # Alternatively, just update notes and keep pending? Let's update notes and keep pending.
 
+    game = match.game # Loaded before the match is dirtied, so the lazy load can't autoflush it
+
     match.status = 'pending' # Keep as pending
     match.approved_by_id = None # Clear any potential previous approver
     match.approved_at = None
     match.approval_notes = f"Rejected by {rejector.username}: {approval_notes or 'No reason provided.'}" # Use username
 
     # Also need to potentially reset the Game status if it was set to Completed
-    if match.game:
-        match.game.status = GameStatus.UPCOMING # Or determine appropriate status
-        db.session.add(match.game)
+    if game:
+        game.status = GameStatus.UPCOMING # Or determine appropriate status
+        db.session.add(game)
 
     try:
         db.session.add(match)
+        signals.match_rejected.send(current_app._get_current_object(), match=match)
         db.session.commit()
         # Use consistent terminology in response message
         return jsonify({"message": "Game result rejection noted. Kept as pending.", "match_id": match.id}), 200
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify(CONCURRENT_UPDATE_ERROR), 409
     except Exception as e:
         db.session.rollback()
         # Use consistent terminology in error message and log
@@ -495,20 +584,33 @@ def get_match_details(match_id):
     Uses eager loading to efficiently fetch all related data
     in a single query.
     """
+    match = _match_detail_query().get_or_404(match_id)
+    return jsonify(_match_details([match])[0]), 200
+
+
+def _match_detail_query():
     # Eager load related objects to prevent N+1 queries
-    match = Match.query.options(
+    return Match.query.options(
         db.joinedload(Match.submitter), # Eager load submitter
         db.joinedload(Match.approver),  # Eager load approver
-        db.joinedload(Match.game)       # Eager load game
-    ).get_or_404(match_id)
+        db.joinedload(Match.game),      # Eager load game
+        db.undefer_group('match_notes') # Notes are deferred by default
+    )
+
 
+def _match_details(matches):
+    """Detail dicts for loaded matches: players in one query, their versions in one more."""
+    if not matches:
+        return []
     players = MatchPlayer.query.options(
         db.joinedload(MatchPlayer.user), # Eager load user
         db.joinedload(MatchPlayer.deck)  # Eager load deck
-    ).filter_by(match_id=match_id).order_by(MatchPlayer.placement).all()
+    ).filter(MatchPlayer.match_id.in_([m.id for m in matches])).order_by(MatchPlayer.placement).all()
+    versions = loader(DeckVersion)
+    versions.prime(p.deck_version_id for p in players)
 
     # Build player details safely, checking for None relationships
-    player_details = []
+    player_details = {}
     for p in players:
         player_info = {
             "user_id": p.user_id,
@@ -521,15 +623,14 @@ def get_match_details(match_id):
         }
         
         # Add version information if available
-        if p.deck_version_id:
-            version = DeckVersion.query.get(p.deck_version_id)
-            if version:
-                player_info["version_number"] = version.version_number
-                player_info["version_notes"] = version.notes
+        version = versions.load(p.deck_version_id)
+        if version:
+            player_info["version_number"] = version.version_number
+            player_info["version_notes"] = version.notes
         
-        player_details.append(player_info)
+        player_details.setdefault(p.match_id, []).append(player_info)
 
-    match_data = {
+    return [{
         "match_id": match.id,
         "game_id": match.game_id,
         # Safely access game date
@@ -553,6 +654,5 @@ def get_match_details(match_id):
         "notes_big_interaction": match.notes_big_interaction,
         "notes_rules_discussion": match.notes_rules_discussion,
         "notes_end_summary": match.notes_end_summary,
-        "players": player_details
-    }
-    return jsonify(match_data), 200
+        "players": player_details.get(match.id, [])
+    } for match in matches]
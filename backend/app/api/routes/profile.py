@@ -55,7 +55,7 @@ def upload_avatar():
 
     try:
         response, status_code = ProfileService.upload_avatar(current_user_id, file)
-        return jsonify({"message": "Avatar uploaded successfully", "avatar_url": response.avatar_url}), status_code
+        return jsonify({"message": "Avatar uploaded, it will appear shortly", "avatar_url": response.avatar_url}), status_code
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
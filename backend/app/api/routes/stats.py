@@ -0,0 +1,97 @@
+"""
+Routes for aggregate play statistics.
+"""
+from flask import request, jsonify, current_app
+
+from .. import bp
+from ..services.duration_stats_service import DurationStatsService, DIMENSIONS
+from ..services.card_stats_service import CardStatsService, SORTS
+from ..services.commander_matchup_service import CommanderMatchupService
+from ..services.deck_stats_service import DeckStatsService, SORTS as DECK_SORTS
+from ..services.leaderboard_service import LeaderboardService, scope_for
+
+
+@bp.route('/stats/durations', methods=['GET'])
+def get_duration_stats():
+    """Get median and p90 game length grouped by ?by=player_count|commander|pauper|player."""
+    dimension = request.args.get('by', 'player_count')
+    if dimension not in DIMENSIONS:
+        return jsonify({"error": f"'by' must be one of: {', '.join(DIMENSIONS)}"}), 400
+    try:
+        return jsonify(DurationStatsService.get_summary(dimension)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching duration stats by {dimension}: {e}")
+        return jsonify({"error": "Failed to fetch duration stats"}), 500
+
+
+@bp.route('/stats/cards', methods=['GET'])
+def get_card_leaderboard():
+    """Get cards ranked by win rate or inclusion, overall or for ?season= / ?commander=."""
+    if request.args.get('season'):
+        scope, scope_key = 'season', request.args['season']
+    elif request.args.get('commander'):
+        scope, scope_key = 'commander', request.args['commander']
+    else:
+        scope, scope_key = 'all', ''
+
+    sort = request.args.get('sort', 'win_rate')
+    if sort not in SORTS:
+        return jsonify({"error": f"'sort' must be one of: {', '.join(SORTS)}"}), 400
+    min_games = request.args.get('min_games', 3, type=int)
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    try:
+        return jsonify(CardStatsService.get_leaderboard(scope, scope_key, min_games, sort, limit)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching card leaderboard for {scope}={scope_key}: {e}")
+        return jsonify({"error": "Failed to fetch card leaderboard"}), 500
+
+
+@bp.route('/stats/decks', methods=['GET'])
+def get_deck_leaderboard():
+    """Get decks ranked by ?sort=win_rate|wins|games|avg_placement|last_played, optionally for one ?user_id= or ?commander=."""
+    sort = request.args.get('sort', 'win_rate')
+    if sort not in DECK_SORTS:
+        return jsonify({"error": f"'sort' must be one of: {', '.join(DECK_SORTS)}"}), 400
+    min_games = request.args.get('min_games', 1, type=int)
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    try:
+        return jsonify(DeckStatsService.get_leaderboard(
+            sort, min_games, request.args.get('user_id', type=int), request.args.get('commander'), limit, offset
+        )), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching deck leaderboard by {sort}: {e}")
+        return jsonify({"error": "Failed to fetch deck leaderboard"}), 500
+
+
+@bp.route('/stats/leaderboard', methods=['GET'])
+def get_player_leaderboard():
+    """Get players ranked by ?metric=wins|win_rate|avg_placement|points_per_game within ?scope=all|season|pauper."""
+    try:
+        scope = scope_for(request.args.get('scope', 'all'), request.args.get('season'))
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        return jsonify(LeaderboardService.get_leaderboard(request.args.get('metric', 'wins'), scope, limit, offset)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error fetching player leaderboard: {e}")
+        return jsonify({"error": "Failed to fetch leaderboard"}), 500
+
+
+@bp.route('/stats/matchups', methods=['GET'])
+def get_commander_matchups():
+    """Get commander-vs-commander finish-ahead rates within ?scope=all|season|pauper, or one ?commander='s top matchups."""
+    try:
+        scope = scope_for(request.args.get('scope', 'all'), request.args.get('season'))
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        return jsonify(CommanderMatchupService.get_matchups(
+            scope, request.args.get('commander'), request.args.get('min_games', 1, type=int),
+            request.args.get('sort', 'win_rate'), limit, offset
+        )), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error fetching commander matchups: {e}")
+        return jsonify({"error": "Failed to fetch commander matchups"}), 500
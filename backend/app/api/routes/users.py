@@ -1,33 +1,51 @@
-from flask import jsonify
+from flask import abort, jsonify, current_app, request
 from sqlalchemy import func
 from ... import db
 from ...models import User, MatchPlayer
 from .. import bp
+from ..services.deck_service import DeckService
+from ..services.head_to_head_service import HeadToHeadService
+from ..services.leaderboard_service import LeaderboardService, scope_for
+from ..services.player_trends_service import PlayerTrendsService
+from ..services.user_service import UserService
+from ..utils.dataloader import loader, parse_ids
+
+
+def _user_or_404(user_id):
+    user = loader(User).load(user_id)
+    if user is None:
+        abort(404)
+    return user
 
 @bp.route('/users', methods=['GET'])
 def get_users():
-    """Get a list of all registered users."""
-    try:
-        users = User.query.order_by(User.username).all()
-        user_list = []
-        for user in users:
-            try:
-                win_count = db.session.query(func.count(MatchPlayer.id)).filter(
-                    MatchPlayer.user_id == user.id,
-                    MatchPlayer.placement == 1
-                ).scalar() or 0
-            except Exception as e:
-                current_app.logger.error(f"Error calculating wins for user {user.id} in user list: {e}")
-                win_count = 0
+    """Get a list of all registered users.
 
-            user_list.append({
-                "id": user.id,
-                "username": user.username,
-                "avatar_url": user.avatar_url,
-                "stats": {
-                    "total_wins": win_count
-                }
-            })
+    ``?ids=1,2,3`` instead returns those users' profiles (the shape of
+    ``/users/<id>``) in the order asked, skipping unknown ids.
+    """
+    if 'ids' in request.args:
+        try:
+            ids = parse_ids(request.args['ids'], current_app.config['BATCH_MAX_IDS'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(UserService.get_user_profiles(ids)), 200
+    try:
+        # One projection query: only the serialized columns, with win counts joined in
+        wins = db.session.query(
+            MatchPlayer.user_id, func.count(MatchPlayer.id).label('total_wins')
+        ).filter(MatchPlayer.placement == 1).group_by(MatchPlayer.user_id).subquery()
+        users = db.session.query(User.id, User.username, User.avatar_url, wins.c.total_wins).outerjoin(
+            wins, wins.c.user_id == User.id
+        ).order_by(User.username).all()
+        user_list = [{
+            "id": user.id,
+            "username": user.username,
+            "avatar_url": user.avatar_url,
+            "stats": {
+                "total_wins": user.total_wins or 0
+            }
+        } for user in users]
         return jsonify(user_list), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching users: {e}")
@@ -35,22 +53,14 @@ def get_users():
 
 @bp.route('/users/<int:user_id>/decks', methods=['GET'])
 def get_specific_user_decks(user_id):
-    """Get all decks belonging to a specific user."""
-    user = User.query.get_or_404(user_id)
-    decks = Deck.query.filter_by(user_id=user_id).order_by(Deck.last_updated.desc()).all()
-    deck_list = [{
-        "id": deck.id,
-        "name": deck.name,
-        "commander": deck.commander,
-        "colors": deck.colors,
-        "last_updated": deck.last_updated.isoformat()
-    } for deck in decks]
-    return jsonify(deck_list), 200
+    """Get all decks belonging to a specific user, with each deck's performance."""
+    _user_or_404(user_id)
+    return jsonify(DeckService.get_user_decks(user_id)), 200
 
 @bp.route('/users/<int:user_id>', methods=['GET'])
 def get_user_profile(user_id):
     """Get public profile details for a specific user."""
-    user = User.query.get_or_404(user_id)
+    user = _user_or_404(user_id)
     try:
         win_count = db.session.query(func.count(MatchPlayer.id)).filter(
             MatchPlayer.user_id == user_id,
@@ -70,4 +80,46 @@ def get_user_profile(user_id):
             "total_wins": win_count
         }
     }
-    return jsonify(profile_data), 200
\ No newline at end of file
+    return jsonify(profile_data), 200
+
+@bp.route('/users/<int:user_id>/head-to-head', methods=['GET'])
+def get_user_head_to_head(user_id):
+    """Get a player's record against each opponent they have shared a game with."""
+    _user_or_404(user_id)
+    try:
+        return jsonify(HeadToHeadService.get_for_user(user_id)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching head-to-head for user {user_id}: {e}")
+        return jsonify({"error": "Failed to fetch head-to-head"}), 500
+
+@bp.route('/users/<int:user_id>/rank', methods=['GET'])
+def get_user_rank(user_id):
+    """Get a player's leaderboard rank for ?metric= within ?scope= (as /stats/leaderboard)."""
+    _user_or_404(user_id)
+    try:
+        scope = scope_for(request.args.get('scope', 'all'), request.args.get('season'))
+        return jsonify(LeaderboardService.get_rank(user_id, request.args.get('metric', 'wins'), scope)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@bp.route('/users/<int:user_id>/trends', methods=['GET'])
+def get_user_trends(user_id):
+    """Get a player's ?series=cumulative_wins|win_rate|placement by week, downsampled to ?points= with ?method=lttb|bucket."""
+    _user_or_404(user_id)
+    try:
+        points = min(request.args.get('points', 100, type=int), current_app.config['TRENDS_MAX_POINTS'])
+        return jsonify(PlayerTrendsService.get_series(
+            user_id, request.args.get('series', 'cumulative_wins'), points,
+            request.args.get('method', 'lttb'), request.args.get('window', 8, type=int)
+        )), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@bp.route('/users/head-to-head', methods=['GET'])
+def get_head_to_head_matrix():
+    """Get the full player-by-player head-to-head matrix."""
+    try:
+        return jsonify(HeadToHeadService.matrix_to_dict(HeadToHeadService.stored_matrix())), 200
+    except Exception as e:
+        current_app.logger.error(f"Error building head-to-head matrix: {e}")
+        return jsonify({"error": "Failed to build head-to-head matrix"}), 500
@@ -5,7 +5,7 @@ from typing import List, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class DeckCreate:
     """Schema for creating a new deck."""
     name: str
@@ -13,7 +13,7 @@ class DeckCreate:
     colors: str
     decklist_text: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class DeckUpdate:
     """Schema for updating a deck."""
     name: Optional[str] = None
@@ -21,13 +21,13 @@ class DeckUpdate:
     colors: Optional[str] = None
     decklist_text: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class DeckVersionCreate:
     """Schema for creating a new deck version."""
     decklist_text: str
     notes: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class DeckVersionResponse:
     """Schema for deck version response."""
     id: int
@@ -36,8 +36,9 @@ class DeckVersionResponse:
     notes: Optional[str]
     decklist_text: str
     is_current: bool
+    deck_id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class DeckResponse:
     """Schema for deck response."""
     id: int
@@ -50,16 +51,21 @@ class DeckResponse:
     last_updated: str  # ISO format datetime
     current_version_id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class DeckListResponse:
-    """Schema for deck list response."""
+    """Schema for deck list response, with the deck's performance."""
     id: int
     name: str
     commander: str
     colors: str
     last_updated: str  # ISO format datetime
+    games: int = 0
+    wins: int = 0
+    win_rate: Optional[float] = None
+    avg_placement: Optional[float] = None
+    last_played: Optional[str] = None  # ISO format date
 
-@dataclass
+@dataclass(slots=True)
 class DeckHistoryEntry:
     """Schema for a deck's game history entry."""
     game_id: int
@@ -67,11 +73,16 @@ class DeckHistoryEntry:
     placement: Optional[int]
     version_number: Optional[int]
 
-@dataclass
+@dataclass(slots=True)
 class DeckVersionListResponse:
-    """Schema for deck version list response."""
+    """Schema for deck version list response, with the version's performance."""
     id: int
     version_number: int
     created_at: str  # ISO format datetime
     notes: Optional[str]
-    is_current: bool
\ No newline at end of file
+    is_current: bool
+    games: int = 0
+    wins: int = 0
+    avg_placement: Optional[float] = None
+    first_played: Optional[str] = None  # ISO format date
+    last_played: Optional[str] = None  # ISO format date
\ No newline at end of file
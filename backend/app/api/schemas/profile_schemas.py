@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class ProfileUpdate:
     """Schema for profile update request data."""
     favorite_color: Optional[str] = None
@@ -20,7 +20,7 @@ class ProfileUpdate:
             return "Retirement plane must be less than 100 characters"
         return None
 
-@dataclass
+@dataclass(slots=True)
 class ProfileResponse:
     """Schema for profile response data."""
     id: int
@@ -31,7 +31,7 @@ class ProfileResponse:
     retirement_plane: Optional[str]
     registered_on: str
 
-@dataclass
+@dataclass(slots=True)
 class AvatarUpdate:
     """Schema for avatar update response."""
     avatar_url: str
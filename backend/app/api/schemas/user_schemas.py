@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Optional
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class UserRegistration:
     """Schema for user registration request data."""
     username: str
@@ -23,7 +23,7 @@ class UserRegistration:
             return "Password must be at least 8 characters long"
         return None
 
-@dataclass
+@dataclass(slots=True)
 class UserResponse:
     """Schema for user response data."""
     id: int
@@ -32,7 +32,7 @@ class UserResponse:
     registered_on: str
     avatar_url: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class UserListResponse:
     """Schema for user list response data."""
     id: int
@@ -40,7 +40,7 @@ class UserListResponse:
     avatar_url: Optional[str]
     stats: Dict[str, int]  # total_wins, etc.
 
-@dataclass
+@dataclass(slots=True)
 class UserProfileResponse:
     """Schema for public user profile response data."""
     id: int
@@ -0,0 +1,17 @@
+def connect_receivers():
+    """Import the service modules whose signal receivers maintain derived tables.
+
+    Receivers connect on import; apps built without the API routes (CLI mode)
+    call this so their writes keep those tables in step too.
+    """
+    from . import (  # noqa: F401
+        card_stats_service,
+        commander_matchup_service,
+        deck_stats_service,
+        deck_version_stats_service,
+        duration_stats_service,
+        game_summary_service,
+        head_to_head_service,
+        leaderboard_service,
+        player_trends_service,
+    )
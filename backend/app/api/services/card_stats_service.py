@@ -0,0 +1,208 @@
+"""
+Service maintaining card-level inclusion and win-rate counters.
+
+Every counted MatchPlayer with a recorded DeckVersion contributes one
+appearance (and a win, if it placed first) to each card in that version's
+decklist, within three scopes: all games, the match's season and the deck's
+commander. Counters move incrementally as matches start or stop counting;
+``recompute_all`` rebuilds them from history, parsing decklists in a process
+pool since that is the expensive part.
+
+Every match touches the scope totals and the rows of popular cards, so the
+increments are atomic SQL upserts (see ``utils/counters.py``) rather than
+changes to loaded rows, which concurrent approvals would overwrite.
+"""
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, cast
+
+from ... import db
+from ...models import CardScopeTotals, CardStats, Deck, DeckVersion, Game, Match, MatchPlayer
+from ...soft_delete import including_deleted
+from ..utils.counters import add_to_row, add_to_rows
+from ..utils.decklist import parse_cards
+from .result_signals import counted_results
+
+SCOPES = ('all', 'season', 'commander')
+SORTS = ('win_rate', 'inclusion')
+
+Scope = Tuple[str, str]
+
+
+def scopes_for(season_number: Optional[int], commander: str) -> List[Scope]:
+    """The (scope, scope_key) pairs a play counts toward."""
+    scopes = [('all', '')]
+    if season_number is not None:
+        scopes.append(('season', str(season_number)))
+    scopes.append(('commander', commander))
+    return scopes
+
+
+def _count_versions(items):
+    """Pool worker: count card appearances for a chunk of deck versions.
+
+    ``items`` is a list of (decklist_text, [(scopes, won), ...]) with one entry
+    per version, so each decklist is parsed once however often it was played.
+    """
+    counts = defaultdict(lambda: [0, 0])
+    names = {}
+    for decklist_text, plays in items:
+        cards = parse_cards(decklist_text)
+        names.update(cards)
+        for scopes, won in plays:
+            for scope, scope_key in scopes:
+                for key in cards:
+                    entry = counts[(scope, scope_key, key)]
+                    entry[0] += 1
+                    entry[1] += won
+    return dict(counts), names
+
+
+class CardStatsService:
+    """Service class for card-level statistics."""
+
+    @staticmethod
+    def apply_match(match: Match, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a match's decks from the counters.
+
+        Args:
+            match: The match whose players' deck versions should be counted
+            sign: +1 when the match starts counting, -1 when it stops
+        """
+        with including_deleted():
+            players = db.session.query(MatchPlayer.placement, Deck.commander, DeckVersion.decklist_text).join(
+                Deck, Deck.id == MatchPlayer.deck_id
+            ).join(
+                DeckVersion, DeckVersion.id == MatchPlayer.deck_version_id
+            ).filter(MatchPlayer.match_id == match.id, MatchPlayer.placement.isnot(None)).all()
+
+        for placement, commander, decklist_text in players:
+            won = int(placement == 1)
+            cards = parse_cards(decklist_text)
+            for scope, scope_key in scopes_for(match.season_number, commander):
+                add_to_row(CardScopeTotals, {"scope": scope, "scope_key": scope_key},
+                           {"decks": sign, "wins": sign * won}, create=sign > 0)
+                add_to_rows(CardStats, [
+                    {"scope": scope, "scope_key": scope_key, "card_key": key, "card_name": name}
+                    for key, name in cards.items()
+                ], {"appearances": sign, "wins": sign * won}, create=sign > 0)
+
+    @staticmethod
+    def recompute_all(workers: int = 1) -> int:
+        """Replace all counters with ones rebuilt from every counted match.
+
+        Args:
+            workers: Processes used to parse and count decklists (1 = inline)
+
+        Returns:
+            int: Number of card rows written, not yet committed
+        """
+        plays = db.session.query(
+            MatchPlayer.deck_version_id, MatchPlayer.placement, Match.season_number, Deck.commander
+        ).join(Match, Match.id == MatchPlayer.match_id).outerjoin(
+            Game, Game.id == Match.game_id
+        ).join(Deck, Deck.id == MatchPlayer.deck_id).filter(
+            # Deleted games are excluded explicitly: backfills run with the global filter off
+            Match.status == 'approved', Game.deleted_at.is_(None),
+            MatchPlayer.deck_version_id.isnot(None), MatchPlayer.placement.isnot(None)
+        ).all()
+
+        totals = defaultdict(lambda: [0, 0])
+        by_version = defaultdict(list)
+        for version_id, placement, season_number, commander in plays:
+            scopes = scopes_for(season_number, commander)
+            won = int(placement == 1)
+            by_version[version_id].append((scopes, won))
+            for scope in scopes:
+                totals[scope][0] += 1
+                totals[scope][1] += won
+
+        decklists = dict(db.session.query(DeckVersion.id, DeckVersion.decklist_text).filter(
+            DeckVersion.id.in_(list(by_version))
+        )) if by_version else {}
+        items = [(decklists.get(version_id), version_plays) for version_id, version_plays in by_version.items()]
+
+        if workers > 1 and len(items) > 1:
+            chunk_count = workers * 4
+            chunks = [items[i::chunk_count] for i in range(chunk_count)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_count_versions, [chunk for chunk in chunks if chunk]))
+        else:
+            results = [_count_versions(items)]
+
+        counts = defaultdict(lambda: [0, 0])
+        names: Dict[str, str] = {}
+        for partial_counts, partial_names in results:
+            for key, (appearances, wins) in partial_counts.items():
+                counts[key][0] += appearances
+                counts[key][1] += wins
+            for key, name in partial_names.items():
+                names.setdefault(key, name)
+
+        CardStats.query.delete()
+        CardScopeTotals.query.delete()
+        db.session.bulk_insert_mappings(CardScopeTotals, [
+            {"scope": scope, "scope_key": scope_key, "decks": decks, "wins": wins}
+            for (scope, scope_key), (decks, wins) in totals.items()
+        ])
+        db.session.bulk_insert_mappings(CardStats, [
+            {"scope": scope, "scope_key": scope_key, "card_key": key, "card_name": names[key],
+             "appearances": appearances, "wins": wins}
+            for (scope, scope_key, key), (appearances, wins) in counts.items()
+        ])
+        return len(counts)
+
+    @staticmethod
+    def get_leaderboard(scope: str = 'all', scope_key: str = '', min_appearances: int = 1,
+                        sort: str = 'win_rate', limit: int = 50) -> Dict:
+        """Rank cards within a scope by win rate or inclusion rate.
+
+        Args:
+            scope: One of SCOPES
+            scope_key: Season number or commander name ('' for 'all')
+            min_appearances: Ignore cards played fewer times than this
+            sort: 'win_rate' or 'inclusion'
+            limit: Maximum number of cards returned
+
+        Returns:
+            Dict: Scope totals and the ranked cards
+        """
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SCOPES)}")
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+
+        totals = db.session.get(CardScopeTotals, (scope, scope_key))
+        decks = totals.decks if totals else 0
+        query = CardStats.query.filter(
+            CardStats.scope == scope, CardStats.scope_key == scope_key,
+            CardStats.appearances >= max(1, min_appearances)
+        )
+        if sort == 'win_rate':
+            query = query.order_by((cast(CardStats.wins, Float) / CardStats.appearances).desc(),
+                                   CardStats.appearances.desc(), CardStats.card_key)
+        else:
+            query = query.order_by(CardStats.appearances.desc(), CardStats.card_key)
+
+        return {
+            "scope": scope,
+            "scope_key": scope_key,
+            "decks": decks,
+            "baseline_win_rate": round(totals.wins / decks, 4) if decks else None,
+            "cards": [{
+                "card_name": row.card_name,
+                "appearances": row.appearances,
+                "wins": row.wins,
+                "win_rate": round(row.wins / row.appearances, 4),
+                "inclusion_rate": round(row.appearances / decks, 4) if decks else None
+            } for row in query.limit(limit)]
+        }
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    CardStatsService.apply_match(match, sign)
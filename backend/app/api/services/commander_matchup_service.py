@@ -0,0 +1,189 @@
+"""
+Service maintaining the commander-versus-commander matchup store.
+
+``commander_matchups`` holds one row per ordered pair of commanders that have
+shared a pod, within each scope (all games, the match's season, pauper
+games), with how often the commander finished ahead of or behind the other.
+Only pairs that actually met are stored, so the store stays sparse however
+many commanders exist. A pod's pairs are added or removed as the match
+starts or stops counting (see ``result_signals``), each by one atomic upsert
+that also derives the win rate; ``rebuild`` recomputes the whole store from
+history for backfills.
+"""
+from collections import defaultdict
+from itertools import groupby, permutations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Float, case, cast
+
+from ... import db
+from ...models import CommanderMatchup, Deck, Game, Match, MatchPlayer
+from ...soft_delete import including_deleted
+from ..utils.counters import add_to_row
+from .result_signals import counted_results
+
+Scope = Tuple[str, str]
+Pair = Tuple[str, str]
+
+SORTS = {
+    'win_rate': (CommanderMatchup.win_rate, CommanderMatchup.games),
+    'games': (CommanderMatchup.games,),
+}
+
+
+def scopes_for(season_number: Optional[int], is_pauper: bool) -> List[Scope]:
+    """The (scope, scope_key) pairs a match counts toward."""
+    scopes = [('all', '')]
+    if season_number is not None:
+        scopes.append(('season', str(season_number)))
+    if is_pauper:
+        scopes.append(('pauper', ''))
+    return scopes
+
+
+def pod_pairs(players: Sequence[Tuple[int, str, int]]) -> Dict[Pair, List[int]]:
+    """[games, wins, losses] per ordered commander pair in one pod.
+
+    Args:
+        players: (user_id, commander, placement) for each player in the pod
+
+    Two decks with the same commander are not a matchup and are skipped.
+    """
+    pairs = defaultdict(lambda: [0, 0, 0])
+    for (user_id, commander, placement), (other_id, opponent, other_placement) in permutations(players, 2):
+        if user_id == other_id or commander == opponent:
+            continue
+        counts = pairs[(commander, opponent)]
+        counts[0] += 1
+        counts[1] += placement < other_placement
+        counts[2] += placement > other_placement
+    return pairs
+
+
+def _win_rate(new, old):
+    # From the new counts, in the same statement as the increment
+    return {"win_rate": case((new('games') > 0, cast(new('wins'), Float) / new('games')), else_=0.0)}
+
+
+class CommanderMatchupService:
+    """Service class for commander-versus-commander statistics."""
+
+    @staticmethod
+    def apply_match(match: Match, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a pod's commander pairs from the store.
+
+        Args:
+            match: The match whose players' commanders should be paired
+            sign: +1 when the match starts counting, -1 when it stops
+        """
+        with including_deleted():
+            game = db.session.get(Game, match.game_id) if match.game_id is not None else None
+            players = db.session.query(MatchPlayer.user_id, Deck.commander, MatchPlayer.placement).join(
+                Deck, Deck.id == MatchPlayer.deck_id
+            ).filter(MatchPlayer.match_id == match.id, MatchPlayer.placement.isnot(None)).all()
+        pairs = pod_pairs(players)
+        if not pairs:
+            return
+
+        for scope, scope_key in scopes_for(match.season_number, game is not None and game.is_pauper):
+            for (commander, opponent), (games, wins, losses) in pairs.items():
+                add_to_row(CommanderMatchup, {
+                    "scope": scope, "scope_key": scope_key, "commander": commander, "opponent": opponent
+                }, {"games": sign * games, "wins": sign * wins, "losses": sign * losses},
+                    create=sign > 0, derived=_win_rate, delete_empty='games')
+
+    @staticmethod
+    def rebuild() -> int:
+        """Replace the whole store with one recomputed from every counted match.
+
+        Returns:
+            int: Number of rows written, not yet committed
+        """
+        # Deleted games are excluded explicitly: backfills run with the global filter off
+        plays = db.session.query(
+            MatchPlayer.match_id, Match.season_number, Game.is_pauper,
+            MatchPlayer.user_id, Deck.commander, MatchPlayer.placement
+        ).join(Match, Match.id == MatchPlayer.match_id).outerjoin(
+            Game, Game.id == Match.game_id
+        ).join(Deck, Deck.id == MatchPlayer.deck_id).filter(
+            Match.status == 'approved', Game.deleted_at.is_(None), MatchPlayer.placement.isnot(None)
+        ).order_by(MatchPlayer.match_id)
+
+        totals = defaultdict(lambda: [0, 0, 0])
+        for _, pod in groupby(plays, key=lambda play: play.match_id):
+            pod = list(pod)
+            pairs = pod_pairs([(play.user_id, play.commander, play.placement) for play in pod])
+            for scope, scope_key in scopes_for(pod[0].season_number, bool(pod[0].is_pauper)):
+                for (commander, opponent), counts in pairs.items():
+                    entry = totals[(scope, scope_key, commander, opponent)]
+                    for i, count in enumerate(counts):
+                        entry[i] += count
+
+        CommanderMatchup.query.delete()
+        if totals:
+            db.session.bulk_insert_mappings(CommanderMatchup, [
+                {"scope": scope, "scope_key": scope_key, "commander": commander, "opponent": opponent,
+                 "games": games, "wins": wins, "losses": losses, "win_rate": wins / games}
+                for (scope, scope_key, commander, opponent), (games, wins, losses) in totals.items()
+            ])
+        return len(totals)
+
+    @staticmethod
+    def get_matchups(scope: Scope = ('all', ''), commander: Optional[str] = None, min_games: int = 1,
+                     sort: str = 'win_rate', limit: int = 50, offset: int = 0) -> Dict:
+        """List commander matchups within a scope, best first.
+
+        With ``commander`` this is that commander's top-K matchups, read in
+        order off the index for the sort; without it, every pair in the scope.
+
+        Args:
+            scope: (scope, scope_key) as returned by ``leaderboard_service.scope_for``
+            commander: Only this commander's matchups
+            min_games: Ignore pairs that shared fewer pods than this
+            sort: 'win_rate' or 'games'
+            limit: Maximum number of matchups returned
+            offset: Number of matchups to skip
+
+        Returns:
+            Dict: The filters, paging and the matchups
+
+        Raises:
+            ValueError: If the sort is unknown
+        """
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        query = CommanderMatchup.query.filter(
+            CommanderMatchup.scope == scope[0], CommanderMatchup.scope_key == scope[1],
+            CommanderMatchup.games >= max(1, min_games)
+        )
+        keys = list(SORTS[sort])
+        if commander:
+            query = query.filter(CommanderMatchup.commander == commander)
+        else:
+            keys.append(CommanderMatchup.commander)
+        query = query.order_by(*[key.desc() for key in keys + [CommanderMatchup.opponent]])
+
+        return {
+            "scope": scope[0],
+            "season": int(scope[1]) if scope[0] == 'season' else None,
+            "commander": commander,
+            "min_games": max(1, min_games),
+            "sort": sort,
+            "limit": limit,
+            "offset": offset,
+            "matchups": [{
+                "commander": row.commander,
+                "opponent": row.opponent,
+                "games": row.games,
+                "wins": row.wins,
+                "losses": row.losses,
+                "win_rate": round(row.win_rate, 4)
+            } for row in query.offset(offset).limit(limit)]
+        }
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    CommanderMatchupService.apply_match(match, sign)
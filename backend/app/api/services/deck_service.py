@@ -3,16 +3,20 @@ Service layer for deck management operations.
 """
 from typing import List, Optional, Tuple, Dict
 from datetime import datetime
-from flask import current_app
+from flask import abort, current_app
+from sqlalchemy import update
 from sqlalchemy.orm import joinedload
 
 from backend.app import db
-from backend.app.models import Deck, DeckVersion, Game, GameRegistration, Match, MatchPlayer
+from backend.app.models import Deck, DeckStats, DeckVersion, Game, GameRegistration, Match, MatchPlayer
 from ..schemas.deck_schemas import (
     DeckCreate, DeckUpdate, DeckVersionCreate,
     DeckResponse, DeckListResponse, DeckVersionResponse,
     DeckHistoryEntry, DeckVersionListResponse
 )
+from .deck_stats_service import DeckStatsService
+from .deck_version_stats_service import DeckVersionStatsService
+from ..utils.dataloader import loader
 
 class DeckService:
     @staticmethod
@@ -24,7 +28,8 @@ class DeckService:
                 commander=data.commander,
                 colors=data.colors,
                 decklist_text=data.decklist_text or '',
-                user_id=user_id
+                user_id=user_id,
+                version_counter=1
             )
             db.session.add(new_deck)
             db.session.flush()  # Get the deck ID
@@ -63,32 +68,47 @@ class DeckService:
 
     @staticmethod
     def get_user_decks(user_id: int) -> List[DeckListResponse]:
-        """Get all decks belonging to a user."""
-        decks = Deck.query.filter_by(user_id=user_id).order_by(Deck.last_updated.desc()).all()
+        """Get all decks belonging to a user, with each deck's performance."""
+        # Stats come from the deck_stats projection, not from scanning match_players
+        decks = db.session.query(Deck.id, Deck.name, Deck.commander, Deck.colors, Deck.last_updated, DeckStats).outerjoin(
+            DeckStats, DeckStats.deck_id == Deck.id
+        ).filter(Deck.user_id == user_id).order_by(Deck.last_updated.desc()).all()
         return [
             DeckListResponse(
                 id=deck.id,
                 name=deck.name,
                 commander=deck.commander,
                 colors=deck.colors,
-                last_updated=deck.last_updated.isoformat()
+                last_updated=deck.last_updated.isoformat(),
+                **DeckStatsService.to_dict(deck.DeckStats)
             ) for deck in decks
         ]
 
     @staticmethod
     def get_deck_details(deck_id: int) -> Tuple[DeckResponse, int]:
         """Get full details for a specific deck."""
-        deck = Deck.query.get_or_404(deck_id)
-        
-        # Get the current version if it exists
-        current_version = None
-        if deck.current_version_id:
-            current_version = DeckVersion.query.get(deck.current_version_id)
-        
+        deck = loader(Deck).load(deck_id)
+        if deck is None:
+            abort(404)
+        return DeckService._deck_response(deck), 200
+
+    @staticmethod
+    def get_decks_by_ids(deck_ids: List[int]) -> List[DeckResponse]:
+        """Get details for several decks, in the order asked; unknown ids are skipped.
+
+        Decks and their current versions are each fetched with one IN query.
+        """
+        decks = [deck for deck in loader(Deck).load_many(deck_ids) if deck is not None]
+        loader(DeckVersion, ('decklist',)).prime(deck.current_version_id for deck in decks)
+        return [DeckService._deck_response(deck) for deck in decks]
+
+    @staticmethod
+    def _deck_response(deck: Deck) -> DeckResponse:
         # Use the decklist from the current version if available
+        current_version = loader(DeckVersion, ('decklist',)).load(deck.current_version_id)
         decklist_text = current_version.decklist_text if current_version else deck.decklist_text
-        
-        response = DeckResponse(
+
+        return DeckResponse(
             id=deck.id,
             name=deck.name,
             commander=deck.commander,
@@ -99,7 +119,6 @@ class DeckService:
             last_updated=deck.last_updated.isoformat(),
             current_version_id=deck.current_version_id
         )
-        return response, 200
 
     @staticmethod
     def create_deck_version(deck_id: int, user_id: int, data: DeckVersionCreate) -> Tuple[DeckVersionResponse, int]:
@@ -110,11 +129,9 @@ class DeckService:
         if deck.user_id != user_id:
             raise PermissionError("You don't own this deck")
         
-        # Get the latest version number
-        latest_version = DeckVersion.query.filter_by(deck_id=deck_id).order_by(DeckVersion.version_number.desc()).first()
-        new_version_number = 1 if not latest_version else latest_version.version_number + 1
-        
         try:
+            new_version_number = DeckService._next_version_number(deck_id)
+
             # Create the new version
             new_version = DeckVersion(
                 deck_id=deck_id,
@@ -128,6 +145,7 @@ class DeckService:
             # Update the current version
             deck.current_version_id = new_version.id
             db.session.add(deck)
+            DeckStatsService.set_current_version(deck_id, new_version.id)
             db.session.commit()
             
             response = DeckVersionResponse(
@@ -136,7 +154,8 @@ class DeckService:
                 created_at=new_version.created_at.isoformat(),
                 notes=new_version.notes,
                 decklist_text=new_version.decklist_text,
-                is_current=True
+                is_current=True,
+                deck_id=new_version.deck_id
             )
             return response, 201
         except Exception as e:
@@ -144,10 +163,29 @@ class DeckService:
             current_app.logger.error(f"Error creating deck version: {e}")
             raise
 
+    @staticmethod
+    def _next_version_number(deck_id: int) -> int:
+        """Allocate the next version number of a deck.
+
+        A single ``UPDATE ... RETURNING`` on the deck's counter: concurrent
+        callers queue on the deck row instead of racing on max(version_number)
+        and colliding on ``_deck_version_uc``. The number is released again if
+        the surrounding transaction rolls back.
+        """
+        return db.session.execute(
+            update(Deck).where(Deck.id == deck_id)
+            .values(version_counter=Deck.version_counter + 1)
+            .returning(Deck.version_counter)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+
     @staticmethod
     def get_deck_versions(deck_id: int) -> List[DeckVersionListResponse]:
-        """Get all versions of a specific deck."""
-        deck = Deck.query.get_or_404(deck_id)
+        """Get all versions of a specific deck with each version's performance."""
+        deck = loader(Deck).load(deck_id)
+        if deck is None:
+            abort(404)
+        # DeckVersion.stats is joined eagerly, so this is a single query
         versions = DeckVersion.query.filter_by(deck_id=deck_id).order_by(DeckVersion.version_number.desc()).all()
         
         return [
@@ -156,7 +194,8 @@ class DeckService:
                 version_number=version.version_number,
                 created_at=version.created_at.isoformat(),
                 notes=version.notes,
-                is_current=version.id == deck.current_version_id
+                is_current=version.id == deck.current_version_id,
+                **DeckVersionStatsService.to_dict(version.stats)
             ) for version in versions
         ]
 
@@ -164,16 +203,29 @@ class DeckService:
     def get_deck_version(deck_id: int, version_id: int) -> Tuple[DeckVersionResponse, int]:
         """Get a specific version of a deck."""
         version = DeckVersion.query.filter_by(deck_id=deck_id, id=version_id).first_or_404()
-        
-        response = DeckVersionResponse(
+        return DeckService._version_response(version, version.deck), 200
+
+    @staticmethod
+    def get_deck_versions_by_ids(version_ids: List[int]) -> List[DeckVersionResponse]:
+        """Get several deck versions, in the order asked; unknown ids are skipped.
+
+        Versions and their decks are each fetched with one IN query.
+        """
+        versions = [v for v in loader(DeckVersion, ('decklist',)).load_many(version_ids) if v is not None]
+        decks = loader(Deck).load_many([version.deck_id for version in versions])
+        return [DeckService._version_response(version, deck) for version, deck in zip(versions, decks)]
+
+    @staticmethod
+    def _version_response(version: DeckVersion, deck: Deck) -> DeckVersionResponse:
+        return DeckVersionResponse(
             id=version.id,
             version_number=version.version_number,
             created_at=version.created_at.isoformat(),
             notes=version.notes,
             decklist_text=version.decklist_text,
-            is_current=version.id == version.deck.current_version_id
+            is_current=version.id == deck.current_version_id,
+            deck_id=version.deck_id
         )
-        return response, 200
 
     @staticmethod
     def get_deck_history(deck_id: int) -> List[DeckHistoryEntry]:
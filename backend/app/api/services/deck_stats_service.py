@@ -0,0 +1,218 @@
+"""
+Service maintaining per-deck performance aggregates and the deck leaderboard.
+
+``deck_stats`` rows are adjusted incrementally as matches start or stop
+counting (see ``result_signals``), in the transaction of the approval,
+unapproval or soft delete that moved them; rejected results were never
+counted, so rejection leaves them alone. Win rate and average placement are
+stored next to the counts, which lets each leaderboard sort walk an index;
+both are set in the same atomic upsert as the counts (see
+``utils/counters.py``).
+"""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import Float, case, cast, func, select, update
+
+from ... import db
+from ...models import Deck, DeckStats, Game, Match, MatchPlayer, User
+from ...soft_delete import including_deleted
+from ..utils.counters import add_to_row, latest
+from .result_signals import counted_results
+
+# Sort name -> column and direction; ties go to more games, then the higher
+# deck id, matching the order of the sort's index
+SORTS = {
+    'win_rate': (DeckStats.win_rate, 'desc'),
+    'wins': (DeckStats.wins, 'desc'),
+    'games': (DeckStats.games, 'desc'),
+    'avg_placement': (DeckStats.avg_placement, 'asc'),
+    'last_played': (DeckStats.last_played, 'desc'),
+}
+
+
+class DeckStatsService:
+    """Service class for deck performance statistics."""
+
+    @staticmethod
+    def apply_match(match: Match, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a match from its decks' stats.
+
+        Args:
+            match: The match whose players' decks should be updated
+            sign: +1 when the match starts counting, -1 when it stops
+        """
+        with including_deleted():
+            game = db.session.get(Game, match.game_id) if match.game_id is not None else None
+            players = db.session.query(MatchPlayer.deck_id, MatchPlayer.placement).filter(
+                MatchPlayer.match_id == match.id,
+                MatchPlayer.deck_id.isnot(None),
+                MatchPlayer.placement.isnot(None)
+            ).all()
+        played_on = game.game_date if game else None
+
+        table = DeckStats.__table__
+        for deck_id, placement in players:
+            deck = db.session.get(Deck, deck_id)
+            if deck is None:
+                continue
+
+            def _derived(new, old, deck=deck):
+                # Rates from the new counts, in the same statement as the increment
+                derived = {"current_version_id": deck.current_version_id}
+                for column, total in (("win_rate", new('wins')), ("avg_placement", new('placement_sum'))):
+                    derived[column] = case((new('games') > 0, cast(total, Float) / new('games')), else_=None)
+                if sign > 0 and played_on is not None:
+                    derived["last_played"] = latest(old('last_played'), played_on)
+                return derived
+
+            add_to_row(DeckStats, {"deck_id": deck_id}, {
+                "games": sign, "wins": sign * (placement == 1), "placement_sum": sign * placement
+            }, create=sign > 0, derived=_derived, inserted={"user_id": deck.user_id})
+
+            if sign < 0:
+                stats = db.session.execute(select(table.c.games, table.c.last_played).where(
+                    table.c.deck_id == deck_id
+                )).first()
+                if stats and (stats.games <= 0 or played_on == stats.last_played):
+                    db.session.execute(update(table).where(table.c.deck_id == deck_id).values(
+                        last_played=DeckStatsService._last_played(deck_id, match.id)
+                    ))
+
+    @staticmethod
+    def recompute(deck_ids: Iterable[int]) -> int:
+        """Rebuild the stats rows of the given decks from the source tables.
+
+        Args:
+            deck_ids: Deck ids to rebuild
+
+        Returns:
+            int: Number of rows written, not yet committed
+        """
+        deck_ids = list(deck_ids)
+        totals = {
+            row.deck_id: row for row in DeckStatsService._aggregate_query().filter(
+                MatchPlayer.deck_id.in_(deck_ids)
+            ).group_by(MatchPlayer.deck_id)
+        }
+        decks = db.session.query(Deck.id, Deck.user_id, Deck.current_version_id).filter(Deck.id.in_(deck_ids))
+        for deck_id, user_id, current_version_id in decks:
+            row = totals.get(deck_id)
+            stats = db.session.get(DeckStats, deck_id)
+            if stats is None:
+                stats = DeckStats(deck_id=deck_id, user_id=user_id)
+                db.session.add(stats)
+            stats.current_version_id = current_version_id
+            stats.games = row.games if row else 0
+            stats.wins = int(row.wins or 0) if row else 0
+            stats.placement_sum = int(row.placement_sum or 0) if row else 0
+            stats.last_played = row.last_played if row else None
+            DeckStatsService._derive(stats)
+        return len(deck_ids)
+
+    @staticmethod
+    def set_current_version(deck_id: int, version_id: int) -> None:
+        """Follow a deck's new current version (a no-op until the deck has been played)."""
+        db.session.execute(
+            update(DeckStats).where(DeckStats.deck_id == deck_id)
+            .values(current_version_id=version_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def get_leaderboard(sort: str = 'win_rate', min_games: int = 1, user_id: Optional[int] = None,
+                        commander: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict:
+        """Rank played decks across all players.
+
+        Args:
+            sort: One of SORTS
+            min_games: Ignore decks played fewer times than this
+            user_id: Only this player's decks
+            commander: Only decks with this commander
+            limit: Maximum number of decks returned
+            offset: Number of ranked decks to skip
+
+        Returns:
+            Dict: The sort, paging and the ranked decks
+
+        Raises:
+            ValueError: If the sort is unknown
+        """
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        column, direction = SORTS[sort]
+        query = db.session.query(
+            DeckStats, Deck.name, Deck.commander, Deck.colors, User.username
+        ).join(Deck, Deck.id == DeckStats.deck_id).join(User, User.id == DeckStats.user_id).filter(
+            DeckStats.games >= max(1, min_games)
+        )
+        if user_id is not None:
+            query = query.filter(DeckStats.user_id == user_id)
+        if commander:
+            query = query.filter(Deck.commander == commander)
+        keys = [column] + ([DeckStats.games] if column is not DeckStats.games else []) + [DeckStats.deck_id]
+        query = query.order_by(*[key.desc() if direction == 'desc' else key.asc() for key in keys])
+
+        return {
+            "sort": sort,
+            "limit": limit,
+            "offset": offset,
+            "decks": [{
+                "deck_id": stats.deck_id,
+                "name": name,
+                "commander": deck_commander,
+                "colors": colors,
+                "user_id": stats.user_id,
+                "username": username,
+                "current_version_id": stats.current_version_id,
+                **DeckStatsService.to_dict(stats)
+            } for stats, name, deck_commander, colors, username in query.offset(offset).limit(limit)]
+        }
+
+    @staticmethod
+    def to_dict(stats: Optional[DeckStats]) -> Dict:
+        """Serialize a deck's stats (zeros when it has never been played)."""
+        if stats is None or stats.games <= 0:
+            return {"games": 0, "wins": 0, "win_rate": None, "avg_placement": None, "last_played": None}
+        return {
+            "games": stats.games,
+            "wins": stats.wins,
+            "win_rate": round(stats.win_rate, 4),
+            "avg_placement": round(stats.avg_placement, 2),
+            "last_played": stats.last_played.isoformat() if stats.last_played else None
+        }
+
+    @staticmethod
+    def _derive(stats: DeckStats) -> None:
+        if stats.games > 0:
+            stats.win_rate = stats.wins / stats.games
+            stats.avg_placement = stats.placement_sum / stats.games
+        else:
+            stats.win_rate = stats.avg_placement = None
+
+    @staticmethod
+    def _aggregate_query():
+        # Deleted games are excluded explicitly: backfills run with the global filter off
+        return db.session.query(
+            MatchPlayer.deck_id,
+            func.count(MatchPlayer.id).label('games'),
+            func.sum(case((MatchPlayer.placement == 1, 1), else_=0)).label('wins'),
+            func.sum(MatchPlayer.placement).label('placement_sum'),
+            func.max(Game.game_date).label('last_played')
+        ).join(Match, Match.id == MatchPlayer.match_id).outerjoin(
+            Game, Game.id == Match.game_id
+        ).filter(Match.status == 'approved', MatchPlayer.placement.isnot(None), Game.deleted_at.is_(None))
+
+    @staticmethod
+    def _last_played(deck_id: int, excluded_match_id: int):
+        # The match being removed may still look approved/live within this transaction
+        row = DeckStatsService._aggregate_query().filter(
+            MatchPlayer.deck_id == deck_id, Match.id != excluded_match_id
+        ).group_by(MatchPlayer.deck_id).first()
+        return row.last_played if row else None
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    DeckStatsService.apply_match(match, sign)
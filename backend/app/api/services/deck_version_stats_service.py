@@ -0,0 +1,134 @@
+"""
+Service maintaining per-deck-version performance aggregates.
+
+``deck_version_stats`` rows are adjusted incrementally as matches start or
+stop counting (see ``result_signals``). Counts are updated in place by atomic
+upserts (see ``utils/counters.py``); first and last played dates are extended
+in the same statement on the way up and only recomputed from the source
+tables when a removed game sat on one of the boundaries.
+"""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, func, select, update
+
+from ... import db
+from ...models import DeckVersion, DeckVersionStats, Game, Match, MatchPlayer
+from ...soft_delete import including_deleted
+from ..utils.counters import add_to_row, earliest, latest
+from .result_signals import counted_results
+
+
+class DeckVersionStatsService:
+    """Service class for deck version performance statistics."""
+
+    @staticmethod
+    def apply_match(match: Match, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a match from its versions' stats.
+
+        Args:
+            match: The match whose players' deck versions should be updated
+            sign: +1 when the match starts counting, -1 when it stops
+        """
+        with including_deleted():
+            game = db.session.get(Game, match.game_id) if match.game_id is not None else None
+            players = db.session.query(
+                MatchPlayer.deck_id, MatchPlayer.deck_version_id, MatchPlayer.placement
+            ).filter(
+                MatchPlayer.match_id == match.id,
+                MatchPlayer.deck_version_id.isnot(None),
+                MatchPlayer.placement.isnot(None)
+            ).all()
+        played_on = game.game_date if game else None
+
+        def _extend_range(new, old):
+            return {"first_played": earliest(old('first_played'), played_on),
+                    "last_played": latest(old('last_played'), played_on)}
+
+        table = DeckVersionStats.__table__
+        for deck_id, version_id, placement in players:
+            add_to_row(DeckVersionStats, {"deck_version_id": version_id}, {
+                "games": sign, "wins": sign * (placement == 1), "placement_sum": sign * placement
+            }, create=sign > 0, derived=_extend_range if sign > 0 and played_on is not None else None,
+                inserted={"deck_id": deck_id})
+
+            if sign < 0:
+                stats = db.session.execute(select(
+                    table.c.games, table.c.first_played, table.c.last_played
+                ).where(table.c.deck_version_id == version_id)).first()
+                if stats and (stats.games <= 0 or played_on in (stats.first_played, stats.last_played)):
+                    first_played, last_played = DeckVersionStatsService._played_range(version_id, match.id)
+                    db.session.execute(update(table).where(table.c.deck_version_id == version_id).values(
+                        first_played=first_played, last_played=last_played
+                    ))
+
+    @staticmethod
+    def recompute(version_ids: Iterable[int]) -> int:
+        """Rebuild the stats rows of the given versions from the source tables.
+
+        Args:
+            version_ids: Deck version ids to rebuild
+
+        Returns:
+            int: Number of rows written, not yet committed
+        """
+        version_ids = list(version_ids)
+        totals = {
+            row.deck_version_id: row for row in DeckVersionStatsService._aggregate_query().filter(
+                MatchPlayer.deck_version_id.in_(version_ids)
+            ).group_by(MatchPlayer.deck_version_id)
+        }
+        versions = db.session.query(DeckVersion.id, DeckVersion.deck_id).filter(DeckVersion.id.in_(version_ids))
+        for version_id, deck_id in versions:
+            row = totals.get(version_id)
+            stats = db.session.get(DeckVersionStats, version_id)
+            if stats is None:
+                stats = DeckVersionStats(deck_version_id=version_id, deck_id=deck_id)
+                db.session.add(stats)
+            stats.games = row.games if row else 0
+            stats.wins = int(row.wins or 0) if row else 0
+            stats.placement_sum = int(row.placement_sum or 0) if row else 0
+            stats.first_played = row.first_played if row else None
+            stats.last_played = row.last_played if row else None
+        return len(version_ids)
+
+    @staticmethod
+    def to_dict(stats: Optional[DeckVersionStats]) -> Dict:
+        """Serialize a version's stats (zeros when it has never been played)."""
+        if stats is None or stats.games <= 0:
+            return {"games": 0, "wins": 0, "avg_placement": None, "first_played": None, "last_played": None}
+        return {
+            "games": stats.games,
+            "wins": stats.wins,
+            "avg_placement": round(stats.placement_sum / stats.games, 2),
+            "first_played": stats.first_played.isoformat() if stats.first_played else None,
+            "last_played": stats.last_played.isoformat() if stats.last_played else None
+        }
+
+    @staticmethod
+    def _aggregate_query():
+        # Deleted games are excluded explicitly: backfills run with the global filter off
+        return db.session.query(
+            MatchPlayer.deck_version_id,
+            func.count(MatchPlayer.id).label('games'),
+            func.sum(case((MatchPlayer.placement == 1, 1), else_=0)).label('wins'),
+            func.sum(MatchPlayer.placement).label('placement_sum'),
+            func.min(Game.game_date).label('first_played'),
+            func.max(Game.game_date).label('last_played')
+        ).join(Match, Match.id == MatchPlayer.match_id).outerjoin(
+            Game, Game.id == Match.game_id
+        ).filter(Match.status == 'approved', MatchPlayer.placement.isnot(None), Game.deleted_at.is_(None))
+
+    @staticmethod
+    def _played_range(version_id: int, excluded_match_id: int):
+        # The match being removed may still look approved/live within this transaction
+        row = DeckVersionStatsService._aggregate_query().filter(
+            MatchPlayer.deck_version_id == version_id, Match.id != excluded_match_id
+        ).group_by(MatchPlayer.deck_version_id).first()
+        return (row.first_played, row.last_played) if row else (None, None)
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    DeckVersionStatsService.apply_match(match, sign)
@@ -0,0 +1,234 @@
+"""
+Service maintaining game duration analytics.
+
+A counted match with both ``start_time`` and ``end_time`` contributes its
+length in minutes to one t-digest per group it belongs to: its player count,
+pauper or regular, each commander in the pod and each player. Adding a match
+folds the value into the stored sketches; since sketches cannot forget a
+value, a match that stops counting enqueues a background rebuild of just its
+groups (the ``rebuild_duration_groups`` job), keeping the scan of their
+matches off the request path.
+Overall figures are the merge of the player-count sketches, which partition
+the counted matches.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from ... import db
+from ...models import Deck, DurationSketch, Game, Match, MatchPlayer, User
+from ...soft_delete import including_deleted
+from ..utils.counters import insert_missing
+from ..utils.tdigest import TDigest
+from .result_signals import counted_results
+
+DIMENSIONS = ('player_count', 'commander', 'pauper', 'player')
+
+GroupKey = Tuple[str, str]
+
+
+def duration_minutes(start_time, end_time) -> Optional[float]:
+    """Length of a match in minutes, or None when the times are missing or inverted."""
+    if start_time is None or end_time is None or end_time <= start_time:
+        return None
+    return (end_time - start_time).total_seconds() / 60
+
+
+class DurationStatsService:
+    """Service class for game length statistics."""
+
+    @staticmethod
+    def apply_match(match: Match, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a match's duration from its groups.
+
+        Args:
+            match: The match whose duration changed counting state
+            sign: +1 when the match starts counting, -1 when it stops
+        """
+        minutes = duration_minutes(match.start_time, match.end_time)
+        if minutes is None:
+            return
+        groups = DurationStatsService._groups(match)
+        if sign > 0:
+            # Merging into the stored digest is a read-modify-write: lock each row
+            # first (groups come in a fixed order, so lockers can't deadlock)
+            for dimension, key in groups:
+                sketch = DurationStatsService._locked_sketch(dimension, key)
+                digest = TDigest.from_dict(sketch.digest)
+                digest.add(minutes)
+                sketch.digest = digest.to_dict()
+                sketch.games += 1
+        else:
+            from ...jobs import enqueue
+            enqueue('rebuild_duration_groups', {'groups': [list(group) for group in groups]})
+
+    @staticmethod
+    def rebuild_groups(groups: Iterable[GroupKey], lock: bool = False) -> None:
+        """Recompute the sketches of the given groups from the source tables.
+
+        Args:
+            groups: (dimension, key) pairs to rebuild
+            lock: Lock the sketch rows (creating missing ones) first, so a
+                match counted concurrently is either in the rebuild or added
+                after it
+        """
+        groups = list(groups)
+        if lock:
+            for dimension, key in groups:
+                DurationStatsService._locked_sketch(dimension, key)
+        for dimension, key in groups:
+            rows = DurationStatsService._counted_query().filter(
+                DurationStatsService._group_filter(dimension, key)
+            ).all()
+            digest = TDigest()
+            digest.update(m for m in (duration_minutes(start, end) for start, end in rows) if m is not None)
+            sketch = DurationStatsService._sketch(dimension, key)
+            sketch.digest = digest.to_dict()
+            sketch.games = int(digest.count)
+
+    @staticmethod
+    def rebuild_all() -> int:
+        """Replace every sketch with ones built from all counted matches.
+
+        Returns:
+            int: Number of sketches written, not yet committed
+        """
+        matches = db.session.query(
+            Match.id, Match.start_time, Match.end_time, Match.player_count, Game.is_pauper
+        ).select_from(Match).outerjoin(Game, Game.id == Match.game_id).filter(
+            *DurationStatsService._counted_criteria()
+        ).all()
+        minutes = {row.id: duration_minutes(row.start_time, row.end_time) for row in matches}
+        minutes = {match_id: m for match_id, m in minutes.items() if m is not None}
+
+        digests: Dict[GroupKey, TDigest] = {}
+
+        def add(group: GroupKey, value: float):
+            digests.setdefault(group, TDigest()).add(value)
+
+        for row in matches:
+            if row.id in minutes:
+                add(('player_count', str(row.player_count)), minutes[row.id])
+                if row.is_pauper is not None:
+                    add(('pauper', 'pauper' if row.is_pauper else 'regular'), minutes[row.id])
+        players = db.session.query(MatchPlayer.match_id, MatchPlayer.user_id, Deck.commander).join(
+            Deck, Deck.id == MatchPlayer.deck_id
+        ).filter(MatchPlayer.match_id.in_(list(minutes))).all() if minutes else []
+        commanders_seen = set()
+        for match_id, user_id, commander in players:
+            add(('player', str(user_id)), minutes[match_id])
+            if (match_id, commander) not in commanders_seen:
+                commanders_seen.add((match_id, commander))
+                add(('commander', commander), minutes[match_id])
+
+        DurationSketch.query.delete()
+        for (dimension, key), digest in digests.items():
+            db.session.add(DurationSketch(dimension=dimension, group_key=key,
+                                          games=int(digest.count), digest=digest.to_dict()))
+        return len(digests)
+
+    @staticmethod
+    def get_summary(dimension: str) -> Dict:
+        """Median and p90 duration for every group of a dimension plus overall.
+
+        Args:
+            dimension: One of DIMENSIONS
+
+        Returns:
+            Dict: {"dimension", "overall", "groups"}, durations in minutes
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"dimension must be one of {', '.join(DIMENSIONS)}")
+
+        overall = TDigest()
+        for sketch in DurationSketch.query.filter_by(dimension='player_count'):
+            overall.merge(TDigest.from_dict(sketch.digest))
+
+        sketches = DurationSketch.query.filter(
+            DurationSketch.dimension == dimension, DurationSketch.games > 0
+        ).order_by(DurationSketch.games.desc(), DurationSketch.group_key).all()
+        labels = {}
+        if dimension == 'player':
+            ids = [int(s.group_key) for s in sketches]
+            labels = {str(user_id): username for user_id, username in
+                      db.session.query(User.id, User.username).filter(User.id.in_(ids))} if ids else {}
+
+        groups = []
+        for sketch in sketches:
+            entry = {"key": sketch.group_key, **DurationStatsService._stats(TDigest.from_dict(sketch.digest))}
+            if dimension == 'player':
+                entry["username"] = labels.get(sketch.group_key)
+            groups.append(entry)
+        return {"dimension": dimension, "overall": DurationStatsService._stats(overall), "groups": groups}
+
+    @staticmethod
+    def _stats(digest: TDigest) -> Dict:
+        median, p90 = digest.quantile(0.5), digest.quantile(0.9)
+        return {
+            "games": int(digest.count),
+            "median_minutes": round(median, 1) if median is not None else None,
+            "p90_minutes": round(p90, 1) if p90 is not None else None
+        }
+
+    @staticmethod
+    def _sketch(dimension: str, key: str) -> DurationSketch:
+        sketch = db.session.get(DurationSketch, (dimension, key))
+        if sketch is None:
+            sketch = DurationSketch(dimension=dimension, group_key=key, games=0, digest=TDigest().to_dict())
+            db.session.add(sketch)
+        return sketch
+
+    @staticmethod
+    def _locked_sketch(dimension: str, key: str) -> DurationSketch:
+        """The group's sketch, created if missing and locked until the transaction ends."""
+        insert_missing(DurationSketch, {"dimension": dimension, "group_key": key, "games": 0,
+                                        "digest": TDigest().to_dict()})
+        return db.session.query(DurationSketch).filter_by(
+            dimension=dimension, group_key=key
+        ).with_for_update().populate_existing().one()
+
+    @staticmethod
+    def _groups(match: Match) -> List[GroupKey]:
+        with including_deleted():
+            game = db.session.get(Game, match.game_id) if match.game_id is not None else None
+            players = db.session.query(MatchPlayer.user_id, Deck.commander).join(
+                Deck, Deck.id == MatchPlayer.deck_id
+            ).filter(MatchPlayer.match_id == match.id).all()
+        groups = [('player_count', str(match.player_count))]
+        if game is not None:
+            groups.append(('pauper', 'pauper' if game.is_pauper else 'regular'))
+        groups += sorted({('commander', commander) for _, commander in players})
+        groups += sorted({('player', str(user_id)) for user_id, _ in players})
+        return groups
+
+    @staticmethod
+    def _counted_criteria():
+        # Deleted games are excluded explicitly: backfills run with the global filter off
+        return (Match.status == 'approved', Match.start_time.isnot(None), Match.end_time.isnot(None),
+                Game.deleted_at.is_(None))
+
+    @staticmethod
+    def _counted_query():
+        return db.session.query(Match.start_time, Match.end_time).select_from(Match).outerjoin(
+            Game, Game.id == Match.game_id
+        ).filter(*DurationStatsService._counted_criteria())
+
+    @staticmethod
+    def _group_filter(dimension: str, key: str):
+        if dimension == 'player_count':
+            return Match.player_count == int(key)
+        if dimension == 'pauper':
+            return Game.is_pauper == (key == 'pauper')
+        if dimension == 'commander':
+            return Match.id.in_(select(MatchPlayer.match_id).join(Deck, Deck.id == MatchPlayer.deck_id)
+                                .where(Deck.commander == key))
+        if dimension == 'player':
+            return Match.id.in_(select(MatchPlayer.match_id).where(MatchPlayer.user_id == int(key)))
+        raise ValueError(f"Unknown duration dimension: {dimension}")
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    DurationStatsService.apply_match(match, sign)
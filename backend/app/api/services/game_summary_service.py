@@ -0,0 +1,162 @@
+"""
+Service maintaining the ``game_summaries`` read model.
+
+Each lifecycle signal rebuilds the affected game's summary row from the
+source tables inside the sender's transaction, so the read model commits
+(or rolls back) together with the change that triggered it.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from ... import db
+from ...models import Game, GameStatus, GameSummary, GameRegistration, Match, MatchPlayer, User, Deck
+from ...soft_delete import including_deleted
+from ... import signals
+from ..utils.fieldsets import Field, enum_value, isoformat, select_fields, serialize
+
+# Fields of the game list (?fields=), in response order; see utils/fieldsets.py
+SUMMARY_FIELDS = {
+    "id": Field(GameSummary.game_id),
+    "game_date": Field(GameSummary.game_date, format=isoformat),
+    "status": Field(GameSummary.status, format=enum_value),
+    "is_pauper": Field(GameSummary.is_pauper),
+    "details": Field(GameSummary.details),
+    "match_id": Field(GameSummary.match_id),
+    "match_status": Field(GameSummary.match_status),
+    "submitted_by_id": Field(GameSummary.submitted_by_id),
+    "registration_count": Field(GameSummary.registration_count),
+    "winner_id": Field(GameSummary.winner_id),
+    "winner_username": Field(GameSummary.winner_username),
+}
+# Expansions outside the default shape (?include=)
+SUMMARY_INCLUDES = {
+    "players": Field(GameSummary.players),
+    "player_count": Field(GameSummary.player_count),
+    "submitted_by_username": Field(GameSummary.submitted_by_username),
+    "approved_by": Field(GameSummary.approved_by_username),
+}
+
+
+class GameSummaryService:
+    """Service class for the denormalized game summary read model."""
+
+    @staticmethod
+    def refresh(game: Game) -> GameSummary:
+        """Rebuild the summary row for a game from the source tables.
+
+        Args:
+            game: The game whose summary should be rebuilt
+
+        Returns:
+            GameSummary: The (added or updated) summary row, not yet committed
+        """
+        with including_deleted():
+            summary = db.session.get(GameSummary, game.id)
+            if summary is None:
+                summary = GameSummary(game_id=game.id)
+                db.session.add(summary)
+
+            summary.game_date = game.game_date
+            summary.status = game.status
+            summary.is_pauper = game.is_pauper
+            summary.details = game.details
+            summary.deleted_at = game.deleted_at
+            summary.registration_count = GameRegistration.query.filter_by(game_id=game.id).count()
+
+            match = Match.query.filter_by(game_id=game.id).order_by(Match.id.desc()).first()
+            players = GameSummaryService._match_players(match.id) if match else GameSummaryService._registered_players(game.id)
+
+            summary.match_id = match.id if match else None
+            summary.match_status = match.status if match else None
+            summary.submitted_by_id = match.submitted_by_id if match else None
+            summary.submitted_by_username = GameSummaryService._username(match.submitted_by_id) if match else None
+            summary.approved_by_id = match.approved_by_id if match else None
+            summary.approved_by_username = GameSummaryService._username(match.approved_by_id) if match else None
+
+            # Winner is only final once the game is completed and its results approved
+            winner = None
+            if game.status == GameStatus.COMPLETED and match and match.status == 'approved':
+                winner = next((p for p in players if p['placement'] == 1), None)
+            summary.winner_id = winner['user_id'] if winner else None
+            summary.winner_username = winner['username'] if winner else None
+
+            summary.player_count = len(players)
+            summary.players = players
+        return summary
+
+    @staticmethod
+    def list_games(status: Optional[GameStatus] = None, fields: Iterable[str] = tuple(SUMMARY_FIELDS),
+                   include: Iterable[str] = ()) -> List[Dict]:
+        """The game list, selecting only the requested summary columns.
+
+        Args:
+            status: Optional game status to filter on
+            fields: Names from SUMMARY_FIELDS
+            include: Names from SUMMARY_INCLUDES
+
+        Returns:
+            List[Dict]: One item per live game, newest first
+        """
+        spec = {**SUMMARY_FIELDS, **SUMMARY_INCLUDES}
+        names = list(fields) + [name for name in SUMMARY_INCLUDES if name in include]
+        query = select_fields(db.session, spec, names, GameSummary, {})
+        if status is not None:
+            query = query.filter(GameSummary.status == status)
+        rows = query.order_by(GameSummary.game_date.desc()).all()
+        return [serialize(row, spec, names) for row in rows]
+
+    @staticmethod
+    def _username(user_id: Optional[int]) -> Optional[str]:
+        if user_id is None:
+            return None
+        return db.session.query(User.username).filter(User.id == user_id).scalar()
+
+    @staticmethod
+    def _match_players(match_id: int) -> List[Dict]:
+        rows = db.session.query(
+            MatchPlayer.user_id, User.username, MatchPlayer.deck_id, Deck.name, Deck.commander, MatchPlayer.placement
+        ).join(User, User.id == MatchPlayer.user_id).join(Deck, Deck.id == MatchPlayer.deck_id).filter(
+            MatchPlayer.match_id == match_id
+        ).order_by(MatchPlayer.placement).all()
+        return [GameSummaryService._player(*row) for row in rows]
+
+    @staticmethod
+    def _registered_players(game_id: int) -> List[Dict]:
+        rows = db.session.query(
+            GameRegistration.user_id, User.username, GameRegistration.deck_id, Deck.name, Deck.commander
+        ).join(User, User.id == GameRegistration.user_id).join(Deck, Deck.id == GameRegistration.deck_id).filter(
+            GameRegistration.game_id == game_id
+        ).order_by(GameRegistration.registered_at).all()
+        return [GameSummaryService._player(*row, None) for row in rows]
+
+    @staticmethod
+    def _player(user_id, username, deck_id, deck_name, commander, placement) -> Dict:
+        return {
+            "user_id": user_id,
+            "username": username,
+            "deck_id": deck_id,
+            "deck_name": deck_name,
+            "commander": commander,
+            "placement": placement
+        }
+
+
+# --- Signal receivers: keep the read model in step with the lifecycle ---
+
+@signals.game_created.connect
+@signals.game_updated.connect
+@signals.registration_changed.connect
+@signals.game_deleted.connect
+@signals.game_restored.connect
+def _on_game_changed(sender, game, **extra):
+    GameSummaryService.refresh(game)
+
+
+@signals.match_submitted.connect
+@signals.match_approved.connect
+@signals.match_rejected.connect
+@signals.match_unapproved.connect
+def _on_match_changed(sender, match, **extra):
+    if match.game_id is not None:
+        with including_deleted():
+            game = db.session.get(Game, match.game_id)
+        GameSummaryService.refresh(game)
@@ -0,0 +1,221 @@
+"""
+Service maintaining the pairwise head-to-head store.
+
+``head_to_head`` holds one row per ordered pair of players with the number of
+approved games they shared, how often each placed higher and the summed
+placement difference. Rows are adjusted incrementally, inside the sender's
+transaction, whenever a match starts or stops counting: results approved or
+un-approved, or the game soft-deleted or restored. Each adjustment is one
+atomic upsert (see ``utils/counters.py``), so concurrent approvals sharing
+players don't lose updates.
+
+The N x N matrix endpoint is assembled from the stored pairs
+(``stored_matrix``). ``build_matrix`` computes the same matrix from the
+placement arrays with NumPy; ``rebuild`` uses it to repopulate the store from
+scratch. NumPy is imported by the functions that need it, keeping it off the
+app's boot path.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import permutations
+from typing import TYPE_CHECKING, Dict, List
+
+from ... import db
+from ...models import Game, HeadToHead, Match, MatchPlayer, User
+from ...soft_delete import including_deleted
+from ..utils.counters import add_to_row
+from .result_signals import counted_results
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Upper bound on the (matches x players x players) block compared at once
+_CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass
+class HeadToHeadMatrix:
+    """Pairwise statistics; row i / column j refer to ``user_ids[i]`` / ``user_ids[j]``."""
+    user_ids: np.ndarray
+    games: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    placement_delta_sum: np.ndarray
+
+    def avg_placement_delta(self) -> np.ndarray:
+        """Mean of (opponent placement - own placement) over shared games, 0 where none."""
+        import numpy as np
+        out = np.zeros(self.games.shape, dtype=np.float64)
+        np.divide(self.placement_delta_sum, self.games, out=out, where=self.games > 0)
+        return out
+
+
+class HeadToHeadService:
+    """Service class for player-versus-player statistics."""
+
+    @staticmethod
+    def apply_match(match: Match, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a match's pairs from the store.
+
+        Args:
+            match: The match whose placements should be counted
+            sign: +1 when the match starts counting, -1 when it stops
+        """
+        with including_deleted():
+            placements = [
+                (user_id, placement) for user_id, placement in db.session.query(
+                    MatchPlayer.user_id, MatchPlayer.placement
+                ).filter(MatchPlayer.match_id == match.id, MatchPlayer.placement.isnot(None)).all()
+            ]
+
+        for (user_id, placement), (opponent_id, opponent_placement) in permutations(placements, 2):
+            if user_id == opponent_id:
+                continue
+            add_to_row(HeadToHead, {"user_id": user_id, "opponent_id": opponent_id}, {
+                "games": sign,
+                "wins": sign * (placement < opponent_placement),
+                "losses": sign * (placement > opponent_placement),
+                "placement_delta_sum": sign * (opponent_placement - placement)
+            }, create=sign > 0)
+
+    @staticmethod
+    def get_for_user(user_id: int) -> List[Dict]:
+        """List a player's record against every opponent, most shared games first.
+
+        Args:
+            user_id: The player whose record to return
+
+        Returns:
+            List[Dict]: One entry per opponent with at least one shared game
+        """
+        rows = db.session.query(HeadToHead, User.username).join(
+            User, User.id == HeadToHead.opponent_id
+        ).filter(
+            HeadToHead.user_id == user_id, HeadToHead.games > 0
+        ).order_by(HeadToHead.games.desc(), User.username).all()
+        return [{
+            "opponent_id": row.opponent_id,
+            "opponent_username": username,
+            "games": row.games,
+            "wins": row.wins,
+            "losses": row.losses,
+            "avg_placement_delta": round(row.placement_delta_sum / row.games, 3)
+        } for row, username in rows]
+
+    @staticmethod
+    def build_matrix() -> HeadToHeadMatrix:
+        """Compute the full pairwise matrix from approved placements.
+
+        Placements are laid out as a (matches x players) array with NaN where a
+        player was not in the pod; every pairwise statistic is then a reduction
+        over the match axis of a broadcast comparison. NaN compares false, so
+        pairs that did not share a match contribute nothing.
+
+        Returns:
+            HeadToHeadMatrix: Statistics for every player with an approved match of a live game
+        """
+        import numpy as np
+
+        # Deleted games are excluded explicitly: backfills run with the global filter off
+        rows = np.array(db.session.query(
+            MatchPlayer.match_id, MatchPlayer.user_id, MatchPlayer.placement
+        ).join(Match, Match.id == MatchPlayer.match_id).outerjoin(
+            Game, Game.id == Match.game_id
+        ).filter(
+            Match.status == 'approved', Game.deleted_at.is_(None), MatchPlayer.placement.isnot(None)
+        ).all(), dtype=np.int64).reshape(-1, 3)
+
+        match_ids, match_index = np.unique(rows[:, 0], return_inverse=True)
+        user_ids, user_index = np.unique(rows[:, 1], return_inverse=True)
+        n = len(user_ids)
+
+        placements = np.full((len(match_ids), n), np.nan)
+        placements[match_index, user_index] = rows[:, 2]
+        present = ~np.isnan(placements)
+
+        games = present.T.astype(np.int64) @ present.astype(np.int64)
+        np.fill_diagonal(games, 0)
+        wins = np.zeros((n, n), dtype=np.int64)
+        losses = np.zeros((n, n), dtype=np.int64)
+        delta = np.zeros((n, n), dtype=np.float64)
+
+        chunk = max(1, _CHUNK_ELEMENTS // max(1, n * n))
+        for start in range(0, len(match_ids), chunk):
+            block = placements[start:start + chunk]
+            own, other = block[:, :, None], block[:, None, :]
+            wins += (own < other).sum(axis=0)
+            losses += (own > other).sum(axis=0)
+            delta += np.nansum(other - own, axis=0)
+
+        return HeadToHeadMatrix(user_ids=user_ids, games=games, wins=wins, losses=losses,
+                                placement_delta_sum=delta.astype(np.int64))
+
+    @staticmethod
+    def stored_matrix() -> HeadToHeadMatrix:
+        """The full pairwise matrix assembled from the ``head_to_head`` store.
+
+        One pass over the stored pairs, so serving the matrix costs the same
+        however long the match history is; ``build_matrix`` is for rebuilds.
+
+        Returns:
+            HeadToHeadMatrix: Statistics for every player with a shared game
+        """
+        import numpy as np
+
+        rows = np.array(db.session.query(
+            HeadToHead.user_id, HeadToHead.opponent_id, HeadToHead.games, HeadToHead.wins,
+            HeadToHead.losses, HeadToHead.placement_delta_sum
+        ).filter(HeadToHead.games > 0).all(), dtype=np.int64).reshape(-1, 6)
+
+        user_ids, index = np.unique(rows[:, :2], return_inverse=True)
+        index = index.reshape(-1, 2)
+        n = len(user_ids)
+        stats = np.zeros((4, n, n), dtype=np.int64)
+        stats[:, index[:, 0], index[:, 1]] = rows[:, 2:].T
+        return HeadToHeadMatrix(user_ids=user_ids, games=stats[0], wins=stats[1], losses=stats[2],
+                                placement_delta_sum=stats[3])
+
+    @staticmethod
+    def matrix_to_dict(matrix: HeadToHeadMatrix) -> Dict:
+        """Serialize a matrix with the players in row/column order."""
+        import numpy as np
+        usernames = dict(db.session.query(User.id, User.username).filter(
+            User.id.in_(matrix.user_ids.tolist())
+        ).all()) if len(matrix.user_ids) else {}
+        return {
+            "players": [{"id": user_id, "username": usernames.get(user_id)} for user_id in matrix.user_ids.tolist()],
+            "games": matrix.games.tolist(),
+            "wins": matrix.wins.tolist(),
+            "losses": matrix.losses.tolist(),
+            "avg_placement_delta": np.round(matrix.avg_placement_delta(), 3).tolist()
+        }
+
+    @staticmethod
+    def rebuild() -> int:
+        """Replace the whole store with rows derived from ``build_matrix``.
+
+        Returns:
+            int: Number of rows written, not yet committed
+        """
+        import numpy as np
+
+        matrix = HeadToHeadService.build_matrix()
+        HeadToHead.query.delete()
+        user_ids = matrix.user_ids.tolist()
+        rows = [
+            {"user_id": user_ids[i], "opponent_id": user_ids[j], "games": int(matrix.games[i, j]),
+             "wins": int(matrix.wins[i, j]), "losses": int(matrix.losses[i, j]),
+             "placement_delta_sum": int(matrix.placement_delta_sum[i, j])}
+            for i, j in zip(*np.nonzero(matrix.games))
+        ]
+        if rows:
+            db.session.bulk_insert_mappings(HeadToHead, rows)
+        return len(rows)
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    HeadToHeadService.apply_match(match, sign)
@@ -0,0 +1,145 @@
+"""
+Service for player leaderboards and rank lookups.
+
+Rankings are served from the worker's in-memory boards (see leaderboards.py).
+The receiver at the bottom turns each match entering or leaving the counted
+set into per-scope changes for its players, which are patched into the
+boards when the transaction commits.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+
+from ... import db
+from ...leaderboards import METRICS, RATE_METRICS, SCOPES, Scope, Totals, record
+from ...models import Game, Match, MatchPlayer, User
+from ...soft_delete import including_deleted
+from ..utils.dataloader import loader
+from .result_signals import counted_results
+
+
+def scope_for(scope: str, season: Optional[str] = None) -> Scope:
+    """The board key for a scope name and, for 'season', its number.
+
+    Raises:
+        ValueError: If the scope is unknown or the season is missing or not a number
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"scope must be one of {', '.join(SCOPES)}")
+    if scope != 'season':
+        return scope, ''
+    if not season or not str(season).isdigit():
+        raise ValueError("'season' must be a season number")
+    return scope, str(int(season))
+
+
+def _stats(totals: Optional[Totals]) -> Dict:
+    if not totals:
+        return {"games": 0, "wins": 0, "win_rate": None, "avg_placement": None, "points": 0, "points_per_game": None}
+    games, wins, placement_sum, points = totals
+    return {
+        "games": games,
+        "wins": wins,
+        "win_rate": round(wins / games, 4),
+        "avg_placement": round(placement_sum / games, 2),
+        "points": points,
+        "points_per_game": round(points / games, 2)
+    }
+
+
+class LeaderboardService:
+    """Service class for player leaderboards."""
+
+    @staticmethod
+    def get_leaderboard(metric: str = 'wins', scope: Scope = ('all', ''), limit: int = 50, offset: int = 0) -> Dict:
+        """Rank players in a scope by a metric.
+
+        Args:
+            metric: One of METRICS
+            scope: Board key from ``scope_for``
+            limit: Maximum number of players returned
+            offset: Number of ranked players to skip
+
+        Returns:
+            Dict: Ranked player count, paging and the page of players with their rank
+
+        Raises:
+            ValueError: If the metric is unknown
+        """
+        LeaderboardService._check_metric(metric)
+        total, entries = current_app.extensions['leaderboards'].page(scope, metric, offset, limit)
+        users = loader(User).load_many([user_id for _, user_id, _ in entries])
+        return {
+            **LeaderboardService._header(metric, scope),
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "players": [{
+                "rank": rank,
+                "user_id": user_id,
+                "username": user.username if user else None,
+                **_stats(totals)
+            } for (rank, user_id, totals), user in zip(entries, users)]
+        }
+
+    @staticmethod
+    def get_rank(user_id: int, metric: str = 'wins', scope: Scope = ('all', '')) -> Dict:
+        """A player's rank in a scope, without ranking everyone else.
+
+        Args:
+            user_id: ID of the player
+            metric: One of METRICS
+            scope: Board key from ``scope_for``
+
+        Returns:
+            Dict: The rank (None when the player isn't ranked), ranked player count and the player's stats
+
+        Raises:
+            ValueError: If the metric is unknown
+        """
+        LeaderboardService._check_metric(metric)
+        rank, total, totals = current_app.extensions['leaderboards'].rank(scope, metric, user_id)
+        return {**LeaderboardService._header(metric, scope), "user_id": user_id, "rank": rank, "total": total,
+                **_stats(totals)}
+
+    @staticmethod
+    def changes_for(match: Match, sign: int) -> List[Tuple[Scope, int, Totals]]:
+        """The (scope, user id, delta) changes a match makes to the boards."""
+        with including_deleted():
+            game = db.session.get(Game, match.game_id) if match.game_id is not None else None
+            players = db.session.query(MatchPlayer.user_id, MatchPlayer.placement).filter(
+                MatchPlayer.match_id == match.id, MatchPlayer.placement.isnot(None)
+            ).all()
+        scopes = [('all', '')]
+        if match.season_number is not None:
+            scopes.append(('season', str(match.season_number)))
+        if game is not None and game.is_pauper:
+            scopes.append(('pauper', ''))
+
+        changes = []
+        for user_id, placement in players:
+            points = max(match.player_count - placement, 0)
+            delta = [sign, sign * (placement == 1), sign * placement, sign * points]
+            changes.extend((scope, user_id, delta) for scope in scopes)
+        return changes
+
+    @staticmethod
+    def _check_metric(metric: str) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+
+    @staticmethod
+    def _header(metric: str, scope: Scope) -> Dict:
+        return {
+            "metric": metric,
+            "scope": scope[0],
+            "season": int(scope[1]) if scope[0] == 'season' else None,
+            "min_games": current_app.extensions['leaderboards'].min_games if metric in RATE_METRICS else None
+        }
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    record(LeaderboardService.changes_for(match, sign))
@@ -0,0 +1,156 @@
+"""
+Service maintaining per-player weekly results and the trend series built on them.
+
+``player_weekly_stats`` holds one row per player and week with games, wins
+and the placement sum of that week's counted results. Rows are adjusted
+incrementally, by atomic upserts, as matches start or stop counting (see
+``result_signals``), so a chart reads one row per week played instead of
+every MatchPlayer row, and the series is downsampled to the requested number
+of points.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List
+
+from ... import db
+from ...models import Game, Match, MatchPlayer, PlayerWeeklyStats
+from ...soft_delete import including_deleted
+from ..utils.counters import add_to_row
+from ..utils.downsample import bucket_mean, lttb
+from .result_signals import counted_results
+
+SERIES = ('cumulative_wins', 'win_rate', 'placement')
+METHODS = {'lttb': lttb, 'bucket': bucket_mean}
+
+
+def week_start(day: date) -> date:
+    """The Monday of a date's week."""
+    return day - timedelta(days=day.weekday())
+
+
+class PlayerTrendsService:
+    """Service class for per-player performance over time."""
+
+    @staticmethod
+    def apply_match(match: Match, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a match from its players' weeks.
+
+        Args:
+            match: The match whose players should be updated
+            sign: +1 when the match starts counting, -1 when it stops
+        """
+        with including_deleted():
+            game = db.session.get(Game, match.game_id) if match.game_id is not None else None
+            players = db.session.query(MatchPlayer.user_id, MatchPlayer.placement).filter(
+                MatchPlayer.match_id == match.id, MatchPlayer.placement.isnot(None)
+            ).all()
+        week = week_start(game.game_date if game else match.created_at.date())
+
+        for user_id, placement in players:
+            add_to_row(PlayerWeeklyStats, {"user_id": user_id, "week_start": week}, {
+                "games": sign, "wins": sign * (placement == 1), "placement_sum": sign * placement
+            }, create=sign > 0, delete_empty='games')
+
+    @staticmethod
+    def recompute(user_ids: Iterable[int]) -> int:
+        """Rebuild the weekly rows of the given players from the source tables.
+
+        Args:
+            user_ids: Player ids to rebuild
+
+        Returns:
+            int: Number of rows written, not yet committed
+        """
+        user_ids = list(user_ids)
+        # Deleted games are excluded explicitly: backfills run with the global filter off
+        plays = db.session.query(
+            MatchPlayer.user_id, MatchPlayer.placement, Game.game_date, Match.created_at
+        ).join(Match, Match.id == MatchPlayer.match_id).outerjoin(Game, Game.id == Match.game_id).filter(
+            MatchPlayer.user_id.in_(user_ids), Match.status == 'approved',
+            MatchPlayer.placement.isnot(None), Game.deleted_at.is_(None)
+        )
+        weeks = defaultdict(lambda: [0, 0, 0])
+        for user_id, placement, game_date, created_at in plays:
+            totals = weeks[(user_id, week_start(game_date or created_at.date()))]
+            totals[0] += 1
+            totals[1] += placement == 1
+            totals[2] += placement
+
+        PlayerWeeklyStats.query.filter(PlayerWeeklyStats.user_id.in_(user_ids)).delete(synchronize_session='fetch')
+        db.session.add_all(
+            PlayerWeeklyStats(user_id=user_id, week_start=week, games=games, wins=wins, placement_sum=placement_sum)
+            for (user_id, week), (games, wins, placement_sum) in weeks.items()
+        )
+        return len(weeks)
+
+    @staticmethod
+    def get_series(user_id: int, series: str = 'cumulative_wins', points: int = 100,
+                   method: str = 'lttb', window: int = 8) -> Dict:
+        """A player's trend series, downsampled to at most ``points`` points.
+
+        Args:
+            user_id: ID of the player
+            series: 'cumulative_wins', 'win_rate' (over the trailing ``window``
+                weeks) or 'placement' (the week's average placement)
+            points: Maximum number of points returned
+            method: 'lttb' (keeps the shape) or 'bucket' (averages)
+            window: Weeks in the rolling win rate
+
+        Returns:
+            Dict: The parameters, the number of weeks played and the points
+
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        if series not in SERIES:
+            raise ValueError(f"series must be one of {', '.join(SERIES)}")
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}")
+        if points < (3 if method == 'lttb' else 1):
+            raise ValueError(f"points must be at least {3 if method == 'lttb' else 1} for {method}")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        rows = db.session.query(
+            PlayerWeeklyStats.week_start, PlayerWeeklyStats.games, PlayerWeeklyStats.wins,
+            PlayerWeeklyStats.placement_sum
+        ).filter(PlayerWeeklyStats.user_id == user_id).order_by(PlayerWeeklyStats.week_start).all()
+        values = PlayerTrendsService._values(rows, series, window)
+        sampled = METHODS[method]([(week.toordinal(), value) for week, value in values], points)
+        return {
+            "user_id": user_id,
+            "series": series,
+            "method": method,
+            "window": window if series == 'win_rate' else None,
+            "weeks": len(rows),
+            "points": [{"week": date.fromordinal(round(x)).isoformat(), "value": round(y, 4)} for x, y in sampled]
+        }
+
+    @staticmethod
+    def _values(rows, series: str, window: int) -> List:
+        if series == 'placement':
+            return [(row.week_start, row.placement_sum / row.games) for row in rows]
+        if series == 'cumulative_wins':
+            values, wins = [], 0
+            for row in rows:
+                wins += row.wins
+                values.append((row.week_start, wins))
+            return values
+        # Rolling win rate over the weeks in (week - window, week]
+        values, games, wins, first = [], 0, 0, 0
+        for row in rows:
+            games += row.games
+            wins += row.wins
+            while rows[first].week_start <= row.week_start - timedelta(weeks=window):
+                games -= rows[first].games
+                wins -= rows[first].wins
+                first += 1
+            values.append((row.week_start, wins / games))
+        return values
+
+
+# --- Signal receiver: a match counts while approved and its game is live ---
+
+@counted_results
+def _apply_match(match, sign):
+    PlayerTrendsService.apply_match(match, sign)
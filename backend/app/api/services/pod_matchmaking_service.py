@@ -0,0 +1,143 @@
+"""
+Service proposing balanced pod splits for a game's registered players.
+
+Skill is each player's smoothed average finishing score over approved
+matches (1 for a win, 0 for last place, shrunk toward 0.5 for players with
+few games). Repeat cost between two players is the recency-weighted number
+of their recent matches in which they shared a pod. Both are turned into
+NumPy arrays once and handed to ``pod_optimizer``.
+"""
+import time
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import func
+
+from ... import db
+from ...models import Deck, Game, GameRegistration, Match, MatchPlayer, User
+from ..utils.pod_optimizer import optimize_pods, pod_sizes
+
+# Pseudo-games at score 0.5 blended into every player's skill estimate
+SKILL_PRIOR_GAMES = 5
+# Weight of a shared pod in the k-th most recent match: RECENCY_DECAY ** k
+RECENCY_DECAY = 0.7
+
+
+class PodMatchmakingService:
+    """Service class for pod assignment suggestions."""
+
+    @staticmethod
+    def suggest(game: Game, min_size: int = 3, max_size: int = 5, recent_matches: int = 10,
+                skill_weight: float = 1.0, repeat_weight: float = 1.0,
+                time_budget_ms: float = 50, seed=None) -> Dict:
+        """Propose a split of the game's registered players into pods.
+
+        Args:
+            game: The game whose registrations should be split
+            min_size: Smallest allowed pod
+            max_size: Largest allowed pod
+            recent_matches: How many recent matches count toward repeat opponents
+            skill_weight: Weight of skill balance in the objective
+            repeat_weight: Weight of avoiding recent opponents in the objective
+            time_budget_ms: Time the optimizer may spend searching
+            seed: Optional seed for a reproducible suggestion
+
+        Returns:
+            Dict: The pods with their players plus the objective breakdown
+
+        Raises:
+            ValueError: If the registrations cannot be split within the size bounds
+        """
+        started = time.perf_counter()
+        registrations = db.session.query(
+            GameRegistration.user_id, User.username, GameRegistration.deck_id, Deck.name, Deck.commander
+        ).join(User, User.id == GameRegistration.user_id).join(
+            Deck, Deck.id == GameRegistration.deck_id
+        ).filter(GameRegistration.game_id == game.id).order_by(GameRegistration.user_id).all()
+        user_ids = [r.user_id for r in registrations]
+
+        sizes = pod_sizes(len(user_ids), min_size, max_size, target_size=4)
+        skills = PodMatchmakingService.skill_ratings(user_ids)
+        repeats = PodMatchmakingService.repeat_matrix(user_ids, recent_matches, exclude_game_id=game.id)
+        split = optimize_pods(skills, repeats, sizes, skill_weight=skill_weight, repeat_weight=repeat_weight,
+                              time_budget=time_budget_ms / 1000, seed=seed)
+
+        pods = []
+        for number, members in enumerate(split.pods, start=1):
+            pods.append({
+                "pod": number,
+                "avg_skill": round(float(skills[members].mean()), 3),
+                "repeat_pairs": round(float(repeats[np.ix_(members, members)].sum() / 2), 3),
+                "players": [{
+                    "user_id": registrations[i].user_id,
+                    "username": registrations[i].username,
+                    "deck_id": registrations[i].deck_id,
+                    "deck_name": registrations[i].name,
+                    "commander": registrations[i].commander,
+                    "skill": round(float(skills[i]), 3)
+                } for i in sorted(members, key=lambda i: -skills[i])]
+            })
+        return {
+            "game_id": game.id,
+            "player_count": len(user_ids),
+            "pod_sizes": [len(pod["players"]) for pod in pods],
+            "pods": pods,
+            "objective": {
+                "skill_imbalance": round(split.skill_cost, 5),
+                "repeat_opponents": round(split.repeat_cost, 5),
+                "total": round(split.cost, 5),
+                "iterations": split.iterations
+            },
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    @staticmethod
+    def skill_ratings(user_ids: List[int]) -> np.ndarray:
+        """Smoothed average finishing score (0 = always last, 1 = always first) per player."""
+        if not user_ids:
+            return np.zeros(0)
+        # Score of one result: (pod size - placement) / (pod size - 1)
+        score = (Match.player_count - MatchPlayer.placement) * 1.0 / func.nullif(Match.player_count - 1, 0)
+        rows = db.session.query(
+            MatchPlayer.user_id, func.count(MatchPlayer.id), func.sum(score)
+        ).join(Match, Match.id == MatchPlayer.match_id).filter(
+            Match.status == 'approved', MatchPlayer.placement.isnot(None), MatchPlayer.user_id.in_(user_ids)
+        ).group_by(MatchPlayer.user_id).all()
+        totals = {user_id: (games, float(total or 0)) for user_id, games, total in rows}
+
+        games = np.array([totals.get(u, (0, 0.0))[0] for u in user_ids], dtype=np.float64)
+        score_sum = np.array([totals.get(u, (0, 0.0))[1] for u in user_ids], dtype=np.float64)
+        return (score_sum + 0.5 * SKILL_PRIOR_GAMES) / (games + SKILL_PRIOR_GAMES)
+
+    @staticmethod
+    def repeat_matrix(user_ids: List[int], recent_matches: int = 10, exclude_game_id=None) -> np.ndarray:
+        """Recency-weighted count of shared pods between each pair of players.
+
+        Built as ``(P * w).T @ P`` from the (matches x players) incidence matrix
+        ``P`` of the most recent matches involving any of the players.
+        """
+        n = len(user_ids)
+        if n == 0 or recent_matches <= 0:
+            return np.zeros((n, n))
+        query = db.session.query(Match.id).join(MatchPlayer, MatchPlayer.match_id == Match.id).filter(
+            MatchPlayer.user_id.in_(user_ids)
+        )
+        if exclude_game_id is not None:
+            query = query.filter((Match.game_id.is_(None)) | (Match.game_id != exclude_game_id))
+        match_ids = [row.id for row in query.group_by(Match.id).order_by(
+            func.max(Match.created_at).desc(), Match.id.desc()
+        ).limit(recent_matches)]
+        if not match_ids:
+            return np.zeros((n, n))
+
+        index = {user_id: i for i, user_id in enumerate(user_ids)}
+        rank = {match_id: k for k, match_id in enumerate(match_ids)}
+        incidence = np.zeros((len(match_ids), n))
+        for match_id, user_id in db.session.query(MatchPlayer.match_id, MatchPlayer.user_id).filter(
+            MatchPlayer.match_id.in_(match_ids), MatchPlayer.user_id.in_(user_ids)
+        ):
+            incidence[rank[match_id], index[user_id]] = 1
+        weights = RECENCY_DECAY ** np.arange(len(match_ids))
+        repeats = (incidence * weights[:, None]).T @ incidence
+        np.fill_diagonal(repeats, 0)
+        return repeats
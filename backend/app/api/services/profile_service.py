@@ -1,12 +1,15 @@
 import os
+import uuid
 from typing import Dict, Tuple, Optional
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 from flask import current_app, url_for
 
 from ... import db
+from ...jobs import PRIORITY_HIGH, enqueue
 from ...models import User
 from ..schemas.profile_schemas import ProfileUpdate, ProfileResponse, AvatarUpdate
+from ..utils.dataloader import loader
 
 # Avatar configuration
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
@@ -28,7 +31,7 @@ class ProfileService:
         Raises:
             ValueError: If user not found
         """
-        user = User.query.get(user_id)
+        user = loader(User).load(user_id)
         if not user:
             raise ValueError("User not found")
 
@@ -61,7 +64,7 @@ class ProfileService:
         if error := data.validate():
             raise ValueError(error)
 
-        user = User.query.get(user_id)
+        user = loader(User).load(user_id)
         if not user:
             raise ValueError("User not found")
 
@@ -93,15 +96,19 @@ class ProfileService:
 
     @staticmethod
     def upload_avatar(user_id: int, file: FileStorage) -> Tuple[AvatarUpdate, int]:
-        """Handle avatar upload and update.
-        
+        """Accept an avatar upload; a ``store_avatar`` job puts it in place.
+
+        The request only writes the upload to a staging file next to its
+        destination. Replacing the current avatar, removing ones with other
+        extensions and updating the user's URL happen in the background.
+
         Args:
             user_id: ID of the user
             file: Uploaded file
-            
+
         Returns:
-            Tuple[AvatarUpdate, int]: Avatar update response and status code
-            
+            Tuple[AvatarUpdate, int]: The URL the avatar will have and status 202
+
         Raises:
             ValueError: If file invalid or upload fails
         """
@@ -111,41 +118,70 @@ class ProfileService:
         if not ProfileService._allowed_file(file.filename):
             raise ValueError("File type not allowed")
 
-        user = User.query.get(user_id)
+        user = loader(User).load(user_id)
         if not user:
             raise ValueError("User not found")
 
         try:
             # Create secure filename
             filename = secure_filename(f"user_{user_id}_avatar.{file.filename.rsplit('.', 1)[1].lower()}")
-            
-            # Get upload path
-            upload_folder = os.path.join(current_app.static_folder, UPLOAD_FOLDER_REL)
-            filepath = os.path.join(upload_folder, filename)
 
-            # Save file
-            file.save(filepath)
+            # Stage the upload in the avatar folder, so the job's move is a rename
+            upload_folder = os.path.join(current_app.static_folder, UPLOAD_FOLDER_REL)
+            staged = f".{filename}.{uuid.uuid4().hex}.part"
+            staged_path = os.path.join(upload_folder, staged)
+            file.save(staged_path)
 
-            # Update user's avatar URL
             url_path = os.path.join(UPLOAD_FOLDER_REL, filename)
             avatar_url = url_for('static', filename=url_path, _external=False)
-            
-            user.avatar_url = avatar_url
-            db.session.add(user)
+
+            enqueue('store_avatar', {'user_id': user.id, 'staged': staged, 'filename': filename,
+                                     'avatar_url': avatar_url}, priority=PRIORITY_HIGH)
             db.session.commit()
 
-            return AvatarUpdate.from_url(avatar_url), 200
+            return AvatarUpdate.from_url(avatar_url), 202
 
         except Exception as e:
             db.session.rollback()
-            # Clean up file if it was saved
-            if 'filepath' in locals() and os.path.exists(filepath):
+            # Clean up the staged file if it was saved
+            if 'staged_path' in locals() and os.path.exists(staged_path):
                 try:
-                    os.remove(filepath)
+                    os.remove(staged_path)
                 except OSError:
                     pass  # Already logged in routes
             raise ValueError(f"Avatar upload failed: {str(e)}")
 
+    @staticmethod
+    def store_avatar(user_id: int, staged: str, filename: str, avatar_url: str) -> None:
+        """Move a staged avatar into place and set the user's avatar URL.
+
+        Safe to repeat: once the staged file is gone the move is skipped.
+
+        Args:
+            user_id: ID of the user
+            staged: Name of the staging file in the avatar folder
+            filename: Final avatar filename
+            avatar_url: URL of the final file, built by the request
+        """
+        user = db.session.get(User, user_id)
+        upload_folder = os.path.join(current_app.static_folder, UPLOAD_FOLDER_REL)
+        staged_path = os.path.join(upload_folder, staged)
+        if user is None:
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
+            return
+
+        if os.path.exists(staged_path):
+            os.replace(staged_path, os.path.join(upload_folder, filename))
+        # A new extension leaves the previous avatar behind under another name
+        stem = filename.rsplit('.', 1)[0]
+        for extension in ALLOWED_EXTENSIONS:
+            other = f"{stem}.{extension}"
+            if other != filename and os.path.exists(os.path.join(upload_folder, other)):
+                os.remove(os.path.join(upload_folder, other))
+
+        user.avatar_url = avatar_url
+
     @staticmethod
     def _allowed_file(filename: str) -> bool:
         """Check if file extension is allowed.
@@ -0,0 +1,59 @@
+"""
+Wiring for aggregates computed over approved match results.
+
+A match's placements count toward statistics while the match is approved and
+its game (if any) is not soft-deleted. ``counted_results`` connects an
+``apply(match, sign)`` function to every lifecycle signal that changes that,
+calling it with ``sign=1`` when a match starts counting and ``sign=-1`` when
+it stops, inside the sender's transaction.
+"""
+from typing import Callable, Optional
+
+from ... import db
+from ...models import Game, Match
+from ...soft_delete import including_deleted
+from ... import signals
+
+ResultApplier = Callable[[Match, int], None]
+
+
+def game_is_live(match: Match) -> bool:
+    """Whether the match's game exists and is not soft-deleted (True for game-less matches)."""
+    if match.game_id is None:
+        return True
+    with including_deleted():
+        game = db.session.get(Game, match.game_id)
+    return game is not None and game.deleted_at is None
+
+
+def approved_match(game: Game) -> Optional[Match]:
+    """The approved match of a game, looked up regardless of soft deletion."""
+    with including_deleted():
+        return Match.query.filter_by(game_id=game.id, status='approved').first()
+
+
+def counted_results(apply: ResultApplier) -> ResultApplier:
+    """Decorator registering ``apply`` for matches entering or leaving the counted set."""
+
+    def on_match_approved(sender, match, **extra):
+        if game_is_live(match):
+            apply(match, 1)
+
+    def on_match_unapproved(sender, match, **extra):
+        if game_is_live(match):
+            apply(match, -1)
+
+    def on_game_deleted(sender, game, **extra):
+        if match := approved_match(game):
+            apply(match, -1)
+
+    def on_game_restored(sender, game, **extra):
+        if match := approved_match(game):
+            apply(match, 1)
+
+    # Strong references: the closures would otherwise be collected immediately
+    signals.match_approved.connect(on_match_approved, weak=False)
+    signals.match_unapproved.connect(on_match_unapproved, weak=False)
+    signals.game_deleted.connect(on_game_deleted, weak=False)
+    signals.game_restored.connect(on_game_restored, weak=False)
+    return apply
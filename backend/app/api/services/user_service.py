@@ -1,12 +1,13 @@
 from typing import List, Tuple, Dict, Optional
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 from ... import db
 from ...models import User, MatchPlayer, Deck
 from ..schemas.user_schemas import (
     UserRegistration, UserResponse, UserListResponse, UserProfileResponse
 )
+from ..utils.dataloader import loader
 
 class UserService:
     """Service class for user-related operations."""
@@ -101,7 +102,7 @@ class UserService:
         Raises:
             ValueError: If user not found
         """
-        user = User.query.get(user_id)
+        user = loader(User).load(user_id)
         if not user:
             raise ValueError("User not found")
 
@@ -114,7 +115,33 @@ class UserService:
         except Exception as e:
             win_count = 0
 
-        response = UserProfileResponse(
+        return UserService._profile_response(user, win_count), 200
+
+    @staticmethod
+    def get_user_profiles(user_ids: List[int]) -> List[UserProfileResponse]:
+        """Get public profiles for several users.
+
+        Users are fetched with one IN query and win counts with one grouped
+        query, instead of two queries per user.
+
+        Args:
+            user_ids: IDs of the users
+
+        Returns:
+            List[UserProfileResponse]: Profiles in the order asked; unknown ids are skipped
+        """
+        users = [user for user in loader(User).load_many(user_ids) if user is not None]
+        if not users:
+            return []
+        wins = dict(db.session.query(MatchPlayer.user_id, func.count(MatchPlayer.id)).filter(
+            MatchPlayer.user_id.in_([user.id for user in users]),
+            MatchPlayer.placement == 1
+        ).group_by(MatchPlayer.user_id).all())
+        return [UserService._profile_response(user, wins.get(user.id, 0)) for user in users]
+
+    @staticmethod
+    def _profile_response(user: User, win_count: int) -> UserProfileResponse:
+        return UserProfileResponse(
             id=user.id,
             username=user.username,
             avatar_url=user.avatar_url,
@@ -122,7 +149,6 @@ class UserService:
             retirement_plane=user.retirement_plane,
             stats={"total_wins": win_count}
         )
-        return response, 200
 
     @staticmethod
     def get_user_decks(user_id: int) -> List[Dict]:
@@ -137,7 +163,7 @@ class UserService:
         Raises:
             ValueError: If user not found
         """
-        user = User.query.get(user_id)
+        user = loader(User).load(user_id)
         if not user:
             raise ValueError("User not found")
 
@@ -149,4 +175,18 @@ class UserService:
             "commander": deck.commander,
             "colors": deck.colors,
             "last_updated": deck.last_updated.isoformat()
-        } for deck in decks]
\ No newline at end of file
+        } for deck in decks]
+
+    @staticmethod
+    def clear_expired_temp_passwords() -> int:
+        """Clear temporary passwords past their expiry.
+
+        Returns:
+            int: Number of users updated, not yet committed
+        """
+        return db.session.execute(
+            update(User).where(
+                User.temp_password_expires_at.isnot(None), User.temp_password_expires_at < datetime.utcnow()
+            ).values(temp_password_hash=None, temp_password_expires_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
@@ -0,0 +1,136 @@
+"""
+Atomic counter updates for the aggregate tables kept by signal receivers.
+
+Approvals of different matches run in concurrent transactions and adjust the
+same aggregate rows, so a Python read-modify-write (``row.games += 1`` on a
+loaded row) loses updates under READ COMMITTED, and two first inserts of the
+same key collide. ``add_to_row`` makes each change a single statement that
+adds to the stored values:
+
+* counting up, ``INSERT ... ON CONFLICT (key) DO UPDATE SET games = games + :d``,
+  which inserts the row or, if a concurrent transaction got there first,
+  waits for it and adds to its values;
+* counting down, a plain ``UPDATE`` - a missing row has nothing to remove.
+
+Derived columns (win rates, averages, date bounds) are set in the same
+statement from the new counts. Both SQLite and Postgres evaluate SET
+expressions against the row as it was before the statement, so the
+expressions see consistent values however many writers there are.
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, literal, null, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ... import db
+
+Derived = Callable[[Callable, Callable], Dict]
+
+_INSERTS = {'postgresql': postgresql_insert, 'sqlite': sqlite_insert}
+ROWS_PER_STATEMENT = 100  # Keeps multi-row statements under SQLite's bound-parameter limit
+
+
+def earliest(stored, value):
+    """SQL for the earlier of a stored value (possibly NULL) and ``value``."""
+    return case((or_(stored.is_(None), stored > value), value), else_=stored)
+
+
+def latest(stored, value):
+    """SQL for the later of a stored value (possibly NULL) and ``value``."""
+    return case((or_(stored.is_(None), stored < value), value), else_=stored)
+
+
+def add_to_row(model, key: Dict, deltas: Dict, create: bool = True, derived: Optional[Derived] = None,
+               inserted: Optional[Dict] = None, delete_empty: Optional[str] = None) -> None:
+    """Add ``deltas`` to one aggregate row in a single statement.
+
+    Args:
+        model: Model of the aggregate table
+        key: Primary key column -> value of the row
+        deltas: Counter column -> amount added to it
+        create: Insert the row with ``deltas`` as its counts when it is missing;
+            pass False when counting down
+        derived: Function of ``(new, old)`` returning further columns to set:
+            ``new(name)`` is a counter's value after the change, ``old(name)``
+            a column's stored value (NULL for a row being inserted)
+        inserted: Values written only when the row is inserted
+        delete_empty: Counter column; when counting down, the row is deleted
+            once it reaches zero
+
+    Raises:
+        NotImplementedError: If the database has no ``ON CONFLICT`` support here
+    """
+    table = model.__table__
+    touched = {'updated_at': datetime.utcnow()} if 'updated_at' in table.c else {}
+
+    def _new(name):
+        return table.c[name] + deltas[name]
+
+    def _old(name):
+        return table.c[name]
+
+    changes = {name: _new(name) for name in deltas}
+    if derived:
+        changes.update(derived(_new, _old))
+
+    if not create:
+        where = and_(*(table.c[name] == value for name, value in key.items()))
+        db.session.execute(update(table).where(where).values(**changes, **touched))
+        if delete_empty:
+            db.session.execute(delete(table).where(where, table.c[delete_empty] <= 0))
+        return
+
+    values = {**key, **(inserted or {}), **deltas, **touched}
+    if derived:
+        values.update(derived(lambda name: literal(deltas[name]), lambda name: null()))
+    statement = _insert(model)(table).values(**values)
+    db.session.execute(statement.on_conflict_do_update(index_elements=list(key), set_={**changes, **touched}))
+
+
+def add_to_rows(model, rows: List[Dict], deltas: Dict, create: bool = True) -> None:
+    """Add the same ``deltas`` to many aggregate rows, a statement per ROWS_PER_STATEMENT rows.
+
+    Args:
+        model: Model of the aggregate table
+        rows: Per row, its primary key values plus any values written only
+            when it is inserted
+        deltas: Counter column -> amount added to every row
+        create: Insert missing rows with ``deltas`` as their counts; pass
+            False when counting down
+    """
+    table = model.__table__
+    key_columns = [column.name for column in table.primary_key]
+    touched = {'updated_at': datetime.utcnow()} if 'updated_at' in table.c else {}
+    for start in range(0, len(rows), ROWS_PER_STATEMENT):
+        chunk = rows[start:start + ROWS_PER_STATEMENT]
+        if not create:
+            keys = [tuple(row[name] for name in key_columns) for row in chunk]
+            db.session.execute(update(table).where(
+                tuple_(*(table.c[name] for name in key_columns)).in_(keys)
+            ).values(**{name: table.c[name] + delta for name, delta in deltas.items()}, **touched))
+            continue
+        statement = _insert(model)(table).values([{**row, **deltas, **touched} for row in chunk])
+        db.session.execute(statement.on_conflict_do_update(index_elements=key_columns, set_={
+            **{name: table.c[name] + statement.excluded[name] for name in deltas}, **touched
+        }))
+
+
+def insert_missing(model, values: Dict) -> None:
+    """Insert a row unless one with the same primary key exists (``ON CONFLICT DO NOTHING``).
+
+    For rows that are then locked and changed in Python, so concurrent first
+    writers don't collide on the insert.
+    """
+    statement = _insert(model)(model.__table__).values(**values)
+    db.session.execute(statement.on_conflict_do_nothing(
+        index_elements=[column.name for column in model.__table__.primary_key]
+    ))
+
+
+def _insert(model):
+    dialect = db.session.get_bind(model.__mapper__).dialect.name
+    if dialect not in _INSERTS:
+        raise NotImplementedError(f"Atomic counter upserts are not supported on {dialect}")
+    return _INSERTS[dialect]
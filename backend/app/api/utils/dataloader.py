@@ -0,0 +1,126 @@
+"""
+Per-request batching and caching of primary-key loads (DataLoader style).
+
+``loader(User).load(user_id)`` returns the row like ``User.query.get`` but:
+
+* rows already in the session (e.g. the JWT user loaded by the user lookup
+  loader) are returned without a query;
+* ids queued with ``prime`` - or passed together to ``load_many`` - are
+  fetched in one ``WHERE id IN (...)`` query the first time any of them is
+  needed;
+* results, including misses, are cached for the rest of the request, so
+  services calling each other don't repeat lookups. Batch sub-requests
+  (routes/batch.py) share the cache.
+
+Loaders live on ``g`` and are dropped whenever the session commits or rolls
+back, so a cached row never outlives the transaction that read it. Ids are
+normalized to ``int``, which lets the string identity from a JWT hit rows
+loaded by integer id.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import undefer_group
+from sqlalchemy.orm.util import identity_key
+
+from ... import db
+
+MAX_BATCH = 500  # Ids per IN (...) query
+
+
+class DataLoader:
+    """Batches and caches primary-key loads of one model."""
+
+    def __init__(self, model, undefer: Tuple[str, ...] = ()):
+        self.model = model
+        self.undefer = undefer
+        self._cache: Dict[int, object] = {}
+        self._pending = set()
+
+    def prime(self, keys: Iterable) -> None:
+        """Queue ids for the next fetch."""
+        for key in keys:
+            if key is not None and int(key) not in self._cache:
+                self._pending.add(int(key))
+
+    def load(self, key) -> Optional[object]:
+        """The row with this id, or None."""
+        if key is None:
+            return None
+        return self.load_many([key])[0]
+
+    def load_many(self, keys: Iterable) -> List[Optional[object]]:
+        """Rows for the ids, in order; None where a row doesn't exist."""
+        keys = [int(key) if key is not None else None for key in keys]
+        self.prime(keys)
+        if self._pending:
+            self._fetch(sorted(self._pending))
+        return [self._cache.get(key) if key is not None else None for key in keys]
+
+    def _query(self):
+        query = self.model.query
+        if self.undefer:
+            query = query.options(*[undefer_group(group) for group in self.undefer])
+        return query
+
+    def _fetch(self, keys: List[int]) -> None:
+        self._pending.clear()
+        if len(keys) == 1:
+            # Query.get checks the identity map itself
+            self._cache[keys[0]] = self._query().get(keys[0])
+            return
+        missing = []
+        for key in keys:
+            found = db.session.identity_map.get(identity_key(self.model, key))
+            if isinstance(found, self.model):
+                self._cache[key] = found
+            else:
+                missing.append(key)
+        for start in range(0, len(missing), MAX_BATCH):
+            chunk = missing[start:start + MAX_BATCH]
+            rows = {row.id: row for row in self._query().filter(self.model.id.in_(chunk)).all()}
+            for key in chunk:
+                self._cache[key] = rows.get(key)
+
+
+def loader(model, undefer: Tuple[str, ...] = ()) -> DataLoader:
+    """The current request's loader for a model (a fresh one outside an app context)."""
+    if not has_app_context():
+        return DataLoader(model, undefer)
+    loaders = g.setdefault('_dataloaders', {})
+    key = (model, undefer)
+    if key not in loaders:
+        loaders[key] = DataLoader(model, undefer)
+    return loaders[key]
+
+
+def parse_ids(raw: Optional[str], limit: int) -> List[int]:
+    """Parse ``?ids=1,2,3`` into unique ids in request order.
+
+    Raises:
+        ValueError: If the list is empty, malformed or longer than ``limit``
+    """
+    ids = []
+    for part in (raw or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f"Invalid id: {part}")
+        if int(part) not in ids:
+            ids.append(int(part))
+    if not ids:
+        raise ValueError("'ids' must list at least one id")
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} ids per request")
+    return ids
+
+
+def _clear(session, *args):
+    if has_app_context():
+        g.pop('_dataloaders', None)
+
+
+event.listen(db.session, 'after_commit', _clear)
+event.listen(db.session, 'after_soft_rollback', _clear)
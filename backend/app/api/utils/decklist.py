@@ -0,0 +1,53 @@
+"""
+Parsing of free-form decklist text into card names.
+
+Accepts the common export formats: ``1 Sol Ring``, ``1x Sol Ring``, bare
+``Sol Ring``, trailing set/collector info (``Sol Ring (C21) 263``) and foil
+markers (``*F*``). ``#`` and ``//`` comments are ignored, as are cards listed
+under sideboard/maybeboard headers, which are not part of the played deck.
+"""
+import re
+from typing import Dict, Optional
+
+_COUNT = re.compile(r'^(\d+)\s*x?\s+(.+)$', re.IGNORECASE)
+_SET_SUFFIX = re.compile(r'\s+\([A-Za-z0-9]{2,6}\)(\s+[\w\-★]+)?$')
+_MARKER_SUFFIX = re.compile(r'(\s+\*[A-Za-z]+\*)+$')
+_UNPLAYED_SECTIONS = {'sideboard', 'maybeboard', 'considering', 'maybe'}
+_SECTIONS = _UNPLAYED_SECTIONS | {'commander', 'commanders', 'deck', 'mainboard', 'main', 'companion'}
+
+
+def card_key(name: str) -> str:
+    """Case- and whitespace-insensitive identity of a card name."""
+    return ' '.join(name.split()).casefold()
+
+
+def parse_cards(decklist_text: Optional[str]) -> Dict[str, str]:
+    """Map card key -> display name for every card in the played part of a list.
+
+    Args:
+        decklist_text: Raw decklist text, one card per line
+
+    Returns:
+        Dict[str, str]: Unique cards, keyed by ``card_key``
+    """
+    cards: Dict[str, str] = {}
+    played = True
+    for raw_line in (decklist_text or '').splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith(('#', '//')):
+            continue
+        header = line.rstrip(':').strip().casefold()
+        if line.endswith(':') or header in _SECTIONS:
+            played = header not in _UNPLAYED_SECTIONS
+            continue
+        if not played:
+            continue
+
+        if match := _COUNT.match(line):
+            line = match.group(2)
+        line = _MARKER_SUFFIX.sub('', line)
+        line = _SET_SUFFIX.sub('', line)
+        name = ' '.join(line.split())
+        if name:
+            cards.setdefault(card_key(name), name)
+    return cards
@@ -0,0 +1,62 @@
+"""
+Downsampling of (x, y) series for charts.
+
+``lttb`` (Largest-Triangle-Three-Buckets) keeps the first and last points
+and, from each bucket in between, the point forming the largest triangle with
+the point kept before it and the average of the next bucket - it preserves
+the visual shape, including peaks. ``bucket_mean`` averages x and y within
+equal-count buckets, which smooths instead. Both return at most ``threshold``
+points and the input unchanged when it is already that short.
+"""
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """Downsample to ``threshold`` points with LTTB.
+
+    Raises:
+        ValueError: If the threshold is below 3 (the first, last and one more point)
+    """
+    if threshold >= len(points):
+        return list(points)
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3")
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    kept = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, len(points))
+        next_bucket = points[next_start:next_end] or points[-1:]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+        ax, ay = points[kept]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (points[j][1] - ay) - (ax - points[j][0]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        kept = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def bucket_mean(points: Sequence[Point], threshold: int) -> List[Point]:
+    """Downsample to ``threshold`` points by averaging equal-count buckets.
+
+    Raises:
+        ValueError: If the threshold is below 1
+    """
+    if threshold >= len(points):
+        return list(points)
+    if threshold < 1:
+        raise ValueError("Bucketing needs a threshold of at least 1")
+    size = len(points) / threshold
+    sampled = []
+    for i in range(threshold):
+        bucket = points[int(i * size):int((i + 1) * size)]
+        sampled.append((sum(p[0] for p in bucket) / len(bucket), sum(p[1] for p in bucket) / len(bucket)))
+    return sampled
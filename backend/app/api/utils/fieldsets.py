@@ -0,0 +1,97 @@
+"""
+Sparse fieldsets for list endpoints: ``?fields=`` and ``?include=``.
+
+An endpoint describes each top-level field of its items as a ``Field``: the
+column to select, the joins that column needs and how to format it. Clients
+narrow the response with ``?fields=id,game_date`` (default: every field) and
+ask for expansions that are not part of the default shape with
+``?include=players``. The endpoint then selects only the chosen columns and
+applies only the joins they need, so a page that wants ids and dates gets a
+single-table query. The item's identifying field is always returned.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+@dataclass(frozen=True)
+class Field:
+    column: Any  # Column expression selected for the field
+    joins: Tuple[str, ...] = ()  # Names of joins the column needs, in order
+    format: Optional[Callable[[Any], Any]] = None  # Applied to non-None values
+
+
+def isoformat(value):
+    return value.isoformat()
+
+
+def enum_value(value):
+    return value.value
+
+
+def _split(raw: Optional[str]) -> List[str]:
+    return [part.strip() for part in (raw or '').split(',') if part.strip()]
+
+
+def parse_fieldset(args, spec: Dict[str, Field], key: str,
+                   includes: Iterable[str] = ()) -> Tuple[List[str], Set[str]]:
+    """Read ``fields`` and ``include`` from query args.
+
+    Args:
+        args: The request's query args
+        spec: Field name -> Field, in response order
+        key: Field always returned (the item's id)
+        includes: Expansions the endpoint supports
+
+    Returns:
+        Tuple[List[str], Set[str]]: Selected field names in spec order, requested expansions
+
+    Raises:
+        ValueError: If a field or expansion is unknown
+    """
+    requested = _split(args.get('fields'))
+    unknown = [name for name in requested if name not in spec]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Valid: {', '.join(spec)}")
+    expansions = set(_split(args.get('include')))
+    unknown = sorted(expansions - set(includes))
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(unknown)}. Valid: {', '.join(includes)}")
+    if not requested:
+        return list(spec), expansions
+    chosen = set(requested) | {key}
+    return [name for name in spec if name in chosen], expansions
+
+
+def select_fields(session, spec: Dict[str, Field], fields: Sequence[str], base,
+                  joins: Dict[str, Callable]):
+    """Build a query selecting the chosen fields, with only the joins they need.
+
+    Args:
+        session: The session to query with
+        spec: Field name -> Field
+        fields: Selected field names
+        base: Entity the query selects from
+        joins: Join name -> function applying that join to a query
+
+    Returns:
+        Query: Rows with one labelled column per field
+    """
+    query = session.query(*[spec[name].column.label(name) for name in fields]).select_from(base)
+    applied = []
+    for name in fields:
+        for join in spec[name].joins:
+            if join not in applied:
+                applied.append(join)
+    for join in applied:
+        query = joins[join](query)
+    return query
+
+
+def serialize(row, spec: Dict[str, Field], fields: Sequence[str]) -> Dict:
+    """One response item from a row of ``select_fields``."""
+    item = {}
+    for name in fields:
+        value = getattr(row, name)
+        formatter = spec[name].format
+        item[name] = formatter(value) if formatter is not None and value is not None else value
+    return item
@@ -0,0 +1,127 @@
+"""
+Merging t-digest: a compact, mergeable sketch for estimating quantiles.
+
+Values are summarized as a sorted list of (mean, weight) centroids whose size
+is bounded by the ``k1`` scale function, which keeps centroids small near the
+tails (so p90/p99 stay accurate) and lets them grow around the median. Two
+digests combine by merging their centroid lists, so sketches kept per
+dimension can be rolled up without revisiting the raw values.
+
+Reference: Dunning & Ertl, "Computing Extremely Accurate Quantiles Using
+t-Digests" (2019).
+"""
+import math
+from typing import Dict, Iterable, List, Optional
+
+
+class TDigest:
+    """Quantile sketch; ``compression`` bounds the number of centroids (~2x)."""
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self._centroids: List[List[float]] = []  # [mean, weight], sorted by mean
+        self._buffer: List[List[float]] = []
+        self.count = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float, weight: float = 1) -> None:
+        """Add a value (optionally weighted)."""
+        self._buffer.append([float(value), float(weight)])
+        self.count += weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._buffer) > 5 * self.compression:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Add every value of an iterable."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Fold another digest into this one and return self."""
+        other._compress()
+        if not other._centroids:
+            return self
+        self._buffer.extend([mean, weight] for mean, weight in other._centroids)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the value at quantile ``q`` (0..1); None for an empty digest."""
+        self._compress()
+        centroids = self._centroids
+        if not centroids:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        if len(centroids) == 1:
+            return centroids[0][0]
+
+        target = q * self.count
+        # Each centroid's mass is centered on its mean; interpolate between the
+        # two centers around the target, using min/max for the outer halves.
+        cumulative = 0.0
+        previous_center, previous_mean = 0.0, self.min
+        for mean, weight in centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                fraction = (target - previous_center) / span if span else 0
+                return previous_mean + fraction * (mean - previous_mean)
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+        span = self.count - previous_center
+        fraction = (target - previous_center) / span if span else 0
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, e.g. for a JSON column."""
+        self._compress()
+        return {"compression": self.compression, "count": self.count, "min": self.min, "max": self.max,
+                "centroids": [[round(mean, 6), weight] for mean, weight in self._centroids]}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'TDigest':
+        """Rebuild a digest from ``to_dict`` output (empty for None)."""
+        digest = cls(compression=(data or {}).get('compression', 100))
+        if data:
+            digest._centroids = [list(c) for c in data.get('centroids', [])]
+            digest.count = data.get('count', 0.0)
+            digest.min, digest.max = data.get('min'), data.get('max')
+        return digest
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        # k(1) = compression / 4; past it the sine would fold back below q = 1
+        k = min(k, self.compression / 4)
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(self._centroids + self._buffer, key=lambda c: c[0])
+        self._buffer = []
+        total = sum(weight for _, weight in items)
+
+        merged = [list(items[0])]
+        weight_before = 0.0
+        q_limit = self._k_inverse(self._k(0.0) + 1)
+        for mean, weight in items[1:]:
+            current = merged[-1]
+            if (weight_before + current[1] + weight) / total <= q_limit:
+                current[0] += (mean - current[0]) * weight / (current[1] + weight)
+                current[1] += weight
+            else:
+                weight_before += current[1]
+                q_limit = self._k_inverse(self._k(weight_before / total) + 1)
+                merged.append([mean, weight])
+        self._centroids = merged
@@ -0,0 +1,10 @@
+# Importing this module registers every API view on the blueprint (see load_routes)
+from . import bp
+from . import auth, admin  # noqa: F401
+from .routes import games, decks, users, profile, stats, batch  # noqa: F401
+from .utils import error_handlers # Import the error handlers module
+
+# Register common error handlers for this blueprint
+error_handlers.register_error_handlers(bp)
+
+# Note: Routes are registered via @bp decorators within each module
@@ -0,0 +1,186 @@
+"""
+Negotiated compression of ``/api`` responses.
+
+JSON bodies of at least ``COMPRESS_MIN_SIZE`` bytes are compressed with the
+best encoding the client accepts (``Accept-Encoding`` q-values first, then
+the server preference in ``COMPRESS_ALGORITHMS``): zstd when ``zstandard``
+is installed, brotli when ``brotli`` is installed, and gzip always. Levels
+come from ``COMPRESS_LEVELS``.
+
+List endpoints return the same body to many clients between writes, so
+compressed bodies are kept in a small LRU cache keyed by a digest of the
+uncompressed body, the encoding and the level. Hashing the body is much
+cheaper than compressing it, and an identical payload is compressed once
+per encoding instead of on every hit.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Optional dependency; brotli is simply not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency; zstd is simply not offered
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = frozenset({'application/json', 'text/plain', 'text/csv'})
+
+
+def _gzip(data, level):
+    # mtime=0 keeps the output deterministic for identical bodies
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(data, level):
+    return brotli.compress(data, quality=level)
+
+
+def _zstd(data, level):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+ENCODERS = {'gzip': _gzip}
+if brotli is not None:
+    ENCODERS['br'] = _brotli
+if zstandard is not None:
+    ENCODERS['zstd'] = _zstd
+
+
+def parse_accept_encoding(header):
+    """Map each encoding in an ``Accept-Encoding`` header to its q-value."""
+    accepted = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def choose_encoding(header, preference):
+    """Pick the encoding to use for a request, or None to send the body as is.
+
+    Args:
+        header: The request's ``Accept-Encoding`` value
+        preference: Available encodings, most preferred first
+
+    Returns:
+        Optional[str]: The accepted encoding with the highest q (ties go to
+        ``preference`` order), or None
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for name in preference:
+        q = accepted.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies bounded by their total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class ResponseCompressor:
+    """Per-app compression settings and the compressed-body cache."""
+
+    def __init__(self, app):
+        self.min_size = int(app.config.get('COMPRESS_MIN_SIZE', 1024))
+        self.levels = dict(app.config.get('COMPRESS_LEVELS') or {})
+        self.preference = [name for name in app.config.get('COMPRESS_ALGORITHMS', ('gzip',)) if name in ENCODERS]
+        self.cache = CompressedBodyCache(int(app.config.get('COMPRESS_CACHE_BYTES', 0)))
+
+    def compress(self, data, encoding):
+        """Compressed ``data``, from the cache when this exact body was seen before."""
+        level = self.levels.get(encoding)
+        key = (encoding, level, hashlib.sha256(data).digest())
+        body = self.cache.get(key) if self.cache.max_bytes else None
+        if body is None:
+            body = ENCODERS[encoding](data, *(() if level is None else (level,)))
+            if self.cache.max_bytes:
+                self.cache.put(key, body)
+        return body
+
+    def process(self, response):
+        if (
+            request.blueprint != 'api'
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or not 200 <= response.status_code < 300
+        ):
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'), self.preference)
+        if encoding is None:
+            return response
+        body = self.compress(data, encoding)
+        if len(body) >= len(data):
+            return response
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def init_compression(app):
+    """Compress eligible ``/api`` responses when ``COMPRESS_RESPONSES`` is on.
+
+    Registered before the other response hooks so it runs after them
+    (Flask calls ``after_request`` functions in reverse order).
+    """
+    if not app.config.get('COMPRESS_RESPONSES'):
+        return
+    compressor = app.extensions['compression'] = ResponseCompressor(app)
+    app.after_request(compressor.process)
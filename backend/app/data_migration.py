@@ -0,0 +1,378 @@
+"""
+Batched, resumable runner for data migrations and maintenance scripts.
+
+A data migration walks one table in primary-key (keyset) order, hands each
+batch of rows to ``process_batch`` and commits after every batch. The last
+committed id is written to a checkpoint file so an interrupted run resumes
+where it stopped instead of starting over. Large tables can be split into
+``id % partitions`` slices and processed by parallel worker processes.
+
+Derived tables that are recomputed whole (``rebuild()`` service methods) run
+through ``run_rebuild_cli`` instead: one transaction, the same logging, and
+only the flags a rebuild uses.
+
+Usage from a script::
+
+    class MyMigration(DataMigration):
+        name = 'my_migration'
+        model = Deck
+
+        def process_batch(self, session, rows):
+            ...
+            return changed_count
+
+    if __name__ == '__main__':
+        run_cli(MyMigration)
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(
+    os.path.abspath(os.path.dirname(os.path.dirname(__file__))), '.migration_checkpoints'
+)
+
+
+class DataMigration:
+    """Base class for a keyset-batched data migration.
+
+    Subclasses set ``name`` and ``model`` and implement ``process_batch``.
+    ``statement`` may be overridden to narrow the rows visited; it must keep
+    selecting whole ``model`` entities so the runner can page on the primary key.
+    Read-only reports set ``resumable = False`` so every run starts from the top.
+    Migrations whose options select different rows override ``checkpoint_key``
+    so each selection keeps its own checkpoint.
+    """
+    name: str = None
+    model = None
+    batch_size: int = 500
+    resumable: bool = True
+
+    def __init__(self, **options):
+        self.options = options
+
+    @property
+    def checkpoint_key(self) -> str:
+        """Names this run's checkpoint files; runs with the same key resume each other."""
+        return self.name
+
+    def statement(self):
+        """Base SELECT for the rows to visit (without ordering or paging)."""
+        return select(self.model)
+
+    def process_batch(self, session: Session, rows: List) -> int:
+        """Apply the migration to one batch and return the number of rows changed."""
+        raise NotImplementedError
+
+    def finish(self, session: Session, stats: 'MigrationStats') -> None:
+        """Hook called once after the last batch (e.g. to print a report)."""
+
+
+@dataclass
+class MigrationStats:
+    """Progress counters for one partition of a run."""
+    migration: str
+    partition: int = 0
+    partitions: int = 1
+    last_id: Optional[int] = None
+    batches: int = 0
+    processed: int = 0
+    changed: int = 0
+    elapsed: float = 0.0
+    completed: bool = False
+    dry_run: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'migration': self.migration,
+            'partition': self.partition,
+            'partitions': self.partitions,
+            'last_id': self.last_id,
+            'batches': self.batches,
+            'processed': self.processed,
+            'changed': self.changed,
+            'elapsed': self.elapsed,
+            'completed': self.completed,
+        }
+
+
+@dataclass
+class Checkpoint:
+    """JSON checkpoint file storing the progress of one partition."""
+    path: str
+
+    def load(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as fh:
+            return json.load(fh)
+
+    def save(self, stats: MigrationStats) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as fh:
+            json.dump(stats.to_dict(), fh)
+        os.replace(tmp_path, self.path)  # Atomic, so a crash never leaves a torn file
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class MigrationRunner:
+    """Runs one partition of a DataMigration in committed keyset batches."""
+
+    def __init__(self, migration: DataMigration, session_factory: Callable[[], Session],
+                 checkpoint_dir: Optional[str] = DEFAULT_CHECKPOINT_DIR, dry_run: bool = False,
+                 partition: int = 0, partitions: int = 1, batch_size: Optional[int] = None):
+        if not migration.name or migration.model is None:
+            raise ValueError("DataMigration subclasses must define 'name' and 'model'")
+        if partitions < 1 or not 0 <= partition < partitions:
+            raise ValueError(f"Invalid partition {partition} of {partitions}")
+        self.migration = migration
+        self.session_factory = session_factory
+        self.dry_run = dry_run
+        self.partition = partition
+        self.partitions = partitions
+        self.batch_size = batch_size or migration.batch_size
+        self.checkpoint = None
+        if checkpoint_dir and migration.resumable:
+            filename = f"{migration.checkpoint_key}.p{partition}of{partitions}.json"
+            self.checkpoint = Checkpoint(os.path.join(checkpoint_dir, filename))
+
+    def _next_batch(self, session: Session, last_id: Optional[int]) -> List:
+        pk = self.migration.model.id
+        stmt = self.migration.statement()
+        if self.partitions > 1:
+            stmt = stmt.where(pk % self.partitions == self.partition)
+        if last_id is not None:
+            stmt = stmt.where(pk > last_id)
+        stmt = stmt.order_by(pk).limit(self.batch_size)
+        return session.execute(stmt).scalars().all()
+
+    def run(self, reset: bool = False) -> MigrationStats:
+        """Process every remaining batch, committing and checkpointing after each."""
+        stats = MigrationStats(migration=self.migration.name, partition=self.partition,
+                               partitions=self.partitions, dry_run=self.dry_run)
+        if self.checkpoint and reset:
+            self.checkpoint.clear()
+        saved = self.checkpoint.load() if self.checkpoint and not self.dry_run else None
+        if saved:
+            if saved.get('completed'):
+                logger.info("%s [%d/%d] already completed; use reset to run again.",
+                            self.migration.name, self.partition, self.partitions)
+                stats.completed = True
+                return stats
+            stats.last_id = saved.get('last_id')
+            stats.processed = saved.get('processed', 0)
+            stats.changed = saved.get('changed', 0)
+            logger.info("%s [%d/%d] resuming after id %s", self.migration.name,
+                        self.partition, self.partitions, stats.last_id)
+
+        session = self.session_factory()
+        started = time.perf_counter()
+        try:
+            while True:
+                rows = self._next_batch(session, stats.last_id)
+                if not rows:
+                    break
+                batch_last_id = rows[-1].id
+                changed = self.migration.process_batch(session, rows)
+                if self.dry_run:
+                    session.rollback()
+                else:
+                    session.commit()
+                stats.batches += 1
+                stats.processed += len(rows)
+                stats.changed += changed or 0
+                stats.last_id = batch_last_id
+                stats.elapsed = time.perf_counter() - started
+                session.expunge_all()  # Keep memory flat across batches
+                if self.checkpoint and not self.dry_run:
+                    self.checkpoint.save(stats)
+                logger.info("%s [%d/%d] batch %d: %d rows (%d changed) up to id %s, %.1f rows/s",
+                            self.migration.name, self.partition, self.partitions, stats.batches,
+                            len(rows), changed or 0, stats.last_id, stats.rows_per_second)
+
+            self.migration.finish(session, stats)
+            if self.dry_run:
+                session.rollback()
+            else:
+                session.commit()
+            stats.completed = True
+            stats.elapsed = time.perf_counter() - started
+            if self.checkpoint and not self.dry_run:
+                self.checkpoint.save(stats)
+        except Exception:
+            session.rollback()
+            logger.exception("%s [%d/%d] failed after id %s; rerun to resume.",
+                             self.migration.name, self.partition, self.partitions, stats.last_id)
+            raise
+        finally:
+            session.close()
+
+        logger.info("%s [%d/%d] %s: %d rows, %d changed in %.2fs (%.1f rows/s)",
+                    self.migration.name, self.partition, self.partitions,
+                    'dry run finished' if self.dry_run else 'finished',
+                    stats.processed, stats.changed, stats.elapsed, stats.rows_per_second)
+        return stats
+
+
+def _run_partition(migration_cls, options: dict, partition: int, partitions: int,
+                   dry_run: bool, batch_size: Optional[int], checkpoint_dir: Optional[str],
+                   reset: bool) -> MigrationStats:
+    """Entry point for one worker; builds its own app and engine.
+
+    Migrations run on ``db.session`` (so service-layer helpers can be reused)
+    with the soft-delete filter disabled, as they must see every row.
+    """
+    from . import create_app, db
+    from .soft_delete import including_deleted
+
+    flask_app = create_app(mode='cli')
+    with flask_app.app_context(), including_deleted():
+        runner = MigrationRunner(
+            migration_cls(**options),
+            lambda: db.session,
+            checkpoint_dir=checkpoint_dir,
+            dry_run=dry_run,
+            partition=partition,
+            partitions=partitions,
+            batch_size=batch_size,
+        )
+        return runner.run(reset=reset)
+
+
+def run_partitioned(migration_cls, options: Optional[dict] = None, workers: int = 1,
+                    dry_run: bool = False, batch_size: Optional[int] = None,
+                    checkpoint_dir: Optional[str] = DEFAULT_CHECKPOINT_DIR,
+                    reset: bool = False) -> List[MigrationStats]:
+    """Run a migration split into ``workers`` id partitions, one process each."""
+    options = options or {}
+    run_args = (dry_run, batch_size, checkpoint_dir, reset)
+    started = time.perf_counter()
+    if workers <= 1:
+        results = [_run_partition(migration_cls, options, 0, 1, *run_args)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_partition, migration_cls, options, partition, workers, *run_args)
+                for partition in range(workers)
+            ]
+            results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - started
+    processed = sum(s.processed for s in results)
+    logger.info("%s: %d rows, %d changed across %d partition(s) in %.2fs (%.1f rows/s)",
+                migration_cls.name, processed, sum(s.changed for s in results), len(results),
+                elapsed, processed / elapsed if elapsed else 0.0)
+    return results
+
+
+def run_rebuild(name: str, rebuild: Callable[..., int], dry_run: bool = False,
+                workers: Optional[int] = None) -> int:
+    """Replace a derived table with ``rebuild()`` in one transaction, in the current app context.
+
+    Args:
+        name: Name used in the log lines
+        rebuild: Service method recomputing the table; returns the rows written
+        dry_run: Roll back instead of committing
+        workers: Passed on to rebuilds that spread their work over processes
+
+    Returns:
+        int: Number of rows the rebuild wrote
+    """
+    from . import db
+
+    started = time.perf_counter()
+    try:
+        written = rebuild() if workers is None else rebuild(workers=workers)
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception("%s failed; nothing was written.", name)
+        raise
+    logger.info("%s %s: %d rows in %.2fs", name, 'dry run finished' if dry_run else 'finished',
+                written, time.perf_counter() - started)
+    return written
+
+
+def build_arg_parser(description: str) -> argparse.ArgumentParser:
+    """Common command-line flags for migration scripts."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--dry-run', action='store_true', help="Run every batch but roll back instead of committing")
+    parser.add_argument('--batch-size', type=int, default=None, help="Rows per committed batch")
+    parser.add_argument('--workers', type=int, default=1, help="Number of parallel id partitions")
+    parser.add_argument('--reset', action='store_true', help="Ignore saved checkpoints and start from the beginning")
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR, help="Where checkpoint files are kept")
+    return parser
+
+
+def run_cli(migration_cls, parser: Optional[argparse.ArgumentParser] = None,
+            option_names: tuple = ()) -> List[MigrationStats]:
+    """Parse the common flags (plus ``option_names`` from ``parser``) and run."""
+    parser = parser or build_arg_parser(migration_cls.__doc__ or migration_cls.name)
+    args = parser.parse_args()
+    _configure_logging()
+    options = {name: getattr(args, name) for name in option_names}
+    return run_partitioned(
+        migration_cls,
+        options=options,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        checkpoint_dir=args.checkpoint_dir,
+        reset=args.reset,
+    )
+
+
+def build_rebuild_arg_parser(description: str, parallel: bool = False) -> argparse.ArgumentParser:
+    """Command-line flags for whole-table rebuild scripts.
+
+    A rebuild is a single transaction, so there are no batches, partitions or
+    checkpoints to configure: only ``--dry-run``, plus ``--workers`` for
+    rebuilds that spread their work over processes.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--dry-run', action='store_true', help="Run the rebuild but roll back instead of committing")
+    if parallel:
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Processes the rebuild uses (default: CPU count)")
+    return parser
+
+
+def run_rebuild_cli(name: str, rebuild: Callable[..., int], description: str,
+                    parallel: bool = False) -> int:
+    """Parse the rebuild flags and run a whole-table rebuild (see ``run_rebuild``).
+
+    ``parallel`` rebuilds take a ``workers`` argument and get the ``--workers``
+    flag. Like the batched runner, the rebuild sees soft-deleted rows.
+    """
+    from . import create_app
+    from .soft_delete import including_deleted
+
+    args = build_rebuild_arg_parser(description, parallel).parse_args()
+    _configure_logging()
+    flask_app = create_app(mode='cli')
+    with flask_app.app_context(), including_deleted():
+        return run_rebuild(name, rebuild, dry_run=args.dry_run, workers=args.workers if parallel else None)
+
+
+def _configure_logging() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
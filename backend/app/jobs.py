@@ -0,0 +1,362 @@
+"""
+Durable background jobs stored in the application database.
+
+Request handlers enqueue work that does not have to finish before the
+response - file moves, statistics rebuilds, cleanups - as rows in ``jobs``,
+in the same transaction as the change that needs it. ``flask worker`` runs
+them::
+
+    flask worker                  # poll forever, one thread
+    flask worker --threads 4
+    flask worker --burst          # run what is due, then exit (cron, tests)
+
+Jobs are plain functions registered by name (see tasks.py)::
+
+    @job('rebuild_duration_groups', priority=PRIORITY_LOW)
+    def rebuild_duration_groups(groups): ...
+
+    enqueue('rebuild_duration_groups', {'groups': [...]})
+
+Workers claim the most urgent due job (highest ``priority``, then oldest
+``run_at``) with ``SELECT ... FOR UPDATE SKIP LOCKED`` on Postgres, so
+concurrent workers never wait on each other; on SQLite, where writers are
+serialized anyway, a conditional UPDATE decides which worker got the row.
+A job's own writes commit together with its ``done`` status. A failing job
+is retried with exponential backoff until ``max_attempts``, then marked
+``failed``; a job whose worker died is re-queued once its lease expires.
+
+Jobs registered with ``every=`` are also enqueued periodically. Their next
+due time lives in ``job_schedules``, so with several workers each period
+still runs once. Each finished job records its duration; ``job_metrics``
+aggregates them per job name for ``GET /api/admin/jobs``.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+import click
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW = 100, 50, 0
+
+
+@dataclass
+class JobSpec:
+    name: str
+    func: Callable
+    priority: int
+    max_attempts: Optional[int]
+    every: Optional[timedelta]
+
+
+REGISTRY: Dict[str, JobSpec] = {}
+
+
+def job(name, priority=PRIORITY_NORMAL, max_attempts=None, every=None):
+    """Register a function as the handler of jobs called ``name``.
+
+    Args:
+        name: Job name used by ``enqueue``
+        priority: Default priority; higher runs first
+        max_attempts: Attempts before the job is marked failed (default JOB_MAX_ATTEMPTS)
+        every: Enqueue the job periodically with this interval
+    """
+    def register(func):
+        REGISTRY[name] = JobSpec(name, func, priority, max_attempts, every)
+        return func
+    return register
+
+
+def load_tasks():
+    """Import the modules that register job handlers."""
+    from . import tasks  # noqa: F401
+
+
+def enqueue(name, payload=None, priority=None, delay=None, max_attempts=None):
+    """Add a job to the current transaction; it becomes visible to workers on commit.
+
+    Args:
+        name: A registered job name
+        payload: JSON-serializable keyword arguments for the handler
+        priority: Overrides the job's default priority
+        delay: Run no earlier than this timedelta from now
+        max_attempts: Overrides the job's default attempt limit
+
+    Returns:
+        Job: The new (pending) row
+    """
+    from flask import current_app
+    from .models import Job
+
+    load_tasks()
+    spec = REGISTRY.get(name)
+    if spec is None:
+        raise ValueError(f"Unknown job: {name}")
+    now = datetime.utcnow()
+    new_job = Job(
+        name=name, payload=payload or {}, status=QUEUED,
+        priority=spec.priority if priority is None else priority,
+        max_attempts=max_attempts or spec.max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 5),
+        attempts=0, run_at=now + (delay or timedelta()), created_at=now
+    )
+    db.session.add(new_job)
+    return new_job
+
+
+def backoff_delay(attempts, base, cap):
+    """Delay before retry number ``attempts``: exponential with +-25% jitter, capped."""
+    delay = min(cap, base * 2 ** max(0, attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.75, 1.25))
+
+
+def job_metrics(since=None):
+    """Per job name: counts by status and the durations of jobs finished since ``since``.
+
+    Returns:
+        List[Dict]: One entry per job name, ordered by name
+    """
+    from .models import Job
+
+    since = since or datetime.utcnow() - timedelta(days=1)
+    recent = Job.finished_at >= since
+    rows = db.session.query(
+        Job.name,
+        func.sum(case((Job.status == QUEUED, 1), else_=0)).label('queued'),
+        func.sum(case((Job.status == RUNNING, 1), else_=0)).label('running'),
+        func.sum(case(((Job.status == DONE) & recent, 1), else_=0)).label('done'),
+        func.sum(case(((Job.status == FAILED) & recent, 1), else_=0)).label('failed'),
+        func.avg(case(((Job.status == DONE) & recent, Job.duration_ms))).label('avg_ms'),
+        func.max(case(((Job.status == DONE) & recent, Job.duration_ms))).label('max_ms'),
+        func.min(case((Job.status == QUEUED, Job.run_at))).label('oldest_due'),
+    ).group_by(Job.name).order_by(Job.name).all()
+    return [{
+        "name": row.name,
+        "queued": int(row.queued or 0),
+        "running": int(row.running or 0),
+        "done": int(row.done or 0),
+        "failed": int(row.failed or 0),
+        "avg_duration_ms": round(float(row.avg_ms), 1) if row.avg_ms is not None else None,
+        "max_duration_ms": row.max_ms,
+        "oldest_due": row.oldest_due.isoformat() if row.oldest_due else None
+    } for row in rows]
+
+
+class Worker:
+    """Claims and runs jobs for one app; ``run_once`` is safe to call from several threads."""
+
+    def __init__(self, app, name=None):
+        self.app = app
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = app.config.get('JOB_POLL_SECONDS', 1.0)
+        self.lease = timedelta(seconds=app.config.get('JOB_LEASE_SECONDS', 600))
+        self.backoff_base = app.config.get('JOB_BACKOFF_SECONDS', 10)
+        self.backoff_cap = app.config.get('JOB_BACKOFF_MAX_SECONDS', 3600)
+        self.stats = {}  # job name -> {'done', 'failed', 'total_ms', 'max_ms'} for this process
+        self._stats_lock = threading.Lock()
+        load_tasks()
+
+    # --- Claiming ---
+
+    def _claim(self):
+        """Mark the next due job as running; returns its id, or None when nothing is due."""
+        from .models import Job
+
+        while True:
+            now = datetime.utcnow()
+            query = select(Job.id).where(Job.status == QUEUED, Job.run_at <= now).order_by(
+                Job.priority.desc(), Job.run_at, Job.id
+            ).limit(1)
+            if db.session.get_bind().dialect.name == 'postgresql':
+                query = query.with_for_update(skip_locked=True)
+            job_id = db.session.execute(query).scalar()
+            if job_id is None:
+                db.session.rollback()
+                return None
+            claimed = db.session.execute(
+                update(Job).where(Job.id == job_id, Job.status == QUEUED).values(
+                    status=RUNNING, attempts=Job.attempts + 1, locked_by=self.name, locked_at=now, started_at=now
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return job_id
+            # Another worker took it between the SELECT and the UPDATE (SQLite); try the next one
+
+    def run_once(self):
+        """Claim and run one due job.
+
+        Returns:
+            bool: False when no job was due
+        """
+        from .models import Job
+
+        with self.app.app_context():
+            job_id = self._claim()
+            if job_id is None:
+                return False
+            claimed = db.session.get(Job, job_id)
+            spec = REGISTRY.get(claimed.name)
+            started = time.perf_counter()
+            try:
+                if spec is None:
+                    raise LookupError(f"No handler registered for job {claimed.name!r}")
+                spec.func(**(claimed.payload or {}))
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                claimed.status, claimed.finished_at, claimed.duration_ms = DONE, datetime.utcnow(), duration_ms
+                claimed.last_error, claimed.locked_by = None, None
+                db.session.commit()  # The job's writes and its DONE status commit together
+                self._record(claimed.name, duration_ms, failed=False)
+                return True
+            except Exception as e:
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                db.session.rollback()
+                self._fail(job_id, e, duration_ms)
+                return True
+
+    def _fail(self, job_id, error, duration_ms):
+        from .models import Job
+
+        failed = db.session.get(Job, job_id)
+        failed.last_error = f"{type(error).__name__}: {error}"[:2000]
+        failed.duration_ms = duration_ms
+        failed.locked_by = None
+        if failed.attempts >= failed.max_attempts:
+            failed.status, failed.finished_at = FAILED, datetime.utcnow()
+            logger.error("Job %s #%s failed permanently after %d attempts: %s",
+                         failed.name, job_id, failed.attempts, failed.last_error)
+        else:
+            failed.status = QUEUED
+            failed.run_at = datetime.utcnow() + backoff_delay(failed.attempts, self.backoff_base, self.backoff_cap)
+            logger.warning("Job %s #%s failed (attempt %d of %d), retrying at %s: %s",
+                           failed.name, job_id, failed.attempts, failed.max_attempts, failed.run_at, failed.last_error)
+        db.session.commit()
+        self._record(failed.name, duration_ms, failed=True)
+
+    def _record(self, name, duration_ms, failed):
+        with self._stats_lock:
+            stats = self.stats.setdefault(name, {'done': 0, 'failed': 0, 'total_ms': 0, 'max_ms': 0})
+            stats['failed' if failed else 'done'] += 1
+            stats['total_ms'] += duration_ms
+            stats['max_ms'] = max(stats['max_ms'], duration_ms)
+
+    # --- Housekeeping ---
+
+    def tick(self):
+        """Enqueue due periodic jobs and re-queue jobs whose worker lease expired."""
+        from .models import Job, JobSchedule
+
+        with self.app.app_context():
+            now = datetime.utcnow()
+            for spec in REGISTRY.values():
+                if spec.every is None:
+                    continue
+                if db.session.get(JobSchedule, spec.name) is None:
+                    try:
+                        db.session.add(JobSchedule(name=spec.name, next_run_at=now))
+                        db.session.commit()
+                    except IntegrityError:
+                        db.session.rollback()  # Another worker created it
+                # Whoever moves next_run_at forward enqueues this period's run
+                advanced = db.session.execute(
+                    update(JobSchedule).where(JobSchedule.name == spec.name, JobSchedule.next_run_at <= now)
+                    .values(next_run_at=now + spec.every).execution_options(synchronize_session=False)
+                ).rowcount
+                if advanced:
+                    enqueue(spec.name)
+                db.session.commit()
+
+            expired = now - self.lease
+            stale = db.session.execute(
+                select(Job.id, Job.attempts, Job.max_attempts).where(Job.status == RUNNING, Job.locked_at < expired)
+            ).all()
+            for job_id, attempts, max_attempts in stale:
+                failed = attempts >= max_attempts
+                # A failed job is finished: stats count it and purge_finished can delete it
+                db.session.execute(
+                    update(Job).where(Job.id == job_id, Job.status == RUNNING, Job.locked_at < expired).values(
+                        status=FAILED if failed else QUEUED, finished_at=now if failed else None, locked_by=None,
+                        last_error='Lease expired: the worker running it stopped responding'
+                    ).execution_options(synchronize_session=False)
+                )
+                logger.warning("Job #%s lease expired; %s", job_id, 'marked failed' if failed else 're-queued')
+            db.session.commit()
+
+    def run_until_idle(self):
+        """Tick once, then run jobs until none is due. Returns the number run."""
+        self.tick()
+        count = 0
+        while self.run_once():
+            count += 1
+        return count
+
+    def run(self, threads=1, stop=None):
+        """Poll for jobs until ``stop`` is set (or forever)."""
+        stop = stop or threading.Event()
+
+        def loop():
+            while not stop.is_set():
+                try:
+                    if not self.run_once():
+                        stop.wait(self.poll_interval)
+                except Exception:
+                    logger.exception("Worker loop error")
+                    stop.wait(self.poll_interval)
+
+        pool = [threading.Thread(target=loop, name=f"job-worker-{n}", daemon=True) for n in range(threads)]
+        for thread in pool:
+            thread.start()
+        while not stop.is_set():
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Worker tick error")
+            stop.wait(max(self.poll_interval, 1.0))
+        for thread in pool:
+            thread.join()
+
+
+def purge_finished(older_than):
+    """Delete done and failed jobs that finished before ``older_than``; returns the count."""
+    from .models import Job
+
+    return db.session.execute(
+        delete(Job).where(Job.status.in_((DONE, FAILED)), Job.finished_at < older_than)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+@click.command('worker')
+@click.option('--threads', default=1, show_default=True, help="Jobs run concurrently by this process.")
+@click.option('--burst', is_flag=True, help="Run the jobs that are due, then exit.")
+def worker_command(threads, burst):
+    """Run background jobs from the jobs table."""
+    from flask import current_app
+
+    app = current_app._get_current_object()
+    worker = Worker(app)
+    if burst:
+        count = worker.run_until_idle()
+        click.echo(f"Ran {count} job(s)")
+        return
+    click.echo(f"Worker {worker.name} started with {threads} thread(s)")
+    try:
+        worker.run(threads=threads)
+    except KeyboardInterrupt:
+        click.echo("Worker stopped")
+
+
+def init_jobs(app):
+    """Register the ``flask worker`` command."""
+    app.cli.add_command(worker_command)
@@ -0,0 +1,74 @@
+"""
+JSON serialization for API responses.
+
+``create_app`` installs one of two providers, chosen by the ``JSON_PROVIDER``
+setting ('auto', 'orjson' or 'default'):
+
+* ``OrjsonProvider`` - uses orjson when it is installed. orjson serializes
+  dataclasses (including slotted ones), ``date``/``datetime`` and ``Enum``
+  values natively in C, without building intermediate dicts.
+* ``FastJSONProvider`` - stdlib fallback. Unlike Flask's default provider it
+  converts dataclasses field by field instead of through the recursive,
+  deep-copying ``dataclasses.asdict``.
+
+Both emit sorted keys and ISO 8601 dates so output is identical either way.
+"""
+import dataclasses
+import decimal
+import enum
+import uuid
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional dependency; fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(o):
+    """Serialize the types the stdlib/orjson encoders don't handle themselves."""
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        # Shallow: nested values are handed back to the encoder as it walks them
+        return {f.name: getattr(o, f.name) for f in dataclasses.fields(o)}
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, enum.Enum):
+        return o.value
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Stdlib JSON provider with shallow dataclass and Enum support."""
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson."""
+    option = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype='application/json')
+
+
+def make_json_provider(app) -> JSONProvider:
+    """Build the provider selected by the app's JSON_PROVIDER setting."""
+    choice = app.config.get('JSON_PROVIDER', 'auto')
+    if choice == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_PROVIDER='orjson' but orjson is not installed")
+    if choice in ('auto', 'orjson') and orjson is not None:
+        return OrjsonProvider(app)
+    return FastJSONProvider(app)
@@ -0,0 +1,231 @@
+"""
+Player leaderboards kept in memory, with rank lookups that don't sort.
+
+Each worker keeps one Board per scope: all games ``('all', '')``, one season
+``('season', '<n>')`` or pauper games ``('pauper', '')``. A board holds every
+player's totals (games, wins, placement sum, points) and, per metric, the
+players in rank order. A page is a slice and "what rank is player X" a binary
+search, so requests never sort the player list.
+
+A player scores one point per opponent placed below them
+(``player_count - placement``): a win in a four-player pod is worth 3.
+
+Rate metrics (win rate, average placement, points per game) rank only
+players with at least ``LEADERBOARD_MIN_GAMES`` games. Tied players share the
+better rank ("1224" ranking) and are ordered by user id, so pages are stable.
+
+A board is built from the match_players aggregates on first use. When a
+transaction that changes counted results commits, its changes are patched
+into this worker's boards (see LeaderboardService). Boards are also rebuilt
+once ``LEADERBOARD_REFRESH_SECONDS`` old, which brings in results committed
+by other workers.
+
+A rebuild can run between another transaction's commit and its
+``after_commit``, and then already counts that transaction's results. Commits
+and builds therefore draw stamps from one counter: a commit when it starts,
+a board when its aggregate has finished. Changes are patched only into boards
+built before the commit started; a board whose build overlapped the commit is
+dropped and rebuilt from the database on its next use.
+"""
+import itertools
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import case, event, func
+
+from . import db
+
+PENDING = 'pending_leaderboard_changes'
+COMMIT_STAMP = 'leaderboard_commit_stamp'
+METRICS = ('wins', 'win_rate', 'avg_placement', 'points_per_game')
+RATE_METRICS = frozenset({'win_rate', 'avg_placement', 'points_per_game'})
+SCOPES = ('all', 'season', 'pauper')
+
+Scope = Tuple[str, str]
+Totals = List[int]  # [games, wins, placement_sum, points]
+
+
+def _primary(metric: str, totals: Totals) -> float:
+    """Sort value of a player for a metric; lower ranks higher."""
+    games, wins, placement_sum, points = totals
+    if metric == 'wins':
+        return -wins
+    if metric == 'win_rate':
+        return -wins / games
+    if metric == 'avg_placement':
+        return placement_sum / games
+    return -points / games
+
+
+class Board:
+    """Totals and per-metric rank order of the players in one scope."""
+
+    def __init__(self, totals: Dict[int, Totals], min_games: int, stamp: int = 0):
+        self.totals = totals
+        self.min_games = min_games
+        self.stamp = stamp
+        self.built_at = time.monotonic()
+        # metric -> sorted [(primary, user id)] of the players it ranks
+        self.ranked = {
+            metric: sorted(self._key(metric, user_id) for user_id in totals if self._ranks(metric, user_id))
+            for metric in METRICS
+        }
+
+    def _ranks(self, metric: str, user_id: int) -> bool:
+        games = self.totals[user_id][0] if user_id in self.totals else 0
+        return games > 0 and (metric not in RATE_METRICS or games >= self.min_games)
+
+    def _key(self, metric: str, user_id: int):
+        return (_primary(metric, self.totals[user_id]), user_id)
+
+    def patch(self, user_id: int, delta: Totals) -> None:
+        """Add a change to a player's totals and move them in each ranking."""
+        previous = {metric: self._key(metric, user_id) for metric in METRICS if self._ranks(metric, user_id)}
+        totals = self.totals.setdefault(user_id, [0, 0, 0, 0])
+        for i, change in enumerate(delta):
+            totals[i] += change
+        for metric in METRICS:
+            ranked = self.ranked[metric]
+            if metric in previous:
+                del ranked[bisect_left(ranked, previous[metric])]
+            if self._ranks(metric, user_id):
+                insort(ranked, self._key(metric, user_id))
+        if totals[0] <= 0:
+            del self.totals[user_id]
+
+    def rank(self, metric: str, user_id: int) -> Optional[int]:
+        """A player's rank (ties share the better rank), or None if unranked."""
+        if not self._ranks(metric, user_id):
+            return None
+        # (value,) sorts before every (value, user id): counts players strictly ahead
+        return bisect_left(self.ranked[metric], (self._key(metric, user_id)[0],)) + 1
+
+    def page(self, metric: str, offset: int, limit: int) -> List[Tuple[int, int, Totals]]:
+        """(rank, user id, totals) for ranked players ``offset`` .. ``offset + limit``."""
+        ranked = self.ranked[metric]
+        entries = []
+        for position in range(offset, min(offset + limit, len(ranked))):
+            value, user_id = ranked[position]
+            if not entries:
+                rank = bisect_left(ranked, (value,)) + 1  # The page may start inside a tie
+            elif value == ranked[position - 1][0]:
+                rank = entries[-1][0]
+            else:
+                rank = position + 1
+            entries.append((rank, user_id, list(self.totals[user_id])))
+        return entries
+
+
+class Leaderboards:
+    """This worker's boards, built on demand and patched as results commit."""
+
+    def __init__(self, min_games: int = 5, refresh_seconds: float = 300.0):
+        self.min_games = min_games
+        self.refresh_seconds = refresh_seconds
+        self._boards: Dict[Scope, Board] = {}
+        self._lock = threading.Lock()
+        # Shared by commits and builds; next() on a count is atomic, so no lock is needed
+        self._stamps = itertools.count(1)
+
+    def stamp(self) -> int:
+        """A stamp ordering a commit against the board builds."""
+        return next(self._stamps)
+
+    def page(self, scope: Scope, metric: str, offset: int, limit: int):
+        """Returns (ranked player count, page entries) for a scope and metric."""
+        with self._lock:
+            board = self._board(scope)
+            return len(board.ranked[metric]), board.page(metric, offset, limit)
+
+    def rank(self, scope: Scope, metric: str, user_id: int):
+        """Returns (rank or None, ranked player count, the player's totals or None)."""
+        with self._lock:
+            board = self._board(scope)
+            totals = board.totals.get(user_id)
+            return board.rank(metric, user_id), len(board.ranked[metric]), list(totals) if totals else None
+
+    def apply(self, changes, stamp: int) -> None:
+        """Patch committed (scope, user id, delta) changes into the boards already built.
+
+        ``stamp`` is the commit's, taken before it started: boards built after
+        that may already count the changes, so they are dropped instead.
+        """
+        with self._lock:
+            for scope, user_id, delta in changes:
+                board = self._boards.get(scope)
+                if board is None:
+                    continue
+                if board.stamp > stamp:
+                    del self._boards[scope]
+                else:
+                    board.patch(user_id, delta)
+
+    def _board(self, scope: Scope) -> Board:
+        board = self._boards.get(scope)
+        if board is None or time.monotonic() - board.built_at >= self.refresh_seconds:
+            totals = aggregate(scope)
+            board = self._boards[scope] = Board(totals, self.min_games, self.stamp())
+        return board
+
+
+def aggregate(scope: Scope) -> Dict[int, Totals]:
+    """Every player's totals in a scope, from the counted match results."""
+    from .models import Game, Match, MatchPlayer
+
+    name, key = scope
+    query = db.session.query(
+        MatchPlayer.user_id,
+        func.count(MatchPlayer.id),
+        func.sum(case((MatchPlayer.placement == 1, 1), else_=0)),
+        func.sum(MatchPlayer.placement),
+        func.sum(case((Match.player_count > MatchPlayer.placement, Match.player_count - MatchPlayer.placement),
+                      else_=0))
+    ).join(Match, Match.id == MatchPlayer.match_id).outerjoin(Game, Game.id == Match.game_id).filter(
+        Match.status == 'approved', MatchPlayer.placement.isnot(None), Game.deleted_at.is_(None)
+    )
+    if name == 'season':
+        query = query.filter(Match.season_number == int(key))
+    elif name == 'pauper':
+        query = query.filter(Game.is_pauper.is_(True))
+    return {
+        user_id: [games, int(wins or 0), int(placement_sum or 0), int(points or 0)]
+        for user_id, games, wins, placement_sum, points in query.group_by(MatchPlayer.user_id)
+    }
+
+
+def record(changes) -> None:
+    """Queue (scope, user id, delta) changes; they reach the boards when the session commits."""
+    db.session.info.setdefault(PENDING, []).extend(changes)
+
+
+@event.listens_for(db.session, 'before_commit')
+def _stamp_commit(session):
+    if has_app_context() and 'leaderboards' in current_app.extensions:
+        session.info[COMMIT_STAMP] = current_app.extensions['leaderboards'].stamp()
+
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_committed(session):
+    pending = session.info.pop(PENDING, None)
+    stamp = session.info.pop(COMMIT_STAMP, None)
+    if not pending or stamp is None or not has_app_context() or 'leaderboards' not in current_app.extensions:
+        return
+    current_app.extensions['leaderboards'].apply(pending, stamp)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_rolled_back(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(PENDING, None)
+        session.info.pop(COMMIT_STAMP, None)
+
+
+def init_leaderboards(app):
+    """Keep this worker's in-memory leaderboards in ``app.extensions``."""
+    app.extensions['leaderboards'] = Leaderboards(
+        app.config.get('LEADERBOARD_MIN_GAMES', 5),
+        app.config.get('LEADERBOARD_REFRESH_SECONDS', 300.0),
+    )
@@ -3,6 +3,12 @@ from datetime import datetime, date, timedelta
 from sqlalchemy import Enum, JSON
 from . import db, bcrypt
 
+# Column loading policy: large text/JSON columns and credentials are deferred,
+# so whole-row queries skip them. Code that needs them asks explicitly with
+# db.undefer(...) / db.undefer_group(<group>); list endpoints select only the
+# columns they serialize. Groups: 'decklist', 'match_notes', 'game_details',
+# 'audit_state', 'credentials'.
+
 # Enum for admin action types
 class AdminActionType(enum.Enum):
     GAME_DELETE = 'GAME_DELETE'
@@ -18,14 +24,16 @@ class AdminAuditLog(db.Model):
     action_type = db.Column(Enum(AdminActionType), nullable=False)
     target_type = db.Column(db.String(50), nullable=False)
     target_id = db.Column(db.Integer, nullable=False)
-    previous_state = db.Column(JSON, nullable=True)
-    new_state = db.Column(JSON, nullable=True)
+    previous_state = db.deferred(db.Column(JSON, nullable=True), group='audit_state')
+    new_state = db.deferred(db.Column(JSON, nullable=True), group='audit_state')
     reason = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     # Relationship to admin user
     admin = db.relationship('User', backref=db.backref('audit_logs', lazy='dynamic'))
 
+    __table_args__ = (db.Index('idx_admin_audit_target', 'target_type', 'target_id'),)
+
     def __repr__(self):
         return f'<AdminAuditLog id={self.id} action={self.action_type.value} target={self.target_type}:{self.target_id}>'
 
@@ -39,9 +47,9 @@ class GameStatus(enum.Enum):
 class MatchPlayer(db.Model):
     __tablename__ = 'match_players'
     id = db.Column(db.Integer, primary_key=True)
-    match_id = db.Column(db.Integer, db.ForeignKey('matches.id', ondelete='CASCADE'), nullable=False, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    deck_id = db.Column(db.Integer, db.ForeignKey('decks.id'), nullable=False)
+    match_id = db.Column(db.Integer, db.ForeignKey('matches.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    deck_id = db.Column(db.Integer, db.ForeignKey('decks.id'), nullable=False, index=True)
     deck_version_id = db.Column(db.Integer, db.ForeignKey('deck_versions.id'), nullable=True)
     placement = db.Column(db.Integer, nullable=True) # Nullable until result submitted
 
@@ -50,6 +58,13 @@ class MatchPlayer(db.Model):
     deck = db.relationship('Deck', backref=db.backref('match_uses', lazy='select'))
     deck_version = db.relationship('DeckVersion', backref=db.backref('match_uses', lazy='dynamic'))
 
+    # (match_id, placement) serves winner lookups, (user_id, placement) win counts;
+    # both also cover the plain match_id / user_id lookups.
+    __table_args__ = (
+        db.Index('ix_match_players_match_id_placement', 'match_id', 'placement'),
+        db.Index('ix_match_players_user_id_placement', 'user_id', 'placement'),
+    )
+
     def __repr__(self):
         return f'<MatchPlayer match_id={self.match_id} user_id={self.user_id} deck_id={self.deck_id}>'
 
@@ -58,13 +73,13 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False, index=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.deferred(db.Column(db.String(128), nullable=False), group='credentials')
     registered_on = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     last_login = db.Column(db.DateTime, nullable=True)
 
     # Admin and password reset fields
     is_admin = db.Column(db.Boolean, nullable=False, default=False, index=True)
-    temp_password_hash = db.Column(db.String(128), nullable=True)
+    temp_password_hash = db.deferred(db.Column(db.String(128), nullable=True), group='credentials')
     must_change_password = db.Column(db.Boolean, nullable=False, default=False)
     temp_password_expires_at = db.Column(db.DateTime, nullable=True)
 
@@ -116,7 +131,7 @@ class DeckVersion(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     deck_id = db.Column(db.Integer, db.ForeignKey('decks.id', ondelete='CASCADE'), nullable=False)
     version_number = db.Column(db.Integer, nullable=False)  # Auto-incremented for each deck
-    decklist_text = db.Column(db.Text, nullable=True)
+    decklist_text = db.deferred(db.Column(db.Text, nullable=True), group='decklist')
     notes = db.Column(db.Text, nullable=True)  # Notes specific to this version
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
@@ -124,6 +139,7 @@ class DeckVersion(db.Model):
     deck = db.relationship('Deck', foreign_keys=[deck_id], backref=db.backref('versions', lazy='dynamic', order_by='DeckVersion.version_number.desc()'))
 
     # Unique constraint to ensure version numbers are unique per deck
+    # (its index also serves the (deck_id, version_number) lookups)
     __table_args__ = (db.UniqueConstraint('deck_id', 'version_number', name='_deck_version_uc'),)
     
     def __repr__(self):
@@ -136,10 +152,13 @@ class Deck(db.Model):
     name = db.Column(db.String(100), nullable=False)
     commander = db.Column(db.String(100), nullable=False)
     colors = db.Column(db.String(5), nullable=False)
-    decklist_text = db.Column(db.Text, nullable=True)
+    decklist_text = db.deferred(db.Column(db.Text, nullable=True), group='decklist')
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     last_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     current_version_id = db.Column(db.Integer, db.ForeignKey('deck_versions.id'), nullable=True)
+    # Last version_number handed out for this deck; incremented atomically by
+    # DeckService.create_deck_version instead of scanning max(version_number)
+    version_counter = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Relationship to the current version
     current_version = db.relationship('DeckVersion', foreign_keys=[current_version_id], post_update=True)
@@ -147,6 +166,10 @@ class Deck(db.Model):
     
     # Relationship to GameRegistrations (renamed)
     game_registrations = db.relationship('GameRegistration', backref='deck', lazy='dynamic', cascade="all, delete-orphan")
+
+    # Serves the per-user deck lists, which are ordered by last_updated
+    __table_args__ = (db.Index('ix_decks_user_id_last_updated', 'user_id', 'last_updated'),)
+
     def __repr__(self): return f'<Deck {self.name} ({self.commander}) by User {self.user_id}>'
 
 class Game(db.Model):
@@ -170,7 +193,7 @@ class Game(db.Model):
     game_date = db.Column(db.Date, nullable=False, default=date.today, index=True)
     status = db.Column(Enum(GameStatus), nullable=False, default=GameStatus.UPCOMING, index=True)
     is_pauper = db.Column(db.Boolean, nullable=False, default=False) # Added Pauper flag
-    details = db.Column(db.Text, nullable=True) # Added details text field
+    details = db.deferred(db.Column(db.Text, nullable=True), group='game_details') # Added details text field
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     # Soft delete and admin action tracking
@@ -178,6 +201,9 @@ class Game(db.Model):
     deleted_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     last_admin_action = db.Column(db.String(50), nullable=True)
     last_admin_action_at = db.Column(db.DateTime, nullable=True)
+    # Optimistic lock: every UPDATE checks and bumps it, so a concurrent lifecycle
+    # transition fails with StaleDataError instead of overwriting the other one
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relationship to admin who deleted
     deleted_by = db.relationship('User', foreign_keys=[deleted_by_id])
@@ -185,6 +211,18 @@ class Game(db.Model):
     registrations = db.relationship('GameRegistration', backref='game', lazy='dynamic', cascade="all, delete-orphan") # Renamed relationship
     matches = db.relationship('Match', backref='game', lazy='dynamic') # Renamed backref
 
+    # Partial indexes: live games ordered like the game lists, and the (small) set
+    # of deleted games that the global soft-delete filter excludes.
+    __table_args__ = (
+        db.Index('ix_games_active_game_date', 'game_date',
+                 postgresql_where=db.text('deleted_at IS NULL'),
+                 sqlite_where=db.text('deleted_at IS NULL')),
+        db.Index('ix_games_deleted', 'id',
+                 postgresql_where=db.text('deleted_at IS NOT NULL'),
+                 sqlite_where=db.text('deleted_at IS NOT NULL')),
+    )
+    __mapper_args__ = {'version_id_col': version_id}
+
     def __repr__(self): return f'<Game id={self.id} date={self.game_date.strftime("%Y-%m-%d")} status={self.status.value}>'
 
     @staticmethod
@@ -199,13 +237,14 @@ class GameRegistration(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     game_id = db.Column(db.Integer, db.ForeignKey('games.id', ondelete='CASCADE'), nullable=False) # Renamed foreign key column and target table
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    deck_id = db.Column(db.Integer, db.ForeignKey('decks.id'), nullable=False)
+    deck_id = db.Column(db.Integer, db.ForeignKey('decks.id'), nullable=False, index=True)
     deck_version_id = db.Column(db.Integer, db.ForeignKey('deck_versions.id'), nullable=True)
     registered_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     # Relationship to the specific version
     deck_version = db.relationship('DeckVersion', backref=db.backref('game_registrations', lazy='dynamic'))
 
+    # _game_user_uc also serves as the game_id index
     __table_args__ = (db.UniqueConstraint('game_id', 'user_id', name='_game_user_uc'),) # Renamed constraint
 
     def __repr__(self): return f'<GameRegistration user={self.user_id} deck={self.deck_id} game={self.game_id}>'
@@ -225,7 +264,7 @@ class Match(db.Model):
     """
     __tablename__ = 'matches'
     id = db.Column(db.Integer, primary_key=True)
-    game_id = db.Column(db.Integer, db.ForeignKey('games.id', ondelete='SET NULL'), nullable=True, index=True) # Renamed foreign key column and target table
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id', ondelete='SET NULL'), nullable=True) # Renamed foreign key column and target table
     player_count = db.Column(db.Integer, nullable=False)
     status = db.Column(db.String(20), nullable=False, default='pending', index=True)
     season_number = db.Column(db.Integer, nullable=True, index=True)
@@ -233,15 +272,315 @@ class Match(db.Model):
     end_time = db.Column(db.DateTime, nullable=True)
     submitted_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     approved_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
-    notes_big_interaction = db.Column(db.Text, nullable=True)
-    notes_rules_discussion = db.Column(db.Text, nullable=True)
-    notes_end_summary = db.Column(db.Text, nullable=True)
+    notes_big_interaction = db.deferred(db.Column(db.Text, nullable=True), group='match_notes')
+    notes_rules_discussion = db.deferred(db.Column(db.Text, nullable=True), group='match_notes')
+    notes_end_summary = db.deferred(db.Column(db.Text, nullable=True), group='match_notes')
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     approved_at = db.Column(db.DateTime, nullable=True)
-    approval_notes = db.Column(db.Text, nullable=True) # Notes added during approval/rejection
+    approval_notes = db.deferred(db.Column(db.Text, nullable=True), group='match_notes') # Notes added during approval/rejection
+    # Optimistic lock, see Game.version_id
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     # Define relationships for submitter and approver
     # submitter = db.relationship('User', foreign_keys=[submitted_by_id], backref='submitted_matches') # backref already defined on User
     approver = db.relationship('User', foreign_keys=[approved_by_id], backref='approved_matches')
 
+    __table_args__ = (
+        db.Index('ix_matches_game_id_status', 'game_id', 'status'),
+        db.Index('ix_matches_status_created_at', 'status', 'created_at'),
+    )
+    __mapper_args__ = {'version_id_col': version_id}
+
     def __repr__(self): return f'<Match id={self.id} game_id={self.game_id} status={self.status}>'
+
+class GameSummary(db.Model):
+    """Denormalized read model with one row per Game.
+
+    Collapses the games -> matches -> match_players -> users/decks joins that
+    every list view needs into a single row, so listing games is a scan of one
+    table. Rows are rebuilt by GameSummaryService inside the same transaction
+    as each lifecycle change (creation, registration, submission, approval,
+    rejection, soft delete/restore) and are never edited directly.
+    """
+    __tablename__ = 'game_summaries'
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id', ondelete='CASCADE'), primary_key=True)
+    game_date = db.Column(db.Date, nullable=False)
+    status = db.Column(Enum(GameStatus), nullable=False, index=True)
+    is_pauper = db.Column(db.Boolean, nullable=False, default=False)
+    details = db.Column(db.Text, nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=True)
+    registration_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Current (most recent) match for the game, if results were submitted
+    match_id = db.Column(db.Integer, nullable=True)
+    match_status = db.Column(db.String(20), nullable=True)
+    submitted_by_id = db.Column(db.Integer, nullable=True)
+    submitted_by_username = db.Column(db.String(80), nullable=True)
+    approved_by_id = db.Column(db.Integer, nullable=True)
+    approved_by_username = db.Column(db.String(80), nullable=True)
+    winner_id = db.Column(db.Integer, nullable=True)
+    winner_username = db.Column(db.String(80), nullable=True)
+
+    # Match players, or the registered players before results are submitted:
+    # [{"user_id", "username", "deck_id", "deck_name", "commander", "placement"}]
+    player_count = db.Column(db.Integer, nullable=False, default=0)
+    players = db.Column(JSON, nullable=False, default=list)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_game_summaries_active_game_date', 'game_date',
+                 postgresql_where=db.text('deleted_at IS NULL'),
+                 sqlite_where=db.text('deleted_at IS NULL')),
+    )
+
+    def __repr__(self): return f'<GameSummary game_id={self.game_id} status={self.status.value}>'
+
+
+class HeadToHead(db.Model):
+    """Pairwise record of one player against another, one row per ordered pair.
+
+    Counts only approved matches of games that are not soft-deleted. Rows are
+    adjusted incrementally by HeadToHeadService when results are approved or
+    un-approved and when a game is deleted or restored; both (a, b) and (b, a)
+    are stored so a player's whole record is a primary-key range scan.
+    """
+    __tablename__ = 'head_to_head'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    opponent_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)  # Placed higher than the opponent
+    losses = db.Column(db.Integer, nullable=False, default=0)  # Placed lower than the opponent
+    # Sum over shared games of (opponent placement - own placement); positive is better
+    placement_delta_sum = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self): return f'<HeadToHead {self.user_id} vs {self.opponent_id} games={self.games}>'
+
+
+class DeckVersionStats(db.Model):
+    """Performance aggregates for one deck version, one row per DeckVersion.
+
+    Counts the approved matches of live games in which the version was played
+    (``MatchPlayer.deck_version_id``). Maintained incrementally by
+    DeckVersionStatsService as results start or stop counting.
+    """
+    __tablename__ = 'deck_version_stats'
+    deck_version_id = db.Column(db.Integer, db.ForeignKey('deck_versions.id', ondelete='CASCADE'), primary_key=True)
+    deck_id = db.Column(db.Integer, db.ForeignKey('decks.id', ondelete='CASCADE'), nullable=False, index=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    placement_sum = db.Column(db.Integer, nullable=False, default=0)
+    first_played = db.Column(db.Date, nullable=True)
+    last_played = db.Column(db.Date, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Joined eagerly so listing a deck's versions returns their stats in the same query
+    version = db.relationship('DeckVersion', backref=db.backref('stats', uselist=False, lazy='joined'))
+
+    def __repr__(self): return f'<DeckVersionStats version={self.deck_version_id} games={self.games}>'
+
+
+class DeckStats(db.Model):
+    """Performance aggregates for one deck across all its versions, one row per Deck.
+
+    Counts the approved matches of live games the deck was played in
+    (``MatchPlayer.deck_id``). ``win_rate`` and ``avg_placement`` are stored
+    alongside the counts so the deck leaderboard sorts on an index instead of
+    computing them per row. Maintained by DeckStatsService as results start
+    or stop counting; ``current_version_id`` follows the deck's versioning.
+    """
+    __tablename__ = 'deck_stats'
+    deck_id = db.Column(db.Integer, db.ForeignKey('decks.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    current_version_id = db.Column(db.Integer, db.ForeignKey('deck_versions.id', ondelete='SET NULL'), nullable=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    placement_sum = db.Column(db.Integer, nullable=False, default=0)
+    win_rate = db.Column(db.Float, nullable=True)  # wins / games, None while unplayed
+    avg_placement = db.Column(db.Float, nullable=True)  # placement_sum / games
+    last_played = db.Column(db.Date, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    deck = db.relationship('Deck', backref=db.backref('stats', uselist=False, passive_deletes=True))
+
+    # One index per leaderboard sort, with games second as the tie-breaker
+    __table_args__ = (
+        db.Index('ix_deck_stats_win_rate', 'win_rate', 'games'),
+        db.Index('ix_deck_stats_wins', 'wins', 'games'),
+        db.Index('ix_deck_stats_games', 'games'),
+        db.Index('ix_deck_stats_avg_placement', 'avg_placement', 'games'),
+        db.Index('ix_deck_stats_last_played', 'last_played'),
+    )
+
+    def __repr__(self): return f'<DeckStats deck={self.deck_id} {self.wins}/{self.games}>'
+
+
+class PlayerWeeklyStats(db.Model):
+    """One player's counted results in one week: the points of their trend charts.
+
+    ``week_start`` is the Monday of the game's date (the match's submission
+    date for matches without a game). Rows are adjusted by
+    PlayerTrendsService as results start or stop counting and removed when a
+    week no longer has games; the primary key serves a player's series in
+    week order.
+    """
+    __tablename__ = 'player_weekly_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    week_start = db.Column(db.Date, primary_key=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    placement_sum = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self): return f'<PlayerWeeklyStats user={self.user_id} week={self.week_start} games={self.games}>'
+
+
+class CommanderMatchup(db.Model):
+    """How one commander fared against another when both were in the same pod.
+
+    One row per ordered (commander, opponent) pair of ``Deck.commander``
+    values within a scope: ``scope`` is 'all', 'season' or 'pauper' and
+    ``scope_key`` the season number ('' otherwise). ``wins``/``losses`` count
+    the times the commander finished ahead of / behind the opponent; pods
+    where both decks share a commander are not counted. Maintained by
+    CommanderMatchupService as results start or stop counting, and removed
+    when a pair no longer has games; ``win_rate`` is stored so a commander's
+    top matchups are read off an index.
+    """
+    __tablename__ = 'commander_matchups'
+    scope = db.Column(db.String(20), primary_key=True)
+    scope_key = db.Column(db.String(100), primary_key=True)
+    commander = db.Column(db.String(100), primary_key=True)
+    opponent = db.Column(db.String(100), primary_key=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    win_rate = db.Column(db.Float, nullable=False, default=0.0)  # wins / games
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # One index per sort of a commander's matchups, ending in the tie-breakers so
+    # a top-K read is an index range scan without a sort
+    __table_args__ = (
+        db.Index('ix_commander_matchups_win_rate', 'scope', 'scope_key', 'commander', 'win_rate', 'games', 'opponent'),
+        db.Index('ix_commander_matchups_games', 'scope', 'scope_key', 'commander', 'games', 'opponent'),
+    )
+
+    def __repr__(self): return f'<CommanderMatchup {self.scope}={self.scope_key} {self.commander} vs {self.opponent} {self.wins}/{self.games}>'
+
+
+class DurationSketch(db.Model):
+    """Mergeable quantile sketch (t-digest) of game durations for one group.
+
+    ``dimension`` is what games are grouped by ('player_count', 'commander',
+    'pauper' or 'player') and ``group_key`` the group within it, e.g.
+    ('player_count', '4') or ('player', '17'). Maintained by
+    DurationStatsService as approved results with start/end times come and go.
+    """
+    __tablename__ = 'duration_sketches'
+    dimension = db.Column(db.String(20), primary_key=True)
+    group_key = db.Column(db.String(100), primary_key=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    digest = db.Column(JSON, nullable=False)  # TDigest.to_dict()
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self): return f'<DurationSketch {self.dimension}={self.group_key} games={self.games}>'
+
+
+class CardStats(db.Model):
+    """How often a card was in a played deck, and how often that deck won.
+
+    One row per card within a scope: ``scope`` is 'all', 'season' or
+    'commander' and ``scope_key`` the season number / commander name ('' for
+    'all'). An appearance is one MatchPlayer of a counted match whose recorded
+    DeckVersion lists the card. Maintained by CardStatsService.
+    """
+    __tablename__ = 'card_stats'
+    scope = db.Column(db.String(20), primary_key=True)
+    scope_key = db.Column(db.String(100), primary_key=True)
+    card_key = db.Column(db.String(200), primary_key=True)  # decklist.card_key(name)
+    card_name = db.Column(db.String(200), nullable=False)
+    appearances = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_card_stats_scope_appearances', 'scope', 'scope_key', 'appearances'),
+    )
+
+    def __repr__(self): return f'<CardStats {self.scope}={self.scope_key} {self.card_name} {self.wins}/{self.appearances}>'
+
+
+class CardScopeTotals(db.Model):
+    """Number of played decks (and winning decks) per card-stats scope.
+
+    The denominator for a card's inclusion rate and the baseline win rate of
+    its scope; one row per (scope, scope_key) present in ``card_stats``.
+    """
+    __tablename__ = 'card_scope_totals'
+    scope = db.Column(db.String(20), primary_key=True)
+    scope_key = db.Column(db.String(100), primary_key=True)
+    decks = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self): return f'<CardScopeTotals {self.scope}={self.scope_key} {self.wins}/{self.decks}>'
+
+
+class TokenRevocation(db.Model):
+    """A revoked JWT, or every token of a user issued before a point in time.
+
+    Rows with a ``jti`` revoke that one token (logout). Rows with only a
+    ``user_id`` revoke all of the user's tokens whose ``iat`` is before
+    ``revoked_at`` (demotion, password change/reset). ``expires_at`` is when
+    the row stops mattering - the token's ``exp``, or the end of the longest
+    token lifetime - after which it is deleted. Each worker keeps the live
+    rows in memory (see revocation.py); this table is how workers share them.
+    """
+    __tablename__ = 'token_revocations'
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self): return f'<TokenRevocation jti={self.jti} user={self.user_id} until={self.expires_at}>'
+
+
+class Job(db.Model):
+    """A unit of background work run by ``flask worker`` (see jobs.py).
+
+    Workers take queued jobs whose ``run_at`` has passed, highest
+    ``priority`` first. ``locked_by``/``locked_at`` record the worker holding
+    a running job; a failed attempt returns the job to 'queued' with a later
+    ``run_at`` until ``max_attempts`` is reached. ``duration_ms`` is the
+    length of the last attempt.
+    """
+    __tablename__ = 'jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(JSON, nullable=False, default=dict)
+    priority = db.Column(db.Integer, nullable=False, default=50)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True, index=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_jobs_status_priority_run_at', 'status', 'priority', 'run_at'),
+    )
+
+    def __repr__(self): return f'<Job {self.id} {self.name} {self.status}>'
+
+
+class JobSchedule(db.Model):
+    """When a periodic job is next due; workers advance it to enqueue the job once per period."""
+    __tablename__ = 'job_schedules'
+    name = db.Column(db.String(100), primary_key=True)
+    next_run_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self): return f'<JobSchedule {self.name} next={self.next_run_at}>'
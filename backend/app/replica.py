@@ -0,0 +1,199 @@
+"""
+Optional read-replica routing for ``db.session``.
+
+When ``DATABASE_REPLICA_URL`` is set, SELECTs issued while handling GET,
+HEAD and OPTIONS requests run on the replica engine (the ``replica`` bind);
+everything else, and every flush, goes to the primary. Reads fall back to
+the primary when:
+
+* the client wrote recently: a successful mutating request marks the client
+  sticky for ``REPLICA_STICKY_SECONDS`` (via a cookie, and by Authorization
+  header within this process for clients that drop cookies), so users see
+  their own writes;
+* the replica lags: its replay delay, probed at most every
+  ``REPLICA_LAG_CHECK_SECONDS``, exceeds ``REPLICA_MAX_LAG_SECONDS`` or the
+  probe fails;
+* the session has flushed during the request, so later reads see the write.
+
+Views whose reads must be fresh opt out, per block or per view function::
+
+    with using_primary():
+        ...
+
+    @using_primary()
+    def get_thing(): ...
+
+Trying it locally: point ``DATABASE_REPLICA_URL`` at a second Postgres
+container restored from a dump of the primary, or at a copy of a SQLite
+database file (``sqlite:////tmp/magmon_replica.db``). Neither is in recovery,
+so the lag probe reports 0 and the stickiness window alone provides
+read-your-writes; the ``X-DB-Route`` response header shows where a request's
+reads were allowed to go.
+"""
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+
+REPLICA_BIND = 'replica'
+USE_REPLICA = 'use_replica'
+WROTE = 'wrote'
+STICKY_COOKIE = 'read_primary_until'
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# 0 when caught up (or not a standby at all), else seconds since the last replayed commit
+_PG_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class RoutingSession(Session):
+    """``db.session`` class sending reads to the replica while a request allows it."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and self.info.get(USE_REPLICA)
+            and not self._flushing
+            and getattr(clause, 'is_select', False)
+        ):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _pin_to_primary(session, flush_context):
+    """Once a request has written, its remaining reads must see the write."""
+    session.info[USE_REPLICA] = False
+    session.info[WROTE] = True
+
+
+def replica_lag(engine):
+    """Seconds the replica is behind the primary, or None when it cannot be probed."""
+    if engine.dialect.name != 'postgresql':
+        return 0.0
+    try:
+        with engine.connect() as connection:
+            return float(connection.execute(_PG_LAG_SQL).scalar() or 0)
+    except SQLAlchemyError as e:
+        current_app.logger.warning(f"Replica lag probe failed, reading from primary: {e}")
+        return None
+
+
+class ReplicaRouter:
+    """Per-app routing state: stickiness by client and the cached lag probe."""
+
+    def __init__(self, app):
+        self.sticky_seconds = float(app.config.get('REPLICA_STICKY_SECONDS', 5))
+        self.max_lag = float(app.config.get('REPLICA_MAX_LAG_SECONDS', 2))
+        self.check_interval = float(app.config.get('REPLICA_LAG_CHECK_SECONDS', 1))
+        self._sticky_until = {}
+        self._lag = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def replica_usable(self, engine) -> bool:
+        """Whether the replica's last probed lag is within bounds, probing if stale."""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            with self._lock:
+                if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                    self._lag = replica_lag(engine)
+                    self._checked_at = time.monotonic()
+        return self._lag is not None and self._lag <= self.max_lag
+
+    def is_sticky(self) -> bool:
+        """Whether the current client wrote within the stickiness window."""
+        now = time.time()
+        try:
+            if float(request.cookies.get(STICKY_COOKIE, 0)) > now:
+                return True
+        except ValueError:
+            pass
+        key = _client_key()
+        return key is not None and self._sticky_until.get(key, 0) > now
+
+    def mark_sticky(self, response):
+        """Send the current client's reads to the primary for the stickiness window."""
+        until = time.time() + self.sticky_seconds
+        key = _client_key()
+        if key is not None:
+            with self._lock:
+                if len(self._sticky_until) > 10000:
+                    now = time.time()
+                    self._sticky_until = {k: v for k, v in self._sticky_until.items() if v > now}
+                self._sticky_until[key] = until
+        response.set_cookie(STICKY_COOKIE, f"{until:.3f}", max_age=int(self.sticky_seconds) + 1,
+                            httponly=True, samesite='Lax')
+
+
+def _client_key():
+    authorization = request.headers.get('Authorization')
+    if not authorization:
+        return None
+    return hashlib.sha1(authorization.encode()).hexdigest()
+
+
+def init_replica(app):
+    """Register the replica bind and request hooks when a replica is configured.
+
+    Must run before ``db.init_app`` so the bind's engine is created with the others.
+    """
+    url = app.config.get('DATABASE_REPLICA_URL')
+    if not url:
+        return
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds[REPLICA_BIND] = url
+    app.config['SQLALCHEMY_BINDS'] = binds
+    router = app.extensions['replica'] = ReplicaRouter(app)
+
+    from . import db
+
+    @app.before_request
+    def _route_reads():
+        route = 'primary'
+        if request.method in SAFE_METHODS and not router.is_sticky():
+            if router.replica_usable(db.engines[REPLICA_BIND]):
+                route = 'replica'
+        db.session.info[USE_REPLICA] = route == 'replica'
+        g.db_route = route
+
+    @app.after_request
+    def _stick_after_write(response):
+        wrote = request.method not in SAFE_METHODS or db.session.info.get(WROTE)
+        if wrote and response.status_code < 400:
+            router.mark_sticky(response)
+        response.headers['X-DB-Route'] = g.get('db_route', 'primary')
+        return response
+
+    @app.teardown_request
+    def _reset_route(exc):
+        db.session.info.pop(USE_REPLICA, None)
+        db.session.info.pop(WROTE, None)
+
+
+@contextmanager
+def using_primary():
+    """Send every read on ``db.session`` to the primary for the enclosed block.
+
+    Also usable as a decorator on views that must not read stale data.
+    """
+    from . import db
+    info = db.session.info
+    previous = info.get(USE_REPLICA, False)
+    info[USE_REPLICA] = False
+    try:
+        yield
+    finally:
+        info[USE_REPLICA] = previous and not info.get(WROTE)
@@ -0,0 +1,276 @@
+"""
+JWT revocation without a database round trip per request.
+
+Revocations are rows in ``token_revocations`` (see TokenRevocation): one
+token by ``jti`` (logout), or every token of a user issued before a given
+second (demotion, password change or reset). Each worker mirrors the live
+rows in memory:
+
+* an exact ``jti -> exp`` map behind a Bloom filter, so the common case -
+  a token that was never revoked - costs one hash and a few bit tests, and
+  the rare Bloom false positive is settled by the map;
+* a ``user id -> cutoff`` map checked against the token's ``iat``.
+
+The worker that revokes a token applies it in memory as soon as its
+transaction commits. Other workers pick it up on their next sync, at most
+``JWT_REVOCATION_SYNC_SECONDS`` later; a sync reads only the rows revoked
+since the previous one (plus an overlap). Entries are dropped once the
+tokens they cover have expired; expired rows are deleted by the hourly
+``prune_token_revocations`` job.
+"""
+import calendar
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, select
+
+from . import db, jwt
+
+PENDING = 'pending_revocations'
+# Each sync re-reads rows revoked this long before the previous one, so rows
+# from late-committing transactions or workers with a lagging clock aren't missed
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def _epoch(value):
+    return calendar.timegm(value.utctimetuple())
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    The bit positions come from one blake2b digest by double hashing
+    (h1 + i * h2), sized for ``capacity`` keys at ``error_rate``.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationList:
+    """One worker's in-memory copy of the live revocations.
+
+    Lookups are lock-free; writers (commits and syncs) serialize on a lock and
+    replace the Bloom filter wholesale when it is rebuilt.
+    """
+
+    def __init__(self, sync_interval=2.0, capacity=10000, error_rate=0.001):
+        self.sync_interval = sync_interval
+        self.error_rate = error_rate
+        self._tokens = {}  # jti -> exp (epoch seconds)
+        self._users = {}  # str(user id), as in the "sub" claim -> (cutoff, expires) epoch seconds
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._next_sync = 0.0
+        self._synced_through = None
+        self.false_positives = 0
+
+    def is_revoked(self, payload):
+        """Whether a decoded token has been revoked."""
+        jti = payload.get('jti')
+        if jti is not None and jti in self._bloom:
+            if jti in self._tokens:
+                return True
+            self.false_positives += 1
+        cutoff = self._users.get(payload.get('sub'))
+        return cutoff is not None and payload.get('iat', 0) < cutoff[0]
+
+    def add_token(self, jti, expires):
+        with self._lock:
+            self._add_token(jti, expires)
+
+    def add_user(self, user_id, cutoff, expires):
+        with self._lock:
+            self._add_user(str(user_id), cutoff, expires)
+
+    def _add_token(self, jti, expires):
+        if jti in self._tokens:
+            return
+        self._tokens[jti] = expires
+        if self._bloom.count >= self._bloom.capacity:
+            self._rebuild(capacity=2 * max(len(self._tokens), self._bloom.capacity))
+        else:
+            self._bloom.add(jti)
+
+    def _add_user(self, key, cutoff, expires):
+        previous = self._users.get(key)
+        if previous is not None:
+            cutoff, expires = max(cutoff, previous[0]), max(expires, previous[1])
+        self._users[key] = (cutoff, expires)
+
+    def _rebuild(self, capacity=None):
+        bloom = BloomFilter(capacity or self._bloom.capacity, self.error_rate)
+        for jti in self._tokens:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def _prune(self, now):
+        expired = [jti for jti, expires in self._tokens.items() if expires <= now]
+        for jti in expired:
+            del self._tokens[jti]
+        for key in [key for key, (_, expires) in self._users.items() if expires <= now]:
+            del self._users[key]
+        # Expired keys stay set in the filter; rebuild once they dominate it
+        if expired and self._bloom.count > 2 * len(self._tokens) + 64:
+            self._rebuild()
+
+    def maybe_sync(self):
+        """Sync from the table when the interval has passed; one thread does it."""
+        if time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return
+            self._next_sync = time.monotonic() + self.sync_interval
+        try:
+            self.sync()
+        except Exception as e:
+            # Keep serving from memory; the next interval retries
+            db.session.rollback()
+            current_app.logger.error(f"Token revocation sync failed: {e}")
+
+    def sync(self):
+        """Load the revocations written since the last sync (all live ones the first time)."""
+        from .models import TokenRevocation
+        from .replica import using_primary
+
+        now = datetime.utcnow()
+        query = select(
+            TokenRevocation.jti, TokenRevocation.user_id, TokenRevocation.revoked_at, TokenRevocation.expires_at
+        ).where(TokenRevocation.expires_at > now)
+        if self._synced_through is not None:
+            query = query.where(TokenRevocation.revoked_at >= self._synced_through - SYNC_OVERLAP)
+        with using_primary():
+            rows = db.session.execute(query).all()
+
+        with self._lock:
+            for row in rows:
+                if row.jti is not None:
+                    self._add_token(row.jti, _epoch(row.expires_at))
+                elif row.user_id is not None:
+                    self._add_user(str(row.user_id), _epoch(row.revoked_at), _epoch(row.expires_at))
+            self._prune(_epoch(now))
+            self._synced_through = now
+            self._next_sync = time.monotonic() + self.sync_interval
+
+    def snapshot(self):
+        return {
+            "tokens": len(self._tokens),
+            "users": len(self._users),
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hashes,
+            "false_positives": self.false_positives,
+        }
+
+
+def _longest_token_lifetime():
+    lifetime = current_app.config.get('JWT_REFRESH_TOKEN_EXPIRES')
+    if isinstance(lifetime, timedelta):
+        return lifetime
+    if isinstance(lifetime, (int, float)) and not isinstance(lifetime, bool):
+        return timedelta(seconds=lifetime)
+    return timedelta(days=30)
+
+
+def _record(revocation):
+    db.session.add(revocation)
+    db.session.info.setdefault(PENDING, []).append(
+        (revocation.jti, revocation.user_id, revocation.revoked_at, revocation.expires_at)
+    )
+
+
+def prune_expired():
+    """Delete rows whose tokens have all expired; returns the count, not yet committed."""
+    from .models import TokenRevocation
+
+    return db.session.execute(
+        delete(TokenRevocation).where(TokenRevocation.expires_at <= datetime.utcnow())
+    ).rowcount
+
+
+def revoke_token(payload):
+    """Revoke one decoded token; takes effect when the session commits."""
+    from .models import TokenRevocation
+
+    try:
+        user_id = int(payload.get('sub'))
+    except (TypeError, ValueError):
+        user_id = None
+    _record(TokenRevocation(
+        jti=payload['jti'], user_id=user_id, revoked_at=datetime.utcnow(),
+        expires_at=datetime.utcfromtimestamp(payload['exp'])
+    ))
+
+
+def revoke_user_tokens(user_id):
+    """Revoke every token of a user issued before the current second.
+
+    Tokens issued later - including ones issued in the same second, right
+    after a password change - stay valid.
+    """
+    from .models import TokenRevocation
+
+    now = datetime.utcnow().replace(microsecond=0)
+    _record(TokenRevocation(user_id=user_id, revoked_at=now, expires_at=now + _longest_token_lifetime()))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_committed(session):
+    pending = session.info.pop(PENDING, None)
+    if not pending or not has_app_context() or 'revocation' not in current_app.extensions:
+        return
+    revocations = current_app.extensions['revocation']
+    for jti, user_id, revoked_at, expires_at in pending:
+        if jti is not None:
+            revocations.add_token(jti, _epoch(expires_at))
+        else:
+            revocations.add_user(user_id, _epoch(revoked_at), _epoch(expires_at))
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_rolled_back(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(PENDING, None)
+
+
+def init_revocation(app):
+    """Check every ``@jwt_required`` token against this worker's RevocationList."""
+    app.extensions['revocation'] = RevocationList(
+        app.config.get('JWT_REVOCATION_SYNC_SECONDS', 2.0),
+        app.config.get('JWT_REVOCATION_BLOOM_CAPACITY', 10000),
+        app.config.get('JWT_REVOCATION_BLOOM_ERROR_RATE', 0.001),
+    )
+
+    @jwt.token_in_blocklist_loader
+    def _token_revoked(jwt_header, jwt_payload):
+        revocations = current_app.extensions['revocation']
+        revocations.maybe_sync()
+        return revocations.is_revoked(jwt_payload)
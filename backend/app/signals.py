@@ -0,0 +1,31 @@
+"""
+Lifecycle signals for games and their results.
+
+Routes send these inside their transaction, before committing, so receivers
+that maintain derived data (statistics, read models) write through the same
+``db.session`` and commit or roll back together with the change itself.
+Receivers are called with the app as sender and the affected object as a
+keyword argument, e.g. ``game_deleted.send(app, game=game)``.
+"""
+from blinker import Namespace
+
+_signals = Namespace()
+
+# A game was created / had its fields or status changed; kwargs: game
+game_created = _signals.signal('game-created')
+game_updated = _signals.signal('game-updated')
+
+# A player registered for or unregistered from a game; kwargs: game
+registration_changed = _signals.signal('registration-changed')
+
+# Results were submitted, approved or rejected; kwargs: match
+match_submitted = _signals.signal('match-submitted')
+match_approved = _signals.signal('match-approved')
+match_rejected = _signals.signal('match-rejected')
+
+# An admin reverted approved results back to pending; kwargs: match
+match_unapproved = _signals.signal('match-unapproved')
+
+# A game was soft-deleted / restored by an admin; kwargs: game
+game_deleted = _signals.signal('game-deleted')
+game_restored = _signals.signal('game-restored')
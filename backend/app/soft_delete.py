@@ -0,0 +1,92 @@
+"""
+Global soft-delete filtering for games and the rows that hang off them.
+
+Every ORM SELECT issued through ``db.session`` automatically excludes
+soft-deleted games (``Game.deleted_at IS NOT NULL``) together with their
+matches, match results and registrations, so individual queries don't need
+to remember the filter. The exclusion is expressed against the small set of
+*deleted* games, which the partial index ``ix_games_deleted`` keeps cheap.
+
+Admin views that must see deleted games opt out, either per statement::
+
+    Game.query.execution_options(include_deleted=True)
+
+or for a whole block / view function::
+
+    with including_deleted():
+        ...
+
+    @including_deleted()
+    def restore_game(game_id): ...
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import with_loader_criteria
+
+from . import db
+
+INCLUDE_DELETED = 'include_deleted'
+
+
+# The subqueries use the Core tables so the ORM criteria are never applied to them.
+
+def _deleted_game_ids():
+    from .models import Game
+    games = Game.__table__
+    return select(games.c.id).where(games.c.deleted_at.isnot(None))
+
+
+def _deleted_match_ids():
+    from .models import Game, Match
+    games, matches = Game.__table__, Match.__table__
+    return select(matches.c.id).join(games, matches.c.game_id == games.c.id).where(games.c.deleted_at.isnot(None))
+
+
+def _soft_delete_criteria():
+    from .models import Game, GameSummary, Match, MatchPlayer, GameRegistration
+    return [
+        with_loader_criteria(Game, Game.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(GameSummary, GameSummary.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(
+            Match, or_(Match.game_id.is_(None), Match.game_id.notin_(_deleted_game_ids())), include_aliases=True
+        ),
+        with_loader_criteria(MatchPlayer, MatchPlayer.match_id.notin_(_deleted_match_ids()), include_aliases=True),
+        with_loader_criteria(
+            GameRegistration, GameRegistration.game_id.notin_(_deleted_game_ids()), include_aliases=True
+        ),
+    ]
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _filter_soft_deleted(orm_execute_state):
+    """Attach the soft-delete criteria to top-level ORM SELECTs.
+
+    Column refreshes and relationship loads are skipped: the criteria already
+    propagate to loaders from the parent query, and refreshing an object that
+    was just soft-deleted in this session must keep working.
+    """
+    if (
+        not orm_execute_state.is_select
+        or orm_execute_state.is_column_load
+        or orm_execute_state.is_relationship_load
+    ):
+        return
+    if orm_execute_state.execution_options.get(INCLUDE_DELETED) or orm_execute_state.session.info.get(INCLUDE_DELETED):
+        return
+    orm_execute_state.statement = orm_execute_state.statement.options(*_soft_delete_criteria())
+
+
+@contextmanager
+def including_deleted():
+    """Disable the soft-delete filter on ``db.session`` for the enclosed block.
+
+    Also usable as a decorator on admin views.
+    """
+    info = db.session.info
+    previous = info.get(INCLUDE_DELETED, False)
+    info[INCLUDE_DELETED] = True
+    try:
+        yield
+    finally:
+        info[INCLUDE_DELETED] = previous
@@ -0,0 +1,57 @@
+"""
+Background job handlers (see jobs.py for the queue and ``flask worker``).
+
+Handlers run inside an app context with a fresh session; the worker commits
+their writes together with the job's ``done`` status, so a handler that
+raises leaves no partial changes and is retried. Handlers may run more than
+once for the same job (a worker can die after the work but before the
+commit), so each one is idempotent.
+"""
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from .jobs import PRIORITY_HIGH, PRIORITY_LOW, job, purge_finished
+
+
+@job('store_avatar', priority=PRIORITY_HIGH)
+def store_avatar(user_id, staged, filename, avatar_url):
+    """Move an uploaded avatar from its staging file into place and point the user at it."""
+    from .api.services.profile_service import ProfileService
+    ProfileService.store_avatar(user_id, staged, filename, avatar_url)
+
+
+@job('rebuild_duration_groups', priority=PRIORITY_LOW)
+def rebuild_duration_groups(groups):
+    """Recompute the duration sketches of groups a match stopped counting in."""
+    from .api.services.duration_stats_service import DurationStatsService
+    DurationStatsService.rebuild_groups([tuple(group) for group in groups], lock=True)
+
+
+@job('recompute_card_stats', priority=PRIORITY_LOW, max_attempts=2)
+def recompute_card_stats():
+    """Rebuild card_stats from every counted match."""
+    from .api.services.card_stats_service import CardStatsService
+    written = CardStatsService.recompute_all()
+    current_app.logger.info(f"Recomputed card stats: {written} card rows")
+
+
+@job('clear_expired_temp_passwords', priority=PRIORITY_LOW, every=timedelta(hours=1))
+def clear_expired_temp_passwords():
+    """Drop temporary passwords that can no longer be used."""
+    from .api.services.user_service import UserService
+    UserService.clear_expired_temp_passwords()
+
+
+@job('prune_token_revocations', priority=PRIORITY_LOW, every=timedelta(hours=1))
+def prune_token_revocations():
+    """Delete revocation rows whose tokens have expired."""
+    from .revocation import prune_expired
+    prune_expired()
+
+
+@job('purge_finished_jobs', priority=PRIORITY_LOW, every=timedelta(hours=6))
+def purge_finished_jobs():
+    """Delete done and failed jobs past the retention period."""
+    retention = timedelta(days=current_app.config.get('JOB_RETENTION_DAYS', 7))
+    purge_finished(datetime.utcnow() - retention)
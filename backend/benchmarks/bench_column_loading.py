@@ -0,0 +1,204 @@
+"""
+Benchmark: deferred heavy columns and projection queries on list endpoints.
+
+Seeds an in-memory SQLite database with decks carrying full decklists,
+matches with notes and users with password hashes, then compares the
+previous whole-row loading (every column undeferred) with the current
+queries for the admin user list, a user's deck list and the match list.
+
+For each it reports the bytes fetched from the database (the summed size of
+every value in the result rows, captured at the cursor), the peak Python
+memory while querying and serializing (tracemalloc) and the median time.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_column_loading.py [--decks 2000] [--matches 5000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+os.environ.setdefault('TEST_DATABASE_URL', 'sqlite://')
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import aliased  # noqa: E402
+
+from backend.app import create_app, db  # noqa: E402
+from backend.app.models import Deck, Match, User  # noqa: E402
+
+DECKLIST = '\n'.join(f"1 Card Number {i} (SET) {i}" for i in range(100))
+NOTE = "Long discussion about the stack, triggers and who had priority. " * 8
+
+
+def seed(users, decks, matches):
+    now = datetime(2025, 1, 1)
+    db.session.bulk_insert_mappings(User, [{
+        "id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "$2b$12$" + "x" * 53,
+        "temp_password_hash": None, "registered_on": now, "is_admin": False, "must_change_password": False,
+    } for i in range(1, users + 1)])
+    db.session.bulk_insert_mappings(Deck, [{
+        "id": i, "user_id": 1 + i % 10, "name": f"Deck {i}", "commander": f"Commander {i % 50}", "colors": "WUBRG",
+        "decklist_text": DECKLIST, "created_at": now, "last_updated": now + timedelta(minutes=i),
+    } for i in range(1, decks + 1)])
+    db.session.bulk_insert_mappings(Match, [{
+        "id": i, "game_id": None, "player_count": 4, "status": "approved", "submitted_by_id": 1 + i % users,
+        "approved_by_id": 1 + (i + 1) % users, "created_at": now + timedelta(minutes=i), "approved_at": now,
+        "notes_big_interaction": NOTE, "notes_rules_discussion": NOTE, "notes_end_summary": NOTE,
+        "approval_notes": NOTE,
+    } for i in range(1, matches + 1)])
+    db.session.commit()
+
+
+# --- Previous implementations: whole rows, every column loaded ---
+
+def users_before():
+    return [{"id": u.id, "username": u.username, "email": u.email, "avatar_url": u.avatar_url,
+             "must_change_password": u.must_change_password, "is_admin": u.is_admin}
+            for u in User.query.options(db.undefer('*')).all()]
+
+
+def decks_before():
+    return [{"id": d.id, "name": d.name, "commander": d.commander, "colors": d.colors,
+             "last_updated": d.last_updated.isoformat()}
+            for d in Deck.query.options(db.undefer('*')).filter_by(user_id=1).order_by(Deck.last_updated.desc())]
+
+
+def matches_before():
+    return [{"match_id": m.id, "status": m.status, "submitted_by": m.submitter.username,
+             "approved_by": m.approver.username if m.approved_by_id else None,
+             "created_at": m.created_at.isoformat()}
+            for m in Match.query.options(db.undefer('*')).order_by(Match.created_at.desc()).all()]
+
+
+# --- Current implementations: deferred columns and projections ---
+
+def users_after():
+    return [{"id": u.id, "username": u.username, "email": u.email, "avatar_url": u.avatar_url,
+             "must_change_password": u.must_change_password, "is_admin": u.is_admin}
+            for u in db.session.query(User.id, User.username, User.email, User.avatar_url,
+                                      User.must_change_password, User.is_admin).all()]
+
+
+def decks_after():
+    return [{"id": d.id, "name": d.name, "commander": d.commander, "colors": d.colors,
+             "last_updated": d.last_updated.isoformat()}
+            for d in db.session.query(Deck.id, Deck.name, Deck.commander, Deck.colors, Deck.last_updated)
+            .filter_by(user_id=1).order_by(Deck.last_updated.desc())]
+
+
+def matches_after():
+    submitter, approver = aliased(User), aliased(User)
+    rows = db.session.query(
+        Match.id, Match.status, Match.created_at, submitter.username.label('submitted_by'),
+        approver.username.label('approved_by')
+    ).join(submitter, submitter.id == Match.submitted_by_id).outerjoin(
+        approver, approver.id == Match.approved_by_id
+    ).order_by(Match.created_at.desc()).all()
+    return [{"match_id": m.id, "status": m.status, "submitted_by": m.submitted_by, "approved_by": m.approved_by,
+             "created_at": m.created_at.isoformat()} for m in rows]
+
+
+class FetchedBytes:
+    """Sums the size of every value the cursor returns while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.total = 0
+
+    def _size(self, value):
+        if value is None:
+            return 0
+        if isinstance(value, (bytes, str)):
+            return len(value)
+        return 8
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if cursor.description is None:
+            return
+        rows = cursor.fetchall()
+        self.total += sum(self._size(v) for row in rows for v in row)
+        # Hand the rows back to the ORM
+        context.cursor = _Replay(cursor, rows)
+
+    def __enter__(self):
+        event.listen(self.engine, 'after_cursor_execute', self._after)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'after_cursor_execute', self._after)
+
+
+class _Replay:
+    def __init__(self, cursor, rows):
+        self.description = cursor.description
+        self.rowcount = cursor.rowcount
+        self.lastrowid = cursor.lastrowid
+        self._rows = rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=None):
+        size = size or 1
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+def measure(fn, repeat):
+    db.session.expunge_all()
+    with FetchedBytes(db.engine) as fetched:
+        fn()
+    db.session.expunge_all()
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return fetched.total, peak, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--decks', type=int, default=2000)
+    parser.add_argument('--matches', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('testing', mode='cli')
+    with app.app_context():
+        db.create_all()
+        seed(args.users, args.decks, args.matches)
+        print(f"{'endpoint':<12} {'variant':<8} {'fetched':>10} {'peak mem':>10} {'median':>9}")
+        for name, before, after in (('admin users', users_before, users_after),
+                                    ('user decks', decks_before, decks_after),
+                                    ('matches', matches_before, matches_after)):
+            results = {}
+            for variant, fn in (('before', before), ('after', after)):
+                fetched, peak, median = results[variant] = measure(fn, args.repeat)
+                print(f"{name:<12} {variant:<8} {fetched / 1024:8.1f}KB {peak / 1024:8.1f}KB {median * 1000:7.1f}ms")
+            (b_fetched, b_peak, _), (a_fetched, a_peak, _) = results['before'], results['after']
+            print(f"{'':<12} {'saved':<8} {1 - a_fetched / b_fetched:9.0%} {1 - a_peak / b_peak:10.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: compression of a large list response.
+
+Serializes a ``/games``-shaped payload and reports, per available encoding
+and level, the compression ratio and time, next to the cost of a
+compressed-body cache hit (hashing the body plus the lookup).
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_compression.py [--rows 2000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from backend.app.compression import ENCODERS, ResponseCompressor  # noqa: E402
+
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 5, 11), 'zstd': (1, 3, 9)}
+
+
+class _App:
+    def __init__(self, encoding, level):
+        self.config = {'COMPRESS_LEVELS': {encoding: level}, 'COMPRESS_ALGORITHMS': (encoding,),
+                       'COMPRESS_CACHE_BYTES': 64 * 1024 * 1024}
+
+
+def make_body(rows):
+    games = [{
+        "id": i, "game_date": f"2020-{1 + i % 12:02d}-{1 + i % 28:02d}", "status": "completed",
+        "is_pauper": i % 5 == 0, "details": "Weekly pod night at the store", "match_id": i,
+        "match_status": "approved", "submitted_by_id": i % 40, "registration_count": 4,
+        "winner_id": i % 40, "winner_username": f"player{i % 40}",
+    } for i in range(rows)]
+    return json.dumps(games, sort_keys=True).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    body = make_body(args.rows)
+    print(f"payload: {len(body) / 1024:.1f} KiB, encodings available: {', '.join(ENCODERS)}")
+    for encoding in ENCODERS:
+        for level in LEVELS[encoding]:
+            compressor = ResponseCompressor(_App(encoding, level))
+            compressed = ENCODERS[encoding](body, level)
+            miss = min(timeit.repeat(lambda: ENCODERS[encoding](body, level), number=1, repeat=args.repeat))
+            compressor.compress(body, encoding)
+            hit = min(timeit.repeat(lambda: compressor.compress(body, encoding), number=1, repeat=args.repeat))
+            print(f"{encoding:>4} level {level:>2}: ratio {len(body) / len(compressed):5.1f}x  "
+                  f"compress {miss * 1000:7.2f} ms  cache hit {hit * 1000:6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
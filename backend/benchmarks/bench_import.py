@@ -0,0 +1,88 @@
+"""
+Benchmark: cold start of the application factory.
+
+Boots the app in fresh interpreters (``python -X importtime``) in web and
+CLI mode and reports the median time to import ``backend.app`` and run
+``create_app``, plus the heaviest imports of the last run. Exits non-zero
+when a mode exceeds its budget or when a deferred dependency (NumPy,
+Alembic/Flask-Migrate) is back on the boot path, so it can gate CI.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_import.py [--runs 5] [--web-budget-ms 1000] [--cli-budget-ms 900]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Only needed by specific routes or by `flask db`; importing them at boot is a regression
+DEFERRED = ('numpy', 'flask_migrate', 'alembic')
+
+BOOT = """
+import sys, time
+started = time.perf_counter()
+from backend.app import create_app
+create_app('testing', mode={mode!r})
+print('BOOT_MS', (time.perf_counter() - started) * 1000)
+print('LOADED', ','.join(m for m in {deferred!r} if m in sys.modules))
+"""
+
+
+def boot_once(mode):
+    """Boot the app once in a fresh interpreter; return (ms, deferred modules loaded, importtime rows)."""
+    env = dict(os.environ, TEST_DATABASE_URL='sqlite://', PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT.format(mode=mode, deferred=DEFERRED)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    boot_ms, loaded = None, []
+    for line in result.stdout.splitlines():
+        if line.startswith('BOOT_MS'):
+            boot_ms = float(line.split()[1])
+        elif line.startswith('LOADED'):
+            loaded = [m for m in line.split(' ', 1)[1].split(',') if m] if ' ' in line else []
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace('import time:', '|').split('|')]
+        rows.append((int(cumulative_us), int(self_us), name))
+    return boot_ms, loaded, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12, help='Heaviest imports to list per mode')
+    parser.add_argument('--web-budget-ms', type=float, default=1000)
+    parser.add_argument('--cli-budget-ms', type=float, default=900)
+    args = parser.parse_args()
+
+    budgets = {'web': args.web_budget_ms, 'cli': args.cli_budget_ms}
+    failures = []
+    for mode, budget in budgets.items():
+        timings, loaded, rows = [], [], []
+        for _ in range(args.runs):
+            boot_ms, loaded, rows = boot_once(mode)
+            timings.append(boot_ms)
+        median = statistics.median(timings)
+        print(f"{mode:>4}: median {median:7.1f} ms  min {min(timings):7.1f} ms  budget {budget:.0f} ms")
+        for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"        {cumulative_us / 1000:7.1f} ms cumulative  {self_us / 1000:6.1f} ms self  {name}")
+        if median > budget:
+            failures.append(f"{mode} boot {median:.1f} ms exceeds budget {budget:.0f} ms")
+        if loaded:
+            failures.append(f"{mode} boot imports deferred modules: {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
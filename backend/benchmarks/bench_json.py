@@ -0,0 +1,72 @@
+"""
+Benchmark: JSON serialization of the large list endpoints.
+
+Compares the previous path (Flask's default provider with ``dataclasses.asdict``
+in the route) against the stdlib FastJSONProvider and the orjson provider.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_json.py [--rows 5000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import timeit
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+os.environ.setdefault('TEST_DATABASE_URL', 'sqlite://')
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.app.json_provider import FastJSONProvider, OrjsonProvider, orjson  # noqa: E402
+from backend.app.api.schemas.deck_schemas import DeckVersionListResponse, DeckHistoryEntry  # noqa: E402
+from backend.app.models import GameStatus  # noqa: E402
+
+
+def make_payloads(rows):
+    now = datetime(2025, 1, 1, 19, 30)
+    games = [{
+        "id": i, "game_date": (date(2020, 1, 1) + timedelta(days=i)).isoformat(), "status": GameStatus.COMPLETED.value,
+        "is_pauper": i % 5 == 0, "details": "Weekly pod night at the store", "match_id": i,
+        "match_status": "approved", "submitted_by_id": i % 40, "registration_count": 4,
+        "winner_id": i % 40, "winner_username": f"player{i % 40}",
+    } for i in range(rows)]
+    versions = [DeckVersionListResponse(
+        id=i, version_number=i, created_at=(now + timedelta(hours=i)).isoformat(),
+        notes="Swapped removal for card draw", is_current=i == rows - 1,
+    ) for i in range(rows)]
+    history = [DeckHistoryEntry(game_id=i, game_date=date(2020, 1, 1).isoformat(), placement=(i % 4) + 1,
+                                version_number=i % 7) for i in range(rows)]
+    return {'GET /games': games, 'GET /decks/<id>/versions': versions, 'GET /decks/<id>/history': history}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    providers = {'before (default + asdict)': DefaultJSONProvider(app), 'FastJSONProvider': FastJSONProvider(app)}
+    if orjson is not None:
+        providers['OrjsonProvider'] = OrjsonProvider(app)
+
+    with app.app_context():
+        for endpoint, payload in make_payloads(args.rows).items():
+            print(f"{endpoint} ({args.rows} rows)")
+            baseline = None
+            for name, provider in providers.items():
+                if name.startswith('before'):
+                    fn = lambda p=provider: p.response([asdict(x) if not isinstance(x, dict) else x for x in payload])  # noqa: E731
+                else:
+                    fn = lambda p=provider: p.response(payload)  # noqa: E731
+                per_call = min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+                baseline = baseline or per_call
+                print(f"  {name:<28} {per_call:8.2f} ms  ({baseline / per_call:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
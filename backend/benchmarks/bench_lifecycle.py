@@ -0,0 +1,104 @@
+"""
+Benchmark: throughput of concurrent game lifecycle transitions.
+
+Seeds games with two registered players each on a file-backed database, then
+fires overlapping submit requests and racing approve / reject requests from a
+thread pool - the load tests/test_lifecycle_concurrency.py checks the
+invariants of - and reports transitions per second for each phase. A low rate
+points at transitions serializing on lock timeouts.
+
+Runs on a temporary SQLite file, or on TEST_DATABASE_URL when it is Postgres.
+Run from the repository root:
+
+    python backend/benchmarks/bench_lifecycle.py [--games 40] [--submits 5] [--workers 12]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+if not os.environ.get('TEST_DATABASE_URL', '').startswith('postgresql'):
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'lifecycle.db')}"
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from backend.app import create_app, db  # noqa: E402
+from backend.app.config import TestingConfig  # noqa: E402
+from backend.app.models import Deck, Match, User  # noqa: E402
+
+
+def seed(app, games):
+    users = [User(username=f"player{i}", email=f"player{i}@example.com", password_hash="x") for i in range(6)]
+    db.session.add_all(users)
+    db.session.flush()
+    decks = [Deck(user_id=u.id, name=f"deck {u.id}", commander="cmdr", colors="G") for u in users]
+    db.session.add_all(decks)
+    db.session.commit()
+
+    with app.test_request_context():
+        headers = {u.id: {'Authorization': f'Bearer {create_access_token(identity=str(u.id))}'} for u in users}
+    client = app.test_client()
+    game_ids = []
+    for i in range(games):
+        game_date = (date(2024, 1, 1) + timedelta(days=i)).isoformat()
+        game_id = client.post('/api/games', json={'game_date': game_date}).get_json()['game']['id']
+        for user, deck in zip(users[:2], decks[:2]):
+            client.post(f'/api/games/{game_id}/registrations', json={'deck_id': deck.id}, headers=headers[user.id])
+        game_ids.append(game_id)
+    return [u.id for u in users], headers, game_ids
+
+
+def fire(app, calls, workers):
+    """Run ``(method, url, json, headers)`` calls concurrently; returns status counts and calls per second."""
+    def call(args):
+        method, url, body, headers = args
+        return getattr(app.test_client(), method)(url, json=body, headers=headers).status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = Counter(pool.map(call, calls))
+    return statuses, len(calls) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=40)
+    parser.add_argument('--submits', type=int, default=5, help='Concurrent submissions per game')
+    parser.add_argument('--approves', type=int, default=3, help='Approvals racing per match')
+    parser.add_argument('--rejects', type=int, default=2, help='Rejections racing per match')
+    parser.add_argument('--workers', type=int, default=12)
+    args = parser.parse_args()
+
+    if TestingConfig.SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        TestingConfig.SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}}
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user_ids, headers, game_ids = seed(app, args.games)
+        players, reviewers = user_ids[:2], user_ids[2:]
+        placements = [{'user_id': players[0], 'placement': 1}, {'user_id': players[1], 'placement': 2}]
+
+        submits = [('post', '/api/matches', {'game_id': game_id, 'placements': placements}, headers[players[n % 2]])
+                   for n in range(args.submits) for game_id in game_ids]
+        statuses, rate = fire(app, submits, args.workers)
+        print(f"submit:  {len(submits):5d} requests {rate:8.0f}/s  {dict(sorted(statuses.items()))}")
+
+        reviews = []
+        for match in db.session.query(Match):
+            reviews += [('patch', f'/api/matches/{match.id}/approve', {}, headers[reviewers[n % len(reviewers)]])
+                        for n in range(args.approves)]
+            reviews += [('patch', f'/api/matches/{match.id}/reject', {'approval_notes': 'wrong'},
+                         headers[reviewers[n % len(reviewers)]]) for n in range(args.rejects)]
+        statuses, rate = fire(app, reviews, args.workers)
+        print(f"review:  {len(reviews):5d} requests {rate:8.0f}/s  {dict(sorted(statuses.items()))}")
+        db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,7 @@ try:
     from app.models import GameNight, GameNightRegistration, User, Deck
 
     print("Creating app context...")
-    app = create_app()
+    app = create_app(mode='cli')
     app.app_context().push()
     print("App context pushed.")
 
@@ -1,19 +1,39 @@
-from app import create_app
-from app.models import Game, MatchPlayer, GameStatus
-
-app = create_app()
-with app.app_context():
-    games = Game.query.filter_by(status=GameStatus.COMPLETED).all()
-    print(f"Found {len(games)} completed games")
-
-    for g in games:
-        match = g.matches.first()
-        if match and match.status == "approved":
-            print(f"Game {g.id} has approved match {match.id}")
-            winner = MatchPlayer.query.filter_by(
-                match_id=match.id, placement=1
-            ).first()  # noqa: E501
-            if winner:
-                print(f"  Winner: User {winner.user_id}")
+import logging
+
+from sqlalchemy import select
+from app.data_migration import DataMigration, run_cli
+from app.models import Match, MatchPlayer
+
+logger = logging.getLogger(__name__)
+
+
+class CheckWinners(DataMigration):
+    """Reports approved matches and their winners, flagging matches with no first place."""
+    name = 'check_winners'
+    model = Match
+    resumable = False
+
+    def statement(self):
+        return select(Match).where(Match.status == "approved")
+
+    def process_batch(self, session, matches):
+        winners = dict(session.execute(
+            select(MatchPlayer.match_id, MatchPlayer.user_id).where(
+                MatchPlayer.match_id.in_([m.id for m in matches]), MatchPlayer.placement == 1
+            )
+        ).all())
+        missing = 0
+        for match in matches:
+            if match.id in winners:
+                logger.info("Game %s has approved match %s, winner: User %s", match.game_id, match.id, winners[match.id])
             else:
-                print("  No winner found")
+                logger.warning("Game %s has approved match %s with no winner found", match.game_id, match.id)
+                missing += 1
+        return missing
+
+    def finish(self, session, stats):
+        logger.info("Checked %d approved matches, %d without a winner.", stats.processed, stats.changed)
+
+
+if __name__ == "__main__":
+    run_cli(CheckWinners)
@@ -9,7 +9,7 @@ try:
     from app.models import Match, MatchPlayer  # Import MatchPlayer
 
     print("Creating app context...")
-    app = create_app()
+    app = create_app(mode='cli')
     app.app_context().push()
     print("App context pushed.")
 
@@ -0,0 +1,22 @@
+# Gunicorn settings for the backend container (Dockerfile CMD, docker-compose).
+#
+# Admission control (app/admission.py) limits concurrency per route class
+# within one process, so each worker must run more threads than any class's
+# limit - with sync workers every process serves one request at a time and no
+# class ever queues or sheds. Tune with GUNICORN_WORKERS / GUNICORN_THREADS.
+import os
+
+from backend.app.config import Config
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5004')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+timeout = 120  # Allows for potentially slow initialization
+
+if Config.ADMISSION_CONTROL:
+    _too_high = sorted(name for name, limits in Config.ADMISSION_LIMITS.items() if limits['concurrency'] >= threads)
+    if _too_high:
+        raise RuntimeError(
+            f"GUNICORN_THREADS={threads} must exceed the admission limits of: {', '.join(_too_high)}"
+        )
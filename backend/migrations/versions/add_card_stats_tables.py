@@ -0,0 +1,113 @@
+"""Add card_stats and card_scope_totals tables
+
+Revision ID: add_card_stats_tables
+Revises: add_duration_sketches_table
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.app.api.utils.decklist import parse_cards
+
+# revision identifiers, used by Alembic.
+revision = 'add_card_stats_tables'
+down_revision = 'add_duration_sketches_table'
+branch_labels = None
+depends_on = None
+
+# The tables as of this revision; the app's models may have moved on since
+matches = sa.table('matches', sa.column('id', sa.Integer), sa.column('game_id', sa.Integer),
+                   sa.column('status', sa.String), sa.column('season_number', sa.Integer))
+games = sa.table('games', sa.column('id', sa.Integer), sa.column('deleted_at', sa.DateTime))
+match_players = sa.table('match_players', sa.column('match_id', sa.Integer), sa.column('deck_id', sa.Integer),
+                         sa.column('deck_version_id', sa.Integer), sa.column('placement', sa.Integer))
+decks = sa.table('decks', sa.column('id', sa.Integer), sa.column('commander', sa.String))
+deck_versions = sa.table('deck_versions', sa.column('id', sa.Integer), sa.column('decklist_text', sa.Text))
+card_stats = sa.table('card_stats', sa.column('scope', sa.String), sa.column('scope_key', sa.String),
+                      sa.column('card_key', sa.String), sa.column('card_name', sa.String),
+                      sa.column('appearances', sa.Integer), sa.column('wins', sa.Integer))
+card_scope_totals = sa.table('card_scope_totals', sa.column('scope', sa.String), sa.column('scope_key', sa.String),
+                             sa.column('decks', sa.Integer), sa.column('wins', sa.Integer))
+
+def populate(connection):
+    """Write every counter from the counted matches, as CardStatsService.recompute_all would."""
+    plays = connection.execute(
+        sa.select(match_players.c.deck_version_id, match_players.c.placement, matches.c.season_number,
+                  decks.c.commander)
+        .select_from(match_players.join(matches, matches.c.id == match_players.c.match_id)
+                     .outerjoin(games, games.c.id == matches.c.game_id)
+                     .join(decks, decks.c.id == match_players.c.deck_id))
+        .where(matches.c.status == 'approved', games.c.deleted_at.is_(None),
+               match_players.c.deck_version_id.isnot(None), match_players.c.placement.isnot(None))
+    ).all()
+
+    totals = defaultdict(lambda: [0, 0])
+    by_version = defaultdict(list)
+    for version_id, placement, season_number, commander in plays:
+        scopes = [('all', '')] + ([('season', str(season_number))] if season_number is not None else [])
+        scopes.append(('commander', commander))
+        won = int(placement == 1)
+        by_version[version_id].append((scopes, won))
+        for scope in scopes:
+            totals[scope][0] += 1
+            totals[scope][1] += won
+
+    # Each decklist is parsed once however often its version was played
+    counts = defaultdict(lambda: [0, 0])
+    names = {}
+    decklists = connection.execute(
+        sa.select(deck_versions.c.id, deck_versions.c.decklist_text).where(deck_versions.c.id.in_(list(by_version)))
+    ).all() if by_version else []
+    for version_id, decklist_text in decklists:
+        cards = parse_cards(decklist_text)
+        for key, name in cards.items():
+            names.setdefault(key, name)
+        for scopes, won in by_version[version_id]:
+            for scope, scope_key in scopes:
+                for key in cards:
+                    entry = counts[(scope, scope_key, key)]
+                    entry[0] += 1
+                    entry[1] += won
+
+    if totals:
+        connection.execute(sa.insert(card_scope_totals), [
+            {"scope": scope, "scope_key": scope_key, "decks": decks_played, "wins": wins}
+            for (scope, scope_key), (decks_played, wins) in totals.items()
+        ])
+    if counts:
+        connection.execute(sa.insert(card_stats), [
+            {"scope": scope, "scope_key": scope_key, "card_key": key, "card_name": names[key],
+             "appearances": appearances, "wins": wins}
+            for (scope, scope_key, key), (appearances, wins) in counts.items()
+        ])
+    return len(counts)
+
+def upgrade():
+    # Filled from history here, so the card leaderboard is complete straight after
+    # the upgrade; scripts/recompute_card_stats.py rebuilds the tables if they ever drift
+    op.create_table('card_stats',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('scope_key', sa.String(length=100), nullable=False),
+        sa.Column('card_key', sa.String(length=200), nullable=False),
+        sa.Column('card_name', sa.String(length=200), nullable=False),
+        sa.Column('appearances', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_key', 'card_key')
+    )
+    op.create_index('ix_card_stats_scope_appearances', 'card_stats', ['scope', 'scope_key', 'appearances'], unique=False)
+    op.create_table('card_scope_totals',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('scope_key', sa.String(length=100), nullable=False),
+        sa.Column('decks', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_key')
+    )
+    populate(op.get_bind())
+
+def downgrade():
+    op.drop_table('card_scope_totals')
+    op.drop_index('ix_card_stats_scope_appearances', table_name='card_stats')
+    op.drop_table('card_stats')
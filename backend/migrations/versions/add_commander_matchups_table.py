@@ -0,0 +1,102 @@
+"""Add commander_matchups pairwise statistics table
+
+Revision ID: add_commander_matchups_table
+Revises: add_player_weekly_stats_table
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import datetime
+from itertools import groupby, permutations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_commander_matchups_table'
+down_revision = 'add_player_weekly_stats_table'
+branch_labels = None
+depends_on = None
+
+# The tables as of this revision; the app's models may have moved on since
+matches = sa.table('matches', sa.column('id', sa.Integer), sa.column('game_id', sa.Integer),
+                   sa.column('status', sa.String), sa.column('season_number', sa.Integer))
+games = sa.table('games', sa.column('id', sa.Integer), sa.column('is_pauper', sa.Boolean),
+                 sa.column('deleted_at', sa.DateTime))
+match_players = sa.table('match_players', sa.column('match_id', sa.Integer), sa.column('user_id', sa.Integer),
+                         sa.column('deck_id', sa.Integer), sa.column('placement', sa.Integer))
+decks = sa.table('decks', sa.column('id', sa.Integer), sa.column('commander', sa.String))
+commander_matchups = sa.table(
+    'commander_matchups', sa.column('scope', sa.String), sa.column('scope_key', sa.String),
+    sa.column('commander', sa.String), sa.column('opponent', sa.String), sa.column('games', sa.Integer),
+    sa.column('wins', sa.Integer), sa.column('losses', sa.Integer), sa.column('win_rate', sa.Float),
+    sa.column('updated_at', sa.DateTime)
+)
+
+def populate(connection):
+    """Write every commander pair from the counted matches, as CommanderMatchupService.rebuild would."""
+    plays = connection.execute(
+        sa.select(match_players.c.match_id, matches.c.season_number, games.c.is_pauper,
+                  match_players.c.user_id, decks.c.commander, match_players.c.placement)
+        .select_from(match_players.join(matches, matches.c.id == match_players.c.match_id)
+                     .outerjoin(games, games.c.id == matches.c.game_id)
+                     .join(decks, decks.c.id == match_players.c.deck_id))
+        .where(matches.c.status == 'approved', games.c.deleted_at.is_(None), match_players.c.placement.isnot(None))
+        .order_by(match_players.c.match_id)
+    )
+
+    totals = defaultdict(lambda: [0, 0, 0])
+    for _, pod in groupby(plays, key=lambda play: play.match_id):
+        pod = list(pod)
+        scopes = [('all', '')]
+        if pod[0].season_number is not None:
+            scopes.append(('season', str(pod[0].season_number)))
+        if pod[0].is_pauper:
+            scopes.append(('pauper', ''))
+        # Ordered pairs of different players with different commanders
+        for play, other in permutations(pod, 2):
+            if play.user_id == other.user_id or play.commander == other.commander:
+                continue
+            for scope, scope_key in scopes:
+                entry = totals[(scope, scope_key, play.commander, other.commander)]
+                entry[0] += 1
+                entry[1] += play.placement < other.placement
+                entry[2] += play.placement > other.placement
+
+    if totals:
+        connection.execute(sa.insert(commander_matchups), [
+            {"scope": scope, "scope_key": scope_key, "commander": commander, "opponent": opponent,
+             "games": games_played, "wins": wins, "losses": losses, "win_rate": wins / games_played,
+             "updated_at": datetime.utcnow()}
+            for (scope, scope_key, commander, opponent), (games_played, wins, losses) in totals.items()
+        ])
+    return len(totals)
+
+def upgrade():
+    # Filled from history here, so matchups are complete straight after the upgrade;
+    # scripts/backfill_commander_matchups.py rebuilds the table if it ever drifts
+    op.create_table('commander_matchups',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('scope_key', sa.String(length=100), nullable=False),
+        sa.Column('commander', sa.String(length=100), nullable=False),
+        sa.Column('opponent', sa.String(length=100), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('win_rate', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_key', 'commander', 'opponent')
+    )
+    with op.batch_alter_table('commander_matchups', schema=None) as batch_op:
+        batch_op.create_index('ix_commander_matchups_win_rate',
+                              ['scope', 'scope_key', 'commander', 'win_rate', 'games', 'opponent'], unique=False)
+        batch_op.create_index('ix_commander_matchups_games',
+                              ['scope', 'scope_key', 'commander', 'games', 'opponent'], unique=False)
+    populate(op.get_bind())
+
+def downgrade():
+    with op.batch_alter_table('commander_matchups', schema=None) as batch_op:
+        batch_op.drop_index('ix_commander_matchups_games')
+        batch_op.drop_index('ix_commander_matchups_win_rate')
+
+    op.drop_table('commander_matchups')
@@ -0,0 +1,68 @@
+"""Add deck_stats aggregates table
+
+Revision ID: add_deck_stats_table
+Revises: add_jobs_tables
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_deck_stats_table'
+down_revision = 'add_jobs_tables'
+branch_labels = None
+depends_on = None
+
+# Same aggregate as DeckStatsService.recompute, for every deck that has been played
+POPULATE = (
+    "INSERT INTO deck_stats (deck_id, user_id, current_version_id, games, wins, placement_sum,"
+    " win_rate, avg_placement, last_played, updated_at) "
+    "SELECT decks.id, decks.user_id, decks.current_version_id, COUNT(match_players.id),"
+    " SUM(CASE WHEN match_players.placement = 1 THEN 1 ELSE 0 END), SUM(match_players.placement),"
+    " CAST(SUM(CASE WHEN match_players.placement = 1 THEN 1 ELSE 0 END) AS FLOAT) / COUNT(match_players.id),"
+    " CAST(SUM(match_players.placement) AS FLOAT) / COUNT(match_players.id),"
+    " MAX(games.game_date), CURRENT_TIMESTAMP "
+    "FROM match_players JOIN matches ON matches.id = match_players.match_id "
+    "LEFT JOIN games ON games.id = matches.game_id JOIN decks ON decks.id = match_players.deck_id "
+    "WHERE matches.status = 'approved' AND match_players.placement IS NOT NULL AND games.deleted_at IS NULL "
+    "GROUP BY decks.id, decks.user_id, decks.current_version_id"
+)
+
+def upgrade():
+    # Filled from history here, so deck lists show stats straight after the upgrade;
+    # scripts/backfill_deck_stats.py rebuilds the table if it ever drifts
+    op.create_table('deck_stats',
+        sa.Column('deck_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('current_version_id', sa.Integer(), nullable=True),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('placement_sum', sa.Integer(), nullable=False),
+        sa.Column('win_rate', sa.Float(), nullable=True),
+        sa.Column('avg_placement', sa.Float(), nullable=True),
+        sa.Column('last_played', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['deck_id'], ['decks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['current_version_id'], ['deck_versions.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('deck_id')
+    )
+    with op.batch_alter_table('deck_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_deck_stats_user_id'), ['user_id'], unique=False)
+        batch_op.create_index('ix_deck_stats_win_rate', ['win_rate', 'games'], unique=False)
+        batch_op.create_index('ix_deck_stats_wins', ['wins', 'games'], unique=False)
+        batch_op.create_index('ix_deck_stats_games', ['games'], unique=False)
+        batch_op.create_index('ix_deck_stats_avg_placement', ['avg_placement', 'games'], unique=False)
+        batch_op.create_index('ix_deck_stats_last_played', ['last_played'], unique=False)
+    op.execute(POPULATE)
+
+def downgrade():
+    with op.batch_alter_table('deck_stats', schema=None) as batch_op:
+        batch_op.drop_index('ix_deck_stats_last_played')
+        batch_op.drop_index('ix_deck_stats_avg_placement')
+        batch_op.drop_index('ix_deck_stats_games')
+        batch_op.drop_index('ix_deck_stats_wins')
+        batch_op.drop_index('ix_deck_stats_win_rate')
+        batch_op.drop_index(batch_op.f('ix_deck_stats_user_id'))
+    op.drop_table('deck_stats')
@@ -0,0 +1,54 @@
+"""Add deck_version_stats aggregates table
+
+Revision ID: add_deck_version_stats_table
+Revises: add_head_to_head_table
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_deck_version_stats_table'
+down_revision = 'add_head_to_head_table'
+branch_labels = None
+depends_on = None
+
+# Same aggregate as DeckVersionStatsService.recompute, for every version that has been played
+POPULATE = (
+    "INSERT INTO deck_version_stats (deck_version_id, deck_id, games, wins, placement_sum,"
+    " first_played, last_played, updated_at) "
+    "SELECT deck_versions.id, deck_versions.deck_id, COUNT(match_players.id),"
+    " SUM(CASE WHEN match_players.placement = 1 THEN 1 ELSE 0 END), SUM(match_players.placement),"
+    " MIN(games.game_date), MAX(games.game_date), CURRENT_TIMESTAMP "
+    "FROM match_players JOIN matches ON matches.id = match_players.match_id "
+    "LEFT JOIN games ON games.id = matches.game_id "
+    "JOIN deck_versions ON deck_versions.id = match_players.deck_version_id "
+    "WHERE matches.status = 'approved' AND match_players.placement IS NOT NULL AND games.deleted_at IS NULL "
+    "GROUP BY deck_versions.id, deck_versions.deck_id"
+)
+
+def upgrade():
+    # Filled from history here, so version stats are complete straight after the
+    # upgrade; scripts/backfill_deck_version_stats.py rebuilds the table if it ever drifts
+    op.create_table('deck_version_stats',
+        sa.Column('deck_version_id', sa.Integer(), nullable=False),
+        sa.Column('deck_id', sa.Integer(), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('placement_sum', sa.Integer(), nullable=False),
+        sa.Column('first_played', sa.Date(), nullable=True),
+        sa.Column('last_played', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['deck_version_id'], ['deck_versions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['deck_id'], ['decks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('deck_version_id')
+    )
+    with op.batch_alter_table('deck_version_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_deck_version_stats_deck_id'), ['deck_id'], unique=False)
+    op.execute(POPULATE)
+
+def downgrade():
+    with op.batch_alter_table('deck_version_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_deck_version_stats_deck_id'))
+    op.drop_table('deck_version_stats')
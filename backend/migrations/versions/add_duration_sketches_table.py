@@ -0,0 +1,89 @@
+"""Add duration_sketches table for game length analytics
+
+Revision ID: add_duration_sketches_table
+Revises: add_deck_version_stats_table
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.app.api.utils.tdigest import TDigest
+
+# revision identifiers, used by Alembic.
+revision = 'add_duration_sketches_table'
+down_revision = 'add_deck_version_stats_table'
+branch_labels = None
+depends_on = None
+
+# The tables as of this revision; the app's models may have moved on since
+matches = sa.table('matches', sa.column('id', sa.Integer), sa.column('game_id', sa.Integer),
+                   sa.column('status', sa.String), sa.column('player_count', sa.Integer),
+                   sa.column('start_time', sa.DateTime), sa.column('end_time', sa.DateTime))
+games = sa.table('games', sa.column('id', sa.Integer), sa.column('is_pauper', sa.Boolean),
+                 sa.column('deleted_at', sa.DateTime))
+match_players = sa.table('match_players', sa.column('match_id', sa.Integer), sa.column('user_id', sa.Integer),
+                         sa.column('deck_id', sa.Integer))
+decks = sa.table('decks', sa.column('id', sa.Integer), sa.column('commander', sa.String))
+duration_sketches = sa.table(
+    'duration_sketches', sa.column('dimension', sa.String), sa.column('group_key', sa.String),
+    sa.column('games', sa.Integer), sa.column('digest', sa.JSON), sa.column('updated_at', sa.DateTime)
+)
+
+def populate(connection):
+    """Write every sketch from the timed, counted matches, as DurationStatsService.rebuild_all would."""
+    rows = connection.execute(
+        sa.select(matches.c.id, matches.c.start_time, matches.c.end_time, matches.c.player_count, games.c.is_pauper)
+        .select_from(matches.outerjoin(games, games.c.id == matches.c.game_id))
+        .where(matches.c.status == 'approved', matches.c.start_time.isnot(None), matches.c.end_time.isnot(None),
+               games.c.deleted_at.is_(None))
+    ).all()
+    minutes = {row.id: (row.end_time - row.start_time).total_seconds() / 60
+               for row in rows if row.end_time > row.start_time}
+    digests = {}
+
+    def add(group, value):
+        digests.setdefault(group, TDigest()).add(value)
+
+    for row in rows:
+        if row.id in minutes:
+            add(('player_count', str(row.player_count)), minutes[row.id])
+            if row.is_pauper is not None:
+                add(('pauper', 'pauper' if row.is_pauper else 'regular'), minutes[row.id])
+    players = connection.execute(
+        sa.select(match_players.c.match_id, match_players.c.user_id, decks.c.commander)
+        .select_from(match_players.join(decks, decks.c.id == match_players.c.deck_id))
+        .where(match_players.c.match_id.in_(list(minutes)))
+    ).all() if minutes else []
+    commanders_seen = set()
+    for match_id, user_id, commander in players:
+        add(('player', str(user_id)), minutes[match_id])
+        if (match_id, commander) not in commanders_seen:
+            commanders_seen.add((match_id, commander))
+            add(('commander', commander), minutes[match_id])
+
+    if digests:
+        connection.execute(sa.insert(duration_sketches), [
+            {"dimension": dimension, "group_key": key, "games": int(digest.count), "digest": digest.to_dict(),
+             "updated_at": datetime.utcnow()}
+            for (dimension, key), digest in digests.items()
+        ])
+    return len(digests)
+
+def upgrade():
+    # Filled from history here, so duration stats are complete straight after the
+    # upgrade; scripts/backfill_duration_sketches.py rebuilds the table if it ever drifts
+    op.create_table('duration_sketches',
+        sa.Column('dimension', sa.String(length=20), nullable=False),
+        sa.Column('group_key', sa.String(length=100), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('digest', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('dimension', 'group_key')
+    )
+    populate(op.get_bind())
+
+def downgrade():
+    op.drop_table('duration_sketches')
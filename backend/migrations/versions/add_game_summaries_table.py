@@ -0,0 +1,133 @@
+"""Add game_summaries read model table
+
+Revision ID: add_game_summaries_table
+Revises: add_games_deleted_partial_index
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_game_summaries_table'
+down_revision = 'add_games_deleted_partial_index'
+branch_labels = None
+depends_on = None
+
+GAME_STATUS = postgresql.ENUM('UPCOMING', 'COMPLETED', 'CANCELLED', name='gamestatus', create_type=False)
+
+# The tables as of this revision; the app's models may have moved on since
+games = sa.table('games', sa.column('id', sa.Integer), sa.column('game_date', sa.Date),
+                 sa.column('status', sa.String), sa.column('is_pauper', sa.Boolean),
+                 sa.column('details', sa.Text), sa.column('deleted_at', sa.DateTime))
+registrations = sa.table('game_registrations', sa.column('game_id', sa.Integer), sa.column('user_id', sa.Integer),
+                         sa.column('deck_id', sa.Integer), sa.column('registered_at', sa.DateTime))
+matches = sa.table('matches', sa.column('id', sa.Integer), sa.column('game_id', sa.Integer),
+                   sa.column('status', sa.String), sa.column('submitted_by_id', sa.Integer),
+                   sa.column('approved_by_id', sa.Integer))
+match_players = sa.table('match_players', sa.column('match_id', sa.Integer), sa.column('user_id', sa.Integer),
+                         sa.column('deck_id', sa.Integer), sa.column('placement', sa.Integer))
+users = sa.table('users', sa.column('id', sa.Integer), sa.column('username', sa.String))
+decks = sa.table('decks', sa.column('id', sa.Integer), sa.column('name', sa.String),
+                 sa.column('commander', sa.String))
+game_summaries = sa.table(
+    'game_summaries', sa.column('game_id', sa.Integer), sa.column('game_date', sa.Date),
+    sa.column('status', GAME_STATUS), sa.column('is_pauper', sa.Boolean), sa.column('details', sa.Text),
+    sa.column('deleted_at', sa.DateTime), sa.column('registration_count', sa.Integer),
+    sa.column('match_id', sa.Integer), sa.column('match_status', sa.String),
+    sa.column('submitted_by_id', sa.Integer), sa.column('submitted_by_username', sa.String),
+    sa.column('approved_by_id', sa.Integer), sa.column('approved_by_username', sa.String),
+    sa.column('winner_id', sa.Integer), sa.column('winner_username', sa.String),
+    sa.column('player_count', sa.Integer), sa.column('players', sa.JSON), sa.column('updated_at', sa.DateTime)
+)
+
+def populate(connection):
+    """Write a summary for every game, as GameSummaryService.refresh would."""
+    usernames = dict(connection.execute(sa.select(users.c.id, users.c.username)).all())
+    deck_names = {row.id: (row.name, row.commander) for row in connection.execute(
+        sa.select(decks.c.id, decks.c.name, decks.c.commander))}
+
+    def player(user_id, deck_id, placement):
+        deck_name, commander = deck_names.get(deck_id, (None, None))
+        return {"user_id": user_id, "username": usernames.get(user_id), "deck_id": deck_id,
+                "deck_name": deck_name, "commander": commander, "placement": placement}
+
+    registered = defaultdict(list)
+    for row in connection.execute(sa.select(registrations).order_by(registrations.c.registered_at)):
+        registered[row.game_id].append(player(row.user_id, row.deck_id, None))
+    latest_match = {}
+    for row in connection.execute(sa.select(matches).where(matches.c.game_id.isnot(None)).order_by(matches.c.id)):
+        latest_match[row.game_id] = row
+    placed = defaultdict(list)
+    for row in connection.execute(sa.select(match_players).order_by(match_players.c.placement)):
+        placed[row.match_id].append(player(row.user_id, row.deck_id, row.placement))
+
+    summaries = []
+    for game in connection.execute(sa.select(games)):
+        match = latest_match.get(game.id)
+        players = placed[match.id] if match else registered[game.id]
+        winner = None
+        if game.status == 'COMPLETED' and match and match.status == 'approved':
+            winner = next((p for p in players if p['placement'] == 1), None)
+        summaries.append({
+            "game_id": game.id, "game_date": game.game_date, "status": game.status,
+            "is_pauper": bool(game.is_pauper), "details": game.details, "deleted_at": game.deleted_at,
+            "registration_count": len(registered[game.id]),
+            "match_id": match.id if match else None,
+            "match_status": match.status if match else None,
+            "submitted_by_id": match.submitted_by_id if match else None,
+            "submitted_by_username": usernames.get(match.submitted_by_id) if match else None,
+            "approved_by_id": match.approved_by_id if match else None,
+            "approved_by_username": usernames.get(match.approved_by_id) if match else None,
+            "winner_id": winner['user_id'] if winner else None,
+            "winner_username": winner['username'] if winner else None,
+            "player_count": len(players), "players": players, "updated_at": datetime.utcnow()
+        })
+
+    if summaries:
+        connection.execute(sa.insert(game_summaries), summaries)
+    return len(summaries)
+
+def upgrade():
+    # Filled from the source tables here, so the game list is complete straight
+    # after the upgrade; scripts/backfill_game_summaries.py rebuilds it if needed
+    op.create_table('game_summaries',
+        sa.Column('game_id', sa.Integer(), nullable=False),
+        sa.Column('game_date', sa.Date(), nullable=False),
+        sa.Column('status', GAME_STATUS, nullable=False),
+        sa.Column('is_pauper', sa.Boolean(), nullable=False),
+        sa.Column('details', sa.Text(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('registration_count', sa.Integer(), nullable=False),
+        sa.Column('match_id', sa.Integer(), nullable=True),
+        sa.Column('match_status', sa.String(length=20), nullable=True),
+        sa.Column('submitted_by_id', sa.Integer(), nullable=True),
+        sa.Column('submitted_by_username', sa.String(length=80), nullable=True),
+        sa.Column('approved_by_id', sa.Integer(), nullable=True),
+        sa.Column('approved_by_username', sa.String(length=80), nullable=True),
+        sa.Column('winner_id', sa.Integer(), nullable=True),
+        sa.Column('winner_username', sa.String(length=80), nullable=True),
+        sa.Column('player_count', sa.Integer(), nullable=False),
+        sa.Column('players', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('game_id')
+    )
+    with op.batch_alter_table('game_summaries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_game_summaries_status'), ['status'], unique=False)
+    op.create_index(
+        'ix_game_summaries_active_game_date', 'game_summaries', ['game_date'], unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+        sqlite_where=sa.text('deleted_at IS NULL'),
+    )
+    populate(op.get_bind())
+
+def downgrade():
+    op.drop_index('ix_game_summaries_active_game_date', table_name='game_summaries')
+    with op.batch_alter_table('game_summaries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_game_summaries_status'))
+    op.drop_table('game_summaries')
@@ -0,0 +1,27 @@
+"""Add partial index over soft-deleted games
+
+Revision ID: add_games_deleted_partial_index
+Revises: add_hot_path_indexes
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_games_deleted_partial_index'
+down_revision = 'add_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # The global soft-delete filter excludes "id IN (deleted games)"; this keeps
+    # that set an index-only lookup no matter how many live games there are.
+    op.create_index(
+        'ix_games_deleted', 'games', ['id'], unique=False,
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+        sqlite_where=sa.text('deleted_at IS NOT NULL'),
+    )
+
+def downgrade():
+    op.drop_index('ix_games_deleted', table_name='games')
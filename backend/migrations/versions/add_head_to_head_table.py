@@ -0,0 +1,51 @@
+"""Add head_to_head pairwise statistics table
+
+Revision ID: add_head_to_head_table
+Revises: add_game_summaries_table
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_head_to_head_table'
+down_revision = 'add_game_summaries_table'
+branch_labels = None
+depends_on = None
+
+# Same pairs as HeadToHeadService.rebuild: every ordered pair of players placed
+# in the same approved match of a live game
+POPULATE = (
+    "INSERT INTO head_to_head (user_id, opponent_id, games, wins, losses, placement_delta_sum, updated_at) "
+    "SELECT own.user_id, other.user_id, COUNT(*),"
+    " SUM(CASE WHEN own.placement < other.placement THEN 1 ELSE 0 END),"
+    " SUM(CASE WHEN own.placement > other.placement THEN 1 ELSE 0 END),"
+    " SUM(other.placement - own.placement), CURRENT_TIMESTAMP "
+    "FROM match_players own JOIN match_players other"
+    " ON other.match_id = own.match_id AND other.user_id <> own.user_id "
+    "JOIN matches ON matches.id = own.match_id LEFT JOIN games ON games.id = matches.game_id "
+    "WHERE matches.status = 'approved' AND own.placement IS NOT NULL AND other.placement IS NOT NULL"
+    " AND games.deleted_at IS NULL "
+    "GROUP BY own.user_id, other.user_id"
+)
+
+def upgrade():
+    # Filled from history here, so head-to-head records are complete straight after
+    # the upgrade; scripts/backfill_head_to_head.py rebuilds the table if it ever drifts
+    op.create_table('head_to_head',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('opponent_id', sa.Integer(), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('placement_delta_sum', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['opponent_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'opponent_id')
+    )
+    op.execute(POPULATE)
+
+def downgrade():
+    op.drop_table('head_to_head')
@@ -0,0 +1,70 @@
+"""Add composite and partial indexes for the hot query paths
+
+Revision ID: add_hot_path_indexes
+Revises: add_admin_audit_logs_table
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_hot_path_indexes'
+down_revision = 'add_admin_audit_logs_table'
+branch_labels = None
+depends_on = None
+
+# Not added on purpose:
+# - game_registrations(game_id): the _game_user_uc unique index leads with game_id
+# - deck_versions(deck_id, version_number): already covered by _deck_version_uc
+
+
+def upgrade():
+    # Winner lookups filter on (match_id, placement); win counts on (user_id, placement).
+    # The composites make the single-column indexes redundant.
+    with op.batch_alter_table('match_players', schema=None) as batch_op:
+        batch_op.create_index('ix_match_players_match_id_placement', ['match_id', 'placement'], unique=False)
+        batch_op.create_index('ix_match_players_user_id_placement', ['user_id', 'placement'], unique=False)
+        batch_op.create_index(batch_op.f('ix_match_players_deck_id'), ['deck_id'], unique=False)
+        batch_op.drop_index('ix_match_players_match_id')
+        batch_op.drop_index('ix_match_players_user_id')
+
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index('ix_matches_game_id_status', ['game_id', 'status'], unique=False)
+        batch_op.create_index('ix_matches_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.drop_index('ix_matches_game_id')
+
+    with op.batch_alter_table('game_registrations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_game_registrations_deck_id'), ['deck_id'], unique=False)
+
+    with op.batch_alter_table('decks', schema=None) as batch_op:
+        batch_op.create_index('ix_decks_user_id_last_updated', ['user_id', 'last_updated'], unique=False)
+
+    # Partial index: only live games, so soft-deleted rows cost nothing to skip
+    op.create_index(
+        'ix_games_active_game_date', 'games', ['game_date'], unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+        sqlite_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_games_active_game_date', table_name='games')
+
+    with op.batch_alter_table('decks', schema=None) as batch_op:
+        batch_op.drop_index('ix_decks_user_id_last_updated')
+
+    with op.batch_alter_table('game_registrations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_game_registrations_deck_id'))
+
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index('ix_matches_game_id', ['game_id'], unique=False)
+        batch_op.drop_index('ix_matches_status_created_at')
+        batch_op.drop_index('ix_matches_game_id_status')
+
+    with op.batch_alter_table('match_players', schema=None) as batch_op:
+        batch_op.create_index('ix_match_players_user_id', ['user_id'], unique=False)
+        batch_op.create_index('ix_match_players_match_id', ['match_id'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_match_players_deck_id'))
+        batch_op.drop_index('ix_match_players_user_id_placement')
+        batch_op.drop_index('ix_match_players_match_id_placement')
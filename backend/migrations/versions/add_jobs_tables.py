@@ -0,0 +1,48 @@
+"""Add jobs and job_schedules tables
+
+Revision ID: add_jobs_tables
+Revises: add_token_revocations_table
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_jobs_tables'
+down_revision = 'add_token_revocations_table'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_ms', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_status_priority_run_at', 'jobs', ['status', 'priority', 'run_at'], unique=False)
+    op.create_index('ix_jobs_finished_at', 'jobs', ['finished_at'], unique=False)
+    op.create_table('job_schedules',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+def downgrade():
+    op.drop_table('job_schedules')
+    op.drop_index('ix_jobs_finished_at', table_name='jobs')
+    op.drop_index('ix_jobs_status_priority_run_at', table_name='jobs')
+    op.drop_table('jobs')
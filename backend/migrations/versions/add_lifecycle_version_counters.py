@@ -0,0 +1,30 @@
+"""Add optimistic lock versions to games/matches and a per-deck version counter
+
+Revision ID: add_lifecycle_version_counters
+Revises: add_card_stats_tables
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_lifecycle_version_counters'
+down_revision = 'add_card_stats_tables'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('games', sa.Column('version_id', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('matches', sa.Column('version_id', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('decks', sa.Column('version_counter', sa.Integer(), nullable=False, server_default='0'))
+    # Continue numbering after each deck's existing versions
+    op.execute(
+        "UPDATE decks SET version_counter = COALESCE("
+        "(SELECT MAX(version_number) FROM deck_versions WHERE deck_versions.deck_id = decks.id), 0)"
+    )
+
+def downgrade():
+    op.drop_column('decks', 'version_counter')
+    op.drop_column('matches', 'version_id')
+    op.drop_column('games', 'version_id')
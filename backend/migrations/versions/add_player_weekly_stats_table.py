@@ -0,0 +1,73 @@
+"""Add player_weekly_stats time-series table
+
+Revision ID: add_player_weekly_stats_table
+Revises: add_deck_stats_table
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_player_weekly_stats_table'
+down_revision = 'add_deck_stats_table'
+branch_labels = None
+depends_on = None
+
+# The tables as of this revision; the app's models may have moved on since
+matches = sa.table('matches', sa.column('id', sa.Integer), sa.column('game_id', sa.Integer),
+                   sa.column('status', sa.String), sa.column('created_at', sa.DateTime))
+games = sa.table('games', sa.column('id', sa.Integer), sa.column('game_date', sa.Date),
+                 sa.column('deleted_at', sa.DateTime))
+match_players = sa.table('match_players', sa.column('match_id', sa.Integer), sa.column('user_id', sa.Integer),
+                         sa.column('placement', sa.Integer))
+player_weekly_stats = sa.table(
+    'player_weekly_stats', sa.column('user_id', sa.Integer), sa.column('week_start', sa.Date),
+    sa.column('games', sa.Integer), sa.column('wins', sa.Integer), sa.column('placement_sum', sa.Integer),
+    sa.column('updated_at', sa.DateTime)
+)
+
+def populate(connection):
+    """Write every player's weeks from the counted matches, as PlayerTrendsService.recompute would."""
+    plays = connection.execute(
+        sa.select(match_players.c.user_id, match_players.c.placement, games.c.game_date, matches.c.created_at)
+        .select_from(match_players.join(matches, matches.c.id == match_players.c.match_id)
+                     .outerjoin(games, games.c.id == matches.c.game_id))
+        .where(matches.c.status == 'approved', match_players.c.placement.isnot(None), games.c.deleted_at.is_(None))
+    ).all()
+    weeks = defaultdict(lambda: [0, 0, 0])
+    for user_id, placement, game_date, created_at in plays:
+        day = game_date or created_at.date()
+        totals = weeks[(user_id, day - timedelta(days=day.weekday()))]  # Weeks start on Monday
+        totals[0] += 1
+        totals[1] += placement == 1
+        totals[2] += placement
+
+    if weeks:
+        connection.execute(sa.insert(player_weekly_stats), [
+            {"user_id": user_id, "week_start": week, "games": games_played, "wins": wins,
+             "placement_sum": placement_sum, "updated_at": datetime.utcnow()}
+            for (user_id, week), (games_played, wins, placement_sum) in weeks.items()
+        ])
+    return len(weeks)
+
+def upgrade():
+    # Filled from history here, so trend charts are complete straight after the
+    # upgrade; scripts/backfill_player_weekly_stats.py rebuilds the table if it ever drifts
+    op.create_table('player_weekly_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('placement_sum', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'week_start')
+    )
+    populate(op.get_bind())
+
+def downgrade():
+    op.drop_table('player_weekly_stats')
@@ -0,0 +1,33 @@
+"""Add token_revocations table
+
+Revision ID: add_token_revocations_table
+Revises: add_lifecycle_version_counters
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_token_revocations_table'
+down_revision = 'add_lifecycle_version_counters'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('token_revocations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=36), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_token_revocations_revoked_at', 'token_revocations', ['revoked_at'], unique=False)
+    op.create_index('ix_token_revocations_expires_at', 'token_revocations', ['expires_at'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_token_revocations_expires_at', table_name='token_revocations')
+    op.drop_index('ix_token_revocations_revoked_at', table_name='token_revocations')
+    op.drop_table('token_revocations')
@@ -0,0 +1,15 @@
+import os
+import sys
+
+# Add the project root to the Python path to allow importing 'app'
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.data_migration import run_rebuild_cli
+from app.api.services.commander_matchup_service import CommanderMatchupService
+
+
+if __name__ == "__main__":
+    run_rebuild_cli('backfill_commander_matchups', CommanderMatchupService.rebuild,
+                    "Rebuild the commander_matchups store from all approved matches of live games.")
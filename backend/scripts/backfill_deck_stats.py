@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Add the project root to the Python path to allow importing 'app'
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.data_migration import DataMigration, run_cli
+from app.models import Deck
+from app.api.services.deck_stats_service import DeckStatsService
+
+
+class BackfillDeckStats(DataMigration):
+    """Builds (or rebuilds) the deck_stats row for every deck."""
+    name = 'backfill_deck_stats'
+    model = Deck
+
+    def process_batch(self, session, decks):
+        return DeckStatsService.recompute(deck.id for deck in decks)
+
+
+if __name__ == "__main__":
+    run_cli(BackfillDeckStats)
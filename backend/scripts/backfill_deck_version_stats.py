@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Add the project root to the Python path to allow importing 'app'
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.data_migration import DataMigration, run_cli
+from app.models import DeckVersion
+from app.api.services.deck_version_stats_service import DeckVersionStatsService
+
+
+class BackfillDeckVersionStats(DataMigration):
+    """Builds (or rebuilds) the deck_version_stats row for every deck version."""
+    name = 'backfill_deck_version_stats'
+    model = DeckVersion
+
+    def process_batch(self, session, versions):
+        return DeckVersionStatsService.recompute(version.id for version in versions)
+
+
+if __name__ == "__main__":
+    run_cli(BackfillDeckVersionStats)
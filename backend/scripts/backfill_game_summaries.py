@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Add the project root to the Python path to allow importing 'app'
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.data_migration import DataMigration, run_cli
+from app.models import Game
+from app.api.services.game_summary_service import GameSummaryService
+
+
+class BackfillGameSummaries(DataMigration):
+    """Builds (or rebuilds) the game_summaries read model row for every game."""
+    name = 'backfill_game_summaries'
+    model = Game
+    batch_size = 200
+
+    def process_batch(self, session, games):
+        for game in games:
+            GameSummaryService.refresh(game)
+        return len(games)
+
+
+if __name__ == "__main__":
+    run_cli(BackfillGameSummaries)
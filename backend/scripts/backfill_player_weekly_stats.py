@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Add the project root to the Python path to allow importing 'app'
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.data_migration import DataMigration, run_cli
+from app.models import User
+from app.api.services.player_trends_service import PlayerTrendsService
+
+
+class BackfillPlayerWeeklyStats(DataMigration):
+    """Builds (or rebuilds) the player_weekly_stats rows of every player."""
+    name = 'backfill_player_weekly_stats'
+    model = User
+
+    def process_batch(self, session, users):
+        return PlayerTrendsService.recompute(user.id for user in users)
+
+
+if __name__ == "__main__":
+    run_cli(BackfillPlayerWeeklyStats)
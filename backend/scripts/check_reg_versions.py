@@ -1,55 +1,66 @@
 import os
 import sys
+import logging
 
 # Add project root to the Python path to allow importing 'app'
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from sqlalchemy.orm import Session
-from app import create_app, db
-from app.models import GameRegistration, DeckVersion # Import DeckVersion
-
-TARGET_DECK_ID = 2 # Assuming 'gorges' is deck ID 2
-
-def check_versions():
-    """Queries and prints game_id and deck_version_id for a specific deck."""
-    flask_app = create_app()
-    with flask_app.app_context():
-        session = Session(db.engine)
-        print(f"Checking registrations for Deck ID: {TARGET_DECK_ID}")
-        try:
-            # Find the ID of version 1 for the target deck
-            initial_version = session.query(DeckVersion).filter_by(deck_id=TARGET_DECK_ID, version_number=1).first()
-            if not initial_version:
-                print(f"Error: Could not find Version 1 for Deck ID {TARGET_DECK_ID}.")
-                return
-
-            print(f"\nFound Initial Version (Version 1) - ID: {initial_version.id}")
-
-            registrations = session.query(GameRegistration).filter_by(deck_id=TARGET_DECK_ID).order_by(GameRegistration.game_id).all()
-            if not registrations:
-                print("No registrations found for this deck.")
-                # Still print suggested command even if no current registrations exist, in case data is inconsistent
-            else:
-                print("\nCurrent Registrations:")
-                print("Game ID | Deck Version ID")
-                print("--------|----------------")
-                for reg in registrations:
-                    print(f"{reg.game_id:<7} | {reg.deck_version_id}")
-                print("--------|----------------")
-
-            # Suggest update command (don't execute automatically)
-            print("\nTo fix incorrect historical versions, consider running SQL like:")
-            print(f"UPDATE game_registrations SET deck_version_id = {initial_version.id} WHERE deck_id = {TARGET_DECK_ID} AND deck_version_id != {initial_version.id};")
-            # Also consider match_players table if needed:
-            # print(f"UPDATE match_players SET deck_version_id = {initial_version.id} WHERE deck_id = {TARGET_DECK_ID} AND deck_version_id != {initial_version.id};")
-
-        except Exception as e:
-            print(f"\nAn error occurred: {e}")
-        finally:
-            print("\nClosing database session.")
-            session.close()
+from sqlalchemy import select
+from app.data_migration import DataMigration, build_arg_parser, run_cli
+from app.models import GameRegistration, DeckVersion
+
+logger = logging.getLogger(__name__)
+
+
+class CheckRegistrationVersions(DataMigration):
+    """Reports (and with --fix, repairs) registrations of a deck that don't point at its version 1."""
+    name = 'check_reg_versions'
+    model = GameRegistration
+
+    def __init__(self, deck_id, fix=False, **options):
+        super().__init__(**options)
+        self.deck_id = deck_id
+        self.fix = fix
+        self.resumable = fix  # Plain reports always rescan from the start
+        self._initial_version_id = None
+
+    @property
+    def checkpoint_key(self):
+        return f"{self.name}.deck{self.deck_id}"
+
+    def statement(self):
+        return select(GameRegistration).where(GameRegistration.deck_id == self.deck_id)
+
+    def _initial_version(self, session):
+        if self._initial_version_id is None:
+            self._initial_version_id = session.execute(
+                select(DeckVersion.id).where(DeckVersion.deck_id == self.deck_id, DeckVersion.version_number == 1)
+            ).scalar()
+            if self._initial_version_id is None:
+                raise ValueError(f"Could not find Version 1 for Deck ID {self.deck_id}.")
+            logger.info("Initial Version (Version 1) - ID: %s", self._initial_version_id)
+        return self._initial_version_id
+
+    def process_batch(self, session, registrations):
+        initial_version_id = self._initial_version(session)
+        changed = 0
+        for reg in registrations:
+            if reg.deck_version_id != initial_version_id:
+                logger.info("Game %s: registration %s uses deck version %s", reg.game_id, reg.id, reg.deck_version_id)
+                if self.fix:
+                    reg.deck_version_id = initial_version_id
+                changed += 1
+        return changed
+
+    def finish(self, session, stats):
+        verb = "Repointed" if self.fix else "Found"
+        logger.info("%s %d registration(s) of deck %s not on version 1.", verb, stats.changed, self.deck_id)
+
 
 if __name__ == "__main__":
-    check_versions()
\ No newline at end of file
+    parser = build_arg_parser(CheckRegistrationVersions.__doc__)
+    parser.add_argument('--deck-id', type=int, required=True, help="Deck whose registrations to check")
+    parser.add_argument('--fix', action='store_true', help="Repoint mismatched registrations at version 1")
+    run_cli(CheckRegistrationVersions, parser, option_names=('deck_id', 'fix'))
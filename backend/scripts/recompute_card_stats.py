@@ -0,0 +1,19 @@
+import os
+import sys
+
+# Add the project root to the Python path to allow importing 'app'
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.data_migration import run_rebuild_cli
+from app.api.services.card_stats_service import CardStatsService
+
+
+if __name__ == "__main__":
+    run_rebuild_cli(
+        'recompute_card_stats', CardStatsService.recompute_all,
+        "Rebuild the card_stats counters from the decklists of every approved match of a live game; "
+        "--workers processes parse the decklists.",
+        parallel=True,
+    )
@@ -1,5 +1,7 @@
-from wsgi import app
-from app.models import User, db
+from app import create_app, db
+from app.models import User
+
+app = create_app(mode='cli')
 
 with app.app_context():
     user = User.query.get(1)
@@ -0,0 +1,131 @@
+import importlib.util
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Tests that need a real database get an in-memory SQLite engine unless a
+# TEST_DATABASE_URL (e.g. a Postgres container) is provided.
+os.environ.setdefault('TEST_DATABASE_URL', 'sqlite://')
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / 'migrations' / 'versions'
+
+
+@pytest.fixture
+def db_app():
+    """Create an app bound to a freshly created test database."""
+    from backend.app import create_app, db
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def auth_headers(db_app):
+    """Return a function building Authorization headers for a user id."""
+    from flask_jwt_extended import create_access_token
+
+    def _headers(user_id, **claims):
+        with db_app.test_request_context():
+            token = create_access_token(identity=str(user_id), additional_claims=claims)
+        return {'Authorization': f'Bearer {token}'}
+    return _headers
+
+
+@pytest.fixture
+def migration():
+    """Return a function loading a migration module by revision file name."""
+    def _load(name):
+        spec = importlib.util.spec_from_file_location(name, MIGRATIONS / f'{name}.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return _load
+
+
+@pytest.fixture
+def captured_sql():
+    """Return a context manager collecting the SQL statements an engine runs."""
+    from sqlalchemy import event
+
+    @contextmanager
+    def _captured(engine):
+        statements = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', _capture)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', _capture)
+    return _captured
+
+
+@pytest.fixture
+def make_users(db_app):
+    """Return a function creating users by name (``admin`` is an admin) and returning their ids.
+
+    With ``decks=True`` each user also gets a deck, and the function returns
+    (user id, deck id) pairs.
+    """
+    from backend.app import db
+    from backend.app.models import Deck, User
+
+    def _make(*names, decks=False):
+        users = [User(username=name, email=f"{name}@example.com", password_hash="x", is_admin=(name == "admin"))
+                 for name in names]
+        db.session.add_all(users)
+        db.session.flush()
+        if not decks:
+            db.session.commit()
+            return [u.id for u in users]
+        user_decks = [Deck(user_id=u.id, name=f"{u.username} deck", commander=f"{u.username} cmdr", colors="B")
+                      for u in users]
+        db.session.add_all(user_decks)
+        db.session.commit()
+        return [(u.id, d.id) for u, d in zip(users, user_decks)]
+    return _make
+
+
+@pytest.fixture
+def create_deck(db_app, auth_headers):
+    """Return a function creating a deck for a user through the API and returning its id."""
+    def _create(user_id, name, **fields):
+        deck = {'name': name, 'commander': name, 'colors': 'G', 'decklist_text': '1 Forest', **fields}
+        response = db_app.test_client().post('/api/decks', json=deck, headers=auth_headers(user_id))
+        return response.get_json()['deck']['id']
+    return _create
+
+
+@pytest.fixture
+def play_and_approve(db_app, auth_headers, create_deck):
+    """Return a function playing a game and approving its match; returns (game id, match id).
+
+    ``order`` lists the players by placement, each as a user id (playing a new
+    deck), a (user id, deck id) pair or a (user id, commander) pair (playing a
+    new deck of that commander). The first player submits the result and the
+    second approves it; extra keyword arguments go into the submission.
+    """
+    def _play(game_date, order, pauper=False, **match):
+        client = db_app.test_client()
+        game_id = client.post('/api/games', json={'game_date': game_date, 'is_pauper': pauper}).get_json()['game']['id']
+        user_ids = []
+        for entry in order:
+            user_id, deck = entry if isinstance(entry, tuple) else (entry, 'Cmdr')
+            if isinstance(deck, str):
+                deck = create_deck(user_id, f'{deck} {game_date}', commander=deck)
+            client.post(f'/api/games/{game_id}/registrations', json={'deck_id': deck}, headers=auth_headers(user_id))
+            user_ids.append(user_id)
+        placements = [{'user_id': user_id, 'placement': i} for i, user_id in enumerate(user_ids, start=1)]
+        match_id = client.post('/api/matches', json={'game_id': game_id, 'placements': placements, **match},
+                               headers=auth_headers(user_ids[0])).get_json()['match_id']
+        client.patch(f'/api/matches/{match_id}/approve', json={}, headers=auth_headers(user_ids[1]))
+        return game_id, match_id
+    return _play
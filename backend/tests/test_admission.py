@@ -0,0 +1,160 @@
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from flask import jsonify
+from werkzeug.serving import make_server
+
+from backend.app.admission import Gate, classify
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_classify_routes():
+    assert classify('api.login', 'POST') == 'auth'
+    assert classify('api.submit_match', 'POST') == 'write'
+    assert classify('api.approve_match', 'PATCH') == 'write'
+    assert classify('api.get_games', 'GET') == 'read'
+    assert classify('api.get_card_leaderboard', 'GET') == 'analytics'
+    assert classify('api.suggest_pods', 'POST') == 'analytics'
+    assert classify('api.batch', 'POST') == 'analytics'
+    assert classify('api.get_player_leaderboard', 'GET') == 'analytics'
+    assert classify('api.get_commander_matchups', 'GET') == 'analytics'
+    assert classify('api.get_games', 'OPTIONS') is None
+    assert classify('api.get_admission_stats', 'GET') is None
+    assert classify('ping', 'GET') is None
+
+
+def test_gate_queues_until_slot_frees():
+    gate = Gate('write', concurrency=1, queue=1, max_wait=2.0)
+    assert gate.enter()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(gate.enter()))
+    waiter.start()
+    _wait_for(lambda: gate.waiting == 1)
+    # Queue is full: the next caller is rejected immediately
+    assert gate.enter() is False
+    gate.leave()
+    waiter.join()
+    assert results == [True]
+    stats = gate.snapshot()
+    assert stats["admitted"] == 2 and stats["shed"] == 1 and stats["queued"] == 1
+    assert stats["active"] == 1 and stats["waiting"] == 0
+
+
+def test_gate_times_out_at_deadline():
+    gate = Gate('read', concurrency=1, queue=4, max_wait=0.05)
+    assert gate.enter()
+    started = time.monotonic()
+    assert gate.enter() is False
+    assert time.monotonic() - started < 1
+    assert gate.snapshot()["timed_out"] == 1
+
+
+def test_saturated_reads_shed_with_retry_after(db_app):
+    controller = db_app.extensions['admission']
+    read = controller.gates['read']
+    read.concurrency, read.queue = 0, 0
+
+    client = db_app.test_client()
+    response = client.get('/api/games')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(controller.retry_after)
+    # Writes have their own pool and still go through
+    assert client.post('/api/games', json={'game_date': '2025-07-01'}).status_code == 201
+    assert read.shed == 1 and controller.gates['write'].active == 0
+
+
+def test_reads_yield_while_writes_wait(db_app):
+    controller = db_app.extensions['admission']
+    write = controller.gates['write']
+    write.concurrency, write.max_wait = 1, 2.0
+    assert write.enter()
+    waiter = threading.Thread(target=lambda: write.enter() and write.leave())
+    waiter.start()
+    try:
+        _wait_for(lambda: write.waiting == 1)
+        response = db_app.test_client().get('/api/games')
+        assert response.status_code == 503
+    finally:
+        write.leave()
+        waiter.join()
+    assert db_app.test_client().get('/api/games').status_code == 200
+
+
+def test_admission_stats_endpoint(db_app, auth_headers):
+    from backend.app import db
+    from backend.app.models import User
+
+    admin = User(username='admin', email='admin@example.com', password_hash='x', is_admin=True)
+    db.session.add(admin)
+    db.session.commit()
+    client = db_app.test_client()
+    client.get('/api/games')
+
+    response = client.get('/api/admin/admission', headers=auth_headers(admin.id))
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["enabled"] is True
+    assert body["classes"]["read"]["admitted"] >= 1
+    assert set(body["classes"]) == {'auth', 'write', 'read', 'analytics'}
+
+
+@pytest.fixture
+def live_server(db_app):
+    """Serve the app over HTTP from a threaded WSGI server, one thread per request."""
+    server = make_server('127.0.0.1', 0, db_app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    thread.join()
+
+
+def test_concurrent_http_requests_queue_and_shed(db_app, live_server):
+    controller = db_app.extensions['admission']
+    analytics = controller.gates['analytics']
+    analytics.concurrency, analytics.queue, analytics.max_wait = 1, 1, 5.0
+    release = threading.Event()
+
+    def _slow_stats():
+        release.wait(5)
+        return jsonify({}), 200
+
+    # Views that hold a slot until released; admission runs before dispatch either way
+    db_app.view_functions['api.get_duration_stats'] = _slow_stats
+    db_app.view_functions['api.get_games'] = lambda: (jsonify([]), 200)
+
+    statuses = {}
+
+    def _get(name, path):
+        try:
+            with urlopen(live_server + path, timeout=10) as response:
+                statuses[name] = response.status
+        except HTTPError as e:
+            statuses[name] = (e.code, e.headers.get('Retry-After'))
+
+    first = threading.Thread(target=_get, args=('first', '/api/stats/durations'))
+    first.start()
+    _wait_for(lambda: analytics.active == 1)
+    second = threading.Thread(target=_get, args=('second', '/api/stats/durations'))
+    second.start()
+    _wait_for(lambda: analytics.waiting == 1)
+
+    _get('third', '/api/stats/durations')
+    _get('read', '/api/games')
+    assert statuses == {'third': (503, str(controller.retry_after)), 'read': 200}
+
+    release.set()
+    first.join()
+    second.join()
+    assert statuses['first'] == statuses['second'] == 200
+    _wait_for(lambda: analytics.active == 0)
+    assert (analytics.admitted, analytics.queued, analytics.shed) == (2, 1, 1)
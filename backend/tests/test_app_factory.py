@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def test_cli_mode_skips_web_setup():
+    from backend.app import create_app, signals
+
+    app = create_app('testing', mode='cli')
+    assert 'api' not in app.blueprints
+    assert 'migrate' not in app.extensions
+    # Derived tables are still maintained by the signal receivers
+    assert signals.match_approved.receivers
+    assert signals.game_created.receivers
+
+
+def test_web_mode_registers_api():
+    from backend.app import create_app
+
+    app = create_app('testing')
+    assert 'api' in app.blueprints
+    assert any(rule.rule == '/api/games' for rule in app.url_map.iter_rules())
+
+
+def test_unknown_mode_rejected():
+    from backend.app import create_app
+
+    with pytest.raises(ValueError):
+        create_app('testing', mode='worker')
+
+
+@pytest.mark.parametrize('mode', ['web', 'cli'])
+def test_boot_does_not_import_deferred_dependencies(mode):
+    code = (
+        "import sys\n"
+        "from backend.app import create_app\n"
+        f"create_app('testing', mode={mode!r})\n"
+        "print(','.join(m for m in ('numpy', 'flask_migrate', 'alembic') if m in sys.modules))\n"
+    )
+    env = dict(os.environ, TEST_DATABASE_URL='sqlite://', PYTHONPATH=REPO_ROOT)
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1:] in ([], [''])
@@ -0,0 +1,118 @@
+"""
+Tests for the composite page-data endpoint (POST /api/batch).
+"""
+import pytest
+from flask import jsonify, request
+
+from backend.app import db
+from backend.app.models import Deck, User
+
+
+@pytest.fixture
+def owner(db_app):
+    user = User(username='alice', email='alice@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    deck = Deck(user_id=user.id, name='Spirits', commander='Kykar', colors='WUR')
+    db.session.add(deck)
+    db.session.commit()
+    return user.id, deck.id
+
+
+def _batch(client, requests, headers=None):
+    response = client.post('/api/batch', json={'requests': requests}, headers=headers or {})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['responses']
+
+
+def test_batch_matches_individual_calls(db_app, owner, auth_headers):
+    user_id, deck_id = owner
+    client = db_app.test_client()
+    responses = _batch(client, [
+        {'id': 'deck', 'path': f'/api/decks/{deck_id}'},
+        {'id': 'versions', 'path': f'/api/decks/{deck_id}/versions'},
+        {'id': 'history', 'path': f'/api/decks/{deck_id}/history'},
+        {'id': 'owner', 'path': '/api/users/{deck.user_id}'},
+    ], auth_headers(user_id))
+
+    for request_id, path in (('deck', f'/api/decks/{deck_id}'), ('versions', f'/api/decks/{deck_id}/versions'),
+                             ('history', f'/api/decks/{deck_id}/history'), ('owner', f'/api/users/{user_id}')):
+        alone = client.get(path, headers=auth_headers(user_id))
+        assert responses[request_id] == {'status': alone.status_code, 'body': alone.get_json()}
+    assert responses['owner']['body']['username'] == 'alice'
+
+
+def _user_loads(statements):
+    return sum(1 for s in statements if s.lstrip().startswith('SELECT') and 'FROM users' in s)
+
+
+def test_sub_requests_share_identity_and_session(db_app, owner, auth_headers, captured_sql):
+    user_id, _ = owner
+    client = db_app.test_client()
+    paths = ['/api/decks', '/api/users/{}/decks'.format(user_id), f'/api/users/{user_id}']
+    separate = 0
+    for path in paths:
+        db.session.expunge_all()  # As a fresh request would start
+        with captured_sql(db.engine) as statements:
+            assert client.get(path, headers=auth_headers(user_id)).status_code == 200
+        separate += _user_loads(statements)
+
+    db.session.expunge_all()
+    with captured_sql(db.engine) as statements:
+        responses = _batch(client, paths + ['/api/decks'], auth_headers(user_id))
+    assert all(response['status'] == 200 for response in responses.values())
+    # The caller's user row is looked up once, not once per protected sub-request
+    assert _user_loads(statements) < separate
+
+    responses = _batch(client, ['/api/profile'])
+    assert responses['/api/profile']['status'] == 401
+
+
+def test_failed_dependency_and_errors(db_app, owner, auth_headers):
+    client = db_app.test_client()
+    responses = _batch(client, [
+        {'id': 'player', 'path': '/api/users/999'},
+        {'id': 'decks', 'path': '/api/users/{player.id}/decks'},
+    ], auth_headers(owner[0]))
+    assert responses['player']['status'] == 404
+    assert responses['decks']['status'] == 424
+
+
+def test_batch_validation(db_app):
+    client = db_app.test_client()
+    assert client.post('/api/batch', json={'requests': []}).status_code == 400
+    assert client.post('/api/batch', json={'requests': ['/ping']}).status_code == 400
+    assert client.post('/api/batch', json={'requests': ['/api/batch']}).status_code == 400
+    assert client.post('/api/batch', json={'requests': [{'path': '/api/games', 'method': 'POST'}]}).status_code == 400
+    assert client.post('/api/batch', json={'requests': ['/api/games'] * 21}).status_code == 400
+
+
+def test_batch_holds_one_admission_slot(db_app, owner):
+    client = db_app.test_client()
+    _batch(client, ['/api/games', '/api/users', '/api/matches'])
+    gates = db_app.extensions['admission'].snapshot()
+    assert gates['analytics']['admitted'] == 1
+    assert all(stats['active'] == 0 for stats in gates.values())
+
+
+def test_sub_requests_run_request_hooks(db_app):
+    calls = []
+
+    @db_app.before_request
+    def _before():
+        calls.append(('before', request.path))
+        if request.path == '/api/users':
+            return jsonify({"error": "stopped"}), 418
+
+    @db_app.teardown_request
+    def _teardown(exc):
+        calls.append(('teardown', request.path))
+
+    responses = _batch(db_app.test_client(), ['/api/games', '/api/users', '/api/matches'])
+    assert responses['/api/users'] == {"status": 418, "body": {"error": "stopped"}}
+    assert responses['/api/matches']['status'] == 200
+    # Setup and teardown stay paired for every sub-request, nested inside the batch
+    assert calls == [('before', '/api/batch')] + [
+        (hook, path) for path in ('/api/games', '/api/users', '/api/matches')
+        for hook in ('before', 'teardown')
+    ] + [('teardown', '/api/batch')]
@@ -0,0 +1,104 @@
+"""
+Tests for card-level win-rate counters and the card leaderboard.
+"""
+import pytest
+
+from backend.app import db
+from backend.app.models import User, Deck, DeckVersion, CardStats, CardScopeTotals
+from backend.app.api.services.card_stats_service import CardStatsService
+
+LISTS = {
+    "alice": "1 Sol Ring\n1 Llanowar Elves\n1 Forest",
+    "bob": "1 Sol Ring\n1 Counterspell\n1 Island",
+    "carol": "1 Arcane Signet\n1 Lightning Bolt\n1 Mountain",
+}
+
+
+@pytest.fixture
+def players(db_app):
+    result = []
+    for name, decklist in LISTS.items():
+        user = User(username=name, email=f"{name}@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.flush()
+        deck = Deck(user_id=user.id, name=f"{name} deck", commander=f"{name} cmdr", colors="G", decklist_text=decklist)
+        db.session.add(deck)
+        db.session.flush()
+        version = DeckVersion(deck_id=deck.id, version_number=1, decklist_text=decklist)
+        db.session.add(version)
+        db.session.flush()
+        deck.current_version_id = version.id
+        result.append((user.id, deck.id))
+    admin = User(username="admin", email="admin@example.com", password_hash="x", is_admin=True)
+    db.session.add(admin)
+    db.session.commit()
+    return result + [(admin.id, None)]
+
+
+def _snapshot():
+    return (
+        {(r.scope, r.scope_key, r.card_key): (r.card_name, r.appearances, r.wins)
+         for r in CardStats.query.filter(CardStats.appearances > 0)},
+        {(r.scope, r.scope_key): (r.decks, r.wins) for r in CardScopeTotals.query.filter(CardScopeTotals.decks > 0)},
+    )
+
+
+def test_leaderboard_follows_approvals(db_app, players, auth_headers, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, carol, admin = players
+    play_and_approve('2025-08-01', [alice, bob, carol])
+    play_and_approve('2025-08-02', [alice, carol])
+    _, last = play_and_approve('2025-08-03', [bob, alice])
+
+    board = client.get('/api/stats/cards?min_games=1').get_json()
+    assert board['decks'] == 7 and board['baseline_win_rate'] == round(3 / 7, 4)
+    cards = {c['card_name']: c for c in board['cards']}
+    assert (cards['Sol Ring']['appearances'], cards['Sol Ring']['wins']) == (5, 3)
+    assert cards['Llanowar Elves']['win_rate'] == round(2 / 3, 4)
+    assert cards['Lightning Bolt']['wins'] == 0
+    assert [c['card_name'] for c in board['cards'][:2]] == ['Forest', 'Llanowar Elves']  # ties by appearances, name
+
+    by_inclusion = client.get('/api/stats/cards?min_games=1&sort=inclusion').get_json()['cards']
+    assert by_inclusion[0]['card_name'] == 'Sol Ring' and by_inclusion[0]['inclusion_rate'] == round(5 / 7, 4)
+
+    commander = client.get('/api/stats/cards?commander=carol cmdr&min_games=1').get_json()
+    assert commander['decks'] == 2 and {c['card_name'] for c in commander['cards']} == set(
+        ['Arcane Signet', 'Lightning Bolt', 'Mountain'])
+
+    client.post(f'/api/admin/matches/{last}/unapprove', json={'reason': 'test'}, headers=auth_headers(admin[0]))
+    cards = {c['card_name']: c for c in client.get('/api/stats/cards?min_games=1').get_json()['cards']}
+    assert (cards['Sol Ring']['appearances'], cards['Sol Ring']['wins']) == (3, 2)
+    assert client.get('/api/stats/cards?min_games=3').get_json()['cards'] == [
+        {'card_name': 'Sol Ring', 'appearances': 3, 'wins': 2, 'win_rate': round(2 / 3, 4), 'inclusion_rate': 0.6}]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_recompute_matches_incremental_counters(db_app, players, workers, play_and_approve):
+    alice, bob, carol, _ = players
+    play_and_approve('2025-08-01', [carol, bob, alice])
+    play_and_approve('2025-08-02', [bob, alice])
+    incremental = _snapshot()
+
+    CardStatsService.recompute_all(workers=workers)
+    db.session.commit()
+    assert _snapshot() == incremental
+
+
+def test_migration_fills_counters_like_the_lifecycle(db_app, players, auth_headers, migration, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, carol, admin = players
+    play_and_approve('2025-08-01', [carol, bob, alice])
+    play_and_approve('2025-08-02', [bob, alice])
+    _, last = play_and_approve('2025-08-03', [alice, carol])
+    client.post(f'/api/admin/matches/{last}/unapprove', json={'reason': 'test'}, headers=auth_headers(admin[0]))
+    incremental = _snapshot()
+
+    CardStats.query.delete()
+    CardScopeTotals.query.delete()
+    assert migration('add_card_stats_tables').populate(db.session.connection()) == len(incremental[0])
+    db.session.commit()
+    assert _snapshot() == incremental
+
+
+def test_rejects_unknown_sort(db_app):
+    assert db_app.test_client().get('/api/stats/cards?sort=price').status_code == 400
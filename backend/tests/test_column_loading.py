@@ -0,0 +1,61 @@
+"""Heavy columns stay deferred unless a query asks for them."""
+from datetime import datetime
+
+from sqlalchemy import inspect
+
+
+def _seed():
+    from backend.app import db
+    from backend.app.models import Deck, Match, User
+
+    user = User(username='alice', email='alice@example.com')
+    user.set_password('secret')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(Deck(user_id=user.id, name='Big', commander='Atraxa', colors='WUBG',
+                        decklist_text='1 Sol Ring\n' * 100))
+    db.session.add(Match(player_count=4, status='approved', submitted_by_id=user.id,
+                         created_at=datetime(2025, 1, 1), notes_end_summary='A long story'))
+    db.session.commit()
+    return user.id
+
+
+def test_heavy_columns_not_loaded_with_entities(db_app):
+    from backend.app import db
+    from backend.app.models import Deck, Match, User
+
+    _seed()
+    db.session.expunge_all()
+    deck = db.session.query(Deck).one()
+    match = db.session.query(Match).one()
+    user = db.session.query(User).one()
+    assert 'decklist_text' not in inspect(deck).dict
+    assert 'notes_end_summary' not in inspect(match).dict
+    assert 'password_hash' not in inspect(user).dict
+
+    # Accessing a deferred column still loads it on demand
+    assert deck.decklist_text.startswith('1 Sol Ring')
+
+    user = db.session.query(User).options(db.undefer_group('credentials')).populate_existing().one()
+    assert 'password_hash' in inspect(user).dict
+
+
+def test_list_endpoints_select_only_serialized_columns(db_app, captured_sql):
+    from backend.app import db
+
+    user_id = _seed()
+    client = db_app.test_client()
+    with captured_sql(db.engine) as statements:
+        assert client.get('/api/users').status_code == 200
+        assert client.get(f'/api/users/{user_id}/decks').status_code == 200
+        assert client.get('/api/matches').status_code == 200
+    sql = '\n'.join(statements)
+    for column in ('password_hash', 'decklist_text', 'notes_end_summary', 'approval_notes'):
+        assert column not in sql
+
+
+def test_login_loads_credentials(db_app):
+    _seed()
+    response = db_app.test_client().post('/api/login', json={'username': 'alice', 'password': 'secret'})
+    assert response.status_code == 200
+    assert response.get_json()['user']['username'] == 'alice'
@@ -0,0 +1,71 @@
+"""
+Tests for the commander-versus-commander matchup store.
+"""
+import pytest
+
+from backend.app import db
+from backend.app.models import CommanderMatchup
+from backend.app.api.services.commander_matchup_service import CommanderMatchupService, pod_pairs
+
+
+def test_pod_pairs_skip_mirror_commanders():
+    pairs = pod_pairs([(1, 'Atraxa', 1), (2, 'Krenko', 2), (3, 'Atraxa', 3)])
+    assert pairs == {('Atraxa', 'Krenko'): [2, 1, 1], ('Krenko', 'Atraxa'): [2, 1, 1]}
+
+
+@pytest.fixture
+def users(make_users):
+    return make_users("alice", "bob", "cara", "admin")
+
+
+def _matchups(client, query=''):
+    response = client.get(f'/api/stats/matchups{query}')
+    assert response.status_code == 200, response.get_json()
+    return [(m['commander'], m['opponent'], m['games'], m['wins'], m['win_rate']) for m in response.get_json()['matchups']]
+
+
+def _rows():
+    return {(r.scope, r.scope_key, r.commander, r.opponent): (r.games, r.wins, r.losses) for r in CommanderMatchup.query}
+
+
+def test_matchups_follow_approvals_and_filters(db_app, users, auth_headers, migration, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, cara, admin = users
+    play_and_approve('2025-08-01', [(alice, 'Atraxa'), (bob, 'Krenko'), (cara, 'Edgar')])
+    play_and_approve('2025-08-02', [(bob, 'Krenko'), (alice, 'Atraxa')])
+    pauper_game, _ = play_and_approve('2025-08-03', [(alice, 'Atraxa'), (cara, 'Krenko')], pauper=True)
+
+    assert _matchups(client, '?commander=Atraxa') == [
+        ('Atraxa', 'Edgar', 1, 1, 1.0), ('Atraxa', 'Krenko', 3, 2, 0.6667)]
+    assert _matchups(client, '?commander=Atraxa&sort=games&limit=1') == [('Atraxa', 'Krenko', 3, 2, 0.6667)]
+    assert _matchups(client, '?commander=Krenko&min_games=2') == [('Krenko', 'Atraxa', 3, 1, 0.3333)]
+    assert _matchups(client, '?scope=pauper') == [('Atraxa', 'Krenko', 1, 1, 1.0), ('Krenko', 'Atraxa', 1, 0, 0.0)]
+    assert len(_matchups(client)) == 6
+
+    client.delete(f'/api/admin/games/{pauper_game}', json={'reason': 'test'}, headers=auth_headers(admin))
+    assert _matchups(client, '?scope=pauper') == []
+    assert _matchups(client, '?commander=Krenko') == [('Krenko', 'Edgar', 1, 1, 1.0), ('Krenko', 'Atraxa', 2, 1, 0.5)]
+
+    incremental = _rows()
+    CommanderMatchupService.rebuild()
+    db.session.commit()
+    assert _rows() == incremental
+
+    # The migration fills the table with the same rows
+    CommanderMatchup.query.delete()
+    assert migration('add_commander_matchups_table').populate(db.session.connection()) == len(incremental)
+    db.session.commit()
+    assert _rows() == incremental
+
+    assert client.get('/api/stats/matchups?sort=elo').status_code == 400
+    assert client.get('/api/stats/matchups?scope=season').status_code == 400
+
+
+def test_top_matchups_are_served_by_their_index(db_app):
+    plan = db.session.execute(db.text(
+        "EXPLAIN QUERY PLAN SELECT opponent FROM commander_matchups "
+        "WHERE scope = 'all' AND scope_key = '' AND commander = 'Atraxa' AND games >= 1 "
+        "ORDER BY win_rate DESC, games DESC, opponent DESC LIMIT 10"
+    )).all()
+    detail = ' '.join(str(row[-1]) for row in plan)
+    assert 'ix_commander_matchups_win_rate' in detail and 'TEMP B-TREE' not in detail
@@ -0,0 +1,85 @@
+import gzip
+
+import pytest
+
+from backend.app.compression import ENCODERS, brotli, choose_encoding, parse_accept_encoding
+
+
+def _create_games(client, count):
+    for day in range(1, count + 1):
+        response = client.post('/api/games', json={
+            'game_date': f'2025-08-{day:02d}', 'details': 'Weekly pod night at the local game store'
+        })
+        assert response.status_code == 201
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding('gzip, br;q=0.8, zstd;q=0') == {'gzip': 1.0, 'br': 0.8, 'zstd': 0.0}
+    assert parse_accept_encoding(None) == {}
+
+
+def test_choose_encoding_respects_q_then_preference():
+    preference = ['zstd', 'br', 'gzip']
+    assert choose_encoding('gzip, br', preference) == 'br'
+    assert choose_encoding('gzip, br;q=0.5', preference) == 'gzip'
+    assert choose_encoding('br;q=0, *', preference) == 'zstd'
+    assert choose_encoding('identity', preference) is None
+    assert choose_encoding('', preference) is None
+
+
+def test_large_api_response_is_gzipped(db_app):
+    client = db_app.test_client()
+    _create_games(client, 20)
+
+    plain = client.get('/api/games')
+    response = client.get('/api/games', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) < len(plain.data)
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_small_response_is_not_compressed(db_app):
+    client = db_app.test_client()
+    _create_games(client, 1)
+    response = client.get('/api/games', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_identical_payloads_compress_once(db_app):
+    client = db_app.test_client()
+    _create_games(client, 20)
+    cache = db_app.extensions['compression'].cache
+
+    first = client.get('/api/games', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/api/games', headers={'Accept-Encoding': 'gzip'})
+    assert first.data == second.data
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    # A write changes the payload, so the next read compresses again
+    created = client.post('/api/games', json={'game_date': '2025-09-01'})
+    assert created.status_code == 201
+    client.get('/api/games', headers={'Accept-Encoding': 'gzip'})
+    assert (cache.misses, cache.hits) == (2, 1)
+
+
+def test_cache_evicts_to_byte_budget():
+    from backend.app.compression import CompressedBodyCache
+
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.put('a', b'12345')
+    cache.put('b', b'12345')
+    cache.put('c', b'123')
+    assert cache.get('a') is None
+    assert cache.get('c') == b'123'
+    assert cache.size <= 10
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli not installed")
+def test_brotli_preferred_when_available(db_app):
+    assert 'br' in ENCODERS
+    client = db_app.test_client()
+    _create_games(client, 20)
+    response = client.get('/api/games', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == client.get('/api/games').data
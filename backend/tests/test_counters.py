@@ -0,0 +1,57 @@
+"""
+Tests for the atomic counter upserts used by the aggregate tables.
+"""
+from sqlalchemy import case
+
+from backend.app import db
+from backend.app.models import User, HeadToHead
+from backend.app.api.utils.counters import add_to_row
+
+
+def _wins_per_ten_games(new, old):
+    # Stored in a spare counter column to observe the derived value
+    return {"placement_delta_sum": case((new('games') > 0, new('wins') * 10 // new('games')), else_=0)}
+
+
+def _row(key):
+    db.session.expire_all()
+    row = db.session.get(HeadToHead, key)
+    return (row.games, row.wins, row.placement_delta_sum) if row else None
+
+
+def test_add_to_row_inserts_adds_and_removes(db_app):
+    users = [User(username=name, email=f"{name}@example.com", password_hash="x") for name in ("alice", "bob")]
+    db.session.add_all(users)
+    db.session.commit()
+    key = {"user_id": users[0].id, "opponent_id": users[1].id}
+    pk = (users[0].id, users[1].id)
+
+    # Counting down a missing row is a no-op rather than a negative insert
+    add_to_row(HeadToHead, key, {"games": -1, "wins": -1}, create=False, derived=_wins_per_ten_games)
+    assert _row(pk) is None
+
+    add_to_row(HeadToHead, key, {"games": 1, "wins": 1}, derived=_wins_per_ten_games, inserted={"losses": 0})
+    add_to_row(HeadToHead, key, {"games": 1, "wins": 0}, derived=_wins_per_ten_games, inserted={"losses": 0})
+    add_to_row(HeadToHead, key, {"games": 1, "wins": 0}, derived=_wins_per_ten_games, inserted={"losses": 0})
+    # Derived columns see the counts after the change: 1 win in 3 games
+    assert _row(pk) == (3, 1, 3)
+
+    add_to_row(HeadToHead, key, {"games": -1, "wins": -1}, create=False, derived=_wins_per_ten_games)
+    assert _row(pk) == (2, 0, 0)
+    add_to_row(HeadToHead, key, {"games": -2, "wins": 0}, create=False, derived=_wins_per_ten_games, delete_empty='games')
+    assert _row(pk) is None
+    db.session.commit()
+
+
+def test_add_to_rows_updates_many_rows_per_statement(db_app, monkeypatch):
+    from backend.app.api.utils import counters
+    from backend.app.models import CardStats
+
+    monkeypatch.setattr(counters, 'ROWS_PER_STATEMENT', 2)
+    rows = [{"scope": "all", "scope_key": "", "card_key": f"card {i}", "card_name": f"Card {i}"} for i in range(5)]
+    counters.add_to_rows(CardStats, rows, {"appearances": 1, "wins": 1})
+    counters.add_to_rows(CardStats, rows[:3], {"appearances": 1, "wins": 0})
+    counters.add_to_rows(CardStats, rows[1:], {"appearances": -1, "wins": -1}, create=False)
+    db.session.expire_all()
+    assert {r.card_key: (r.appearances, r.wins) for r in CardStats.query} == {
+        'card 0': (2, 1), 'card 1': (1, 0), 'card 2': (1, 0), 'card 3': (0, 0), 'card 4': (0, 0)}
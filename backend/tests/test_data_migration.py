@@ -0,0 +1,149 @@
+"""
+Tests for the batched, resumable data-migration runner.
+"""
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.app import db
+from backend.app.models import User
+from backend.app.data_migration import DataMigration, MigrationRunner, build_rebuild_arg_parser, run_rebuild
+
+
+class UppercaseUsernames(DataMigration):
+    name = 'uppercase_usernames'
+    model = User
+    batch_size = 3
+
+    def __init__(self, fail_after_id=None, **options):
+        super().__init__(**options)
+        self.fail_after_id = fail_after_id
+        self.seen = []
+
+    def process_batch(self, session, users):
+        for user in users:
+            if self.fail_after_id is not None and user.id > self.fail_after_id:
+                raise RuntimeError("simulated crash")
+            self.seen.append(user.id)
+            user.username = user.username.upper()
+        return len(users)
+
+
+@pytest.fixture
+def users(db_app):
+    for i in range(10):
+        db.session.add(User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x"))
+    db.session.commit()
+    return [u.id for u in User.query.order_by(User.id)]
+
+
+def _usernames():
+    db.session.expire_all()
+    return [u.username for u in User.query.order_by(User.id)]
+
+
+def _runner(migration, tmp_path, **kwargs):
+    return MigrationRunner(migration, lambda: Session(db.engine), checkpoint_dir=str(tmp_path), **kwargs)
+
+
+def test_runs_in_committed_batches(users, tmp_path):
+    """Every row is visited once, in keyset order, across several batches."""
+    migration = UppercaseUsernames()
+    stats = _runner(migration, tmp_path).run()
+
+    assert stats.completed
+    assert stats.processed == 10
+    assert stats.batches == 4
+    assert migration.seen == users
+    assert all(name.isupper() for name in _usernames())
+
+
+def test_dry_run_rolls_back(users, tmp_path):
+    """A dry run reports the work but leaves the data and checkpoints untouched."""
+    stats = _runner(UppercaseUsernames(), tmp_path, dry_run=True).run()
+
+    assert stats.processed == 10
+    assert stats.changed == 10
+    assert all(name.islower() for name in _usernames())
+    assert not list(tmp_path.iterdir())
+
+
+def test_resumes_from_checkpoint(users, tmp_path):
+    """A failed run keeps its committed batches and the next run continues after them."""
+    with pytest.raises(RuntimeError):
+        _runner(UppercaseUsernames(fail_after_id=users[4]), tmp_path).run()
+    assert _usernames()[:3] == ['USER0', 'USER1', 'USER2']
+    assert _usernames()[3] == 'user3'  # The failing batch was rolled back
+
+    resumed = UppercaseUsernames()
+    stats = _runner(resumed, tmp_path).run()
+    assert resumed.seen == users[3:]
+    assert stats.processed == 10
+    assert all(name.isupper() for name in _usernames())
+
+    # A completed run is a no-op until reset
+    again = UppercaseUsernames()
+    _runner(again, tmp_path).run()
+    assert again.seen == []
+    _runner(again, tmp_path).run(reset=True)
+    assert again.seen == users
+
+
+def test_partitions_are_disjoint(users, tmp_path):
+    """Partitions split the table by id so parallel workers never overlap."""
+    seen = []
+    for partition in range(3):
+        migration = UppercaseUsernames()
+        _runner(migration, tmp_path, partition=partition, partitions=3).run()
+        seen.extend(migration.seen)
+    assert sorted(seen) == users
+
+
+class UppercaseParity(UppercaseUsernames):
+    """Uppercases only the users whose id has the given parity."""
+
+    def __init__(self, parity, **options):
+        super().__init__(**options)
+        self.parity = parity
+
+    @property
+    def checkpoint_key(self):
+        return f"{self.name}.parity{self.parity}"
+
+    def statement(self):
+        return super().statement().where(User.id % 2 == self.parity)
+
+
+def test_options_keep_separate_checkpoints(users, tmp_path):
+    """A finished run for one selection doesn't mark another selection as done."""
+    even, odd = UppercaseParity(0), UppercaseParity(1)
+    _runner(even, tmp_path).run()
+    _runner(odd, tmp_path).run()
+    assert sorted(even.seen + odd.seen) == users
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_rejects_invalid_partition():
+    with pytest.raises(ValueError):
+        MigrationRunner(UppercaseUsernames(), lambda: None, partition=2, partitions=2)
+
+
+def _rename_all():
+    for user in User.query:
+        user.username = f"rebuilt {user.id}"
+    return User.query.count()
+
+
+def test_rebuild_commits_or_rolls_back(users):
+    assert run_rebuild('rename', _rename_all, dry_run=True) == 10
+    assert _usernames() == [f"user{i}" for i in range(10)]
+
+    assert run_rebuild('rename', lambda workers: _rename_all() * workers, workers=2) == 20
+    assert _usernames() == [f"rebuilt {user_id}" for user_id in users]
+
+
+def test_rebuild_flags_are_only_the_ones_used():
+    assert vars(build_rebuild_arg_parser('x').parse_args(['--dry-run'])) == {'dry_run': True}
+    assert build_rebuild_arg_parser('x', parallel=True).parse_args(['--workers', '3']).workers == 3
+    for flags in (['--workers', '3'], ['--reset'], ['--checkpoint-dir', '/tmp'], ['--batch-size', '10']):
+        with pytest.raises(SystemExit):
+            build_rebuild_arg_parser('x').parse_args(flags)
@@ -0,0 +1,108 @@
+"""
+Tests for the ?ids= batch lookups and the per-request DataLoader behind them.
+"""
+import pytest
+from flask import g
+
+from backend.app import db
+from backend.app.models import User
+from backend.app.api.schemas.deck_schemas import DeckVersionCreate
+from backend.app.api.services.deck_service import DeckService
+from backend.app.api.utils.dataloader import loader, parse_ids
+
+
+def _selects(statements, table):
+    return sum(1 for s in statements if s.lstrip().startswith('SELECT') and f'FROM {table}' in s)
+
+
+@pytest.fixture
+def seeded(db_app, auth_headers):
+    users = [User(username=name, email=f"{name}@example.com", password_hash="x") for name in ("alice", "bob", "cara")]
+    db.session.add_all(users)
+    db.session.commit()
+    client = db_app.test_client()
+    headers = auth_headers(users[0].id)
+
+    deck_ids, version_ids = [], []
+    for user in users:
+        deck = client.post('/api/decks', json={'name': f'{user.username} deck', 'commander': f'{user.username} cmdr',
+                                               'colors': 'G', 'decklist_text': '1 Forest'},
+                           headers=auth_headers(user.id)).get_json()['deck']
+        version, _ = DeckService.create_deck_version(deck['id'], user.id, DeckVersionCreate(decklist_text='2 Forest'))
+        deck_ids.append(deck['id'])
+        version_ids.append(version.id)
+
+    match_ids = []
+    for day in ('2025-09-01', '2025-09-08'):
+        game_id = client.post('/api/games', json={'game_date': day}).get_json()['game']['id']
+        for user, deck_id in zip(users, deck_ids):
+            client.post(f'/api/games/{game_id}/registrations', json={'deck_id': deck_id}, headers=auth_headers(user.id))
+        placements = [{'user_id': u.id, 'placement': n} for n, u in enumerate(users, start=1)]
+        match_ids.append(client.post('/api/matches', json={'game_id': game_id, 'placements': placements},
+                                     headers=headers).get_json()['match_id'])
+    return client, headers, [u.id for u in users], deck_ids, version_ids, match_ids
+
+
+def test_ids_match_the_single_item_endpoints(seeded):
+    client, headers, user_ids, deck_ids, version_ids, match_ids = seeded
+    cases = [
+        ('/api/users', [f'/api/users/{i}' for i in user_ids], user_ids),
+        ('/api/decks', [f'/api/decks/{i}' for i in deck_ids], deck_ids),
+        ('/api/matches', [f'/api/matches/{i}' for i in match_ids], match_ids),
+    ]
+    for base, singles, ids in cases:
+        ids, singles = ids[::-1], singles[::-1]  # Order follows the request
+        batch = client.get(f"{base}?ids={','.join(map(str, ids))},999", headers=headers)
+        assert batch.status_code == 200
+        assert batch.get_json() == [client.get(path, headers=headers).get_json() for path in singles]
+
+    versions = client.get(f"/api/decks/versions?ids={','.join(map(str, version_ids))}", headers=headers).get_json()
+    for version, deck_id in zip(versions, deck_ids):
+        single = client.get(f"/api/decks/{deck_id}/versions/{version['id']}", headers=headers).get_json()
+        assert version == single and version['deck_id'] == deck_id and version['is_current']
+
+
+def test_batched_lookups_use_one_in_query(seeded, captured_sql):
+    client, headers, user_ids, deck_ids, version_ids, match_ids = seeded
+    db.session.expunge_all()  # As a fresh request would start
+    with captured_sql(db.engine) as statements:
+        decks = client.get(f"/api/decks?ids={','.join(map(str, deck_ids))}", headers=headers).get_json()
+    assert [d['decklist_text'] for d in decks] == ['2 Forest'] * 3
+    assert _selects(statements, 'decks') == 1 and _selects(statements, 'deck_versions') == 1
+
+    db.session.expunge_all()
+    with captured_sql(db.engine) as statements:
+        client.get(f"/api/users?ids={','.join(map(str, user_ids))}", headers=headers)
+    assert _selects(statements, 'users') == 1 and _selects(statements, 'match_players') == 1
+
+    db.session.expunge_all()
+    with captured_sql(db.engine) as statements:
+        matches = client.get(f"/api/matches?ids={','.join(map(str, match_ids))}").get_json()
+    assert all(p['version_number'] == 2 for m in matches for p in m['players'])
+    assert _selects(statements, 'deck_versions') == 1
+
+
+def test_loader_caches_until_commit(db_app, captured_sql):
+    user = User(username='dana', email='dana@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+    db.session.expunge_all()
+
+    with captured_sql(db.engine) as statements:
+        assert loader(User).load(str(user_id)).username == 'dana'  # JWT identities are strings
+        assert loader(User).load(user_id) is loader(User).load_many([user_id])[0]
+        assert loader(User).load(999) is None and loader(User).load(999) is None
+    assert _selects(statements, 'users') == 2
+
+    db.session.commit()
+    assert '_dataloaders' not in g
+
+
+def test_ids_validation(seeded):
+    client, headers = seeded[:2]
+    assert client.get('/api/users?ids=').status_code == 400
+    assert client.get('/api/matches?ids=1,x').status_code == 400
+    assert client.get('/api/decks/versions', headers=headers).status_code == 400
+    assert client.get('/api/decks?ids=' + ','.join(map(str, range(1, 102))), headers=headers).status_code == 400
+    assert parse_ids('3, 1,3', 10) == [3, 1]
@@ -3,6 +3,7 @@ Tests for deck service layer.
 """
 import pytest
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from sqlalchemy.orm.session import Session
 from flask import Flask
@@ -172,7 +173,10 @@ def test_create_deck(mock_db_session, sample_deck, sample_version, app):
 def test_get_user_decks(mock_db_session, sample_deck, app):
     """Test getting all decks for a user."""
     # Setup
-    mock_db_session.query.return_value.filter_by.return_value.order_by.return_value.all.return_value = [sample_deck]
+    # Deck columns with the deck's stats row outer-joined (never played: None)
+    row = SimpleNamespace(id=sample_deck.id, name=sample_deck.name, commander=sample_deck.commander,
+                          colors=sample_deck.colors, last_updated=sample_deck.last_updated, DeckStats=None)
+    mock_db_session.query.return_value.outerjoin.return_value.filter.return_value.order_by.return_value.all.return_value = [row]
     
     # Execute
     decks = DeckService.get_user_decks(1)
@@ -181,11 +185,14 @@ def test_get_user_decks(mock_db_session, sample_deck, app):
     assert len(decks) == 1
     assert decks[0].id == sample_deck.id
     assert decks[0].name == sample_deck.name
+    assert decks[0].games == 0 and decks[0].win_rate is None
 
 def test_get_deck_details(mock_db_session, sample_deck, sample_version, app):
     """Test getting deck details."""
     # Setup
-    mock_db_session.query.return_value.get_or_404.return_value = sample_deck
+    # Lookups go through the request's loaders: Deck by id, the version with its decklist undeferred
+    mock_db_session.query.return_value.get.return_value = sample_deck
+    mock_db_session.query.return_value.options.return_value.get.return_value = sample_version
     sample_deck.current_version_id = sample_version.id
     
     # Execute
@@ -201,7 +208,8 @@ def test_create_deck_version(mock_db_session, sample_deck, sample_version, app):
     """Test creating a new deck version."""
     # Setup
     mock_db_session.query.return_value.get_or_404.return_value = sample_deck
-    mock_db_session.query.return_value.filter_by.return_value.order_by.return_value.first.return_value = sample_version
+    # The deck's version counter hands out the next number
+    mock_db_session.execute.return_value.scalar_one.return_value = sample_version.version_number + 1
     
     version_data = DeckVersionCreate(
         decklist_text="2 New Card",
@@ -247,7 +255,7 @@ def test_create_deck_version_permission_error(mock_db_session, sample_deck, app)
 def test_get_deck_versions(mock_db_session, sample_deck, sample_version, app):
     """Test getting all versions of a deck."""
     # Setup
-    mock_db_session.query.return_value.get_or_404.return_value = sample_deck
+    mock_db_session.query.return_value.get.return_value = sample_deck
     mock_db_session.query.return_value.filter_by.return_value.order_by.return_value.all.return_value = [sample_version]
     sample_deck.current_version_id = sample_version.id
     
@@ -0,0 +1,98 @@
+"""
+Tests for per-deck performance stats, the deck list and the deck leaderboard.
+"""
+import pytest
+
+from backend.app import db
+from backend.app.models import DeckStats
+from backend.app.api.schemas.deck_schemas import DeckVersionCreate
+from backend.app.api.services.deck_service import DeckService
+from backend.app.api.services.deck_stats_service import DeckStatsService
+
+
+@pytest.fixture
+def users(make_users):
+    return make_users("alice", "bob", "admin")
+
+
+def _snapshot():
+    return {s.deck_id: (s.games, s.wins, s.placement_sum, s.win_rate, s.avg_placement, s.last_played,
+                        s.current_version_id) for s in DeckStats.query}
+
+
+def test_stats_follow_approval_and_soft_delete(db_app, users, auth_headers, create_deck, play_and_approve, migration):
+    client = db_app.test_client()
+    alice, bob, admin = users
+    elves = create_deck(alice, 'Elves')
+    merfolk = create_deck(bob, 'Merfolk')
+
+    play_and_approve('2025-07-01', [(alice, elves), (bob, merfolk)])
+    version, _ = DeckService.create_deck_version(elves, alice, DeckVersionCreate(decklist_text='1 Llanowar Elves'))
+    play_and_approve('2025-07-05', [(bob, merfolk), (alice, elves)])
+    last_game, last_match = play_and_approve('2025-07-09', [(alice, elves), (bob, merfolk)])
+
+    decks = {d['id']: d for d in client.get('/api/decks', headers=auth_headers(alice)).get_json()}
+    assert (decks[elves]['games'], decks[elves]['wins'], decks[elves]['avg_placement']) == (3, 2, 1.33)
+    assert decks[elves]['win_rate'] == 0.6667 and decks[elves]['last_played'] == '2025-07-09'
+    assert db.session.get(DeckStats, elves).current_version_id == version.id
+
+    # Removing the latest game pulls last_played back to the previous one
+    client.delete(f'/api/admin/games/{last_game}', json={'reason': 'test'}, headers=auth_headers(admin))
+    deck = client.get(f'/api/users/{alice}/decks').get_json()[0]
+    assert (deck['games'], deck['wins'], deck['last_played']) == (2, 1, '2025-07-05')
+
+    client.post(f'/api/admin/games/{last_game}/restore', json={'reason': 'test'}, headers=auth_headers(admin))
+    client.post(f'/api/admin/matches/{last_match}/unapprove', json={'reason': 'test'}, headers=auth_headers(admin))
+    client.patch(f'/api/matches/{last_match}/approve', json={}, headers=auth_headers(bob))
+
+    incremental = _snapshot()
+    DeckStatsService.recompute(incremental)
+    db.session.commit()
+    db.session.expire_all()
+    assert _snapshot() == incremental
+
+    # The migration fills the table from history with the same aggregate
+    DeckStats.query.delete()
+    db.session.execute(db.text(migration('add_deck_stats_table').POPULATE))
+    db.session.commit()
+    db.session.expire_all()
+    assert _snapshot() == incremental
+
+
+def test_leaderboard_sorts_filters_and_pages(db_app, users, captured_sql, create_deck, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, _ = users
+    elves = create_deck(alice, 'Elves')
+    goblins = create_deck(alice, 'Goblins')
+    merfolk = create_deck(bob, 'Merfolk')
+    create_deck(bob, 'Unplayed')
+
+    play_and_approve('2025-07-01', [(alice, elves), (bob, merfolk)])
+    play_and_approve('2025-07-02', [(alice, elves), (bob, merfolk)])
+    play_and_approve('2025-07-03', [(bob, merfolk), (alice, goblins)])
+
+    board = client.get('/api/stats/decks').get_json()
+    assert [d['deck_id'] for d in board['decks']] == [elves, merfolk, goblins]
+    assert board['decks'][0]['username'] == 'alice' and board['decks'][0]['win_rate'] == 1.0
+
+    by_games = client.get('/api/stats/decks?sort=games&limit=1&offset=0').get_json()['decks']
+    assert [d['deck_id'] for d in by_games] == [merfolk]
+    by_placement = client.get('/api/stats/decks?sort=avg_placement').get_json()['decks']
+    assert [d['deck_id'] for d in by_placement] == [elves, merfolk, goblins]
+
+    assert [d['deck_id'] for d in client.get(f'/api/stats/decks?user_id={alice}&min_games=2').get_json()['decks']] == [elves]
+    assert [d['deck_id'] for d in client.get('/api/stats/decks?commander=Merfolk').get_json()['decks']] == [merfolk]
+    assert client.get('/api/stats/decks?sort=colors').status_code == 400
+
+    with captured_sql(db.engine) as statements:
+        client.get('/api/stats/decks?sort=wins')
+    assert not any('match_players' in s for s in statements)
+
+
+def test_win_rate_sort_is_served_by_its_index(db_app):
+    plan = db.session.execute(db.text(
+        "EXPLAIN QUERY PLAN SELECT deck_id FROM deck_stats WHERE games >= 1 "
+        "ORDER BY win_rate DESC, games DESC, deck_id DESC LIMIT 50"
+    )).all()
+    detail = ' '.join(str(row[-1]) for row in plan)
+    assert 'ix_deck_stats_win_rate' in detail and 'TEMP B-TREE' not in detail
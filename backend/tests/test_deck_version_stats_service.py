@@ -0,0 +1,80 @@
+"""
+Tests for per-deck-version performance stats and their incremental maintenance.
+"""
+import pytest
+
+from backend.app import db
+from backend.app.models import Deck, DeckVersion, DeckVersionStats
+from backend.app.api.services.deck_version_stats_service import DeckVersionStatsService
+
+
+@pytest.fixture
+def users(make_users):
+    return make_users("alice", "bob", "admin")
+
+
+def _new_version(deck_id, decklist):
+    deck = db.session.get(Deck, deck_id)
+    version = DeckVersion(deck_id=deck_id, version_number=deck.versions.count() + 1, decklist_text=decklist)
+    db.session.add(version)
+    db.session.flush()
+    deck.current_version_id = version.id
+    db.session.commit()
+
+
+def _versions(client, deck_id, headers):
+    return {v['version_number']: v for v in client.get(f'/api/decks/{deck_id}/versions', headers=headers).get_json()}
+
+
+def test_versions_report_their_own_performance(db_app, users, auth_headers, migration, create_deck, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, admin = users
+    alice_deck = create_deck(alice, 'Elves')
+    bob_deck = create_deck(bob, 'Merfolk')
+
+    play_and_approve('2025-06-01', [(alice, alice_deck), (bob, bob_deck)])
+    _new_version(alice_deck, '1 Llanowar Elves')
+    play_and_approve('2025-06-05', [(bob, bob_deck), (alice, alice_deck)])
+    last_game, last_match = play_and_approve('2025-06-09', [(alice, alice_deck), (bob, bob_deck)])
+
+    versions = _versions(client, alice_deck, auth_headers(alice))
+    assert versions[1]['games'] == 1 and versions[1]['wins'] == 1 and versions[1]['avg_placement'] == 1
+    assert (versions[2]['games'], versions[2]['wins'], versions[2]['avg_placement']) == (2, 1, 1.5)
+    assert (versions[2]['first_played'], versions[2]['last_played']) == ('2025-06-05', '2025-06-09')
+
+    # Removing the most recent game pulls last_played back to the previous one
+    client.delete(f'/api/admin/games/{last_game}', json={'reason': 'test'}, headers=auth_headers(admin))
+    versions = _versions(client, alice_deck, auth_headers(alice))
+    assert (versions[2]['games'], versions[2]['wins'], versions[2]['last_played']) == (1, 0, '2025-06-05')
+
+    client.post(f'/api/admin/games/{last_game}/restore', json={'reason': 'test'}, headers=auth_headers(admin))
+    client.post(f'/api/admin/matches/{last_match}/unapprove', json={'reason': 'test'}, headers=auth_headers(admin))
+    versions = _versions(client, alice_deck, auth_headers(alice))
+    assert (versions[2]['games'], versions[2]['last_played']) == (1, '2025-06-05')
+
+    client.patch(f'/api/matches/{last_match}/approve', json={}, headers=auth_headers(bob))
+    incremental = {s.deck_version_id: (s.games, s.wins, s.placement_sum, s.first_played, s.last_played)
+                   for s in DeckVersionStats.query}
+    DeckVersionStatsService.recompute(incremental)
+    db.session.commit()
+    db.session.expire_all()
+    recomputed = {s.deck_version_id: (s.games, s.wins, s.placement_sum, s.first_played, s.last_played)
+                  for s in DeckVersionStats.query}
+    assert recomputed == incremental
+
+    # The migration fills the table with the same rows
+    DeckVersionStats.query.delete()
+    db.session.execute(db.text(migration('add_deck_version_stats_table').POPULATE))
+    db.session.commit()
+    db.session.expire_all()
+    assert {s.deck_version_id: (s.games, s.wins, s.placement_sum, s.first_played, s.last_played)
+            for s in DeckVersionStats.query} == incremental
+
+
+def test_unplayed_version_has_empty_stats(db_app, users, auth_headers, create_deck):
+    client = db_app.test_client()
+    alice = users[0]
+    deck_id = create_deck(alice, 'Goblins')
+    versions = _versions(client, deck_id, auth_headers(alice))
+    assert versions[1]['games'] == 0
+    assert versions[1]['avg_placement'] is None and versions[1]['first_played'] is None
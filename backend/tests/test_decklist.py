@@ -0,0 +1,36 @@
+"""
+Tests for decklist text parsing.
+"""
+from backend.app.api.utils.decklist import card_key, parse_cards
+
+
+def test_parses_common_export_formats():
+    cards = parse_cards(
+        "Commander:\n"
+        "1 Atraxa, Praetors' Voice (C16) 28 *F*\n"
+        "\n"
+        "Deck\n"
+        "1x Sol Ring\n"
+        "sol  ring\n"
+        "Arcane Signet\n"
+        "12 Forest\n"
+        "# a comment\n"
+        "// another\n"
+    )
+    assert cards == {
+        "atraxa, praetors' voice": "Atraxa, Praetors' Voice",
+        "sol ring": "Sol Ring",
+        "arcane signet": "Arcane Signet",
+        "forest": "Forest",
+    }
+
+
+def test_skips_unplayed_sections():
+    cards = parse_cards("1 Sol Ring\nSideboard:\n1 Swords to Plowshares\nMaybeboard\n1 Mana Crypt\nDeck:\n1 Forest")
+    assert set(cards) == {"sol ring", "forest"}
+
+
+def test_empty_and_missing_lists():
+    assert parse_cards(None) == {}
+    assert parse_cards("\n\n") == {}
+    assert card_key("  Sol   Ring ") == "sol ring"
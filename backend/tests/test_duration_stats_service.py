@@ -0,0 +1,77 @@
+"""
+Tests for game duration analytics maintained from approved results.
+"""
+import pytest
+
+from backend.app import db
+from backend.app.models import DurationSketch
+from backend.app.api.services.duration_stats_service import DurationStatsService
+from backend.app.jobs import Worker
+
+
+@pytest.fixture
+def players(make_users):
+    return make_users("alice", "bob", "carol", "admin", decks=True)
+
+
+def _groups(client, by):
+    body = client.get(f'/api/stats/durations?by={by}').get_json()
+    return body['overall'], {g['key']: g for g in body['groups']}
+
+
+def test_durations_grouped_by_dimension(db_app, players, auth_headers, migration, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, carol, admin = players
+    play_and_approve('2025-07-01', [alice, bob], start_time='2025-07-01T19:00', end_time='2025-07-01T20:00')
+    play_and_approve('2025-07-02', [alice, bob, carol], pauper=True,
+                     start_time='2025-07-02T19:00', end_time='2025-07-02T20:30')
+    _, slow_match = play_and_approve('2025-07-03', [bob, carol, alice],
+                                     start_time='2025-07-03T19:00', end_time='2025-07-03T21:30')
+
+    overall, by_count = _groups(client, 'player_count')
+    assert overall == {'games': 3, 'median_minutes': 90, 'p90_minutes': 150}
+    assert by_count['2']['median_minutes'] == 60 and by_count['3']['games'] == 2
+
+    _, by_pauper = _groups(client, 'pauper')
+    assert (by_pauper['pauper']['games'], by_pauper['regular']['games']) == (1, 2)
+
+    _, by_commander = _groups(client, 'commander')
+    assert by_commander['carol cmdr']['median_minutes'] == 120
+
+    _, by_player = _groups(client, 'player')
+    assert by_player[str(alice[0])]['username'] == 'alice'
+    assert by_player[str(alice[0])]['games'] == 3
+
+    # Un-approving queues a rebuild of only the affected groups without the match
+    client.post(f'/api/admin/matches/{slow_match}/unapprove', json={'reason': 'test'}, headers=auth_headers(admin[0]))
+    Worker(db_app).run_until_idle()
+    overall, by_count = _groups(client, 'player_count')
+    assert overall['games'] == 2 and by_count['3']['median_minutes'] == 90
+    _, by_commander = _groups(client, 'commander')
+    assert by_commander['carol cmdr']['games'] == 1
+
+    incremental = {(s.dimension, s.group_key): s.digest for s in DurationSketch.query.filter(DurationSketch.games > 0)}
+    DurationStatsService.rebuild_all()
+    db.session.commit()
+    rebuilt = {(s.dimension, s.group_key): s.digest for s in DurationSketch.query}
+    assert rebuilt == incremental
+
+    # The migration fills the table with the same sketches
+    DurationSketch.query.delete()
+    assert migration('add_duration_sketches_table').populate(db.session.connection()) == len(incremental)
+    db.session.commit()
+    db.session.expire_all()
+    assert {(s.dimension, s.group_key): s.digest for s in DurationSketch.query} == incremental
+
+
+def test_matches_without_times_are_ignored(db_app, players, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, _, _ = players
+    play_and_approve('2025-07-09', [alice, bob])
+    overall, groups = _groups(client, 'player_count')
+    assert overall == {'games': 0, 'median_minutes': None, 'p90_minutes': None}
+    assert groups == {}
+
+
+def test_unknown_dimension_is_rejected(db_app):
+    assert db_app.test_client().get('/api/stats/durations?by=weather').status_code == 400
@@ -0,0 +1,72 @@
+"""
+Tests for ?fields= / ?include= on the game, match and registration lists.
+"""
+import pytest
+
+from backend.app import db
+from backend.app.models import User, Deck
+
+
+@pytest.fixture
+def played(db_app, auth_headers):
+    users = [User(username=name, email=f"{name}@example.com", password_hash="x") for name in ("alice", "bob")]
+    db.session.add_all(users)
+    db.session.flush()
+    decks = [Deck(user_id=u.id, name=f"{u.username} deck", commander=f"{u.username} cmdr", colors="U") for u in users]
+    db.session.add_all(decks)
+    db.session.commit()
+
+    client = db_app.test_client()
+    game_id = client.post('/api/games', json={'game_date': '2025-08-01'}).get_json()['game']['id']
+    for user, deck in zip(users, decks):
+        client.post(f'/api/games/{game_id}/registrations', json={'deck_id': deck.id}, headers=auth_headers(user.id))
+    placements = [{'user_id': u.id, 'placement': n} for n, u in enumerate(users, start=1)]
+    match_id = client.post('/api/matches', json={'game_id': game_id, 'placements': placements},
+                           headers=auth_headers(users[0].id)).get_json()['match_id']
+    return client, game_id, match_id
+
+
+def test_default_shapes_are_unchanged(played):
+    client, game_id, match_id = played
+    game = client.get('/api/games').get_json()[0]
+    assert set(game) == {'id', 'game_date', 'status', 'is_pauper', 'details', 'match_id', 'match_status',
+                         'submitted_by_id', 'registration_count', 'winner_id', 'winner_username'}
+    match = client.get('/api/matches').get_json()[0]
+    assert match['submitted_by'] == 'alice' and match['game_date'] == '2025-08-01' and 'players' not in match
+    registration = client.get(f'/api/games/{game_id}/registrations').get_json()[0]
+    assert registration['username'] == 'alice' and registration['commander'] == 'alice cmdr'
+    assert 'version_number' not in registration
+
+
+def test_fields_narrow_items_and_skip_joins(db_app, played, captured_sql):
+    client, game_id, match_id = played
+    assert client.get('/api/games?fields=game_date').get_json() == [{'id': game_id, 'game_date': '2025-08-01'}]
+
+    with captured_sql(db.engine) as statements:
+        matches = client.get('/api/matches?fields=status,created_at').get_json()
+    assert set(matches[0]) == {'match_id', 'status', 'created_at'}
+    listing = next(s for s in statements if 'FROM matches' in s and 'match_players' not in s)
+    assert 'JOIN' not in listing
+
+    with captured_sql(db.engine) as statements:
+        registrations = client.get(f'/api/games/{game_id}/registrations?fields=deck_name').get_json()
+    assert [r['deck_name'] for r in registrations] == ['alice deck', 'bob deck']
+    listing = next(s for s in statements if 'FROM game_registrations' in s)
+    assert 'JOIN decks' in listing and 'JOIN users' not in listing and 'deck_versions' not in listing
+
+
+def test_include_expands(played):
+    client, game_id, match_id = played
+    game = client.get('/api/games?fields=id&include=players').get_json()[0]
+    assert [p['username'] for p in game['players']] == ['alice', 'bob']
+
+    match = client.get('/api/matches?fields=match_id&include=players').get_json()[0]
+    assert [(p['username'], p['placement']) for p in match['players']] == [('alice', 1), ('bob', 2)]
+
+
+def test_unknown_fields_are_rejected(played):
+    client, game_id, _ = played
+    response = client.get('/api/matches?fields=status,secret')
+    assert response.status_code == 400 and 'secret' in response.get_json()['error']
+    assert client.get('/api/games?include=everything').status_code == 400
+    assert client.get(f'/api/games/{game_id}/registrations?fields=password').status_code == 400
@@ -0,0 +1,119 @@
+"""
+Tests for the game_summaries read model and its maintenance by the lifecycle routes.
+"""
+from datetime import date
+
+import pytest
+
+from backend.app import db
+from backend.app.models import Game, GameStatus, GameSummary
+from backend.app.soft_delete import including_deleted
+from backend.app.api.services.game_summary_service import GameSummaryService
+
+
+@pytest.fixture
+def players(make_users):
+    return make_users("alice", "bob", "admin", decks=True)
+
+
+def _summary(game_id):
+    db.session.expire_all()
+    with including_deleted():
+        return db.session.get(GameSummary, game_id)
+
+
+def test_lifecycle_keeps_summary_in_step(db_app, players, auth_headers):
+    client = db_app.test_client()
+    (alice, alice_deck), (bob, bob_deck), (admin, _) = players
+
+    game_id = client.post('/api/games', json={'game_date': '2025-03-03'}).get_json()['game']['id']
+    assert _summary(game_id).registration_count == 0
+
+    client.post(f'/api/games/{game_id}/registrations', json={'deck_id': alice_deck}, headers=auth_headers(alice))
+    client.post(f'/api/games/{game_id}/registrations', json={'deck_id': bob_deck}, headers=auth_headers(bob))
+    summary = _summary(game_id)
+    assert summary.registration_count == 2
+    assert {p['username'] for p in summary.players} == {'alice', 'bob'}
+    assert summary.match_id is None
+
+    placements = [{'user_id': alice, 'placement': 1}, {'user_id': bob, 'placement': 2}]
+    match_id = client.post('/api/matches', json={'game_id': game_id, 'placements': placements},
+                           headers=auth_headers(bob)).get_json()['match_id']
+    summary = _summary(game_id)
+    assert (summary.match_id, summary.match_status, summary.submitted_by_username) == (match_id, 'pending', 'bob')
+    assert summary.winner_id is None
+    assert [p['placement'] for p in summary.players] == [1, 2]
+
+    client.patch(f'/api/matches/{match_id}/approve', json={}, headers=auth_headers(alice))
+    summary = _summary(game_id)
+    assert summary.match_status == 'approved'
+    assert (summary.winner_id, summary.winner_username) == (alice, 'alice')
+    assert summary.approved_by_username == 'alice'
+
+    games = client.get('/api/games').get_json()
+    assert games == GameSummaryService.list_games()
+    assert [(g['id'], g['status'], g['match_id'], g['winner_username']) for g in games] == [
+        (game_id, GameStatus.COMPLETED.value, match_id, 'alice')]
+
+    client.delete(f'/api/admin/games/{game_id}', json={'reason': 'test'}, headers=auth_headers(admin))
+    assert _summary(game_id).deleted_at is not None
+    assert client.get('/api/games').get_json() == []
+
+    client.post(f'/api/admin/games/{game_id}/restore', json={'reason': 'test'}, headers=auth_headers(admin))
+    assert len(client.get('/api/games').get_json()) == 1
+
+
+def test_migration_fills_summaries_like_the_lifecycle(db_app, players, auth_headers, migration):
+    client = db_app.test_client()
+    (alice, alice_deck), (bob, bob_deck), (admin, _) = players
+    played = client.post('/api/games', json={'game_date': '2025-03-03'}).get_json()['game']['id']
+    upcoming = client.post('/api/games', json={'game_date': '2025-03-10'}).get_json()['game']['id']
+    for game_id in (played, upcoming):
+        for user_id, deck_id in ((alice, alice_deck), (bob, bob_deck)):
+            client.post(f'/api/games/{game_id}/registrations', json={'deck_id': deck_id}, headers=auth_headers(user_id))
+    placements = [{'user_id': bob, 'placement': 1}, {'user_id': alice, 'placement': 2}]
+    match_id = client.post('/api/matches', json={'game_id': played, 'placements': placements},
+                           headers=auth_headers(bob)).get_json()['match_id']
+    client.patch(f'/api/matches/{match_id}/approve', json={}, headers=auth_headers(alice))
+    client.delete(f'/api/admin/games/{upcoming}', json={'reason': 'test'}, headers=auth_headers(admin))
+
+    columns = [c.name for c in GameSummary.__table__.columns if c.name != 'updated_at']
+
+    def snapshot():
+        db.session.expire_all()
+        with including_deleted():
+            return {s.game_id: [getattr(s, name) for name in columns] for s in GameSummary.query}
+
+    maintained = snapshot()
+    GameSummary.query.delete()
+    assert migration('add_game_summaries_table').populate(db.session.connection()) == 2
+    db.session.commit()
+    assert snapshot() == maintained
+
+
+def test_failed_transition_leaves_summary_untouched(db_app, players, auth_headers):
+    client = db_app.test_client()
+    (alice, alice_deck), _, _ = players
+    game = Game(game_date=date(2025, 4, 1))
+    db.session.add(game)
+    db.session.flush()
+    GameSummaryService.refresh(game)
+    db.session.commit()
+
+    # Registering the same user twice fails validation; nothing changes
+    client.post(f'/api/games/{game.id}/registrations', json={'deck_id': alice_deck}, headers=auth_headers(alice))
+    response = client.post(f'/api/games/{game.id}/registrations', json={'deck_id': alice_deck}, headers=auth_headers(alice))
+    assert response.status_code == 409
+    assert _summary(game.id).registration_count == 1
+
+
+def test_status_filter(db_app, players):
+    for day, status in ((1, 'Upcoming'), (2, 'Cancelled')):
+        game = Game(game_date=date(2025, 5, day))
+        db.session.add(game)
+        db.session.flush()
+        GameSummaryService.refresh(game)
+    db.session.commit()
+    client = db_app.test_client()
+    assert [g['game_date'] for g in client.get('/api/games?status=Upcoming').get_json()] == ['2025-05-02', '2025-05-01']
+    assert client.get('/api/games?status=Bogus').status_code == 400
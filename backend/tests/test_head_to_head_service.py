@@ -0,0 +1,203 @@
+"""
+Tests for the head-to-head store, its incremental maintenance and the NumPy matrix.
+"""
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from backend.app import db
+from backend.app.models import User, Deck, Game, GameStatus, HeadToHead, Match, MatchPlayer
+from backend.app.api.services.head_to_head_service import HeadToHeadService
+
+
+@pytest.fixture
+def players(make_users):
+    return make_users("alice", "bob", "carol", "admin", decks=True)
+
+
+def _record(client, user_id):
+    return {row['opponent_username']: row for row in client.get(f'/api/users/{user_id}/head-to-head').get_json()}
+
+
+def test_store_follows_approval_unapproval_and_soft_delete(db_app, players, auth_headers, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, carol, admin = players
+
+    play_and_approve('2025-05-01', [alice, bob, carol])
+    game_id, match_id = play_and_approve('2025-05-02', [bob, alice])
+
+    record = _record(client, alice[0])
+    assert (record['bob']['games'], record['bob']['wins'], record['bob']['losses']) == (2, 1, 1)
+    assert record['bob']['avg_placement_delta'] == 0
+    assert (record['carol']['games'], record['carol']['wins'], record['carol']['avg_placement_delta']) == (1, 1, 2)
+
+    response = client.post(f'/api/admin/matches/{match_id}/unapprove', json={'reason': 'wrong placements'},
+                           headers=auth_headers(admin[0]))
+    assert response.status_code == 200
+    assert _record(client, alice[0])['bob']['games'] == 1
+    assert db.session.get(Match, match_id).status == 'pending'
+
+    client.patch(f'/api/matches/{match_id}/approve', json={}, headers=auth_headers(alice[0]))
+    assert _record(client, alice[0])['bob']['games'] == 2
+
+    client.delete(f'/api/admin/games/{game_id}', json={'reason': 'test'}, headers=auth_headers(admin[0]))
+    assert _record(client, bob[0])['alice']['games'] == 1
+    client.post(f'/api/admin/games/{game_id}/restore', json={'reason': 'test'}, headers=auth_headers(admin[0]))
+    assert _record(client, bob[0])['alice']['games'] == 2
+
+
+def test_rebuild_skips_soft_deleted_games(db_app, players, auth_headers, play_and_approve):
+    from backend.app.soft_delete import including_deleted
+
+    client = db_app.test_client()
+    alice, bob, carol, admin = players
+    play_and_approve('2025-05-01', [alice, bob])
+    game_id, _ = play_and_approve('2025-05-02', [carol, alice])
+    client.delete(f'/api/admin/games/{game_id}', json={'reason': 'test'}, headers=auth_headers(admin[0]))
+    assert set(_record(client, alice[0])) == {'bob'}
+
+    # As the backfill script runs it: with the global soft-delete filter off
+    with including_deleted():
+        HeadToHeadService.rebuild()
+    db.session.commit()
+    assert set(_record(client, alice[0])) == {'bob'}
+    assert _record(client, carol[0]) == {}
+
+
+def test_migration_fills_the_store_like_the_lifecycle(db_app, players, auth_headers, migration, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, carol, admin = players
+    play_and_approve('2025-05-01', [alice, bob, carol])
+    play_and_approve('2025-05-02', [carol, alice])
+    game_id, _ = play_and_approve('2025-05-03', [bob, carol])
+    client.delete(f'/api/admin/games/{game_id}', json={'reason': 'test'}, headers=auth_headers(admin[0]))
+
+    def snapshot():
+        db.session.expire_all()
+        return {(r.user_id, r.opponent_id): (r.games, r.wins, r.losses, r.placement_delta_sum)
+                for r in HeadToHead.query}
+
+    maintained = snapshot()
+    HeadToHead.query.delete()
+    db.session.execute(db.text(migration('add_head_to_head_table').POPULATE))
+    db.session.commit()
+    assert snapshot() == maintained
+
+
+def test_unapprove_requires_approved_match(db_app, players, auth_headers):
+    client = db_app.test_client()
+    alice, bob, _, admin = players
+    game_id = client.post('/api/games', json={'game_date': '2025-05-03'}).get_json()['game']['id']
+    match = Match(game_id=game_id, player_count=2, status='pending', submitted_by_id=alice[0])
+    db.session.add(match)
+    db.session.commit()
+
+    response = client.post(f'/api/admin/matches/{match.id}/unapprove', json={'reason': 'x'},
+                           headers=auth_headers(admin[0]))
+    assert response.status_code == 400
+    response = client.post(f'/api/admin/matches/{match.id}/unapprove', json={'reason': 'x'},
+                           headers=auth_headers(alice[0]))
+    assert response.status_code == 403
+
+
+def test_concurrent_unapprove_is_a_conflict(db_app, players, auth_headers, play_and_approve):
+    from sqlalchemy import update
+
+    client = db_app.test_client()
+    alice, bob, _, admin = players
+    _, match_id = play_and_approve('2025-05-01', [alice, bob])
+
+    def _changed_meanwhile(mapper, connection, target):
+        # Another transaction's transition lands first and bumps the lock version
+        connection.execute(update(Match.__table__).where(Match.__table__.c.id == target.id).values(
+            version_id=Match.__table__.c.version_id + 1))
+
+    event.listen(Match, 'before_update', _changed_meanwhile, once=True)
+    try:
+        response = client.post(f'/api/admin/matches/{match_id}/unapprove', json={'reason': 'x'},
+                               headers=auth_headers(admin[0]))
+    finally:
+        event.remove(Match, 'before_update', _changed_meanwhile)
+    assert response.status_code == 409
+    assert 'changed by another request' in response.get_json()['error']
+    db.session.expire_all()
+    assert db.session.get(Match, match_id).status == 'approved'
+    assert _record(client, alice[0])['bob']['games'] == 1
+
+
+def test_incremental_store_matches_numpy_matrix(db_app):
+    rng = random.Random(7)
+    users = [User(username=f"p{i}", email=f"p{i}@example.com", password_hash="x") for i in range(8)]
+    db.session.add_all(users)
+    db.session.flush()
+    decks = [Deck(user_id=u.id, name="d", commander="c", colors="G") for u in users]
+    db.session.add_all(decks)
+    db.session.flush()
+
+    for day in range(1, 26):
+        game = Game(game_date=date(2025, 1, day), status=GameStatus.COMPLETED)
+        db.session.add(game)
+        db.session.flush()
+        pod = rng.sample(range(len(users)), rng.randint(2, 5))
+        match = Match(game_id=game.id, player_count=len(pod), status='approved', submitted_by_id=users[0].id)
+        db.session.add(match)
+        db.session.flush()
+        db.session.add_all([MatchPlayer(match_id=match.id, user_id=users[i].id, deck_id=decks[i].id, placement=p)
+                            for p, i in enumerate(pod, start=1)])
+        db.session.flush()
+        HeadToHeadService.apply_match(match, 1)
+    db.session.commit()
+
+    incremental = {(r.user_id, r.opponent_id): (r.games, r.wins, r.losses, r.placement_delta_sum)
+                   for r in HeadToHead.query.filter(HeadToHead.games > 0)}
+
+    matrix = HeadToHeadService.build_matrix()
+    ids = matrix.user_ids.tolist()
+    from_matrix = {
+        (ids[i], ids[j]): (matrix.games[i, j], matrix.wins[i, j], matrix.losses[i, j], matrix.placement_delta_sum[i, j])
+        for i, j in zip(*np.nonzero(matrix.games))
+    }
+    assert incremental == from_matrix
+    assert (matrix.wins == matrix.losses.T).all()
+    assert (matrix.games == matrix.games.T).all()
+
+    # The endpoint's matrix, read from the store, is the same matrix
+    stored = HeadToHeadService.stored_matrix()
+    assert stored.user_ids.tolist() == ids
+    for name in ('games', 'wins', 'losses', 'placement_delta_sum'):
+        assert (getattr(stored, name) == getattr(matrix, name)).all()
+
+    HeadToHeadService.rebuild()
+    db.session.commit()
+    rebuilt = {(r.user_id, r.opponent_id): (r.games, r.wins, r.losses, r.placement_delta_sum)
+               for r in HeadToHead.query}
+    assert rebuilt == incremental
+
+
+def test_matrix_endpoint(db_app, players, captured_sql, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, carol, _ = players
+    play_and_approve('2025-05-01', [carol, alice, bob])
+    assert client.get('/api/users/head-to-head').get_json() == HeadToHeadService.matrix_to_dict(
+        HeadToHeadService.build_matrix())
+
+    with captured_sql(db.engine) as statements:
+        client.get('/api/users/head-to-head')
+    assert not any('match_players' in s for s in statements)
+
+    body = client.get('/api/users/head-to-head').get_json()
+    names = [p['username'] for p in body['players']]
+    assert sorted(names) == ['alice', 'bob', 'carol']
+    c, b = names.index('carol'), names.index('bob')
+    assert body['games'][c][b] == 1 and body['wins'][c][b] == 1 and body['losses'][b][c] == 1
+    assert body['avg_placement_delta'][c][b] == 2
+
+
+def test_matrix_with_no_matches(db_app):
+    matrix = HeadToHeadService.build_matrix()
+    assert matrix.games.shape == (0, 0)
+    assert HeadToHeadService.matrix_to_dict(matrix)['players'] == []
+    assert HeadToHeadService.stored_matrix().games.shape == (0, 0)
@@ -0,0 +1,212 @@
+"""
+Tests for the database-backed job queue and the jobs that use it.
+"""
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+
+from backend.app import db
+from backend.app.jobs import DONE, FAILED, QUEUED, RUNNING, REGISTRY, Worker, enqueue, job, purge_finished
+from backend.app.models import Job, JobSchedule, User
+
+calls = []
+
+
+@job('test_record')
+def _record(value):
+    calls.append(value)
+
+
+@job('test_flaky', max_attempts=3)
+def _flaky():
+    calls.append('attempt')
+    raise RuntimeError('boom')
+
+
+@job('test_writes')
+def _writes(username):
+    db.session.add(User(username=username, email=f'{username}@example.com', password_hash='x'))
+    raise RuntimeError('after writing')
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+    yield
+    REGISTRY.pop('test_every', None)
+
+
+def _only_test_jobs(worker):
+    """Run due jobs without the periodic ones (tick is not called)."""
+    count = 0
+    while worker.run_once():
+        count += 1
+    return count
+
+
+def test_job_runs_and_records_duration(db_app):
+    enqueue('test_record', {'value': 1})
+    db.session.commit()
+    worker = Worker(db_app)
+    assert _only_test_jobs(worker) == 1
+    assert calls == [1]
+    row = Job.query.one()
+    assert row.status == DONE and row.attempts == 1 and row.duration_ms is not None
+    assert worker.stats['test_record']['done'] == 1
+
+
+def test_uncommitted_job_is_not_run(db_app):
+    enqueue('test_record', {'value': 1})
+    db.session.rollback()
+    assert _only_test_jobs(Worker(db_app)) == 0
+
+
+def test_unknown_job_is_rejected(db_app):
+    with pytest.raises(ValueError):
+        enqueue('no_such_job')
+
+
+def test_priority_then_run_at_order(db_app):
+    enqueue('test_record', {'value': 'low'}, priority=0)
+    enqueue('test_record', {'value': 'high'}, priority=100)
+    enqueue('test_record', {'value': 'normal'})
+    enqueue('test_record', {'value': 'later'}, priority=100, delay=timedelta(hours=1))
+    db.session.commit()
+    _only_test_jobs(Worker(db_app))
+    assert calls == ['high', 'normal', 'low']
+
+
+def test_failures_back_off_then_fail(db_app):
+    db_app.config['JOB_BACKOFF_SECONDS'] = 60
+    enqueue('test_flaky')
+    db.session.commit()
+    worker = Worker(db_app)
+
+    assert worker.run_once()
+    row = db.session.query(Job).populate_existing().one()
+    assert row.status == QUEUED and row.attempts == 1 and 'boom' in row.last_error
+    assert row.run_at > datetime.utcnow() + timedelta(seconds=40)
+    assert not worker.run_once()  # Not due yet
+
+    for attempt in (2, 3):
+        row.run_at = datetime.utcnow()
+        db.session.commit()
+        assert worker.run_once()
+    row = db.session.query(Job).populate_existing().one()
+    assert row.status == FAILED and row.attempts == 3 and calls == ['attempt'] * 3
+    assert worker.stats['test_flaky']['failed'] == 3
+
+
+def test_failed_job_writes_are_rolled_back(db_app):
+    enqueue('test_writes', {'username': 'ghost'}, max_attempts=1)
+    db.session.commit()
+    Worker(db_app).run_once()
+    assert User.query.filter_by(username='ghost').first() is None
+    assert db.session.query(Job.status).scalar() == FAILED
+
+
+def test_expired_lease_is_requeued(db_app):
+    enqueue('test_record', {'value': 'again'})
+    db.session.commit()
+    row = Job.query.one()
+    row.status, row.attempts, row.locked_by = RUNNING, 1, 'dead-worker'
+    row.locked_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+    worker = Worker(db_app)
+    worker.tick()
+    assert db.session.query(Job.status).filter(Job.name == 'test_record').scalar() == QUEUED
+    _only_test_jobs(worker)
+    assert calls == ['again']
+
+
+def test_expired_lease_on_last_attempt_fails_the_job(db_app):
+    enqueue('test_record', {'value': 'lost'})
+    db.session.commit()
+    row = Job.query.one()
+    row.status, row.attempts, row.locked_by = RUNNING, row.max_attempts, 'dead-worker'
+    row.locked_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+    Worker(db_app).tick()
+    row = Job.query.filter_by(name='test_record').one()
+    assert row.status == FAILED and row.finished_at is not None
+    assert purge_finished(datetime.utcnow() + timedelta(seconds=1)) == 1
+
+
+def test_periodic_job_enqueued_once_per_period(db_app):
+    job('test_every', every=timedelta(minutes=5))(lambda: calls.append('tick'))
+    first, second = Worker(db_app, name='a'), Worker(db_app, name='b')
+    first.tick()
+    second.tick()
+    assert Job.query.filter_by(name='test_every').count() == 1
+    assert db.session.get(JobSchedule, 'test_every').next_run_at > datetime.utcnow()
+
+    db.session.get(JobSchedule, 'test_every').next_run_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    second.tick()
+    assert Job.query.filter_by(name='test_every').count() == 2
+
+
+def test_expired_temp_passwords_are_cleared(db_app):
+    expired = User(username='old', email='old@example.com', password_hash='x')
+    expired.set_temp_password('temp', expires_in_hours=-1)
+    live = User(username='new', email='new@example.com', password_hash='x')
+    live.set_temp_password('temp')
+    db.session.add_all([expired, live])
+    db.session.commit()
+
+    enqueue('clear_expired_temp_passwords')
+    db.session.commit()
+    _only_test_jobs(Worker(db_app))
+    rows = dict(db.session.query(User.username, User.temp_password_expires_at))
+    assert rows['old'] is None and rows['new'] is not None
+
+
+def test_avatar_upload_is_moved_into_place_by_job(db_app, auth_headers, tmp_path, monkeypatch):
+    monkeypatch.setattr(db_app, 'static_folder', str(tmp_path))
+    folder = tmp_path / 'uploads' / 'avatars'
+    folder.mkdir(parents=True)
+    user = User(username='pic', email='pic@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    (folder / f'user_{user.id}_avatar.gif').write_bytes(b'old')
+
+    client = db_app.test_client()
+    response = client.post('/api/profile/avatar', headers=auth_headers(user.id),
+                           data={'avatar': (BytesIO(b'new image'), 'me.png')}, content_type='multipart/form-data')
+    assert response.status_code == 202
+    assert db.session.get(User, user.id).avatar_url is None
+    assert [p.name.startswith('.') for p in folder.iterdir()].count(True) == 1
+
+    _only_test_jobs(Worker(db_app))
+    assert sorted(p.name for p in folder.iterdir()) == [f'user_{user.id}_avatar.png']
+    assert (folder / f'user_{user.id}_avatar.png').read_bytes() == b'new image'
+    user = db.session.query(User).populate_existing().filter_by(id=user.id).one()
+    assert user.avatar_url == response.get_json()['avatar_url']
+
+
+def test_admin_job_stats_and_recompute(db_app, auth_headers):
+    admin = User(username='boss', email='boss@example.com', password_hash='x', is_admin=True)
+    db.session.add(admin)
+    db.session.commit()
+    client = db_app.test_client()
+
+    response = client.post('/api/admin/stats/recompute', headers=auth_headers(admin.id))
+    assert response.status_code == 202
+    _only_test_jobs(Worker(db_app))
+
+    stats = {entry['name']: entry for entry in
+             client.get('/api/admin/jobs', headers=auth_headers(admin.id)).get_json()['jobs']}
+    assert stats['recompute_card_stats']['done'] == 1
+    assert stats['recompute_card_stats']['avg_duration_ms'] is not None
+
+
+def test_worker_command_burst(db_app):
+    enqueue('test_record', {'value': 'cli'})
+    db.session.commit()
+    result = db_app.test_cli_runner().invoke(args=['worker', '--burst'])
+    assert result.exit_code == 0, result.output
+    assert 'cli' in calls
+    assert 'Ran' in result.output
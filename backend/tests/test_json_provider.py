@@ -0,0 +1,74 @@
+"""
+Tests for the API JSON providers.
+"""
+import enum
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import List, Optional
+
+import pytest
+
+from backend.app.json_provider import FastJSONProvider, OrjsonProvider, make_json_provider, orjson
+from backend.app.models import GameStatus
+
+PROVIDERS = [FastJSONProvider, pytest.param(OrjsonProvider, marks=pytest.mark.skipif(
+    orjson is None, reason="orjson not installed"))]
+
+
+@dataclass(slots=True)
+class Child:
+    name: str
+    color: enum.Enum
+
+
+@dataclass(slots=True)
+class Parent:
+    id: int
+    played_on: date
+    updated_at: datetime
+    children: List[Child] = field(default_factory=list)
+    notes: Optional[str] = None
+
+
+def _payload():
+    return [Parent(id=1, played_on=date(2025, 3, 1), updated_at=datetime(2025, 3, 1, 20, 15, 30),
+                   children=[Child(name="a", color=GameStatus.COMPLETED)])]
+
+
+EXPECTED = [{
+    "children": [{"color": "Completed", "name": "a"}],
+    "id": 1,
+    "notes": None,
+    "played_on": "2025-03-01",
+    "updated_at": "2025-03-01T20:15:30",
+}]
+
+
+@pytest.mark.parametrize('provider_cls', PROVIDERS)
+def test_serializes_nested_slotted_dataclasses(db_app, provider_cls):
+    provider = provider_cls(db_app)
+    assert json.loads(provider.dumps(_payload())) == EXPECTED
+
+
+@pytest.mark.parametrize('provider_cls', PROVIDERS)
+def test_response_is_json(db_app, provider_cls):
+    provider = provider_cls(db_app)
+    with db_app.app_context():
+        response = provider.response(_payload())
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == EXPECTED
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+def test_providers_produce_identical_documents(db_app):
+    payload = {"games": _payload(), "count": 1}
+    assert json.loads(OrjsonProvider(db_app).dumps(payload)) == json.loads(FastJSONProvider(db_app).dumps(payload))
+
+
+def test_provider_selection(db_app):
+    db_app.config['JSON_PROVIDER'] = 'default'
+    assert isinstance(make_json_provider(db_app), FastJSONProvider)
+    db_app.config['JSON_PROVIDER'] = 'auto'
+    expected = OrjsonProvider if orjson is not None else FastJSONProvider
+    assert isinstance(make_json_provider(db_app), expected)
@@ -0,0 +1,109 @@
+"""
+Tests for the in-memory player leaderboards and rank lookups.
+"""
+import pytest
+
+from backend.app import db
+from backend.app import leaderboards
+from backend.app.leaderboards import Board, Leaderboards
+
+
+def test_ties_share_a_rank_and_pages_are_stable():
+    # user id -> [games, wins, placement_sum, points]
+    board = Board({1: [4, 3, 6, 8], 2: [4, 2, 8, 6], 3: [4, 2, 7, 7], 4: [2, 0, 5, 1], 5: [1, 1, 1, 2]}, min_games=2)
+    assert [board.rank('wins', user_id) for user_id in (1, 2, 3, 5, 4)] == [1, 2, 2, 4, 5]
+    assert [entry[:2] for entry in board.page('wins', 0, 10)] == [(1, 1), (2, 2), (2, 3), (4, 5), (5, 4)]
+    # A page starting inside a tie keeps the tie's rank
+    assert [entry[:2] for entry in board.page('wins', 2, 2)] == [(2, 3), (4, 5)]
+
+    # Rate metrics skip players under the minimum
+    assert board.rank('win_rate', 5) is None and board.rank('wins', 5) == 4
+    assert [user_id for _, user_id, _ in board.page('avg_placement', 0, 10)] == [1, 3, 2, 4]
+
+    board.patch(4, [1, 1, 1, 3])
+    board.patch(2, [-4, -2, -8, -6])
+    assert 2 not in board.totals and board.rank('wins', 2) is None
+    assert [entry[:2] for entry in board.page('wins', 0, 10)] == [(1, 1), (2, 3), (3, 4), (3, 5)]
+    assert board.rank('points_per_game', 1) == 1 and board.rank('points_per_game', 4) == 3
+
+
+def test_boards_built_during_a_commit_are_not_patched_twice(monkeypatch):
+    history = {1: [1, 1, 1, 1]}
+    monkeypatch.setattr(leaderboards, 'aggregate', lambda scope: {k: list(v) for k, v in history.items()})
+    boards = Leaderboards(min_games=1)
+    scope, win = ('all', ''), [(('all', ''), 2, [1, 1, 1, 1])]
+
+    # Built before the commit started: the change is patched in
+    boards.page(scope, 'wins', 0, 10)
+    stamp = boards.stamp()
+    history[2] = [1, 1, 1, 1]
+    boards.apply(win, stamp)
+    assert boards.rank(scope, 'wins', 2) == (1, 2, [1, 1, 1, 1])
+
+    # Rebuilt between the commit and its after_commit: the aggregate already counts it
+    boards.refresh_seconds = 0
+    stamp = boards.stamp()
+    history[2] = [2, 2, 2, 2]
+    boards.page(scope, 'wins', 0, 10)
+    boards.refresh_seconds = 300
+    boards.apply(win, stamp)
+    assert boards.rank(scope, 'wins', 2) == (1, 2, [2, 2, 2, 2])
+
+
+@pytest.fixture
+def users(db_app, make_users):
+    db_app.extensions['leaderboards'].min_games = 2
+    return make_users("alice", "bob", "cara", "admin")
+
+
+def _board(client, query=''):
+    response = client.get(f'/api/stats/leaderboard{query}')
+    assert response.status_code == 200, response.get_json()
+    return [(p['rank'], p['username']) for p in response.get_json()['players']]
+
+
+def test_leaderboard_metrics_and_scopes(db_app, users, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, cara, admin = users
+    play_and_approve('2025-08-01', [alice, bob, cara])
+    play_and_approve('2025-08-02', [bob, alice, cara], pauper=True)
+    play_and_approve('2025-08-03', [alice, cara])
+
+    assert _board(client) == [(1, 'alice'), (2, 'bob'), (3, 'cara')]
+    assert _board(client, '?metric=win_rate') == [(1, 'alice'), (2, 'bob'), (3, 'cara')]
+    # Points: one per opponent placed below - alice 2+1+1, bob 1+2, cara 0
+    body = client.get('/api/stats/leaderboard?metric=points_per_game').get_json()
+    assert [(p['username'], p['points'], p['points_per_game']) for p in body['players']] == [
+        ('bob', 3, 1.5), ('alice', 4, 1.33), ('cara', 0, 0.0)]
+    assert body['min_games'] == 2 and body['total'] == 3
+    assert _board(client, '?scope=pauper') == [(1, 'bob'), (2, 'alice'), (2, 'cara')]
+    assert _board(client, '?metric=wins&limit=1&offset=1') == [(2, 'bob')]
+
+    rank = client.get(f'/api/users/{cara}/rank?metric=avg_placement').get_json()
+    assert (rank['rank'], rank['total'], rank['games'], rank['avg_placement']) == (3, 3, 3, 2.67)
+    assert client.get(f'/api/users/{admin}/rank').get_json()['rank'] is None
+
+    assert client.get('/api/stats/leaderboard?metric=elo').status_code == 400
+    assert client.get('/api/stats/leaderboard?scope=season').status_code == 400
+    assert client.get('/api/stats/leaderboard?scope=season&season=1').get_json()['players'] == []
+
+
+def test_approvals_and_deletes_patch_the_boards(db_app, users, auth_headers, captured_sql, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, cara, admin = users
+    play_and_approve('2025-08-01', [alice, bob])
+    assert _board(client) == [(1, 'alice'), (2, 'bob')]
+
+    # Later results are patched in on commit: no aggregate query on the next read
+    game_id, _ = play_and_approve('2025-08-02', [bob, cara])
+    play_and_approve('2025-08-03', [bob, alice])
+    with captured_sql(db.engine) as statements:
+        assert _board(client) == [(1, 'bob'), (2, 'alice'), (3, 'cara')]
+    assert not any('match_players' in s for s in statements)
+
+    client.delete(f'/api/admin/games/{game_id}', json={'reason': 'test'}, headers=auth_headers(admin))
+    assert _board(client) == [(1, 'alice'), (1, 'bob')]
+    patched = client.get('/api/stats/leaderboard?metric=avg_placement').get_json()['players']
+
+    db_app.extensions['leaderboards'].refresh_seconds = 0  # Force a rebuild from the database
+    assert client.get('/api/stats/leaderboard?metric=avg_placement').get_json()['players'] == patched
@@ -0,0 +1,169 @@
+"""
+Concurrency stress test for the game lifecycle transitions and deck versions.
+
+Fires hundreds of overlapping submit / approve / reject requests (and deck
+version creations) from a thread pool against a file-backed database, then
+checks the invariants the optimistic lock versions and the per-deck version
+counter guarantee: one result per game, every transition either applied or
+refused cleanly (never a 500), and gap-free, unique version numbers.
+Throughput under the same load is measured by benchmarks/bench_lifecycle.py.
+
+Runs on a temporary SQLite file, or on TEST_DATABASE_URL when it is Postgres.
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+from backend.app.config import TestingConfig
+
+N_GAMES = 40
+SUBMITS_PER_GAME = 5
+APPROVES_PER_MATCH = 3
+REJECTS_PER_MATCH = 2
+N_DECK_VERSIONS = 120
+WORKERS = 12
+
+
+@pytest.fixture
+def concurrent_app(monkeypatch, tmp_path):
+    """App on a database that real concurrent connections can share."""
+    from backend.app import create_app, db
+
+    if not TestingConfig.SQLALCHEMY_DATABASE_URI.startswith('postgresql'):
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'lifecycle.db'}")
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', {'connect_args': {'timeout': 30}},
+                            raising=False)
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def seeded_games(concurrent_app, auth_headers):
+    """N_GAMES upcoming games with two registered players each, plus spare approvers."""
+    from backend.app import db
+    from backend.app.models import User, Deck
+
+    users = [User(username=f"player{i}", email=f"player{i}@example.com", password_hash="x") for i in range(6)]
+    db.session.add_all(users)
+    db.session.flush()
+    decks = [Deck(user_id=u.id, name=f"deck {u.id}", commander="cmdr", colors="G") for u in users]
+    db.session.add_all(decks)
+    db.session.commit()
+
+    client = concurrent_app.test_client()
+    game_ids = []
+    for i in range(N_GAMES):
+        game_date = (date(2024, 1, 1) + timedelta(days=i)).isoformat()
+        game_id = client.post('/api/games', json={'game_date': game_date}).get_json()['game']['id']
+        for user, deck in zip(users[:2], decks[:2]):
+            response = client.post(f'/api/games/{game_id}/registrations', json={'deck_id': deck.id},
+                                   headers=auth_headers(user.id))
+            assert response.status_code == 201
+        game_ids.append(game_id)
+    return [u.id for u in users], game_ids
+
+
+def _fire(app, calls):
+    """Run ``(method, url, json, headers)`` calls concurrently; returns their status codes."""
+    def call(args):
+        method, url, body, headers = args
+        return getattr(app.test_client(), method)(url, json=body, headers=headers).status_code
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        return list(pool.map(call, calls))
+
+
+def test_concurrent_lifecycle_transitions_keep_invariants(concurrent_app, seeded_games, auth_headers):
+    from backend.app import db
+    from backend.app.models import Game, GameStatus, HeadToHead, Match, MatchPlayer
+
+    user_ids, game_ids = seeded_games
+    players = user_ids[:2]
+    placements = [{'user_id': players[0], 'placement': 1}, {'user_id': players[1], 'placement': 2}]
+
+    submits = [('post', '/api/matches', {'game_id': game_id, 'placements': placements},
+                auth_headers(players[n % 2]))
+               for n in range(SUBMITS_PER_GAME) for game_id in game_ids]
+    submit_statuses = _fire(concurrent_app, submits)
+
+    counts = Counter(submit_statuses)
+    assert set(counts) <= {201, 400, 409}, counts
+    assert counts[201] == N_GAMES
+
+    db.session.expire_all()
+    matches = db.session.query(Match).all()
+    assert sorted(m.game_id for m in matches) == sorted(game_ids)
+    assert db.session.query(MatchPlayer).count() == 2 * N_GAMES
+    assert all(g.status == GameStatus.COMPLETED for g in db.session.query(Game))
+
+    # Race approvals against rejections by the non-submitting players
+    reviewers = user_ids[2:]
+    reviews = []
+    for match in matches:
+        reviews += [('patch', f'/api/matches/{match.id}/approve', {}, auth_headers(reviewers[n % len(reviewers)]))
+                    for n in range(APPROVES_PER_MATCH)]
+        reviews += [('patch', f'/api/matches/{match.id}/reject', {'approval_notes': 'wrong'},
+                     auth_headers(reviewers[n % len(reviewers)])) for n in range(REJECTS_PER_MATCH)]
+    review_statuses = _fire(concurrent_app, reviews)
+
+    counts = Counter(review_statuses)
+    assert set(counts) <= {200, 400, 409}, counts
+
+    db.session.expire_all()
+    for match in db.session.query(Match):
+        game = db.session.get(Game, match.game_id)
+        if match.status == 'approved':
+            # Approved results always belong to a completed game and record their approver
+            assert game.status == GameStatus.COMPLETED
+            assert match.approved_by_id is not None and match.approved_at is not None
+        else:
+            # Otherwise a rejection won: the game is open for resubmission
+            assert match.status == 'pending'
+            assert game.status == GameStatus.UPCOMING
+            assert match.approval_notes.startswith('Rejected by')
+
+    # Every approval of the same two players landed in their head-to-head rows
+    approved = db.session.query(Match).filter_by(status='approved').count()
+    record = db.session.get(HeadToHead, (players[0], players[1]))
+    assert (record.games, record.wins) == (approved, approved)
+    assert db.session.get(HeadToHead, (players[1], players[0])).losses == approved
+
+
+def test_concurrent_deck_versions_are_unique_and_gap_free(concurrent_app):
+    from backend.app import db
+    from backend.app.models import User, Deck, DeckVersion
+    from backend.app.api.schemas.deck_schemas import DeckCreate, DeckVersionCreate
+    from backend.app.api.services.deck_service import DeckService
+
+    user = User(username="builder", email="builder@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    deck_id = DeckService.create_deck(user.id, DeckCreate(name="Deck", commander="Cmdr", colors="U",
+                                                          decklist_text="1 Island"))[0].id
+    user_id = user.id
+
+    def create_version(n):
+        with concurrent_app.app_context():
+            response, _ = DeckService.create_deck_version(
+                deck_id, user_id, DeckVersionCreate(decklist_text=f"{n} Island", notes=str(n))
+            )
+            return response.version_number
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        numbers = list(pool.map(create_version, range(N_DECK_VERSIONS)))
+
+    assert sorted(numbers) == list(range(2, N_DECK_VERSIONS + 2))
+    db.session.expire_all()
+    stored = [v for (v,) in db.session.query(DeckVersion.version_number).filter_by(deck_id=deck_id)]
+    assert sorted(stored) == list(range(1, N_DECK_VERSIONS + 2))
+    deck = db.session.get(Deck, deck_id)
+    assert deck.version_counter == N_DECK_VERSIONS + 1
+    current = db.session.get(DeckVersion, deck.current_version_id)
+    assert current.deck_id == deck_id
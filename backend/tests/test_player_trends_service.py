@@ -0,0 +1,92 @@
+"""
+Tests for per-player weekly results, trend series and their downsampling.
+"""
+from datetime import date
+
+import pytest
+
+from backend.app import db
+from backend.app.models import PlayerWeeklyStats
+from backend.app.api.services.player_trends_service import PlayerTrendsService
+from backend.app.api.utils.downsample import bucket_mean, lttb
+
+
+def test_downsampling_bounds_the_series_and_keeps_its_shape():
+    series = [(x, 0.0) for x in range(100)]
+    series[37] = (37, 50.0)  # A spike LTTB must keep
+    sampled = lttb(series, 10)
+    assert len(sampled) == 10 and sampled[0] == series[0] and sampled[-1] == series[-1]
+    assert (37, 50.0) in sampled
+    assert lttb(series[:5], 10) == series[:5]
+
+    buckets = bucket_mean([(x, float(x)) for x in range(10)], 5)
+    assert buckets == [(0.5, 0.5), (2.5, 2.5), (4.5, 4.5), (6.5, 6.5), (8.5, 8.5)]
+    with pytest.raises(ValueError):
+        lttb(series, 2)
+
+
+@pytest.fixture
+def users(make_users):
+    return make_users("alice", "bob", "admin")
+
+
+def _points(client, user_id, query=''):
+    response = client.get(f'/api/users/{user_id}/trends{query}')
+    assert response.status_code == 200, response.get_json()
+    return [(p['week'], p['value']) for p in response.get_json()['points']]
+
+
+def _rows():
+    return {(r.user_id, r.week_start): (r.games, r.wins, r.placement_sum) for r in PlayerWeeklyStats.query}
+
+
+def test_weekly_points_follow_approvals(db_app, users, auth_headers, migration, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, admin = users
+    # 2025-09-01 and -03 share a week; -15 is two weeks later, -29 two more
+    play_and_approve('2025-09-01', [alice, bob])
+    play_and_approve('2025-09-03', [bob, alice])
+    play_and_approve('2025-09-15', [alice, bob])
+    last_game, _ = play_and_approve('2025-09-29', [alice, bob])
+
+    assert _points(client, alice) == [('2025-09-01', 1), ('2025-09-15', 2), ('2025-09-29', 3)]
+    assert _points(client, alice, '?series=placement') == [('2025-09-01', 1.5), ('2025-09-15', 1), ('2025-09-29', 1)]
+    # Trailing two weeks: the 09-01 week drops out of the 09-15 window
+    assert _points(client, alice, '?series=win_rate&window=2') == [
+        ('2025-09-01', 0.5), ('2025-09-15', 1), ('2025-09-29', 1)]
+    assert _points(client, alice, '?series=win_rate&window=8')[1] == ('2025-09-15', 0.6667)
+
+    client.delete(f'/api/admin/games/{last_game}', json={'reason': 'test'}, headers=auth_headers(admin))
+    assert _points(client, bob) == [('2025-09-01', 1), ('2025-09-15', 1)]
+    assert (alice, date(2025, 9, 29)) not in _rows()
+
+    incremental = _rows()
+    PlayerTrendsService.recompute(users)
+    db.session.commit()
+    db.session.expire_all()
+    assert _rows() == incremental
+
+    # The migration fills the table with the same rows
+    PlayerWeeklyStats.query.delete()
+    assert migration('add_player_weekly_stats_table').populate(db.session.connection()) == len(incremental)
+    db.session.commit()
+    db.session.expire_all()
+    assert _rows() == incremental
+
+
+def test_series_are_downsampled_to_the_requested_points(db_app, users, play_and_approve):
+    client = db_app.test_client()
+    alice, bob, _ = users
+    for day in range(1, 29, 7):
+        play_and_approve(f'2025-07-{day:02d}', [alice, bob])
+        play_and_approve(f'2025-08-{day:02d}', [bob, alice])
+
+    full = _points(client, alice, '?series=placement')
+    assert len(full) == 8
+    sampled = _points(client, alice, '?series=placement&points=4')
+    assert len(sampled) == 4 and sampled[0] == full[0] and sampled[-1] == full[-1]
+    assert len(_points(client, alice, '?method=bucket&points=2')) == 2
+
+    assert client.get(f'/api/users/{alice}/trends?series=elo').status_code == 400
+    assert client.get(f'/api/users/{alice}/trends?points=2').status_code == 400
+    assert client.get('/api/users/999/trends').status_code == 404
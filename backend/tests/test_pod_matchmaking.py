@@ -0,0 +1,108 @@
+"""
+Tests for the pod optimizer and the pod suggestion endpoint.
+"""
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.app import db
+from backend.app.models import User, Deck, Game, GameRegistration, Match, MatchPlayer
+from backend.app.api.utils.pod_optimizer import optimize_pods, pod_sizes
+
+
+@pytest.mark.parametrize('n,expected', [(3, [3]), (6, [3, 3]), (13, [5, 4, 4]), (14, [4, 4, 3, 3]), (40, [4] * 10)])
+def test_pod_sizes(n, expected):
+    assert pod_sizes(n) == expected
+
+
+def test_pod_sizes_rejects_impossible_splits():
+    with pytest.raises(ValueError):
+        pod_sizes(2)
+    with pytest.raises(ValueError):
+        pod_sizes(7, min_size=4, max_size=5)
+
+
+def _random_problem(n, seed=0):
+    rng = np.random.default_rng(seed)
+    skills = rng.random(n)
+    incidence = (rng.random((10, n)) < 0.15).astype(float)
+    repeats = (incidence * 0.7 ** np.arange(10)[:, None]).T @ incidence
+    np.fill_diagonal(repeats, 0)
+    return skills, repeats
+
+
+def test_forty_players_within_budget():
+    skills, repeats = _random_problem(40)
+    sizes = pod_sizes(40)
+    started = time.perf_counter()
+    split = optimize_pods(skills, repeats, sizes, time_budget=0.05, seed=1)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.1
+    assert sorted(len(p) for p in split.pods) == sorted(sizes)
+    assert sorted(i for pod in split.pods for i in pod) == list(range(40))
+    baseline = optimize_pods(skills, repeats, sizes, max_iterations=0)
+    assert split.cost < baseline.cost
+    assert split.repeat_cost < 0.05
+
+
+def test_optimizer_separates_recent_opponents():
+    # Two cliques of players that just played each other should be mixed up
+    skills = np.full(8, 0.5)
+    repeats = np.zeros((8, 8))
+    for clique in ([0, 1, 2, 3], [4, 5, 6, 7]):
+        for i in clique:
+            for j in clique:
+                if i != j:
+                    repeats[i, j] = 1
+    split = optimize_pods(skills, repeats, [4, 4], seed=3)
+    for pod in split.pods:
+        assert len(set(pod) & {0, 1, 2, 3}) == 2
+
+
+def test_suggest_endpoint(db_app, auth_headers):
+    users = [User(username=f"p{i}", email=f"p{i}@example.com", password_hash="x") for i in range(13)]
+    db.session.add_all(users)
+    db.session.flush()
+    decks = [Deck(user_id=u.id, name=f"deck {u.id}", commander="cmdr", colors="U") for u in users]
+    db.session.add_all(decks)
+    db.session.flush()
+
+    # History: p0 beat p1 and p2 last week, so those three should be split up
+    past = Game(game_date=date(2025, 9, 1))
+    db.session.add(past)
+    db.session.flush()
+    match = Match(game_id=past.id, player_count=3, status='approved', submitted_by_id=users[0].id,
+                  created_at=datetime(2025, 9, 1) + timedelta(hours=3))
+    db.session.add(match)
+    db.session.flush()
+    db.session.add_all([MatchPlayer(match_id=match.id, user_id=users[i].id, deck_id=decks[i].id, placement=i + 1)
+                        for i in range(3)])
+
+    game = Game(game_date=date(2025, 9, 8))
+    db.session.add(game)
+    db.session.flush()
+    db.session.add_all([GameRegistration(game_id=game.id, user_id=u.id, deck_id=d.id) for u, d in zip(users, decks)])
+    db.session.commit()
+
+    response = db_app.test_client().post(f'/api/games/{game.id}/pods/suggest', json={'seed': 7},
+                                         headers=auth_headers(users[0].id))
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['pod_sizes'] == [5, 4, 4]
+    placed = [p['user_id'] for pod in body['pods'] for p in pod['players']]
+    assert sorted(placed) == sorted(u.id for u in users)
+    assert all(pod['repeat_pairs'] == 0 for pod in body['pods'])
+    skills = {p['username']: p['skill'] for pod in body['pods'] for p in pod['players']}
+    assert skills['p0'] > skills['p4'] > skills['p2']
+
+
+def test_suggest_needs_enough_players(db_app, auth_headers):
+    user = User(username="solo", email="solo@example.com", password_hash="x")
+    game = Game(game_date=date(2025, 9, 15))
+    db.session.add_all([user, game])
+    db.session.commit()
+    response = db_app.test_client().post(f'/api/games/{game.id}/pods/suggest', headers=auth_headers(user.id))
+    assert response.status_code == 400
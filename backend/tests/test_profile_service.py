@@ -18,6 +18,13 @@ def app():
     app = create_app('testing')
     return app
 
+@pytest.fixture(autouse=True)
+def restore_user_query():
+    """These tests assign User.query directly; drop the override so it can't leak into other modules."""
+    yield
+    if 'query' in vars(User):
+        del User.query
+
 @pytest.fixture
 def mock_db_session(mocker):
     """Create a mock database session."""
@@ -149,10 +156,12 @@ def test_upload_avatar(app, mock_db_session, sample_user, mock_file):
             # Execute
             response, status_code = ProfileService.upload_avatar(1, mock_file)
 
-        # Verify
-        assert status_code == 200
+        # Verify: the upload is staged and a job queued to put it in place
+        assert status_code == 202
         assert response.avatar_url == '/static/uploads/avatars/user_1_avatar.png'
         assert mock_save.called
+        queued = mock_db_session.add.call_args[0][0]
+        assert queued.name == 'store_avatar' and queued.payload['user_id'] == 1
         assert mock_db_session.commit.called
 
 def test_upload_avatar_invalid_file(mock_db_session, sample_user):
@@ -0,0 +1,112 @@
+import pytest
+
+from backend.app.config import TestingConfig
+
+
+@pytest.fixture
+def replica_app(monkeypatch, tmp_path):
+    """App whose replica is a separate, initially empty SQLite file."""
+    from backend.app import create_app, db
+
+    monkeypatch.setattr(TestingConfig, 'DATABASE_REPLICA_URL', f"sqlite:///{tmp_path / 'replica.db'}")
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all(bind_key=None)
+        db.metadata.create_all(db.engines['replica'])
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+    # init_app registered metadata for the bind on the shared db; don't leak it into other apps
+    db.metadatas.pop('replica', None)
+
+
+def _game_dates(response):
+    return [game['game_date'] for game in response.get_json()]
+
+
+def test_reads_go_to_replica_without_recent_writes(replica_app):
+    from backend.app import db
+    from backend.app.models import Game, GameStatus
+    from backend.app.api.services.game_summary_service import GameSummaryService
+    from datetime import date
+
+    game = Game(game_date=date(2025, 6, 1), status=GameStatus.UPCOMING)
+    db.session.add(game)
+    db.session.flush()
+    GameSummaryService.refresh(game)
+    db.session.commit()
+
+    response = replica_app.test_client().get('/api/games')
+    assert response.status_code == 200
+    assert response.headers['X-DB-Route'] == 'replica'
+    # The replica never received the row
+    assert _game_dates(response) == []
+
+
+def test_writer_reads_own_writes_from_primary(replica_app):
+    writer = replica_app.test_client()
+    created = writer.post('/api/games', json={'game_date': '2025-06-02'})
+    assert created.status_code == 201
+
+    response = writer.get('/api/games')
+    assert response.headers['X-DB-Route'] == 'primary'
+    assert _game_dates(response) == ['2025-06-02']
+
+    # Another client without the cookie is still served by the replica
+    other = replica_app.test_client().get('/api/games')
+    assert other.headers['X-DB-Route'] == 'replica'
+
+
+def test_sticky_by_authorization_header_without_cookie(replica_app, auth_headers):
+    headers = auth_headers(1)
+    created = replica_app.test_client(use_cookies=False).post(
+        '/api/games', json={'game_date': '2025-06-03'}, headers=headers
+    )
+    assert created.status_code == 201
+
+    response = replica_app.test_client(use_cookies=False).get('/api/games', headers=headers)
+    assert response.headers['X-DB-Route'] == 'primary'
+
+
+def test_failed_write_does_not_stick(replica_app):
+    client = replica_app.test_client()
+    assert client.post('/api/games', json={}).status_code == 400
+    assert client.get('/api/games').headers['X-DB-Route'] == 'replica'
+
+
+def test_lagging_replica_falls_back_to_primary(replica_app, monkeypatch):
+    from backend.app import replica
+
+    router = replica_app.extensions['replica']
+    router._checked_at = None
+    monkeypatch.setattr(replica, 'replica_lag', lambda engine: router.max_lag + 10)
+    assert replica_app.test_client().get('/api/games').headers['X-DB-Route'] == 'primary'
+
+    router._checked_at = None
+    monkeypatch.setattr(replica, 'replica_lag', lambda engine: None)
+    assert replica_app.test_client().get('/api/games').headers['X-DB-Route'] == 'primary'
+
+
+def test_using_primary_overrides_replica(replica_app):
+    from backend.app import db
+    from backend.app.models import User
+    from backend.app.replica import USE_REPLICA, WROTE, using_primary
+
+    db.session.add(User(username='alice', email='alice@example.com', password_hash='x'))
+    db.session.commit()
+    db.session.info.pop(WROTE)
+
+    db.session.info[USE_REPLICA] = True
+    try:
+        assert db.session.query(User.id).count() == 0
+        with using_primary():
+            assert db.session.query(User.id).count() == 1
+        assert db.session.query(User.id).count() == 0
+    finally:
+        db.session.info[USE_REPLICA] = False
+
+
+def test_no_replica_configured_leaves_routing_off(db_app):
+    response = db_app.test_client().get('/api/games')
+    assert response.status_code == 200
+    assert 'X-DB-Route' not in response.headers
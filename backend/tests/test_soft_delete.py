@@ -0,0 +1,81 @@
+"""
+Tests for the global soft-delete filter.
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func
+
+from backend.app import db
+from backend.app.models import User, Deck, Game, GameStatus, GameRegistration, Match, MatchPlayer
+from backend.app.soft_delete import including_deleted
+from backend.app.api.services.deck_service import DeckService
+from backend.app.api.services.user_service import UserService
+
+
+@pytest.fixture
+def games(db_app):
+    """Two completed games won by the same player; the second one is soft-deleted."""
+    alice = User(username="alice", email="alice@example.com", password_hash="x")
+    bob = User(username="bob", email="bob@example.com", password_hash="x")
+    db.session.add_all([alice, bob])
+    db.session.flush()
+    deck = Deck(user_id=alice.id, name="Deck", commander="Commander", colors="G")
+    other_deck = Deck(user_id=bob.id, name="Other", commander="Other", colors="U")
+    db.session.add_all([deck, other_deck])
+    db.session.flush()
+
+    created = []
+    for day, deleted in ((1, False), (2, True)):
+        game = Game(game_date=date(2025, 1, day), status=GameStatus.COMPLETED,
+                    deleted_at=datetime.utcnow() if deleted else None)
+        db.session.add(game)
+        db.session.flush()
+        match = Match(game_id=game.id, player_count=2, status='approved', submitted_by_id=bob.id)
+        db.session.add(match)
+        db.session.flush()
+        db.session.add_all([
+            GameRegistration(game_id=game.id, user_id=alice.id, deck_id=deck.id),
+            GameRegistration(game_id=game.id, user_id=bob.id, deck_id=other_deck.id),
+            MatchPlayer(match_id=match.id, user_id=alice.id, deck_id=deck.id, placement=1),
+            MatchPlayer(match_id=match.id, user_id=bob.id, deck_id=other_deck.id, placement=2),
+        ])
+        created.append(game)
+    db.session.commit()
+    return {'alice': alice.id, 'deck': deck.id, 'live': created[0].id, 'deleted': created[1].id}
+
+
+def test_deleted_games_and_their_rows_are_hidden(games):
+    assert [g.id for g in Game.query.all()] == [games['live']]
+    assert db.session.get(Game, games['deleted']) is None
+    assert {m.game_id for m in Match.query.all()} == {games['live']}
+    assert GameRegistration.query.count() == 2
+    assert MatchPlayer.query.count() == 2
+
+
+def test_win_counts_and_history_ignore_deleted_games(games):
+    wins = db.session.query(func.count(MatchPlayer.id)).filter(
+        MatchPlayer.user_id == games['alice'], MatchPlayer.placement == 1
+    ).scalar()
+    assert wins == 1
+    profile, _ = UserService.get_user_profile(games['alice'])
+    assert profile.stats == {"total_wins": 1}
+    history = DeckService.get_deck_history(games['deck'])
+    assert [entry.game_id for entry in history] == [games['live']]
+
+
+def test_admin_bypass(games):
+    with including_deleted():
+        assert Game.query.count() == 2
+        assert MatchPlayer.query.count() == 4
+    assert Game.query.count() == 1
+    assert Game.query.execution_options(include_deleted=True).count() == 2
+
+
+def test_refresh_of_just_deleted_game_still_works(games):
+    game = db.session.get(Game, games['live'])
+    game.deleted_at = datetime.utcnow()
+    db.session.commit()
+    # Expired attributes reload even though the row is now filtered out
+    assert game.deleted_at is not None
+    assert Game.query.count() == 0
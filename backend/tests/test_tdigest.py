@@ -0,0 +1,43 @@
+"""
+Tests for the t-digest quantile sketch.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from backend.app.api.utils.tdigest import TDigest
+
+
+def test_quantiles_track_exact_values():
+    rng = np.random.default_rng(3)
+    values = rng.lognormal(4.3, 0.4, 50_000)
+    digest = TDigest()
+    digest.update(values)
+    for q in (0.01, 0.5, 0.9, 0.99):
+        assert digest.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+    assert len(digest.to_dict()['centroids']) <= 2 * digest.compression
+
+
+def test_merged_digest_matches_single_digest():
+    rng = random.Random(5)
+    values = [rng.gauss(90, 20) for _ in range(20_000)]
+    parts = [TDigest() for _ in range(5)]
+    for i, value in enumerate(values):
+        parts[i % 5].add(value)
+    merged = TDigest()
+    for part in parts:
+        merged.merge(TDigest.from_dict(part.to_dict()))
+    assert merged.count == len(values)
+    assert (merged.min, merged.max) == (min(values), max(values))
+    for q in (0.5, 0.9):
+        assert merged.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.01)
+
+
+def test_small_and_empty_digests():
+    assert TDigest().quantile(0.5) is None
+    digest = TDigest()
+    digest.update([30, 10, 40, 20])
+    assert digest.quantile(0.5) == 25
+    assert digest.quantile(0) == 10 and digest.quantile(1) == 40
+    assert TDigest.from_dict(digest.to_dict()).quantile(0.5) == 25
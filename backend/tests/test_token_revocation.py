@@ -0,0 +1,125 @@
+"""
+Tests for JWT revocation: the Bloom-filtered in-memory list and the routes that revoke.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app import db
+from backend.app.models import User, TokenRevocation
+from backend.app.revocation import BloomFilter, RevocationList, _epoch
+
+
+@pytest.fixture
+def users(db_app):
+    alice = User(username='alice', email='alice@example.com', is_admin=True)
+    alice.set_password('secret')
+    bob = User(username='bob', email='bob@example.com', is_admin=True)
+    bob.set_password('hunter2')
+    db.session.add_all([alice, bob])
+    db.session.commit()
+    return alice.id, bob.id
+
+
+def _login(client, username, password):
+    response = client.post('/api/login', json={'username': username, 'password': password})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_bloom_filter_membership_and_error_rate():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    keys = [str(uuid.uuid4()) for _ in range(5000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(20000))
+    assert false_positives / 20000 < 0.03
+
+
+def test_revocation_list_tokens_users_and_expiry():
+    revocations = RevocationList(capacity=4, error_rate=0.01)
+    now = _epoch(datetime.utcnow())
+    for n in range(10):  # Past capacity: the filter is resized, nothing is lost
+        revocations.add_token(f'jti-{n}', now + 60)
+    assert all(revocations.is_revoked({'jti': f'jti-{n}', 'sub': '1', 'iat': now}) for n in range(10))
+    assert not revocations.is_revoked({'jti': 'other', 'sub': '1', 'iat': now})
+
+    revocations.add_user(7, now, now + 60)
+    assert revocations.is_revoked({'jti': 'a', 'sub': '7', 'iat': now - 1})
+    assert not revocations.is_revoked({'jti': 'b', 'sub': '7', 'iat': now})
+
+    revocations._prune(now + 61)
+    assert revocations.snapshot()['tokens'] == 0
+    assert not revocations.is_revoked({'jti': 'jti-0', 'sub': '7', 'iat': now - 1})
+
+
+def test_logout_revokes_access_and_refresh_tokens(db_app, users):
+    client = db_app.test_client()
+    tokens = _login(client, 'alice', 'secret')
+    assert client.get('/api/check-auth', headers=_bearer(tokens['access_token'])).status_code == 200
+
+    response = client.post('/api/logout', json={'refresh_token': tokens['refresh_token']},
+                           headers=_bearer(tokens['access_token']))
+    assert response.status_code == 200
+
+    response = client.get('/api/check-auth', headers=_bearer(tokens['access_token']))
+    assert response.status_code == 401
+    assert response.get_json()['message'] == 'Token has been revoked'
+    assert client.post('/api/refresh', headers=_bearer(tokens['refresh_token'])).status_code == 401
+
+    # A fresh login is unaffected
+    fresh = _login(client, 'alice', 'secret')
+    assert client.get('/api/check-auth', headers=_bearer(fresh['access_token'])).status_code == 200
+
+
+def test_demoted_admin_loses_existing_tokens(db_app, users):
+    _, bob_id = users
+    client = db_app.test_client()
+    alice = _login(client, 'alice', 'secret')
+    bob = _login(client, 'bob', 'hunter2')
+
+    with db_app.test_request_context():
+        from flask_jwt_extended import decode_token
+        bob_claims = decode_token(bob['access_token'])
+    response = client.post(f'/api/admin/users/{bob_id}/make-admin', headers=_bearer(alice['access_token']))
+    assert response.get_json()['is_admin'] is False
+
+    # Tokens issued before the demotion's second are revoked, later ones are not
+    row = db.session.query(TokenRevocation).filter_by(user_id=bob_id).one()
+    cutoff = _epoch(row.revoked_at)
+    revocations = db_app.extensions['revocation']
+    assert revocations.is_revoked({**bob_claims, 'iat': cutoff - 1})
+    assert not revocations.is_revoked({**bob_claims, 'iat': cutoff})
+    assert client.get('/api/check-auth', headers=_bearer(alice['access_token'])).status_code == 200
+
+
+def test_other_workers_pick_up_revocations_on_sync(db_app, users):
+    client = db_app.test_client()
+    tokens = _login(client, 'alice', 'secret')
+    client.post('/api/logout', headers=_bearer(tokens['access_token']))
+
+    # A second worker's list starts empty and learns the row from the table
+    with db_app.test_request_context():
+        from flask_jwt_extended import decode_token
+        claims = decode_token(tokens['access_token'], allow_expired=True)
+        other_worker = RevocationList(sync_interval=0)
+        assert not other_worker.is_revoked(claims)
+        other_worker.sync()
+        assert other_worker.is_revoked(claims)
+
+
+def test_rolled_back_revocation_is_not_applied(db_app, users):
+    from backend.app.revocation import revoke_token
+
+    payload = {'jti': str(uuid.uuid4()), 'sub': '1', 'exp': _epoch(datetime.utcnow() + timedelta(minutes=5))}
+    with db_app.test_request_context():
+        revoke_token(payload)
+        db.session.rollback()
+        db.session.commit()
+        assert not db_app.extensions['revocation'].is_revoked({**payload, 'iat': 0})
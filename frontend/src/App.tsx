@@ -48,6 +48,10 @@ const useAuth = () => {
     };
 
     const logout = () => {
+        if (accessToken) {
+            // Revoke the token server-side; logging out locally doesn't wait for it
+            apiClient.post('/logout', null, { headers: { Authorization: `Bearer ${accessToken}` } }).catch(() => {});
+        }
         setLoggedInUser(null);
         setAccessToken(null);
         localStorage.removeItem('loggedInUser');
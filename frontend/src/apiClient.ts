@@ -111,6 +111,21 @@ const apiRequest = async (method: string, url: string, data?: any) => {
   }
 };
 
+// Page data: several GETs in one round trip (POST /api/batch).
+// Paths are relative to the API base, e.g. `/decks/3`; a path may use a field of an
+// earlier response by id, e.g. `/users/{deck.user_id}`.
+export interface BatchResponse<T = any> {
+  status: number;
+  body: T;
+}
+
+export const fetchBatch = async (requests: Record<string, string>): Promise<Record<string, BatchResponse>> => {
+  const response = await apiClient.post<{ responses: Record<string, BatchResponse> }>('/batch', {
+    requests: Object.entries(requests).map(([id, path]) => ({ id, path: `/api${path}` })),
+  });
+  return response.data.responses;
+};
+
 // Auth-related API calls
 export const registerUser = async (userData: any) => {
   return await apiRequest('POST', '/register', userData);
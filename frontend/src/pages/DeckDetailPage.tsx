@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
-import apiClient from '../apiClient';
+import apiClient, { fetchBatch } from '../apiClient';
 import { useParams, Link, useLocation, useNavigate } from 'react-router-dom';
 
 // Keyframes for loading spinner
@@ -107,38 +107,46 @@ function DeckDetailPage({ loggedInUser }: { loggedInUser: User | null }) {
             const targetVersionId = location.state?.targetVersionId;
 
             try {
-                // Fetch base details, versions, and history in parallel
-                const [baseDetailsResponse, versionsResponse, historyResponse] = await Promise.all([
-                    apiClient.get<DeckDetailData>(`/decks/${numericDeckId}`),
-                    apiClient.get<DeckVersionSummary[]>(`/decks/${numericDeckId}/versions`),
-                    apiClient.get<DeckGameHistoryItem[]>(`/decks/${numericDeckId}/history`)
-                ]);
-
-                setDeckDetails(baseDetailsResponse.data);
-                setAllVersions(versionsResponse.data);
-                setDeckHistory(historyResponse.data);
-
-                // Fetch owner info
-                try {
-                    const ownerResponse = await apiClient.get<PlayerProfile>(`/users/${baseDetailsResponse.data.user_id}`);
-                    setOwnerInfo(ownerResponse.data);
-                } catch (ownerError) {
-                    console.error("Could not fetch owner details", ownerError);
+                // One round trip for details, versions, history, owner and the current version
+                const responses = await fetchBatch({
+                    deck: `/decks/${numericDeckId}`,
+                    versions: `/decks/${numericDeckId}/versions`,
+                    history: `/decks/${numericDeckId}/history`,
+                    owner: '/users/{deck.user_id}',
+                    current: `/decks/${numericDeckId}/versions/{deck.current_version_id}`
+                });
+                if (responses.deck.status !== 200) {
+                    throw new Error(responses.deck.body?.error || `HTTP ${responses.deck.status}`);
+                }
+                const baseDetails: DeckDetailData = responses.deck.body;
+                const versions: DeckVersionSummary[] = responses.versions.status === 200 ? responses.versions.body : [];
+
+                setDeckDetails(baseDetails);
+                setAllVersions(versions);
+                setDeckHistory(responses.history.status === 200 ? responses.history.body : []);
+                if (responses.owner.status === 200) {
+                    setOwnerInfo(responses.owner.body);
+                } else {
+                    console.error("Could not fetch owner details", responses.owner.body);
                 }
 
                 // Determine which version to show initially
                 let initialVersionId = targetVersionId;
-                if (!initialVersionId || !versionsResponse.data.some((v: DeckVersionSummary) => v.id === initialVersionId)) {
-                    initialVersionId = baseDetailsResponse.data.current_version_id ?? undefined;
-                    if (!initialVersionId && versionsResponse.data.length > 0) {
-                        initialVersionId = versionsResponse.data[0].id;
+                if (!initialVersionId || !versions.some((v: DeckVersionSummary) => v.id === initialVersionId)) {
+                    initialVersionId = baseDetails.current_version_id ?? undefined;
+                    if (!initialVersionId && versions.length > 0) {
+                        initialVersionId = versions[0].id;
                     }
                 }
 
                 if (initialVersionId) {
                     setSelectedVersionId(initialVersionId);
-                    const versionDetails = await apiClient.get<DeckVersionDetail>(`/decks/${numericDeckId}/versions/${initialVersionId}`);
-                    setSelectedVersionDetail(versionDetails.data);
+                    if (initialVersionId === baseDetails.current_version_id && responses.current.status === 200) {
+                        setSelectedVersionDetail(responses.current.body);
+                    } else {
+                        const versionDetails = await apiClient.get<DeckVersionDetail>(`/decks/${numericDeckId}/versions/${initialVersionId}`);
+                        setSelectedVersionDetail(versionDetails.data);
+                    }
                 }
 
             } catch (error) {
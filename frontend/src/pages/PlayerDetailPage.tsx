@@ -1,7 +1,7 @@
 // frontend/src/pages/PlayerDetailPage.tsx
 import React, { useState, useEffect } from 'react';
 import axios from 'axios'; // Keep for type guard
-import apiClient, { getDeckDetails, getDeckVersions, getDeckVersion } from '../apiClient'; // Import version functions
+import apiClient, { fetchBatch, getDeckDetails, getDeckVersions, getDeckVersion } from '../apiClient'; // Import version functions
 // Removed apiClient import
 import { useParams, Link } from 'react-router-dom'; // Import Link
 
@@ -99,25 +99,27 @@ function PlayerDetailPage() {
             setSelectedDeckDetails(null);
             setSelectedDeckHistory([]);
 
-            // Fetch Profile
+            // Profile and decks in one round trip
             try {
-                const profileResponse = await apiClient.get<PlayerProfile>(`/users/${userId}`); // Use apiClient, relative URL (Retry 2)
-                setPlayer(profileResponse.data);
+                const responses = await fetchBatch({
+                    profile: `/users/${userId}`,
+                    decks: `/users/${userId}/decks`
+                });
+                if (responses.profile.status === 200) {
+                    setPlayer(responses.profile.body);
+                } else {
+                    setPlayerMessage(`Failed to load player profile: ${responses.profile.body?.error || `HTTP ${responses.profile.status}`}`);
+                }
+                if (responses.decks.status === 200) {
+                    setPlayerDecks(responses.decks.body);
+                } else {
+                    setDecksMessage(`Failed to load decks: ${responses.decks.body?.error || `HTTP ${responses.decks.status}`}`);
+                }
             } catch (error) {
-                console.error(`Error fetching profile for user ${userId}:`, error);
+                console.error(`Error fetching player data for user ${userId}:`, error);
                 setPlayerMessage(axios.isAxiosError(error) && error.response ? `Failed to load player profile: ${error.response.data.error || error.message}` : `Failed to load player profile: ${(error as Error).message}`); // Use axios.isAxiosError
             } finally {
                 setIsLoadingPlayer(false);
-            }
-
-            // Fetch Decks
-            try {
-                const decksResponse = await apiClient.get<DeckListItem[]>(`/users/${userId}/decks`); // Use apiClient, relative URL (Retry 2)
-                setPlayerDecks(decksResponse.data);
-            } catch (error) {
-                console.error(`Error fetching decks for user ${userId}:`, error);
-                setDecksMessage(axios.isAxiosError(error) && error.response ? `Failed to load decks: ${error.response.data.error || error.message}` : `Failed to load decks: ${(error as Error).message}`); // Use axios.isAxiosError
-            } finally {
                 setIsLoadingDecks(false);
             }
         };
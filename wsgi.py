@@ -1,14 +1,6 @@
 import os
-from dotenv import load_dotenv # Import load_dotenv
 
-# Load environment variables from .env file at the project root (/app)
-# This assumes wsgi.py is at the root level alongside the .env file
-dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
-if os.path.exists(dotenv_path):
-    print(f"Loading environment variables from: {dotenv_path}")
-    load_dotenv(dotenv_path=dotenv_path, override=True) # Override existing env vars if needed
-else:
-    print(f"Warning: .env file not found at {dotenv_path}. Relying on system environment variables.")
+# .env files are loaded by backend/app/config.py when the app package is imported
 
 # Import using the full package path
 from backend.app import create_app, db